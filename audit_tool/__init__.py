@@ -20,11 +20,40 @@ __author__ = "Sopra Steria Digital Experience Team"
 __email__ = "digital.experience@soprasteria.com"
 __license__ = "Proprietary"
 
-# Import key components for easier access
-from .ai_interface import AIInterface
-from .methodology_parser import MethodologyParser
-from .persona_parser import PersonaParser
-from .tier_classifier import TierClassifier
-from .strategic_summary_generator import StrategicSummaryGenerator
-from .multi_persona_packager import MultiPersonaPackager
-from .main import BrandAuditTool
+import importlib
+from typing import TYPE_CHECKING
+
+# Key components, imported from their module on first access so that
+# `import audit_tool` does not pull in pandas, Playwright or requests
+_LAZY_IMPORTS = {
+    "AIInterface": ".ai_interface",
+    "MethodologyParser": ".methodology_parser",
+    "PersonaParser": ".persona_parser",
+    "TierClassifier": ".tier_classifier",
+    "StrategicSummaryGenerator": ".strategic_summary_generator",
+    "MultiPersonaPackager": ".multi_persona_packager",
+    "BrandAuditTool": ".main",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from .ai_interface import AIInterface
+    from .methodology_parser import MethodologyParser
+    from .persona_parser import PersonaParser
+    from .tier_classifier import TierClassifier
+    from .strategic_summary_generator import StrategicSummaryGenerator
+    from .multi_persona_packager import MultiPersonaPackager
+    from .main import BrandAuditTool
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
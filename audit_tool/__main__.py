@@ -0,0 +1,19 @@
+"""
+Command-line dispatcher for `python -m audit_tool`.
+
+`python -m audit_tool serve ...` starts the audit daemon; any other arguments
+are handled by the regular audit CLI in audit_tool.main.
+"""
+
+import sys
+
+def run() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .server import main as serve_main
+        serve_main(sys.argv[2:])
+    else:
+        from .main import main
+        main()
+
+if __name__ == "__main__":
+    run()
@@ -17,25 +17,187 @@ AI providers, ensuring consistent outputs regardless of the underlying model.
 import os
 import re
 import json
+import time
 import logging
-import requests
+import threading
 from typing import Dict, List, Any, Optional, Union
 
 from .methodology_parser import MethodologyParser
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates live at module level so a run can fingerprint them
+HYGIENE_PROMPT_TEMPLATE = """
+You are a brand audit expert evaluating digital content for Sopra Steria.
+
+# URL
+{url}
+
+# Page Content
+{page_content}  # Truncate to avoid token limits
+
+# Persona
+{persona_content}
+
+# Tier Classification
+This URL is classified as: {tier_label}
+
+# Evaluation Criteria
+{criteria_text}
+
+# Task
+Generate a detailed brand hygiene scorecard for this URL from the perspective of the persona.
+For each criterion, provide:
+1. A score from 0-10 (where 10 is excellent)
+2. Specific evidence from the page content that justifies the score
+3. Brief explanation of how well the content meets the criterion for this persona
+
+Then provide an overall score and 3-5 specific recommendations for improvement.
+
+Format your response as a markdown document with the following sections:
+1. Title: "Brand Hygiene Scorecard for [Persona Name]"
+2. URL section
+3. Introduction
+4. Criteria Scores (in a table with columns for Criterion, Score, and Evidence)
+5. Overall Assessment with Final Score
+6. Recommendations (numbered list)
+
+Be specific, objective, and focus on how well the content meets the needs of the persona.
+"""
+
+EXPERIENCE_PROMPT_TEMPLATE = """
+You are a brand experience analyst evaluating digital content for Sopra Steria.
+
+# URL
+{url}
+
+# Page Content
+{page_content}  # Truncate to avoid token limits
+
+# Persona
+{persona_content}
+
+# Tier Classification
+This URL is classified as: {tier_label}
+
+# Task
+Generate a detailed brand experience report for this URL from the perspective of the persona.
+Analyze how the content would be experienced by this specific persona, considering:
+
+1. First Impressions: What would the persona notice first? How would they feel?
+2. Content Relevance: How relevant is the content to the persona's needs and priorities?
+3. Brand Perception: How would this content affect the persona's perception of the Sopra Steria brand?
+4. Journey Analysis: What would be the persona's likely path through this content? Where might they get stuck or confused?
+5. Emotional Response: What emotions would the content evoke in this persona?
+
+Then provide:
+1. Overall sentiment (Positive, Neutral, or Negative)
+2. Engagement level (High, Medium, or Low)
+3. Conversion likelihood (High, Medium, or Low)
+4. 3-5 specific recommendations for improving the experience for this persona
+
+Format your response as a markdown document with the following sections:
+1. Title: "Brand Experience Report for [Persona Name]"
+2. URL section
+3. Introduction
+4. Analysis sections (First Impressions, Content Relevance, Brand Perception, Journey Analysis, Emotional Response)
+5. Experience Metrics (Sentiment, Engagement, Conversion)
+6. Recommendations (numbered list)
+
+Be specific, empathetic, and focus on the persona's likely experience with this content.
+"""
+
+SUMMARY_PROMPT_TEMPLATE = """
+You are a strategic brand consultant analyzing audit data for Sopra Steria.
+
+# Persona
+{persona_name}
+
+# Audit Data
+{data_text}  # Truncate to avoid token limits
+
+# Task
+Generate a strategic summary of the brand audit results for this persona.
+Analyze the data to identify:
+
+1. Overall brand health score and what it means
+2. Key strengths and weaknesses across the digital estate
+3. Patterns and trends in the data
+4. Strategic implications for the brand
+5. Prioritized recommendations for improvement
+
+Format your response as a markdown document with the following sections:
+1. Title: "Strategic Brand Audit Summary for [Persona Name]"
+2. Executive Summary (1-2 paragraphs)
+3. Key Findings (bullet points)
+4. Strengths (bullet points)
+5. Weaknesses (bullet points)
+6. Strategic Recommendations (numbered list with bold headings)
+7. Next Steps (numbered list)
+
+Be strategic, insightful, and focus on actionable recommendations that will improve the brand experience for this persona.
+"""
+
+PROMPT_TEMPLATES = {
+    "hygiene_scorecard": HYGIENE_PROMPT_TEMPLATE,
+    "experience_report": EXPERIENCE_PROMPT_TEMPLATE,
+    "strategic_summary": SUMMARY_PROMPT_TEMPLATE,
+}
+
+class RateLimiter:
+    """Caps concurrent and per-minute model calls across every job sharing it."""
+    
+    def __init__(self, max_concurrent: int = 4, requests_per_minute: int = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_concurrent: Maximum calls in flight at once
+            requests_per_minute: Maximum calls started per minute (optional)
+        """
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def __enter__(self):
+        self._slots.acquire()
+        if self.requests_per_minute:
+            # Space call starts evenly instead of bursting at the top of each minute
+            interval = 60.0 / self.requests_per_minute
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._slots.release()
+        return False
+
+# Text the single-call generators return in place of a report when the provider fails
+ERROR_RESPONSE_PREFIX = "Error generating response: "
+
+class ProviderError(RuntimeError):
+    """A model provider call failed (network error, rate limit, outage or bad response)."""
+
 class AIInterface:
     """Interface for AI services used in brand audits."""
     
-    def __init__(self, model_provider: str = "anthropic"):
+    def __init__(self, model_provider: str = "anthropic", rate_limiter: "RateLimiter" = None):
         """
         Initialize with model provider.
         
         Args:
             model_provider: The AI provider to use ("anthropic" or "openai")
+            rate_limiter: Limiter shared by every caller of the provider (optional)
         """
         self.model_provider = model_provider
+        self.rate_limiter = rate_limiter
+        self._usage = threading.local()
         
         # Load API keys from environment
         self.anthropic_api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -66,14 +228,59 @@ class AIInterface:
         """
         logger.info(f"Generating hygiene scorecard for {url}")
         
+        prompt = self.build_hygiene_prompt(url, page_content, persona_content, methodology)
+        
+        # Generate response
+        return self._response_or_error(prompt)
+    
+    def generate_experience_report(self, url: str, page_content: str, persona_content: str, methodology: MethodologyParser) -> str:
+        """
+        Generate an experience report for a URL.
+        
+        Args:
+            url: The URL to evaluate
+            page_content: The content of the page
+            persona_content: The persona markdown content
+            methodology: The methodology parser instance
+            
+        Returns:
+            Markdown formatted experience report
+        """
+        logger.info(f"Generating experience report for {url}")
+        
+        prompt = self.build_experience_prompt(url, page_content, persona_content, methodology)
+        
+        # Generate response
+        return self._response_or_error(prompt)
+    
+    def build_hygiene_prompt(self, url: str, page_content: str, persona_content: str, methodology: MethodologyParser,
+                             tier_name: str = None, tier_config: Dict[str, Any] = None,
+                             criteria: List[Dict[str, Any]] = None) -> str:
+        """
+        Build the hygiene scorecard prompt for a URL without calling the model.
+        
+        Args:
+            url: The URL to evaluate
+            page_content: The content of the page
+            persona_content: The persona markdown content
+            methodology: The methodology parser instance
+            tier_name: Tier already assigned to the URL (optional, classified if omitted)
+            tier_config: Configuration of that tier (optional)
+            criteria: Criteria for that tier (optional, looked up if omitted)
+            
+        Returns:
+            Formatted prompt
+        """
         # Get tier information
-        tier_name, tier_config = methodology.classify_url(url)
+        if tier_name is None or tier_config is None:
+            tier_name, tier_config = methodology.classify_url(url)
         
         # Get criteria for this tier
-        criteria = methodology.get_criteria_for_tier(tier_name)
+        if criteria is None:
+            criteria = methodology.get_criteria_for_tier(tier_name)
         
         # Construct prompt
-        prompt = self._construct_hygiene_prompt(
+        return self._construct_hygiene_prompt(
             url=url,
             page_content=page_content,
             persona_content=persona_content,
@@ -81,43 +288,78 @@ class AIInterface:
             tier_config=tier_config,
             criteria=criteria
         )
-        
-        # Generate response
-        response = self._generate_ai_response(prompt)
-        
-        return response
     
-    def generate_experience_report(self, url: str, page_content: str, persona_content: str, methodology: MethodologyParser) -> str:
+    def build_experience_prompt(self, url: str, page_content: str, persona_content: str, methodology: MethodologyParser,
+                                tier_name: str = None, tier_config: Dict[str, Any] = None) -> str:
         """
-        Generate an experience report for a URL.
+        Build the experience report prompt for a URL without calling the model.
         
         Args:
             url: The URL to evaluate
             page_content: The content of the page
             persona_content: The persona markdown content
             methodology: The methodology parser instance
+            tier_name: Tier already assigned to the URL (optional, classified if omitted)
+            tier_config: Configuration of that tier (optional)
             
         Returns:
-            Markdown formatted experience report
+            Formatted prompt
         """
-        logger.info(f"Generating experience report for {url}")
-        
         # Get tier information
-        tier_name, tier_config = methodology.classify_url(url)
+        if tier_name is None or tier_config is None:
+            tier_name, tier_config = methodology.classify_url(url)
         
         # Construct prompt
-        prompt = self._construct_experience_prompt(
+        return self._construct_experience_prompt(
             url=url,
             page_content=page_content,
             persona_content=persona_content,
             tier_name=tier_name,
             tier_config=tier_config
         )
+    
+    def generate_response(self, prompt: str) -> str:
+        """
+        Send a prepared prompt to the configured model provider.
         
-        # Generate response
-        response = self._generate_ai_response(prompt)
+        Args:
+            prompt: The prompt to send to the AI
+            
+        Returns:
+            The AI's response
+            
+        Raises:
+            ProviderError: If the provider call fails, so the caller can record and retry the page
+        """
+        self._usage.tokens = {}
+        if self.rate_limiter is None:
+            return self._generate_ai_response(prompt)
+        
+        with self.rate_limiter:
+            return self._generate_ai_response(prompt)
+    
+    def last_usage(self) -> Dict[str, int]:
+        """
+        Token usage reported by the provider for this thread's last response.
         
-        return response
+        Returns:
+            input_tokens and output_tokens, or an empty dict if the provider reported none
+        """
+        return dict(getattr(self._usage, 'tokens', None) or {})
+    
+    def _record_usage(self, result: Dict[str, Any]) -> None:
+        """
+        Keep the token counts of a provider response for last_usage().
+        
+        Args:
+            result: Decoded provider response
+        """
+        usage = result.get("usage") or {}
+        input_tokens = usage.get("input_tokens", usage.get("prompt_tokens"))
+        output_tokens = usage.get("output_tokens", usage.get("completion_tokens"))
+        if input_tokens is None and output_tokens is None:
+            return
+        self._usage.tokens = {"input_tokens": input_tokens or 0, "output_tokens": output_tokens or 0}
     
     def generate_strategic_summary(self, persona_name: str, scorecard_data: List[Dict], methodology: MethodologyParser) -> str:
         """
@@ -141,9 +383,7 @@ class AIInterface:
         )
         
         # Generate response
-        response = self._generate_ai_response(prompt)
-        
-        return response
+        return self._response_or_error(prompt)
     
     def _construct_hygiene_prompt(self, url: str, page_content: str, persona_content: str, 
                                  tier_name: str, tier_config: Dict[str, Any], 
@@ -168,43 +408,13 @@ class AIInterface:
             criteria_text += f"- {criterion['name']}: {criterion['description']}\n"
         
         # Construct prompt
-        prompt = f"""
-You are a brand audit expert evaluating digital content for Sopra Steria.
-
-# URL
-{url}
-
-# Page Content
-{page_content[:10000]}  # Truncate to avoid token limits
-
-# Persona
-{persona_content}
-
-# Tier Classification
-This URL is classified as: {tier_config.get('name', tier_name.upper())}
-
-# Evaluation Criteria
-{criteria_text}
-
-# Task
-Generate a detailed brand hygiene scorecard for this URL from the perspective of the persona.
-For each criterion, provide:
-1. A score from 0-10 (where 10 is excellent)
-2. Specific evidence from the page content that justifies the score
-3. Brief explanation of how well the content meets the criterion for this persona
-
-Then provide an overall score and 3-5 specific recommendations for improvement.
-
-Format your response as a markdown document with the following sections:
-1. Title: "Brand Hygiene Scorecard for [Persona Name]"
-2. URL section
-3. Introduction
-4. Criteria Scores (in a table with columns for Criterion, Score, and Evidence)
-5. Overall Assessment with Final Score
-6. Recommendations (numbered list)
-
-Be specific, objective, and focus on how well the content meets the needs of the persona.
-"""
+        prompt = HYGIENE_PROMPT_TEMPLATE.format(
+            url=url,
+            page_content=page_content[:10000],
+            persona_content=persona_content,
+            tier_label=tier_config.get('name', tier_name.upper()),
+            criteria_text=criteria_text
+        )
         
         return prompt
     
@@ -224,47 +434,12 @@ Be specific, objective, and focus on how well the content meets the needs of the
             Formatted prompt
         """
         # Construct prompt
-        prompt = f"""
-You are a brand experience analyst evaluating digital content for Sopra Steria.
-
-# URL
-{url}
-
-# Page Content
-{page_content[:10000]}  # Truncate to avoid token limits
-
-# Persona
-{persona_content}
-
-# Tier Classification
-This URL is classified as: {tier_config.get('name', tier_name.upper())}
-
-# Task
-Generate a detailed brand experience report for this URL from the perspective of the persona.
-Analyze how the content would be experienced by this specific persona, considering:
-
-1. First Impressions: What would the persona notice first? How would they feel?
-2. Content Relevance: How relevant is the content to the persona's needs and priorities?
-3. Brand Perception: How would this content affect the persona's perception of the Sopra Steria brand?
-4. Journey Analysis: What would be the persona's likely path through this content? Where might they get stuck or confused?
-5. Emotional Response: What emotions would the content evoke in this persona?
-
-Then provide:
-1. Overall sentiment (Positive, Neutral, or Negative)
-2. Engagement level (High, Medium, or Low)
-3. Conversion likelihood (High, Medium, or Low)
-4. 3-5 specific recommendations for improving the experience for this persona
-
-Format your response as a markdown document with the following sections:
-1. Title: "Brand Experience Report for [Persona Name]"
-2. URL section
-3. Introduction
-4. Analysis sections (First Impressions, Content Relevance, Brand Perception, Journey Analysis, Emotional Response)
-5. Experience Metrics (Sentiment, Engagement, Conversion)
-6. Recommendations (numbered list)
-
-Be specific, empathetic, and focus on the persona's likely experience with this content.
-"""
+        prompt = EXPERIENCE_PROMPT_TEMPLATE.format(
+            url=url,
+            page_content=page_content[:10000],
+            persona_content=persona_content,
+            tier_label=tier_config.get('name', tier_name.upper())
+        )
         
         return prompt
     
@@ -285,39 +460,20 @@ Be specific, empathetic, and focus on the persona's likely experience with this
         data_text = json.dumps(scorecard_data, indent=2)
         
         # Construct prompt
-        prompt = f"""
-You are a strategic brand consultant analyzing audit data for Sopra Steria.
-
-# Persona
-{persona_name}
-
-# Audit Data
-{data_text[:15000]}  # Truncate to avoid token limits
-
-# Task
-Generate a strategic summary of the brand audit results for this persona.
-Analyze the data to identify:
-
-1. Overall brand health score and what it means
-2. Key strengths and weaknesses across the digital estate
-3. Patterns and trends in the data
-4. Strategic implications for the brand
-5. Prioritized recommendations for improvement
-
-Format your response as a markdown document with the following sections:
-1. Title: "Strategic Brand Audit Summary for [Persona Name]"
-2. Executive Summary (1-2 paragraphs)
-3. Key Findings (bullet points)
-4. Strengths (bullet points)
-5. Weaknesses (bullet points)
-6. Strategic Recommendations (numbered list with bold headings)
-7. Next Steps (numbered list)
-
-Be strategic, insightful, and focus on actionable recommendations that will improve the brand experience for this persona.
-"""
+        prompt = SUMMARY_PROMPT_TEMPLATE.format(
+            persona_name=persona_name,
+            data_text=data_text[:15000]
+        )
         
         return prompt
     
+    def _response_or_error(self, prompt: str) -> str:
+        # The single-call generators return the error as the report text, as they always have
+        try:
+            return self._generate_ai_response(prompt)
+        except ProviderError as e:
+            return f"{ERROR_RESPONSE_PREFIX}{str(e)}"
+    
     def _generate_ai_response(self, prompt: str) -> str:
         """
         Generate a response from the AI model.
@@ -335,6 +491,25 @@ Be strategic, insightful, and focus on actionable recommendations that will impr
         else:
             raise ValueError(f"Unsupported model provider: {self.model_provider}")
     
+    def _post_json(self, url: str, headers: Dict[str, str], data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a JSON request to a provider and return the decoded response.
+        
+        Args:
+            url: Provider endpoint
+            headers: Request headers
+            data: JSON body
+            
+        Returns:
+            The decoded JSON response
+        """
+        # requests is only imported once a model is actually called
+        import requests
+        
+        response = requests.post(url, headers=headers, json=data)
+        response.raise_for_status()
+        return response.json()
+    
     def _generate_anthropic_response(self, prompt: str) -> str:
         """
         Generate a response from Anthropic's Claude.
@@ -344,6 +519,9 @@ Be strategic, insightful, and focus on actionable recommendations that will impr
             
         Returns:
             Claude's response
+            
+        Raises:
+            ProviderError: If the request fails
         """
         if not self.anthropic_api_key:
             raise ValueError("Anthropic API key not found")
@@ -361,20 +539,14 @@ Be strategic, insightful, and focus on actionable recommendations that will impr
                 "temperature": 0.2
             }
             
-            response = requests.post(
-                "https://api.anthropic.com/v1/complete",
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+            result = self._post_json("https://api.anthropic.com/v1/complete", headers, data)
+            self._record_usage(result)
             
             return result.get("completion", "")
             
         except Exception as e:
             logger.error(f"Error generating Anthropic response: {str(e)}")
-            return f"Error generating response: {str(e)}"
+            raise ProviderError(str(e)) from e
     
     def _generate_openai_response(self, prompt: str) -> str:
         """
@@ -385,6 +557,9 @@ Be strategic, insightful, and focus on actionable recommendations that will impr
             
         Returns:
             GPT's response
+            
+        Raises:
+            ProviderError: If the request fails
         """
         if not self.openai_api_key:
             raise ValueError("OpenAI API key not found")
@@ -405,17 +580,11 @@ Be strategic, insightful, and focus on actionable recommendations that will impr
                 "temperature": 0.2
             }
             
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+            result = self._post_json("https://api.openai.com/v1/chat/completions", headers, data)
+            self._record_usage(result)
             
             return result.get("choices", [{}])[0].get("message", {}).get("content", "")
             
         except Exception as e:
             logger.error(f"Error generating OpenAI response: {str(e)}")
-            return f"Error generating response: {str(e)}"
+            raise ProviderError(str(e)) from e
@@ -0,0 +1,206 @@
+"""
+Analytics Store for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module puts an embedded DuckDB engine over the Parquet files the tool writes:
+1. Defines views over the unified dataset: criteria_scores, experience, persona_comparison,
+   score_cube and page_dimension
+2. Defines views over the persona tables: page_facts and recommendations
+3. Defines run_page_facts over every audit_runs/<run>/page_facts.parquet
+4. Defines run_history, one row per run and persona across the dataset and audit_runs
+5. Offers a small query API returning pandas DataFrames, with bound parameters
+
+Views read the Parquet files at query time, so queries see files written after
+the store was opened, aggregate column by column and only bring the result
+into pandas. DuckDB prunes partitions and row groups from the filters of a query
+and spills to disk for tables larger than memory. A view whose files do not
+exist yet is an empty view with the same columns, so queries never fail for
+lack of data; refresh() picks up the files once they are written.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+from . import dataset
+
+logger = logging.getLogger(__name__)
+
+# Columns of the views over the persona tables and audit runs, used while no file exists
+PAGE_FACTS_COLUMNS = {
+    'page_id': 'VARCHAR', 'url': 'VARCHAR', 'slug': 'VARCHAR', 'persona': 'VARCHAR', 'tier': 'VARCHAR',
+    'final_score': 'DOUBLE', 'brand_health_index': 'DOUBLE', 'trust_gap': 'DOUBLE', 'audited_ts': 'VARCHAR'
+}
+RECOMMENDATIONS_COLUMNS = {
+    'page_id': 'VARCHAR', 'recommendation': 'VARCHAR', 'strategic_impact': 'VARCHAR', 'complexity': 'VARCHAR',
+    'urgency': 'VARCHAR', 'resources': 'VARCHAR', 'impact_score': 'DOUBLE', 'quick_win_flag': 'BOOLEAN',
+    'owner': 'VARCHAR', 'target_date': 'VARCHAR', 'status': 'VARCHAR', 'persona': 'VARCHAR'
+}
+RUN_PAGE_FACTS_COLUMNS = {
+    'run_id': 'VARCHAR', 'persona_id': 'VARCHAR', 'page_id': 'VARCHAR', 'page_key': 'INTEGER', 'url_slug': 'VARCHAR',
+    'url': 'VARCHAR',
+    'tier': 'VARCHAR', 'criterion_id': 'VARCHAR', 'raw_score': 'DOUBLE', 'weighted_score': 'DOUBLE',
+    'descriptor': 'VARCHAR'
+}
+
+# Views over the unified dataset and the dataset table each one reads
+DATASET_VIEWS = {
+    'criteria_scores': 'audit',
+    'experience': 'experience',
+    'persona_comparison': 'comparison',
+    'score_cube': 'cube',
+    'page_dimension': 'pages'
+}
+
+RUN_HISTORY_SQL = """
+CREATE OR REPLACE VIEW run_history AS
+SELECT run, persona, source,
+       count(DISTINCT page_id) AS pages,
+       count(*) AS criteria_rows,
+       avg(score) AS average_score,
+       min(score) AS min_score,
+       max(score) AS max_score
+FROM (
+    SELECT run, persona, page_id, score, 'dataset' AS source FROM criteria_scores
+    UNION ALL
+    SELECT run_id, persona_id, page_id, raw_score, 'audit_runs' FROM run_page_facts
+)
+GROUP BY run, persona, source
+"""
+
+def _sql_type(arrow_type: pa.DataType) -> str:
+    if pa.types.is_dictionary(arrow_type) or pa.types.is_string(arrow_type):
+        return 'VARCHAR'
+    if pa.types.is_floating(arrow_type):
+        return 'DOUBLE'
+    if pa.types.is_int32(arrow_type):
+        return 'INTEGER'
+    if pa.types.is_integer(arrow_type):
+        return 'BIGINT'
+    if pa.types.is_boolean(arrow_type):
+        return 'BOOLEAN'
+    return 'VARCHAR'
+
+def _quote(path: Union[str, Path]) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+class AnalyticsStore:
+    """Embedded DuckDB views over the unified dataset, the persona tables and audit runs."""
+
+    def __init__(self, data_dir: Union[str, Path] = "audit_data", runs_dir: Union[str, Path] = "audit_runs",
+                 database: str = ":memory:"):
+        """
+        Open the engine and define the views.
+
+        Args:
+            data_dir: Directory holding the unified dataset and the persona table folders
+            runs_dir: Directory holding one folder per audit run
+            database: DuckDB database file, in memory by default since views hold no data
+        """
+        self.data_dir = Path(data_dir)
+        self.dataset_dir = self.data_dir / dataset.DATASET_DIRNAME
+        self.runs_dir = Path(runs_dir)
+        self._connection = duckdb.connect(database)
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _empty_view(self, name: str, columns: Dict[str, str]) -> None:
+        select = ", ".join(f"CAST(NULL AS {sql_type}) AS {column}" for column, sql_type in columns.items())
+        self._connection.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT {select} WHERE false")
+
+    def _parquet_view(self, name: str, base: Path, pattern: str, columns: Dict[str, str], select: str = "*",
+                      options: str = "") -> None:
+        if not any(base.glob(pattern)):
+            self._empty_view(name, columns)
+            return
+        self._connection.execute(
+            f"CREATE OR REPLACE VIEW {name} AS SELECT {select} "
+            f"FROM read_parquet({_quote((base / pattern).as_posix())}, union_by_name=true{options})")
+
+    def refresh(self) -> None:
+        """Define every view again, picking up tables written since the store was opened."""
+        with self._lock:
+            for name, table in DATASET_VIEWS.items():
+                layout = dataset.TABLES[table]
+                columns = {field.name: _sql_type(field.type) for field in layout.schema}
+                columns.update(dict.fromkeys(layout.partition_by, 'VARCHAR'))
+                self._parquet_view(name, self.dataset_dir / table, "**/*.parquet", columns,
+                                   options=", hive_partitioning=true, hive_types_autocast=false")
+
+            self._parquet_view('page_facts', self.data_dir, "*/pages.parquet", PAGE_FACTS_COLUMNS)
+            # The persona of a recommendation is the name of the folder its table is in
+            self._parquet_view('recommendations', self.data_dir, "*/recommendations.parquet",
+                               RECOMMENDATIONS_COLUMNS,
+                               select="* EXCLUDE (filename), "
+                                      "regexp_extract(filename, '([^/\\\\]+)[/\\\\][^/\\\\]+$', 1) AS persona",
+                               options=", filename=true")
+            self._parquet_view('run_page_facts', self.runs_dir, "*/page_facts.parquet", RUN_PAGE_FACTS_COLUMNS)
+            self._connection.execute(RUN_HISTORY_SQL)
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None, **frames: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run a SQL query against the views.
+
+        Args:
+            sql: Query, with ? placeholders for params
+            params: Values bound to the placeholders
+            **frames: DataFrames to expose to the query under their keyword name
+
+        Returns:
+            Query result
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+        try:
+            for name, frame in frames.items():
+                cursor.register(name, frame)
+            return cursor.execute(sql, list(params or [])).df()
+        finally:
+            cursor.close()
+
+    def scalar(self, sql: str, params: Optional[Sequence[Any]] = None, **frames: pd.DataFrame) -> Any:
+        """
+        Run a query returning a single value.
+
+        Returns:
+            First column of the first row, or None if the query returns no rows
+        """
+        result = self.query(sql, params, **frames)
+        return None if result.empty else result.iat[0, 0]
+
+    def views(self) -> List[str]:
+        """Names of the defined views."""
+        return self.query("SELECT view_name FROM duckdb_views() WHERE NOT internal ORDER BY view_name")[
+            "view_name"].tolist()
+
+    def score_spread(self, by: str, run: Optional[str] = None, table: str = "criteria_scores") -> pd.DataFrame:
+        """
+        Mean, sample standard deviation and count of scores per group.
+
+        Args:
+            by: Column to group by, e.g. criterion_code or persona
+            run: Only include this run (every run when omitted)
+            table: View to aggregate
+
+        Returns:
+            One row per group with mean, std and count columns
+        """
+        where, params = ("WHERE run = ?", [run]) if run is not None else ("", [])
+        return self.query(f'SELECT "{by}", avg(score) AS mean, stddev_samp(score) AS std, count(*) AS count '
+                          f'FROM {table} {where} GROUP BY "{by}" ORDER BY "{by}"', params)
+
+    def close(self) -> None:
+        """Close the engine."""
+        self._connection.close()
+
+    def __enter__(self) -> "AnalyticsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
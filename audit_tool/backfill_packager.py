@@ -2,22 +2,158 @@
 """
 Enhanced Backfill Packager for Brand Audit Tool
 Converts existing markdown audit outputs into rich, structured CSV format
+Repackaging parses only reports that changed since the last run (see package_manifest)
+The backfill streams rows to Parquet a batch of pages at a time (see stream_incremental)
 """
 
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Callable, TYPE_CHECKING
 import hashlib
+import logging
+from functools import lru_cache
+
+from .criteria_index import default_criteria_index
+from .dataset import ROW_GROUP_SIZE
+from .package_manifest import PackageManifest
+from .report_parser import parse_report, parse_report_file, ReportRecord
+from .row_writer import ParquetRowWriter
+from .scoring import brand_health_index, SENTIMENT_SCORES, ENGAGEMENT_SCORES
+
+if TYPE_CHECKING:
+    from .parallel_packaging import PackagingPool
+
+logger = logging.getLogger(__name__)
+
+# Tables built from each persona's reports, in the order they are written
+TABLE_NAMES = ('pages', 'criteria_scores', 'recommendations', 'experience')
+
+# Pages parsed and written together by the streaming backfill; bounds the rows held at once
+PAGE_BATCH_SIZE = 256
+
+# Generic criteria scored by older scorecards that the methodology no longer lists
+FALLBACK_CRITERION_WEIGHTS = {
+    "value_proposition_clarity": 20,
+    "call_to_action_effectiveness": 15
+}
+
+# Labels of the experience report's narrative sections and their keys
+EXPERIENCE_SECTIONS = {
+    "First Impression": "first_impression",
+    "Language & Tone": "language_tone",
+    "Gaps in Information": "information_gaps",
+    "Trust and Credibility": "trust_credibility",
+    "Business Impact & Next Steps": "business_impact"
+}
+
+RECOMMENDATION_ITEM = re.compile(r'\*\*([^*]+)\*\*\s*-\s*(.+)')
+
+@lru_cache(maxsize=None)
+def _methodology_weights():
+    # Whole-number weights stay integers so weight_pct columns keep their dtype
+    weights = {code: int(weight) if float(weight).is_integer() else weight
+               for code, weight in default_criteria_index().weights.items()}
+    return {**FALLBACK_CRITERION_WEIGHTS, **weights}
+
+def criterion_weights() -> Dict[str, float]:
+    """Weight of every criterion code, compiled once per process from the methodology"""
+    return dict(_methodology_weights())
+
+def _strings(*names: str) -> List[Tuple[str, pa.DataType]]:
+    return [(name, pa.string()) for name in names]
+
+@lru_cache(maxsize=None)
+def table_schemas() -> Dict[str, pa.Schema]:
+    """Columns and types of each table, in the order its rows are built"""
+    weights = _methodology_weights().values()
+    weight_type = pa.int64() if all(isinstance(weight, int) for weight in weights) else pa.float64()
+    return {
+        'pages': pa.schema(_strings('page_id', 'url', 'slug', 'persona', 'tier') + [
+            ('final_score', pa.float64()), ('brand_health_index', pa.float64()), ('trust_gap', pa.float64()),
+            ('audited_ts', pa.string())]),
+        'criteria_scores': pa.schema(_strings('page_id', 'criterion_code', 'criterion_name') + [
+            ('score', pa.float64()), ('evidence', pa.string()), ('weight_pct', weight_type), ('tier', pa.string()),
+            ('descriptor', pa.string()), ('impact_score', pa.float64())]),
+        'recommendations': pa.schema(_strings('page_id', 'recommendation', 'strategic_impact', 'complexity',
+                                             'urgency', 'resources') + [
+            ('impact_score', pa.float64()), ('quick_win_flag', pa.bool_())] + _strings('owner', 'target_date', 'status')),
+        'experience': pa.schema(_strings(
+            'page_id', 'persona_id', 'first_impression', 'language_tone_feedback', 'information_gaps',
+            'trust_credibility_assessment', 'business_impact_analysis', 'effective_copy_examples',
+            'ineffective_copy_examples', 'overall_sentiment', 'engagement_level', 'conversion_likelihood'))
+    }
+
+def _conform(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """A batch with the columns and types of a schema, missing columns as nulls"""
+    names = batch.schema.names
+    return pa.RecordBatch.from_arrays(
+        [batch.column(field.name).cast(field.type) if field.name in names else pa.nulls(len(batch), field.type)
+         for field in schema], schema=schema)
+
+class _TableCursor:
+    """Reads row ranges of a Parquet table front to back, holding one row group at a time"""
+    
+    def __init__(self, path: Path, schema: pa.Schema):
+        self.path = path
+        self.schema = schema
+        self._restart()
+    
+    def _restart(self) -> None:
+        self._batches = pq.ParquetFile(self.path).iter_batches(batch_size=ROW_GROUP_SIZE)
+        self._batch: Optional[pa.RecordBatch] = None
+        self._start = self._stop = 0
+    
+    def rows(self, start: int, stop: int) -> Iterator[Dict]:
+        """Rows start to stop, in the writer's schema"""
+        if start < self._start:
+            self._restart()
+        while start < stop:
+            if start >= self._stop:
+                self._batch = _conform(next(self._batches), self.schema)
+                self._start, self._stop = self._stop, self._stop + len(self._batch)
+                continue
+            end = min(stop, self._stop)
+            yield from self._batch.slice(start - self._start, end - start).to_pylist()
+            start = end
+
+def _write_csv(parquet_path: Path, csv_path: Path) -> None:
+    """Write a Parquet table as CSV one row group at a time, replacing the CSV once complete"""
+    tmp_path = csv_path.with_name(f".{csv_path.name}.tmp")
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as handle:
+            parquet = pq.ParquetFile(parquet_path)
+            if not parquet.metadata.num_rows:
+                parquet.schema_arrow.empty_table().to_pandas().to_csv(handle, index=False)
+            for i, batch in enumerate(parquet.iter_batches(batch_size=ROW_GROUP_SIZE)):
+                batch.to_pandas().to_csv(handle, index=False, header=i == 0)
+        os.replace(tmp_path, csv_path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+def _row_slice(rows) -> Optional[Tuple[pd.DataFrame, int, int]]:
+    """A page's fresh rows of a table as (table, start, stop)"""
+    if isinstance(rows, pd.DataFrame):
+        return rows, 0, len(rows)
+    return rows
+
+def _row_count(rows) -> int:
+    rows = _row_slice(rows)
+    return 0 if rows is None else rows[2] - rows[1]
 
 class EnhancedBackfillPackager:
-    def __init__(self, persona_name: str):
+    def __init__(self, persona_name: str, input_dir: Optional[Path] = None):
         self.persona_name = persona_name
         # Use absolute paths from project root
         current_dir = Path(__file__).parent
         project_root = current_dir.parent
-        self.input_dir = project_root / f"audit_outputs/{persona_name}"
+        self.input_dir = Path(input_dir) if input_dir else project_root / f"audit_outputs/{persona_name}"
         self.output_dir = self.input_dir  # Keep outputs in same folder
         
         # Weight mappings from audit_method.md
@@ -27,103 +163,66 @@ class EnhancedBackfillPackager:
             "Tier 3": {"brand": 30, "performance": 70}
         }
         
-        # Criterion weights by tier (from methodology)
-        self.criterion_weights = {
-            # Tier 1 - Brand Positioning (80% Brand | 20% Performance)
-            "corporate_positioning_alignment": 25,  # Brand
-            "brand_differentiation": 20,            # Brand  
-            "emotional_resonance": 20,              # Brand
-            "visual_brand_integrity": 15,           # Brand
-            "strategic_clarity": 10,                # Performance
-            "trust_credibility_signals": 10,        # Performance
-            
-            # Tier 2 - Value Proposition (50% Brand | 50% Performance)  
-            "regional_narrative_integration": 15,   # Brand
-            "brand_message_consistency": 15,        # Brand
-            "visual_brand_consistency": 10,         # Brand
-            "brand_promise_delivery": 10,           # Brand
-            "strategic_value_clarity": 25,          # Performance
-            "solution_sophistication": 15,          # Performance
-            "proof_points_validation": 10,          # Performance
-            
-            # Tier 3 - Functional Content (30% Brand | 70% Performance)
-            "brand_voice_alignment": 10,            # Brand
-            "sub_narrative_integration": 10,        # Brand
-            "visual_brand_elements": 10,            # Brand
-            "executive_relevance": 25,              # Performance
-            "strategic_insight_quality": 20,        # Performance
-            "business_value_focus": 15,             # Performance
-            "credibility_elements": 10,             # Performance
-            
-            # Generic criteria (fallback)
-            "value_proposition_clarity": 20,
-            "call_to_action_effectiveness": 15
-        }
+        # Criterion weights from the methodology's criteria index, plus generic fallbacks
+        self.criterion_weights = criterion_weights()
     
     def parse_scorecard_markdown(self, file_path: Path) -> Dict:
         """Enhanced parsing of scorecard markdown into structured data"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract page metadata
-        url_match = re.search(r'\*\*URL:\*\*\s*(https?://[^\s]+)', content)
-        persona_match = re.search(r'\*\*Persona:\*\*\s*([^\n]+)', content)
-        audited_match = re.search(r'\*\*Audited:\*\*\s*([^\n]+)', content)
-        tier_match = re.search(r'\*\*Tier/Channel:\*\*\s*([^\n]+)', content)
-        final_score_match = re.search(r'\*\*Final Score:\*\*\s*(\d+(?:\.\d+)?)/10', content)
-        
+        return self.scorecard_from_record(parse_report_file(str(file_path)))
+    
+    def parse_scorecard_content(self, content: str) -> Dict:
+        """Parse scorecard markdown content that is already in memory"""
+        return self.scorecard_from_record(parse_report(content))
+    
+    def scorecard_from_record(self, record: ReportRecord) -> Dict:
+        """Shape a parsed scorecard record into metadata, criteria and recommendations"""
+        final_score = record.final_score
         metadata = {
-            'url': url_match.group(1) if url_match else '',
-            'persona': persona_match.group(1) if persona_match else self.persona_name,
-            'audited': audited_match.group(1) if audited_match else '',
-            'tier': tier_match.group(1) if tier_match else '',
-            'final_score': float(final_score_match.group(1)) if final_score_match else 0.0
+            'url': record.url,
+            'persona': record.field('Persona', self.persona_name),
+            'audited': record.field('Audited', ''),
+            'tier': record.field('Tier/Channel', ''),
+            'final_score': final_score if final_score is not None else 0.0
         }
         
-        # Extract criteria scores from table
-        # Pattern: | Category | Score | Rationale |
-        table_pattern = r'\|\s*([^|]+?)\s*\|\s*(\d+(?:\.\d+)?)\s*\|\s*([^|]+?)\s*\|'
-        matches = re.findall(table_pattern, content)
-        
+        # Criteria rows: | Category | Score | Rationale |
         criteria_scores = []
-        for criterion_name, score, rationale in matches:
-            # Skip header row
-            if 'Category' in criterion_name or 'Score' in criterion_name:
+        for row in record.criteria:
+            # Skip header row and "X/10" rows of other report layouts
+            if row.out_of_ten or 'Category' in row.name or 'Score' in row.name:
                 continue
                 
-            criterion_code = self.normalize_criterion_name(criterion_name.strip())
+            criterion_code = self.normalize_criterion_name(row.name)
             criteria_scores.append({
-                'criterion_name': criterion_name.strip(),
+                'criterion_name': row.name,
                 'criterion_code': criterion_code,
-                'score': float(score),
-                'evidence': rationale.strip(),
+                'score': row.score,
+                'evidence': row.rationale,
                 'weight_pct': self.criterion_weights.get(criterion_code, 10),  # Default 10%
-                'descriptor': self.score_to_descriptor(float(score))
+                'descriptor': self.score_to_descriptor(row.score)
             })
         
-        # Extract recommendations
+        # Recommendations written as "1. **Title** - description", the description possibly on a nested bullet
         recommendations = []
-        rec_section = re.search(r'## Priority Recommendations(.*?)(?=##|$)', content, re.DOTALL)
-        if rec_section:
-            rec_text = rec_section.group(1)
-            # Find numbered or bulleted recommendations
-            rec_pattern = r'(?:^\d+\.|^[-*])\s*\*\*([^*]+)\*\*\s*-\s*([^\n]+)'
-            rec_matches = re.findall(rec_pattern, rec_text, re.MULTILINE)
-            
-            for rec_title, rec_desc in rec_matches:
-                recommendations.append({
-                    'recommendation': f"{rec_title.strip()}: {rec_desc.strip()}",
-                    'strategic_impact': self.categorize_recommendation(rec_title),
-                    'complexity': 'Medium',  # Default
-                    'urgency': 'Medium',     # Default  
-                    'resources': 'TBD'       # Default
-                })
+        section = record.section('Priority Recommendations')
+        for item in section.items if section else ():
+            match = RECOMMENDATION_ITEM.match(f"{item.text}\n{item.detail}")
+            if not match:
+                continue
+            rec_title, rec_desc = match.groups()
+            recommendations.append({
+                'recommendation': f"{rec_title.strip()}: {rec_desc.strip()}",
+                'strategic_impact': self.categorize_recommendation(rec_title),
+                'complexity': 'Medium',  # Default
+                'urgency': 'Medium',     # Default  
+                'resources': 'TBD'       # Default
+            })
         
         return {
             'metadata': metadata,
             'criteria_scores': criteria_scores,
             'recommendations': recommendations,
-            'raw_content': content
+            'raw_content': record.content
         }
     
     def normalize_criterion_name(self, name: str) -> str:
@@ -168,12 +267,8 @@ class EnhancedBackfillPackager:
     
     def calculate_brand_health_index(self, hygiene_score: float, positive_sentiment_pct: float, engagement_rate: float) -> float:
         """Calculate composite brand health index"""
-        return round(
-            hygiene_score * 0.60 +           # Technical quality
-            positive_sentiment_pct * 0.25 +  # Emotional resonance  
-            engagement_rate * 0.15,          # User behavior
-            2
-        )
+        # Technical quality, emotional resonance and user behaviour, as scored in bulk by the scoring engine
+        return float(brand_health_index(hygiene_score, positive_sentiment_pct, engagement_rate))
     
     def calculate_impact_score(self, criterion_score: float, weight_pct: float, tier: str) -> float:
         """Calculate impact score for prioritization"""
@@ -216,178 +311,153 @@ class EnhancedBackfillPackager:
         
         return complexity_num <= 2 and impact_score >= 7.0
 
-    def create_pages_table(self, parsed_data: List[Dict], experience_data: List[Dict] = None) -> pd.DataFrame:
-        """Create enhanced pages.csv table with derived metrics"""
-        pages = []
+    def page_row(self, data: Dict, experience_data: List[Dict] = None) -> Dict:
+        """Row of one scorecard in the pages table, with derived metrics"""
+        metadata = data['metadata']
+        url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
+        page_id = self.create_page_id(url_slug)
         
-        for data in parsed_data:
-            metadata = data['metadata']
-            url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
-            page_id = self.create_page_id(url_slug)
-            
-            # Calculate derived metrics
-            hygiene_score = metadata['final_score']
-            
-            # Get sentiment and engagement from experience data if available
-            positive_sentiment_pct = 5.0  # Default neutral
-            engagement_rate = 5.0         # Default neutral
-            
-            if experience_data:
-                page_experience = next((exp for exp in experience_data if self.create_page_id(exp.get('url_slug', '')) == page_id), None)
-                if page_experience:
-                    # Convert sentiment to percentage
-                    sentiment_map = {'Positive': 8.0, 'Mixed': 5.0, 'Negative': 2.0, 'Neutral': 5.0}
-                    positive_sentiment_pct = sentiment_map.get(page_experience.get('overall_sentiment', 'Neutral'), 5.0)
-                    
-                    # Convert engagement to rate
-                    engagement_map = {'High': 8.0, 'Medium': 5.0, 'Low': 2.0}
-                    engagement_rate = engagement_map.get(page_experience.get('engagement_level', 'Medium'), 5.0)
-            
-            brand_health_index = self.calculate_brand_health_index(hygiene_score, positive_sentiment_pct, engagement_rate)
-            trust_gap = self.calculate_trust_gap(data['criteria_scores'])
+        # Calculate derived metrics
+        hygiene_score = metadata['final_score']
+        
+        # Get sentiment and engagement from experience data if available
+        positive_sentiment_pct = 5.0  # Default neutral
+        engagement_rate = 5.0         # Default neutral
+        
+        if experience_data:
+            page_experience = next((exp for exp in experience_data if self.create_page_id(exp.get('url_slug', '')) == page_id), None)
+            if page_experience:
+                # Convert sentiment to percentage
+                positive_sentiment_pct = SENTIMENT_SCORES.get(page_experience.get('overall_sentiment', 'Neutral'), 5.0)
+                
+                # Convert engagement to rate
+                engagement_rate = ENGAGEMENT_SCORES.get(page_experience.get('engagement_level', 'Medium'), 5.0)
+        
+        brand_health_index = self.calculate_brand_health_index(hygiene_score, positive_sentiment_pct, engagement_rate)
+        trust_gap = self.calculate_trust_gap(data['criteria_scores'])
+        
+        return {
+            'page_id': page_id,
+            'url': metadata['url'],
+            'slug': url_slug,
+            'persona': self.persona_name,
+            'tier': metadata['tier'],
+            'final_score': metadata['final_score'],
+            'brand_health_index': brand_health_index,
+            'trust_gap': trust_gap,
+            'audited_ts': metadata['audited']
+        }
+    
+    def create_pages_table(self, parsed_data: List[Dict], experience_data: List[Dict] = None) -> pd.DataFrame:
+        """Create enhanced pages.csv table with derived metrics in memory"""
+        return pd.DataFrame([self.page_row(data, experience_data) for data in parsed_data])
+    
+    def criteria_score_rows(self, data: Dict) -> Iterator[Dict]:
+        """Rows of one scorecard in the criteria_scores table, with impact scores"""
+        url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
+        page_id = self.create_page_id(url_slug)
+        tier = data['metadata']['tier']
+        
+        for criterion in data['criteria_scores']:
+            impact_score = self.calculate_impact_score(
+                criterion['score'], 
+                criterion['weight_pct'], 
+                tier
+            )
             
-            pages.append({
+            yield {
                 'page_id': page_id,
-                'url': metadata['url'],
-                'slug': url_slug,
-                'persona': self.persona_name,
-                'tier': metadata['tier'],
-                'final_score': metadata['final_score'],
-                'brand_health_index': brand_health_index,
-                'trust_gap': trust_gap,
-                'audited_ts': metadata['audited']
-            })
-        
-        return pd.DataFrame(pages)
+                'criterion_code': criterion['criterion_code'],
+                'criterion_name': criterion['criterion_name'],
+                'score': criterion['score'],
+                'evidence': criterion['evidence'],
+                'weight_pct': criterion['weight_pct'],
+                'tier': tier,
+                'descriptor': criterion['descriptor'],
+                'impact_score': impact_score
+            }
     
     def create_criteria_scores_table(self, parsed_data: List[Dict]) -> pd.DataFrame:
-        """Create enhanced criteria_scores.csv table with impact scores"""
-        criteria_rows = []
-        
-        for data in parsed_data:
-            url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
-            page_id = self.create_page_id(url_slug)
-            tier = data['metadata']['tier']
-            
-            for criterion in data['criteria_scores']:
-                impact_score = self.calculate_impact_score(
-                    criterion['score'], 
-                    criterion['weight_pct'], 
-                    tier
-                )
-                
-                criteria_rows.append({
-                    'page_id': page_id,
-                    'criterion_code': criterion['criterion_code'],
-                    'criterion_name': criterion['criterion_name'],
-                    'score': criterion['score'],
-                    'evidence': criterion['evidence'],
-                    'weight_pct': criterion['weight_pct'],
-                    'tier': tier,
-                    'descriptor': criterion['descriptor'],
-                    'impact_score': impact_score
-                })
-        
-        return pd.DataFrame(criteria_rows)
+        """Create enhanced criteria_scores.csv table with impact scores in memory"""
+        return pd.DataFrame([row for data in parsed_data for row in self.criteria_score_rows(data)])
     
     def parse_experience_markdown(self, file_path: Path) -> Dict:
         """Extract persona experience data from experience report markdown"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract the structured table data
+        return self.experience_from_record(parse_report_file(str(file_path)))
+    
+    def parse_experience_content(self, content: str) -> Dict:
+        """Parse experience report markdown content that is already in memory"""
+        return self.experience_from_record(parse_report(content))
+    
+    def experience_from_record(self, record: ReportRecord) -> Dict:
+        """Shape a parsed experience report record into findings and narrative sections"""
+        # Findings table: | Finding | Example from Text | Strategic Analysis |
         findings = []
-        table_pattern = r'\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|'
-        matches = re.findall(table_pattern, content)
-        
-        for finding_type, example_text, analysis in matches:
-            # Skip header rows
-            if 'Finding' in finding_type or '---' in finding_type:
+        for row in record.rows:
+            # Skip header rows and rows of narrower tables
+            if len(row) < 3 or 'Finding' in row[0] or '---' in row[0]:
                 continue
                 
             findings.append({
-                'finding_type': finding_type.strip(),
-                'example_text': example_text.strip(),
-                'strategic_analysis': analysis.strip()
+                'finding_type': row[0],
+                'example_text': row[1],
+                'strategic_analysis': row[2]
             })
         
-        # Extract narrative sections
+        # Narrative sections introduced by "First Impression:" style labels
         sections = {}
+        for label, key in EXPERIENCE_SECTIONS.items():
+            fields = record.fields_named(label)
+            if fields:
+                sections[key] = fields[0].body
         
-        # First Impression
-        first_impression_match = re.search(r'First Impression:(.*?)(?=\n\n[A-Z]|\n[A-Z][^:]*:|$)', content, re.DOTALL)
-        if first_impression_match:
-            sections['first_impression'] = first_impression_match.group(1).strip()
-        
-        # Language & Tone
-        language_tone_match = re.search(r'Language & Tone:(.*?)(?=\n\n[A-Z]|\n[A-Z][^:]*:|$)', content, re.DOTALL)
-        if language_tone_match:
-            sections['language_tone'] = language_tone_match.group(1).strip()
+        return {
+            'findings': findings,
+            'sections': sections,
+            'raw_content': record.content
+        }
+    
+    def experience_row(self, data: Dict, experience_map: Dict[str, Dict]) -> Dict:
+        """Row of one scorecard in the experience table, from its experience report if there is one"""
+        url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
+        page_id = self.create_page_id(url_slug)
         
-        # Gaps in Information
-        gaps_match = re.search(r'Gaps in Information:(.*?)(?=\n\n[A-Z]|\n[A-Z][^:]*:|$)', content, re.DOTALL)
-        if gaps_match:
-            sections['information_gaps'] = gaps_match.group(1).strip()
+        # Get corresponding experience data
+        exp_data = experience_map.get(url_slug, {})
+        exp_content = exp_data.get('parsed_content', {})
         
-        # Trust and Credibility
-        trust_match = re.search(r'Trust and Credibility:(.*?)(?=\n\n[A-Z]|\n[A-Z][^:]*:|$)', content, re.DOTALL)
-        if trust_match:
-            sections['trust_credibility'] = trust_match.group(1).strip()
+        # Extract findings
+        findings = exp_content.get('findings', [])
+        effective_examples = [f for f in findings if f.get('finding_type', '').lower() == 'effective copy']
+        ineffective_examples = [f for f in findings if f.get('finding_type', '').lower() == 'ineffective copy']
         
-        # Business Impact & Next Steps
-        impact_match = re.search(r'Business Impact & Next Steps:(.*?)$', content, re.DOTALL)
-        if impact_match:
-            sections['business_impact'] = impact_match.group(1).strip()
+        # Extract sections
+        sections = exp_content.get('sections', {})
         
         return {
-            'findings': findings,
-            'sections': sections,
-            'raw_content': content
+            'page_id': page_id,
+            'persona_id': self.persona_name,
+            'first_impression': sections.get('first_impression', ''),
+            'language_tone_feedback': sections.get('language_tone', ''),
+            'information_gaps': sections.get('information_gaps', ''),
+            'trust_credibility_assessment': sections.get('trust_credibility', ''),
+            'business_impact_analysis': sections.get('business_impact', ''),
+            'effective_copy_examples': ' | '.join([f"{ex.get('example_text', '')}: {ex.get('strategic_analysis', '')}" for ex in effective_examples]),
+            'ineffective_copy_examples': ' | '.join([f"{ex.get('example_text', '')}: {ex.get('strategic_analysis', '')}" for ex in ineffective_examples]),
+            'overall_sentiment': self.analyze_sentiment(sections.get('first_impression', '')),
+            'engagement_level': self.analyze_engagement(sections.get('business_impact', '')),
+            'conversion_likelihood': self.analyze_conversion(sections.get('business_impact', ''))
         }
     
+    def experience_map(self, experience_data: List[Dict]) -> Dict[str, Dict]:
+        """Experience reports keyed by the slug of their page"""
+        return {Path(exp_data['file_path']).stem.replace('_experience_report', ''): exp_data
+                for exp_data in experience_data}
+    
     def create_experience_table(self, parsed_data: List[Dict], experience_data: List[Dict]) -> pd.DataFrame:
-        """Create experience.csv table from experience report data"""
-        experience_rows = []
-        
-        # Create a mapping from file paths to experience data
-        experience_map = {}
-        for exp_data in experience_data:
-            file_path = exp_data['file_path']
-            url_slug = Path(file_path).stem.replace('_experience_report', '')
-            experience_map[url_slug] = exp_data
-        
-        for data in parsed_data:
-            url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
-            page_id = self.create_page_id(url_slug)
-            
-            # Get corresponding experience data
-            exp_data = experience_map.get(url_slug, {})
-            exp_content = exp_data.get('parsed_content', {})
-            
-            # Extract findings
-            findings = exp_content.get('findings', [])
-            effective_examples = [f for f in findings if f.get('finding_type', '').lower() == 'effective copy']
-            ineffective_examples = [f for f in findings if f.get('finding_type', '').lower() == 'ineffective copy']
-            
-            # Extract sections
-            sections = exp_content.get('sections', {})
-            
-            experience_rows.append({
-                'page_id': page_id,
-                'persona_id': self.persona_name,
-                'first_impression': sections.get('first_impression', ''),
-                'language_tone_feedback': sections.get('language_tone', ''),
-                'information_gaps': sections.get('information_gaps', ''),
-                'trust_credibility_assessment': sections.get('trust_credibility', ''),
-                'business_impact_analysis': sections.get('business_impact', ''),
-                'effective_copy_examples': ' | '.join([f"{ex.get('example_text', '')}: {ex.get('strategic_analysis', '')}" for ex in effective_examples]),
-                'ineffective_copy_examples': ' | '.join([f"{ex.get('example_text', '')}: {ex.get('strategic_analysis', '')}" for ex in ineffective_examples]),
-                'overall_sentiment': self.analyze_sentiment(sections.get('first_impression', '')),
-                'engagement_level': self.analyze_engagement(sections.get('business_impact', '')),
-                'conversion_likelihood': self.analyze_conversion(sections.get('business_impact', ''))
-            })
-        
-        return pd.DataFrame(experience_rows)
+        """Create experience.csv table from experience report data in memory"""
+        experience_map = self.experience_map(experience_data)
+        return pd.DataFrame([self.experience_row(data, experience_map) for data in parsed_data])
     
     def analyze_sentiment(self, first_impression: str) -> str:
         """Analyze sentiment from first impression text"""
@@ -440,40 +510,39 @@ class EnhancedBackfillPackager:
         else:
             return 'Medium'
 
-    def create_recommendations_table(self, parsed_data: List[Dict]) -> pd.DataFrame:
-        """Create enhanced recommendations.csv table with quick win flags"""
-        rec_rows = []
-        
-        for data in parsed_data:
-            url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
-            page_id = self.create_page_id(url_slug)
-            tier = data['metadata']['tier']
+    def recommendation_rows(self, data: Dict) -> Iterator[Dict]:
+        """Rows of one scorecard in the recommendations table, with quick win flags"""
+        url_slug = Path(data['file_path']).stem.replace('_hygiene_scorecard', '')
+        page_id = self.create_page_id(url_slug)
+        tier = data['metadata']['tier']
+        
+        for rec in data['recommendations']:
+            # Calculate impact score for this recommendation
+            # Use average of all criteria scores for this page as baseline
+            avg_score = sum(c['score'] for c in data['criteria_scores']) / len(data['criteria_scores']) if data['criteria_scores'] else 5.0
+            rec_impact_score = self.calculate_impact_score(avg_score, 20, tier)  # 20% weight for recommendations
             
-            for rec in data['recommendations']:
-                # Calculate impact score for this recommendation
-                # Use average of all criteria scores for this page as baseline
-                avg_score = sum(c['score'] for c in data['criteria_scores']) / len(data['criteria_scores']) if data['criteria_scores'] else 5.0
-                rec_impact_score = self.calculate_impact_score(avg_score, 20, tier)  # 20% weight for recommendations
-                
-                # Assign complexity based on strategic impact category
-                complexity = self.assign_complexity(rec['strategic_impact'])
-                quick_win = self.determine_quick_win_flag(rec_impact_score, complexity)
-                
-                rec_rows.append({
-                    'page_id': page_id,
-                    'recommendation': rec['recommendation'],
-                    'strategic_impact': rec['strategic_impact'],
-                    'complexity': complexity,
-                    'urgency': rec['urgency'],
-                    'resources': rec['resources'],
-                    'impact_score': rec_impact_score,
-                    'quick_win_flag': quick_win,
-                    'owner': '',        # Empty for user assignment
-                    'target_date': '',  # Empty for user assignment
-                    'status': 'Not Started'  # Default status
-                })
-        
-        return pd.DataFrame(rec_rows)
+            # Assign complexity based on strategic impact category
+            complexity = self.assign_complexity(rec['strategic_impact'])
+            quick_win = self.determine_quick_win_flag(rec_impact_score, complexity)
+            
+            yield {
+                'page_id': page_id,
+                'recommendation': rec['recommendation'],
+                'strategic_impact': rec['strategic_impact'],
+                'complexity': complexity,
+                'urgency': rec['urgency'],
+                'resources': rec['resources'],
+                'impact_score': rec_impact_score,
+                'quick_win_flag': quick_win,
+                'owner': '',        # Empty for user assignment
+                'target_date': '',  # Empty for user assignment
+                'status': 'Not Started'  # Default status
+            }
+    
+    def create_recommendations_table(self, parsed_data: List[Dict]) -> pd.DataFrame:
+        """Create enhanced recommendations.csv table with quick win flags in memory"""
+        return pd.DataFrame([row for data in parsed_data for row in self.recommendation_rows(data)])
     
     def assign_complexity(self, strategic_impact: str) -> str:
         """Assign complexity based on strategic impact category"""
@@ -494,32 +563,41 @@ class EnhancedBackfillPackager:
         if criteria_df.empty:
             issues.append("No criteria scores found")
         
+        return issues + self.validate_rows(pages_df.to_dict('records'), criteria_df.to_dict('records'))
+    
+    def validate_rows(self, pages: List[Dict], criteria_rows: List[Dict]) -> List[str]:
+        """Validate rows of the pages and criteria_scores tables and return list of issues"""
+        issues = []
+        
         # Check evidence length for high/low scores
-        for _, row in criteria_df.iterrows():
-            if (row['score'] >= 7 or row['score'] <= 4) and len(row['evidence']) < 25:
-                issues.append(f"Page {row['page_id']}: Evidence too short for score {row['score']}")
+        page_scores = {}
+        for row in criteria_rows:
+            score = row['score']
+            if score is None or pd.isna(score):
+                continue
+            if (score >= 7 or score <= 4) and len(row['evidence']) < 25:
+                issues.append(f"Page {row['page_id']}: Evidence too short for score {score}")
+            page_scores.setdefault(row['page_id'], []).append(score)
         
         # Check final scores match
-        for _, page in pages_df.iterrows():
-            page_criteria = criteria_df[criteria_df['page_id'] == page['page_id']]
-            if not page_criteria.empty:
-                avg_score = page_criteria['score'].mean()
+        for page in pages:
+            scores = page_scores.get(page['page_id'])
+            if scores:
+                avg_score = sum(scores) / len(scores)
                 if abs(avg_score - page['final_score']) > 1.0:
                     issues.append(f"Page {page['page_id']}: Final score mismatch ({page['final_score']} vs {avg_score:.1f})")
         
         return issues
     
-    def backfill_run(self):
-        """Main backfill function"""
-        print(f"🔄 Backfilling audit data for {self.persona_name}...")
-        
+    def parse_input_files(self) -> Tuple[List[Dict], List[Dict]]:
+        """Parse every scorecard and experience report in the input folder"""
         # Parse all scorecard files
         parsed_data = []
         scorecard_files = list(self.input_dir.glob("*_hygiene_scorecard.md"))
         
         if not scorecard_files:
             print("❌ No hygiene scorecard files found")
-            return
+            return [], []
         
         print(f"📄 Found {len(scorecard_files)} scorecard files")
         
@@ -535,7 +613,7 @@ class EnhancedBackfillPackager:
         
         if not parsed_data:
             print("❌ No data successfully parsed")
-            return
+            return [], []
         
         # Parse all experience report files
         experience_data = []
@@ -554,55 +632,347 @@ class EnhancedBackfillPackager:
                 print(f"❌ Error parsing experience report {experience_file.name}: {e}")
                 continue
         
-        # Create tables
-        print("📊 Creating structured tables...")
-        
-        pages_df = self.create_pages_table(parsed_data, experience_data)
-        criteria_df = self.create_criteria_scores_table(parsed_data)
-        recommendations_df = self.create_recommendations_table(parsed_data)
+        return parsed_data, experience_data
+    
+    def build_tables(self, parsed_data: List[Dict], experience_data: List[Dict]) -> Dict[str, pd.DataFrame]:
+        """Build the pages, criteria, recommendations and experience tables from parsed reports"""
+        tables = {
+            'pages': self.create_pages_table(parsed_data, experience_data),
+            'criteria_scores': self.create_criteria_scores_table(parsed_data),
+            'recommendations': self.create_recommendations_table(parsed_data)
+        }
         
         # Create experience table if we have experience data
-        experience_df = None
         if experience_data:
-            print("📝 Creating experience data table...")
-            experience_df = self.create_experience_table(parsed_data, experience_data)
+            tables['experience'] = self.create_experience_table(parsed_data, experience_data)
+        
+        return tables
+    
+    def save_tables(self, tables: Dict[str, pd.DataFrame]):
+        """Write tables as CSV and parquet into the output folder"""
+        for name in TABLE_NAMES:
+            if name in tables:
+                self.save_table(name, tables[name])
+    
+    def save_table(self, name: str, df: pd.DataFrame):
+        """Write one table as CSV and parquet (for analytics) into the output folder"""
+        # Experience data is only saved if available
+        if name == 'experience' and (df is None or df.empty):
+            return
+        df.to_csv(self.output_dir / f"{name}.csv", index=False)
+        df.to_parquet(self.output_dir / f"{name}.parquet", index=False)
+    
+    def build_page_rows(self, page_sources: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict]]:
+        """Parse one page's scorecard and experience report and build its rows of every table"""
+        scorecard_file = self.input_dir / page_sources['scorecard']['file']
+        scorecard = self.parse_scorecard_markdown(scorecard_file)
+        scorecard['file_path'] = str(scorecard_file)
+        
+        experience_data = []
+        if 'experience' in page_sources:
+            experience_file = self.input_dir / page_sources['experience']['file']
+            experience = self.parse_experience_markdown(experience_file)
+            experience['file_path'] = str(experience_file)
+            experience['parsed_content'] = experience
+            experience_data.append(experience)
+        
+        # Pages get an experience row even without a report of their own, as in a full build
+        return {
+            'pages': [self.page_row(scorecard, experience_data)],
+            'criteria_scores': list(self.criteria_score_rows(scorecard)),
+            'recommendations': list(self.recommendation_rows(scorecard)),
+            'experience': [self.experience_row(scorecard, self.experience_map(experience_data))]
+        }
+    
+    def build_page_tables(self, page_sources: Dict[str, Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+        """Parse one page's scorecard and experience report and build its rows of every table as DataFrames"""
+        return {name: pd.DataFrame(rows) for name, rows in self.build_page_rows(page_sources).items()}
+    
+    def package_incremental(self, table_dir: Optional[Path] = None,
+                            save_table: Optional[Callable[[str, pd.DataFrame], None]] = None,
+                            full: bool = False,
+                            pool: Optional["PackagingPool"] = None,
+                            prepare: Optional[Callable[[Dict[str, pd.DataFrame]], Dict[str, pd.DataFrame]]] = None
+                            ) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        """
+        Package the input folder, parsing only reports that changed since the last run.
+        
+        Rows of unchanged pages are kept from the tables on disk using the row
+        ranges in the package manifest, rows of deleted pages are dropped and
+        only tables whose rows changed are written again. Without an intact
+        manifest every report is parsed and every table written.
+        
+        Args:
+            table_dir: Directory holding the tables and their manifest (the output folder by default)
+            save_table: Writer called with each table to rewrite (save_table by default)
+            full: Parse every report and write every table regardless of the manifest
+            pool: Process pool to parse large batches of pages in (optional)
+            prepare: Called with the assembled tables before any is written, returning
+                the tables to write, e.g. with page keys added (optional)
+            
+        Returns:
+            Every table, keyed by name, and the names of the tables that were written
+        """
+        table_dir = Path(table_dir) if table_dir else self.output_dir
+        save_table = save_table or self.save_table
+        manifest = PackageManifest(table_dir)
+        sources = manifest.scan(self.input_dir)
+        
+        if full:
+            manifest.pages = {}
+        previous = self._previous_tables(manifest)
+        rebuild = not manifest.pages
+        changed, removed = manifest.changes(sources)
+        
+        if not changed and not removed:
+            logger.info(f"Tables of {self.persona_name} are up to date")
+            return previous, []
+        
+        fresh = {slug: {} for slug in changed if 'scorecard' not in sources[slug]}
+        pending = {slug: sources[slug] for slug in changed if 'scorecard' in sources[slug]}
+        # Pages that fail are left out of fresh, keeping their previous rows and sources for the next run
+        if pool is not None and pool.worthwhile(len(pending)):
+            fresh.update(pool.build_pages(self.persona_name, self.input_dir, pending))
+        else:
+            for slug, page_sources in pending.items():
+                try:
+                    fresh[slug] = self.build_page_tables(page_sources)
+                except Exception as e:
+                    logger.error(f"Error packaging {slug} for {self.persona_name}: {e}")
+        
+        slugs = sorted(slug for slug in sources if slug in fresh or slug in manifest.pages)
+        tables, ranges = self._assemble(previous, manifest, slugs, fresh)
+        if not any('experience' in sources[slug] for slug in slugs):
+            tables.pop('experience', None)
+        if prepare is not None:
+            tables = prepare(tables)
+        
+        # A table is rewritten when a new, changed or deleted page had or has rows in it
+        touched = set(fresh) | set(removed)
+        written = [name for name in tables
+                   if rebuild or name not in manifest.tables
+                   or any(manifest.rows(slug, name) != (0, 0) for slug in touched)
+                   or any(_row_count(page.get(name)) for page in fresh.values())]
+        for name in written:
+            save_table(name, tables[name])
+        
+        manifest.update({slug: sources[slug] if slug in fresh or slug not in changed else manifest.pages[slug]['sources']
+                         for slug in slugs}, ranges, {name: len(df) for name, df in tables.items()})
+        manifest.save()
+        logger.info(f"Repackaged {len(fresh)} changed and {len(removed)} deleted pages of {self.persona_name}, "
+                    f"rewrote {', '.join(written) or 'no tables'}")
+        return tables, written
+    
+    def _previous_tables(self, manifest: PackageManifest) -> Dict[str, pd.DataFrame]:
+        """Load the tables a manifest describes, forgetting its pages if they cannot be reused"""
+        if manifest.tables_intact():
+            try:
+                return {name: pd.read_parquet(manifest.table_dir / f"{name}.parquet")
+                        for name, table in manifest.tables.items() if table['rows']}
+            except Exception as e:
+                logger.warning(f"Repackaging {self.persona_name} from scratch, tables unreadable: {e}")
+        manifest.pages = {}
+        return {}
+    
+    def _assemble(self, previous: Dict[str, pd.DataFrame], manifest: PackageManifest, slugs: List[str],
+                  fresh: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, pd.DataFrame], Dict]:
+        """
+        Concatenate each page's rows in slug order, from fresh tables or slices of the previous ones.
+        
+        Fresh rows are a page's own table, or (table, start, stop) in a table shared
+        with other pages; runs of adjacent rows of one table are copied as one slice.
+        """
+        tables, ranges = {}, {slug: {} for slug in slugs}
+        for name in TABLE_NAMES:
+            runs, template, position = [], None, 0
+            for slug in slugs:
+                if slug in fresh:
+                    rows = _row_slice(fresh[slug].get(name))
+                else:
+                    start, stop = manifest.rows(slug, name)
+                    rows = (previous[name], start, stop) if stop > start else None
+                count = 0 if rows is None else rows[2] - rows[1]
+                if count and runs and runs[-1][0] is rows[0] and runs[-1][2] == rows[1]:
+                    runs[-1][2] = rows[2]
+                elif count:
+                    runs.append(list(rows))
+                elif rows is not None and template is None:
+                    template = rows[0].iloc[0:0]
+                ranges[slug][name] = (position, position + count)
+                position += count
+            if runs:
+                frames = [df.iloc[start:stop] for df, start, stop in runs]
+                tables[name] = pd.concat(frames, ignore_index=True) if len(frames) > 1 \
+                    else frames[0].reset_index(drop=True)
+            elif template is not None:
+                tables[name] = template
+        return tables, ranges
+    
+    def stream_incremental(self, full: bool = False, pool: Optional["PackagingPool"] = None
+                           ) -> Tuple[Dict[str, int], List[str], List[str]]:
+        """
+        Package the input folder as package_incremental() does, streaming rows to the tables on disk.
+        
+        Pages are parsed PAGE_BATCH_SIZE at a time and their rows written through
+        one ParquetRowWriter per table; rows of unchanged pages are copied from the
+        previous tables one row group at a time. No table is ever held in memory,
+        so memory stays flat however many reports the folder has. Tables no page
+        changed are left as they are, and each rewritten table's CSV is written
+        from its Parquet file once complete.
+        
+        Args:
+            full: Parse every report and write every table regardless of the manifest
+            pool: Process pool to parse large batches of pages in (optional)
+            
+        Returns:
+            Row count of every table, the names of the tables that were written, and
+            the validation issues of the pages that were parsed
+        """
+        manifest = PackageManifest(self.output_dir)
+        sources = manifest.scan(self.input_dir)
+        if full or not manifest.tables_intact():
+            manifest.pages = {}
+        rebuild = not manifest.pages
+        changed, removed = manifest.changes(sources)
+        
+        if not changed and not removed:
+            logger.info(f"Tables of {self.persona_name} are up to date")
+            return {name: table['rows'] for name, table in manifest.tables.items()}, [], []
+        
+        schemas = dict(table_schemas())
+        cursors = {}
+        for name, table in manifest.tables.items() if not rebuild else ():
+            path = self.output_dir / f"{name}.parquet"
+            if table['rows'] and name in schemas:
+                # Columns added to the previous table since (input fingerprints) are carried over
+                previous = pq.read_schema(path)
+                extra = [field for field in previous if field.name not in schemas[name].names]
+                schemas[name] = pa.schema(list(schemas[name]) + extra)
+                cursors[name] = _TableCursor(path, schemas[name])
+        
+        writers = {name: ParquetRowWriter(self.output_dir / f"{name}.parquet", schemas[name]) for name in TABLE_NAMES}
+        changed_set = set(changed)
+        slugs = sorted(slug for slug in sources if slug in changed_set or slug in manifest.pages)
+        ranges, issues, packaged, built = {}, [], [], False
+        try:
+            for start in range(0, len(slugs), PAGE_BATCH_SIZE):
+                batch = slugs[start:start + PAGE_BATCH_SIZE]
+                fresh = self._build_batch(batch, changed_set, sources, pool)
+                for slug in batch:
+                    if slug in fresh:
+                        page_rows = fresh[slug]
+                        built = built or bool(page_rows)
+                        issues += self.validate_rows(page_rows.get('pages', []), page_rows.get('criteria_scores', []))
+                    elif slug in manifest.pages:
+                        page_rows = {name: cursors[name].rows(*manifest.rows(slug, name))
+                                     for name in TABLE_NAMES if name in cursors}
+                    else:
+                        # New pages that fail are left out, keeping their sources unpackaged for the next run
+                        continue
+                    ranges[slug] = {}
+                    for name, writer in writers.items():
+                        position = writer.rows_added
+                        writer.write_rows(page_rows.get(name, ()))
+                        ranges[slug][name] = (position, writer.rows_added)
+                    packaged.append(slug)
+            
+            present = [name for name in TABLE_NAMES if built or name in manifest.tables]
+            if not any('experience' in sources[slug] for slug in packaged) and 'experience' in present:
+                present.remove('experience')
+            # A table is rewritten when a new, changed or deleted page had or has rows in it
+            touched = (changed_set & set(packaged)) | set(removed)
+            written = [name for name in present
+                       if rebuild or name not in manifest.tables
+                       or any(manifest.rows(slug, name) != (0, 0) for slug in touched)
+                       or any(ranges[slug][name][0] != ranges[slug][name][1] for slug in touched if slug in ranges)]
+            counts = {name: writers[name].rows_added for name in present}
+            for name, writer in writers.items():
+                if name in written:
+                    writer.close()
+                    _write_csv(writer.path, self.output_dir / f"{name}.csv")
+                else:
+                    writer.abort()
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        
+        manifest.update({slug: sources[slug] if slug in changed_set else manifest.pages[slug]['sources']
+                         for slug in packaged}, ranges, counts)
+        manifest.save()
+        logger.info(f"Repackaged {len(touched)} changed and deleted pages of {self.persona_name}, "
+                    f"rewrote {', '.join(written) or 'no tables'}")
+        return counts, written, issues
+    
+    def score_summary(self) -> Tuple[float, Dict[str, int]]:
+        """Mean criterion score and count of each descriptor, reading the criteria table one row group at a time"""
+        path = self.output_dir / "criteria_scores.parquet"
+        total, count, descriptors = 0.0, 0, pd.Series(dtype='int64')
+        if path.exists():
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=ROW_GROUP_SIZE, columns=['score', 'descriptor']):
+                scores = batch.column('score').to_pandas()
+                total, count = total + scores.sum(), count + scores.count()
+                descriptors = descriptors.add(batch.column('descriptor').to_pandas().value_counts(), fill_value=0)
+        distribution = descriptors.astype('int64').sort_values(ascending=False, kind='stable')
+        return (total / count if count else float('nan')), distribution.to_dict()
+    
+    def _build_batch(self, batch: List[str], changed: set, sources: Dict[str, Dict[str, Any]],
+                     pool: Optional["PackagingPool"]) -> Dict[str, Dict[str, Any]]:
+        """Rows of the changed pages of a batch, keyed by slug; pages that fail are left out"""
+        fresh = {slug: {} for slug in batch if slug in changed and 'scorecard' not in sources[slug]}
+        pending = {slug: sources[slug] for slug in batch if slug in changed and 'scorecard' in sources[slug]}
+        if pool is not None and pool.worthwhile(len(pending)):
+            for slug, tables in pool.build_pages(self.persona_name, self.input_dir, pending).items():
+                fresh[slug] = {name: df.iloc[start:stop].to_dict('records')
+                               for name, (df, start, stop) in tables.items()}
+        else:
+            for slug, page_sources in pending.items():
+                try:
+                    fresh[slug] = self.build_page_rows(page_sources)
+                except Exception as e:
+                    logger.error(f"Error packaging {slug} for {self.persona_name}: {e}")
+        return fresh
+    
+    def backfill_run(self, full: bool = False):
+        """Main backfill function, repackaging only reports that changed unless full is set"""
+        from .parallel_packaging import PackagingPool
+        
+        print(f"🔄 Backfilling audit data for {self.persona_name}...")
+        
+        # Parse new or changed reports, across worker processes for large backfills
+        print("📊 Creating structured tables...")
+        
+        with PackagingPool() as pool:
+            counts, written, issues = self.stream_incremental(full=full, pool=pool)
+        if not counts.get('pages'):
+            print("❌ No hygiene scorecard files found")
+            return
         
-        # Validate data
+        # Pages were validated as they were parsed
         print("🔍 Validating data...")
-        issues = self.validate_data(pages_df, criteria_df)
+        if not counts.get('criteria_scores'):
+            issues.insert(0, "No criteria scores found")
         if issues:
             print("⚠️  Validation issues found:")
             for issue in issues[:5]:  # Show first 5 issues
                 print(f"   - {issue}")
         
-        # Save tables
-        print("💾 Saving enhanced CSV files...")
-        
-        pages_df.to_csv(self.output_dir / "pages.csv", index=False)
-        criteria_df.to_csv(self.output_dir / "criteria_scores.csv", index=False)
-        recommendations_df.to_csv(self.output_dir / "recommendations.csv", index=False)
-        
-        # Save experience data if available
-        if experience_df is not None and not experience_df.empty:
-            experience_df.to_csv(self.output_dir / "experience.csv", index=False)
-            experience_df.to_parquet(self.output_dir / "experience.parquet", index=False)
-            print(f"💭 Saved experience data: {len(experience_df)} persona experiences")
-        
-        # Also save as parquet for analytics
-        pages_df.to_parquet(self.output_dir / "pages.parquet", index=False)
-        criteria_df.to_parquet(self.output_dir / "criteria_scores.parquet", index=False)
-        recommendations_df.to_parquet(self.output_dir / "recommendations.parquet", index=False)
+        if written:
+            print(f"💾 Saved enhanced CSV files: {', '.join(written)}")
+        else:
+            print("💾 Tables already up to date")
         
         # Summary stats
         print(f"✅ Backfill complete!")
         print(f"📊 Summary:")
-        print(f"   - Pages: {len(pages_df)}")
-        print(f"   - Criteria scores: {len(criteria_df)}")
-        print(f"   - Recommendations: {len(recommendations_df)}")
-        if experience_df is not None:
-            print(f"   - Experience reports: {len(experience_df)}")
-        print(f"   - Average score: {criteria_df['score'].mean():.2f}")
-        print(f"   - Score distribution: {criteria_df['descriptor'].value_counts().to_dict()}")
+        print(f"   - Pages: {counts['pages']}")
+        print(f"   - Criteria scores: {counts.get('criteria_scores', 0)}")
+        print(f"   - Recommendations: {counts.get('recommendations', 0)}")
+        if 'experience' in counts:
+            print(f"   - Experience reports: {counts['experience']}")
+        average, distribution = self.score_summary()
+        print(f"   - Average score: {average:.2f}")
+        print(f"   - Score distribution: {distribution}")
         
         return self.output_dir
 
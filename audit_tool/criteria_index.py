@@ -0,0 +1,215 @@
+"""
+Criteria Index for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module compiles the methodology's criteria once, when it is loaded:
+1. Normalises both criteria layouts (inline tier lists and grouped criteria sections)
+2. Maps each criterion code to its definition
+3. Keeps each tier's ordered criterion codes and a read-only NumPy weight vector
+4. Maps each code to the tiers and channels it belongs to
+5. Offers O(1) weight lookups and vectorised weighted sums for scoring and packaging
+6. Fingerprints each tier's criteria and the rest of the methodology separately
+
+Two layouts are understood. The built-in default methodology lists criteria
+inline as classification.<onsite|offsite>.<tier>.criteria, while the YAML
+methodology groups them by tier under criteria.<tier>.<group>_criteria and
+offsite_criteria.<channel>.<group>_criteria. Both are flattened into the same
+criterion records so callers never care which one was loaded.
+
+The fingerprints let caches and provenance columns depend only on the part of
+the methodology that produced them: editing one tier's criteria changes that
+tier's fingerprint and nothing else.
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet, Mapping, Iterable
+
+import numpy as np
+
+from .fingerprint import config_hash
+
+logger = logging.getLogger(__name__)
+
+# Methodology shipped with the package, used when no parser is at hand
+DEFAULT_METHODOLOGY_PATH = Path(__file__).parent / "config" / "methodology.yaml"
+
+def _criterion(code: str, tier: str, definition: Dict[str, Any], group: str = None) -> Mapping[str, Any]:
+    """Normalise one criterion definition into a read-only record."""
+    record = dict(definition)
+    record['code'] = code
+    record.setdefault('name', code.replace('_', ' ').title())
+    record.setdefault('description', '')
+    record['weight'] = float(record.get('weight') or 0)
+    record['tier'] = tier
+    if group:
+        record['group'] = group
+    if isinstance(record.get('requirements'), list):
+        record['requirements'] = tuple(record['requirements'])
+    return MappingProxyType(record)
+
+def _without_criteria(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the configuration with every criteria definition left out."""
+    settings = {key: value for key, value in config.items() if key not in ('criteria', 'offsite_criteria')}
+    classification = settings.get('classification')
+    if isinstance(classification, dict):
+        settings['classification'] = {
+            site: ({tier: ({k: v for k, v in tier_config.items() if k != 'criteria'}
+                           if isinstance(tier_config, dict) else tier_config)
+                    for tier, tier_config in tiers.items()} if isinstance(tiers, dict) else tiers)
+            for site, tiers in classification.items()
+        }
+    return settings
+
+def _grouped_criteria(tier: str, groups: Dict[str, Any]) -> List[Mapping[str, Any]]:
+    """Flatten a {<group>_criteria: {code: definition}} section in file order."""
+    criteria = []
+    for group_key, definitions in (groups or {}).items():
+        if not group_key.endswith('_criteria') or not isinstance(definitions, dict):
+            continue
+        group = group_key[:-len('_criteria')]
+        for code, definition in definitions.items():
+            criteria.append(_criterion(code, tier, definition or {}, group))
+    return criteria
+
+class CriteriaIndex:
+    """Immutable lookup tables over every criterion of a methodology."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Compile the criteria of a methodology configuration.
+
+        Args:
+            config: Methodology configuration as loaded from YAML
+        """
+        classification = config.get('classification', {}) or {}
+        onsite = classification.get('onsite', {}) or {}
+        offsite = classification.get('offsite', {}) or {}
+        grouped_onsite = config.get('criteria', {}) or {}
+        grouped_offsite = config.get('offsite_criteria', {}) or {}
+
+        # Onsite tiers first, then offsite channels, in file order
+        sections = [(name, onsite.get(name), grouped_onsite.get(name))
+                    for name in list(onsite) + [n for n in grouped_onsite if n not in onsite]]
+        sections += [(name, offsite.get(name), grouped_offsite.get(name))
+                     for name in list(offsite) + [n for n in grouped_offsite if n not in offsite]]
+
+        by_code: Dict[str, Mapping[str, Any]] = {}
+        tier_criteria: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+        code_tiers: Dict[str, set] = {}
+
+        for tier, tier_config, groups in sections:
+            criteria = [_criterion(definition['code'], tier, definition)
+                        for definition in (tier_config or {}).get('criteria', []) or [] if definition.get('code')]
+            seen = {criterion['code'] for criterion in criteria}
+            criteria += [criterion for criterion in _grouped_criteria(tier, groups) if criterion['code'] not in seen]
+
+            tier_criteria[tier] = tuple(criteria)
+            for criterion in criteria:
+                # The first tier defining a code owns its shared definition
+                by_code.setdefault(criterion['code'], criterion)
+                code_tiers.setdefault(criterion['code'], set()).add(tier)
+
+        self.tiers: Tuple[str, ...] = tuple(tier_criteria)
+        self.criteria: Mapping[str, Mapping[str, Any]] = MappingProxyType(by_code)
+        self.tier_criteria: Mapping[str, Tuple[Mapping[str, Any], ...]] = MappingProxyType(tier_criteria)
+        self.tier_codes: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {tier: tuple(c['code'] for c in criteria) for tier, criteria in tier_criteria.items()}
+        )
+        self.code_tiers: Mapping[str, FrozenSet[str]] = MappingProxyType(
+            {code: frozenset(tiers) for code, tiers in code_tiers.items()}
+        )
+        self._positions = {(tier, code): i for tier, codes in self.tier_codes.items() for i, code in enumerate(codes)}
+
+        weight_vectors = {}
+        for tier, criteria in tier_criteria.items():
+            vector = np.array([c['weight'] for c in criteria], dtype=np.float64)
+            vector.setflags(write=False)
+            weight_vectors[tier] = vector
+        self.tier_weights: Mapping[str, np.ndarray] = MappingProxyType(weight_vectors)
+        self.weights: Mapping[str, float] = MappingProxyType({code: c['weight'] for code, c in by_code.items()})
+
+        self.fingerprints: Mapping[str, str] = MappingProxyType(
+            {tier: config_hash({c['code']: dict(c) for c in criteria}) for tier, criteria in tier_criteria.items()}
+        )
+        self.settings_fingerprint: str = config_hash(_without_criteria(config))
+
+        logger.debug(f"Indexed {len(by_code)} criteria across {len(self.tiers)} tiers and channels")
+
+    def get(self, code: str) -> Optional[Mapping[str, Any]]:
+        """
+        Look up a criterion by code.
+
+        Args:
+            code: Criterion code
+
+        Returns:
+            The criterion record, or None if the code is unknown
+        """
+        return self.criteria.get(code)
+
+    def weight(self, code: str, tier: str = None, default: float = None) -> Optional[float]:
+        """
+        Weight of a criterion, optionally as defined by a specific tier.
+
+        Args:
+            code: Criterion code
+            tier: Tier whose definition to use (optional, first defining tier otherwise)
+            default: Value returned for unknown codes
+
+        Returns:
+            The criterion weight
+        """
+        if tier is not None:
+            position = self._positions.get((tier, code))
+            return float(self.tier_weights[tier][position]) if position is not None else default
+        return self.weights.get(code, default)
+
+    def weights_for(self, codes: Iterable[str], default: float = np.nan) -> np.ndarray:
+        """
+        Vector of weights for a column of criterion codes.
+
+        Args:
+            codes: Criterion codes
+            default: Weight used for unknown codes
+
+        Returns:
+            Array of weights aligned with the codes
+        """
+        weights = self.weights
+        return np.fromiter((weights.get(code, default) for code in codes), dtype=np.float64)
+
+    def weighted_score(self, tier: str, scores: Any) -> Any:
+        """
+        Weighted average of scores given in the tier's criterion order.
+
+        Args:
+            tier: Tier or channel name
+            scores: Array whose last axis follows tier_codes[tier]; NaN scores are left out
+
+        Returns:
+            Weighted score per row (a float for a single row), NaN where nothing was scored
+        """
+        weights = self.tier_weights[tier]
+        scores = np.asarray(scores, dtype=np.float64)
+        scored = ~np.isnan(scores)
+        total = np.where(scored, scores, 0.0) @ weights
+        weight_sum = scored @ weights
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(weight_sum > 0, total / weight_sum, np.nan)
+        return float(result) if result.ndim == 0 else result
+
+@lru_cache(maxsize=None)
+def default_criteria_index() -> CriteriaIndex:
+    """
+    Criteria index of the methodology shipped with the package, built once per process.
+
+    Returns:
+        The index
+    """
+    from .methodology_parser import MethodologyParser
+
+    return MethodologyParser(str(DEFAULT_METHODOLOGY_PATH)).criteria_index
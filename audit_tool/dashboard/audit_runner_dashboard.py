@@ -11,6 +11,8 @@ from pathlib import Path
 # Add audit_tool to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from components.run_monitor import follow_audit_process
+
 def get_persona_name(persona_content: str) -> str:
     """Extracts the full persona name from the markdown content."""
     lines = persona_content.strip().split('\n')
@@ -26,7 +28,8 @@ def get_persona_name(persona_content: str) -> str:
         return match.group(0)
     return "default_persona"
 
-def run_audit(persona_file_path, urls_file_path, output_dir, model_provider="anthropic"):
+def run_audit(persona_file_path, urls_file_path, output_dir, model_provider="anthropic",
+              events_path=None, log_path=None):
     """Runs the audit tool as a subprocess with YAML methodology."""
     command = [
         "python",
@@ -41,13 +44,23 @@ def run_audit(persona_file_path, urls_file_path, output_dir, model_provider="ant
         "--model",
         model_provider
     ]
-    process = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding='utf-8'
-    )
+    if events_path:
+        command += ["--events", events_path]
+    
+    # Progress comes from the event stream; the log output is only kept for errors
+    log_file = open(log_path, "w", encoding="utf-8") if log_path else subprocess.DEVNULL
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8'
+        )
+    finally:
+        # The child has its own copy of the descriptor; keeping ours open leaks one per run
+        if log_file is not subprocess.DEVNULL:
+            log_file.close()
     return process
 
 def find_and_parse_reports(persona_name: str) -> dict:
@@ -225,6 +238,9 @@ def main():
             st.warning(f"🔄 **Audit Running** - Using {st.session_state.selected_model.upper()}")
             
             temp_dir = tempfile.mkdtemp(prefix="audit_")
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            metrics_container = st.empty()
             log_expander = st.expander("📋 Live Audit Log", expanded=True)
             log_container = log_expander.empty()
 
@@ -248,16 +264,13 @@ def main():
                 # --- RUN AUDIT & STREAM LOGS ---
                 log_container.code(f"Starting audit for {st.session_state.persona_name} using {st.session_state.selected_model.upper()}...")
                 
-                process = run_audit(persona_file_path, urls_file_path, output_dir, st.session_state.selected_model)
+                events_path = os.path.join(temp_dir, "events.jsonl")
+                log_path = os.path.join(temp_dir, "audit.log")
+                process = run_audit(persona_file_path, urls_file_path, output_dir, st.session_state.selected_model,
+                                    events_path=events_path, log_path=log_path)
 
-                log_lines = []
-                for line in iter(process.stdout.readline, ''):
-                    log_lines.append(line.rstrip())
-                    if len(log_lines) > 100:  # Keep only the last 100 lines
-                        log_lines = log_lines[-100:]
-                    log_container.code('\n'.join(log_lines))
-                
-                process.wait()
+                follow_audit_process(process, events_path, progress_bar, status_text,
+                                     metrics_container, log_container)
                 # --- END AUDIT ---
                 
                 if process.returncode == 0:
@@ -266,6 +279,8 @@ def main():
                     st.balloons()
                 else:
                     st.error("❌ Audit failed. Check the log for details.", icon="🚨")
+                    with open(log_path, 'r', encoding='utf-8') as f:
+                        log_container.code(''.join(f.readlines()[-100:]))
                     st.session_state.results = None
 
             except Exception as e:
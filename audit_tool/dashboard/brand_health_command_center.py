@@ -137,6 +137,8 @@ def main():
     
     # Initialize data loader
     data_loader = BrandHealthDataLoader()
+    # Pin the run, so the audit data and the score cube come from the same packaging
+    data_loader.run = data_loader.current_run()
     
     # Load unified data only
     datasets, master_df = data_loader.load_all_data()
@@ -144,6 +146,7 @@ def main():
     # Store data in session state for other pages to access
     st.session_state['datasets'] = datasets
     st.session_state['master_df'] = master_df
+    st.session_state['score_cube'] = data_loader.load_score_cube()
     st.session_state['summary'] = data_loader.get_summary_stats(master_df, datasets)
     
     if master_df.empty:
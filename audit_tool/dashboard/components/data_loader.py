@@ -1,25 +1,62 @@
 """
 Enhanced Data Loader for Brand Health Command Center
-Handles loading and merging all CSV files with proper data type handling
+Handles loading the unified audit dataset (or its CSV export) with proper data type handling
 """
 
 import pandas as pd
 import streamlit as st
 from pathlib import Path
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
+
+from audit_tool.analytics import AnalyticsStore
+from audit_tool.dataset import DATASET_DIRNAME, latest_run
+from audit_tool.frame_cache import cached_frame, load_table, load_unified, read_frame
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Long experience narratives, read only by the Persona Experience page
+NARRATIVE_COLUMNS = ['first_impression', 'language_tone_feedback', 'information_gaps',
+                     'trust_credibility_assessment', 'business_impact_analysis',
+                     'effective_copy_examples', 'ineffective_copy_examples']
+
+# Columns of master_df, shared by the command center and every other page
+MASTER_COLUMNS = ['persona_id', 'persona', 'run', 'page_id', 'page_key', 'url_slug', 'slug', 'url',
+                  'tier', 'tier_name', 'tier_weight', 'brand_percentage', 'performance_percentage',
+                  'criterion_id', 'criterion_code', 'criterion_name', 'raw_score', 'score', 'final_score',
+                  'weight_pct', 'impact_score', 'descriptor', 'evidence', 'overall_sentiment',
+                  'engagement_level', 'conversion_likelihood', 'audited_ts', 'quick_win_flag',
+                  'critical_issue_flag', 'success_flag', 'sentiment_numeric', 'engagement_numeric',
+                  'conversion_numeric', 'avg_score']
+
+# Columns of the Persona Experience page
+EXPERIENCE_COLUMNS = ['persona_id', 'page_id', 'url_slug', 'overall_sentiment', 'engagement_level',
+                      'conversion_likelihood'] + NARRATIVE_COLUMNS
+
+@st.cache_resource
+def analytics_store(data_dir: str = "../../audit_data", runs_dir: str = "../../audit_runs") -> AnalyticsStore:
+    """Analytics store over the audit data, shared by every page"""
+    return AnalyticsStore(data_dir, runs_dir)
+
 class BrandHealthDataLoader:
     """Enhanced data loader with proper type handling and derived metrics"""
     
-    def __init__(self, audit_outputs_dir: str = "audit_outputs"):
+    def __init__(self, audit_outputs_dir: str = "audit_outputs", run: Optional[str] = None):
         self.audit_outputs_dir = Path("../../audit_outputs")
         self.unified_data_dir = Path("../../audit_data")
+        # Run of the dataset every view reads (the latest packaged run when None)
+        self.run = run
+        
+    def current_run(self) -> Optional[str]:
+        """Run of the dataset the views read: the chosen run, or the latest packaged one"""
+        return self.run or latest_run(self.unified_data_dir / DATASET_DIRNAME, "audit")
         
+    def query(self, sql: str, params=None, **frames: pd.DataFrame) -> pd.DataFrame:
+        """Run SQL against the analytics store views, and any DataFrames passed by name"""
+        return analytics_store(str(self.unified_data_dir)).query(sql, params, **frames)
+    
     def safe_sort_unique(self, series):
         """Handle mixed float/string types in sorting"""
         try:
@@ -28,40 +65,26 @@ class BrandHealthDataLoader:
             logger.warning(f"Error sorting series: {e}")
             return list(series.dropna().unique())
     
-    def load_unified_data(self) -> pd.DataFrame:
-        """Load the unified dataset from CSV"""
+    def load_unified_data(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load the unified dataset, or its Parquet or CSV export, cached until the files change"""
         try:
-            # Load standard unified dataset (enhanced version removed - was identical)
-            standard_path = self.unified_data_dir / "unified_audit_data.csv"
-            if standard_path.exists():
-                df = pd.read_csv(standard_path)
-                logger.info(f"Loaded unified dataset: {len(df)} rows, {len(df.columns)} columns")
-                
-                # Ensure avg_score column exists for dashboard compatibility
-                if 'avg_score' not in df.columns:
-                    if 'final_score' in df.columns:
-                        df['avg_score'] = df['final_score']
-                    elif 'raw_score' in df.columns:
-                        df['avg_score'] = df['raw_score']
-                    elif 'raw_score' in df.columns:
-                        df['avg_score'] = df['raw_score']
-                
-                return df
-            
-            logger.error("No unified dataset found")
-            return pd.DataFrame()
+            df = load_unified(self.unified_data_dir, columns, run=self.current_run())
+            if df.empty:
+                logger.error("No unified dataset found")
+            return df
             
         except Exception as e:
             logger.error(f"Error loading unified data: {e}")
             return pd.DataFrame()
 
-    @st.cache_data  
-    def load_experience_data(_self):
-        """Load unified experience dataset"""
+    def load_experience_data(self):
+        """Load the unified experience data of the same run as the audit data, cached until its files change"""
         try:
-            experience_file = _self.unified_data_dir / "unified_experience_data.csv"
-            if experience_file.exists():
-                df = pd.read_csv(experience_file)
+            df = load_table(self.unified_data_dir / DATASET_DIRNAME, "experience", run=self.current_run())
+            experience_file = self.unified_data_dir / "unified_experience_data.csv"
+            if df.empty and experience_file.exists():
+                df = cached_frame(experience_file, lambda projection: read_frame(experience_file, projection))
+            if not df.empty:
                 logger.info(f"Loaded unified experience data: {len(df)} rows, {len(df.columns)} columns")
                 return df
             return pd.DataFrame()
@@ -69,10 +92,21 @@ class BrandHealthDataLoader:
             logger.error(f"Error loading experience data: {str(e)}")
             return pd.DataFrame()
 
-    def load_all_data(self):
-        """Load all data (unified dataset only)"""
+    def load_score_cube(self) -> pd.DataFrame:
+        """Load the score cube of the same run as the audit data, cached until its files change"""
+        try:
+            cube = load_table(self.unified_data_dir / DATASET_DIRNAME, "cube", run=self.current_run())
+            if not cube.empty:
+                logger.info(f"Loaded score cube: {len(cube)} groups")
+            return cube
+        except Exception as e:
+            logger.error(f"Error loading score cube: {str(e)}")
+            return pd.DataFrame()
+
+    def load_all_data(self, columns: Optional[List[str]] = MASTER_COLUMNS):
+        """Load all data (unified dataset only), with the columns the dashboard pages share"""
         # Load primary unified dataset
-        master_df = self.load_unified_data()
+        master_df = self.load_unified_data(columns)
         
         if master_df.empty:
             logger.error("Failed to load unified dataset")
@@ -0,0 +1,72 @@
+"""
+Run Monitor for the audit runner pages
+Follows an audit subprocess through its JSONL event stream instead of its log output
+"""
+
+import time
+import streamlit as st
+from typing import List, Dict, Any
+
+from audit_tool.events import EventTail, RunStats
+
+def format_event(event: Dict[str, Any]) -> str:
+    """One log line for a run event"""
+    kind = event.get("event", "")
+    target = event.get("url", "")
+    if event.get("persona"):
+        target += f" ({event['persona']})"
+
+    if kind == "run_started":
+        return f"Run started: {event.get('total', 0)} page audits"
+    if kind == "scraped":
+        return f"SCRAPED {target} in {event.get('latency_ms', 0):.0f} ms [{event.get('tier') or event.get('status')}]"
+    if kind == "llm_done":
+        tokens = f", {event['output_tokens']} tokens" if event.get("output_tokens") else ""
+        return f"LLM {event.get('artefact')} for {target} in {event.get('latency_ms', 0) / 1000:.1f} s{tokens}"
+    if kind == "failed":
+        return f"FAILED {target}: {event.get('message')}"
+    if kind == "run_finished":
+        return f"Run finished: {event.get('completed', 0)} completed, {event.get('failed', 0)} failed"
+    return f"{kind.upper()} {target}".strip()
+
+def render_run_stats(stats: RunStats, progress_bar, status_text, metrics_container):
+    """Render progress, throughput, ETA and per-stage latency"""
+    if stats.total:
+        progress_bar.progress(min(100, 10 + int(90 * stats.done / stats.total)))
+    status_text.text(f"Audited {stats.done} of {stats.total or '?'} pages ({stats.failed} failed)")
+
+    now = time.time()
+    eta = stats.eta_seconds(now)
+    with metrics_container.container():
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Throughput", f"{stats.throughput(now):.1f} pages/min")
+        col2.metric("ETA", f"{eta / 60:.1f} min" if eta is not None else "—")
+        col3.metric("Tokens", f"{stats.input_tokens + stats.output_tokens:,}")
+
+        latency = stats.stage_latency()
+        if latency:
+            st.table({
+                stage: {"runs": values["count"], "mean (s)": round(values["mean_ms"] / 1000, 2),
+                        "p95 (s)": round(values["p95_ms"] / 1000, 2)}
+                for stage, values in latency.items()
+            })
+
+def follow_audit_process(process, events_path: str, progress_bar, status_text, metrics_container,
+                         log_container, poll_interval: float = 0.5) -> RunStats:
+    """Tail the event stream of a running audit until the process exits"""
+    tail = EventTail(events_path)
+    stats = RunStats()
+    log_lines: List[str] = []
+
+    while True:
+        exited = process.poll() is not None
+        events = tail.read()
+        if events:
+            stats.update(events)
+            log_lines = (log_lines + [format_event(event) for event in events])[-100:]
+            log_container.code('\n'.join(log_lines))
+        render_run_stats(stats, progress_bar, status_text, metrics_container)
+
+        if exited:
+            return stats
+        time.sleep(poll_interval)
@@ -11,14 +11,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from audit_tool.score_cube import PAGE_FACTS_SOURCE, build_cube, slice_cube
+
 class TierAnalyzer:
     """Analyzes brand performance across content tiers with methodology-based weighting"""
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, cube: Optional[pd.DataFrame] = None):
         self.data = data
+        # Score cube written at packaging time; built from the data on first use when not given
+        self.cube = cube if cube is not None and not cube.empty else None
         # Use actual tier data from unified CSV instead of hardcoded config
         self.tier_config = self._load_tier_config_from_data()
     
+    def _score_cube(self) -> pd.DataFrame:
+        """Score cube of the data, built once from the rows when no packaged cube was given"""
+        if self.cube is None:
+            self.cube = build_cube(self.data, **PAGE_FACTS_SOURCE)
+        return self.cube
+    
     def _load_tier_config_from_data(self) -> Dict:
         """Load tier configuration from unified CSV data instead of hardcoded values"""
         tier_config = {}
@@ -54,13 +64,17 @@ class TierAnalyzer:
             
         tier_summary = {}
         
+        # Tier roll-ups from the score cube rather than the raw rows
+        cube = self._score_cube()
+        tiers = slice_cube(cube, by=['tier']).set_index('tier')
+        tier_personas = slice_cube(cube, by=['tier', 'persona']).dropna(subset=['persona'])
+        persona_counts = tier_personas.groupby('tier', observed=True)['persona'].count()
+        
         for tier_id, config in self.tier_config.items():
-            tier_data = self.data[self.data['tier'] == tier_id]
-            
-            if not tier_data.empty:
-                avg_score = tier_data['raw_score'].mean()
-                page_count = tier_data['page_id'].nunique()
-                persona_count = tier_data['persona_id'].nunique()
+            if tier_id in tiers.index:
+                avg_score = tiers.loc[tier_id, 'mean']
+                page_count = int(tiers.loc[tier_id, 'pages'])
+                persona_count = int(persona_counts.get(tier_id, 0))
                 
                 # Calculate brand health status
                 if avg_score >= 7:
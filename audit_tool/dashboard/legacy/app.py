@@ -226,7 +226,10 @@ def render_main_content():
     
     with col1:
         st.markdown("#### 🏆 Top Performing Tiers")
-        tier_breakdown = gateway.get_tier_breakdown(filtered_data)
+        cube = gateway.get_score_cube(run_data, st.session_state['score_filter'])
+        tier_breakdown = gateway.get_tier_breakdown(
+            cube, st.session_state['persona_filter'], st.session_state['tier_filter']
+        )
         if not tier_breakdown.empty:
             for _, row in tier_breakdown.head(3).iterrows():
                 st.write(f"**{row['tier'].title()}**: {row['avg_score']:.2f}/10 ({row['pass_rate']:.1f}% pass rate)")
@@ -18,6 +18,8 @@ from datetime import datetime
 # Add audit_tool to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from components.run_monitor import follow_audit_process
+
 def get_persona_name(persona_content: str, filename: str = None) -> str:
     """Extract a human-readable persona name; fall back to P-number."""
     lines = persona_content.strip().split('\n')
@@ -33,7 +35,8 @@ def get_persona_name(persona_content: str, filename: str = None) -> str:
         match = re.search(r"P\d+", filename)
     return match.group(0) if match else "default_persona"
 
-def run_audit(persona_file_path, urls_file_path, persona_name, model_provider="anthropic"):
+def run_audit(persona_file_path, urls_file_path, persona_name, model_provider="anthropic",
+              events_path=None, log_path=None):
     """Runs the audit tool as a subprocess (inherits current working dir)."""
     # Create output directory for this persona
     output_dir = os.path.join("audit_outputs", persona_name)
@@ -52,15 +55,59 @@ def run_audit(persona_file_path, urls_file_path, persona_name, model_provider="a
         "--model",
         model_provider
     ]
-    process = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding='utf-8'
-    )
+    if events_path:
+        command += ["--events", events_path]
+    
+    # Progress comes from the event stream; the log output is only kept for errors
+    log_file = open(log_path, "w", encoding="utf-8") if log_path else subprocess.DEVNULL
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8'
+        )
+    finally:
+        # The child has its own copy of the descriptor; keeping ours open leaks one per run
+        if log_file is not subprocess.DEVNULL:
+            log_file.close()
     return process
 
+def get_daemon_client():
+    """Return a client for the audit daemon if one is running, else None."""
+    try:
+        from audit_tool.server import AuditClient
+    except ImportError:
+        return None
+    client = AuditClient()
+    return client if client.is_available() else None
+
+def run_audit_on_daemon(client, persona_file, urls, model_provider, progress_bar, status_text, log_container):
+    """Submits the audit to the warm daemon and follows its events until it finishes."""
+    job = client.submit(
+        urls,
+        personas=[{"filename": persona_file.name, "content": persona_file.getvalue().decode("utf-8")}],
+        model=model_provider
+    )
+    st.session_state.audit_job_id = job["job_id"]
+    
+    log_lines = [f"Submitted job {job['job_id']} to audit daemon ({job['total']} pages)"]
+    log_container.code('\n'.join(log_lines))
+    
+    for event in client.stream_events(job["job_id"]):
+        if event["type"] == "page":
+            progress_bar.progress(min(100, 10 + int(90 * event["completed"] / max(1, event["total"]))))
+            status_text.text(f"Audited {event['completed']} of {event['total']} pages")
+            log_lines.append(f"{event['status'].upper()}: {event['url']} ({event['persona']})"
+                             + (f" - {event['message']}" if event.get("message") else ""))
+        else:
+            log_lines.append(f"Job {event['type']}")
+        log_lines = log_lines[-100:]
+        log_container.code('\n'.join(log_lines))
+    
+    return client.status(job["job_id"])
+
 def initialize_audit_state():
     """Initialize audit-related session state variables"""
     if 'is_running' not in st.session_state:
@@ -82,6 +129,15 @@ def initialize_audit_state():
 
 def stop_audit():
     """Stop the currently running audit"""
+    if st.session_state.get('audit_job_id'):
+        client = get_daemon_client()
+        if client:
+            try:
+                client.cancel(st.session_state.audit_job_id)
+            except Exception:
+                pass
+        st.session_state.audit_job_id = None
+    
     if hasattr(st.session_state, 'audit_process') and st.session_state.audit_process:
         try:
             st.session_state.audit_process.terminate()
@@ -272,9 +328,36 @@ def main():
         # Create progress indicators
         progress_bar = st.progress(0)
         status_text = st.empty()
+        metrics_container = st.empty()
         log_expander = st.expander("📋 Live Audit Log", expanded=True)
         log_container = log_expander.empty()
         
+        # Prefer the warm audit daemon (`python -m audit_tool serve`) when it is running
+        client = get_daemon_client()
+        if client:
+            try:
+                urls = [url.strip() for url in st.session_state.urls_text.split('\n') if url.strip()]
+                valid_urls = [url for url in urls if url.startswith(('http://', 'https://'))]
+                status_text.text(f"Submitting audit to daemon using {st.session_state.selected_model.upper()}...")
+                progress_bar.progress(10)
+                
+                job = run_audit_on_daemon(client, persona_file, valid_urls, st.session_state.selected_model,
+                                          progress_bar, status_text, log_container)
+                
+                if job["status"] == "completed":
+                    st.success(f"✅ Audit completed: {job['counts']['success']} pages succeeded, "
+                               f"{job['counts']['error']} failed.")
+                    st.info("🔄 Refresh the dashboard to see new data in other tabs.")
+                    st.balloons()
+                else:
+                    st.error(f"❌ Audit {job['status']}. {job.get('error') or ''}")
+            except Exception as e:
+                st.error(f"💥 Unexpected error: {e}")
+            finally:
+                st.session_state.is_running = False
+                st.session_state.audit_job_id = None
+            return
+        
         temp_dir = tempfile.mkdtemp(prefix="audit_")
         
         try:
@@ -294,26 +377,24 @@ def main():
             status_text.text(f"Starting audit for {persona_name} using {st.session_state.selected_model.upper()}...")
             progress_bar.progress(10)
             
-            process = run_audit(persona_file_path, urls_file_path, persona_name, st.session_state.selected_model)
+            events_path = os.path.join(temp_dir, "events.jsonl")
+            log_path = os.path.join(temp_dir, "audit.log")
+            process = run_audit(persona_file_path, urls_file_path, persona_name, st.session_state.selected_model,
+                                events_path=events_path, log_path=log_path)
             st.session_state.audit_process = process  # Store process for potential termination
             
-            # Stream logs using the same pattern as audit_runner_dashboard.py
-            log_lines = []
-            
-            for line in iter(process.stdout.readline, ''):
-                log_lines.append(line.rstrip())
-                if len(log_lines) > 100:  # Keep only the last 100 lines
-                    log_lines = log_lines[-100:]
-                log_container.code('\n'.join(log_lines))
-            
-            process.wait()
+            # Follow the run through its event stream
+            stats = follow_audit_process(process, events_path, progress_bar, status_text,
+                                         metrics_container, log_container)
             
             if process.returncode == 0:
-                st.success("✅ Audit completed successfully!")
+                st.success(f"✅ Audit completed: {stats.completed} pages succeeded, {stats.failed} failed.")
                 st.info("🔄 Refresh the dashboard to see new data in other tabs.")
                 st.balloons()
             else:
                 st.error("❌ Audit failed. Check the log for details.")
+                with open(log_path, 'r', encoding='utf-8') as f:
+                    log_container.code(''.join(f.readlines()[-100:]))
                 
         except Exception as e:
             st.error(f"💥 Unexpected error: {e}")
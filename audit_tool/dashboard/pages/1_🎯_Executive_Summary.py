@@ -34,7 +34,7 @@ def main():
     st.markdown("### Strategic Overview & Key Performance Indicators")
     
     # Initialize tier analyzer for methodology-based scoring
-    tier_analyzer = TierAnalyzer(master_df)
+    tier_analyzer = TierAnalyzer(master_df, st.session_state.get('score_cube'))
     brand_health = tier_analyzer.calculate_overall_brand_health()
     
     # Display tier-weighted brand health score prominently
@@ -14,6 +14,8 @@ from pathlib import Path
 # Add audit_tool to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from audit_tool.score_cube import build_cube, slice_cube
+
 def main():
     """Main persona comparison page"""
     st.set_page_config(page_title="Persona Comparison", page_icon="👥", layout="wide")
@@ -54,15 +56,22 @@ def main():
         st.warning("No data matches the current filters.")
         return
     
-    # Persona Performance Overview
-    persona_summary = filtered_df.groupby('persona_id').agg({
-        'avg_score': ['mean', 'std', 'count', 'min', 'max'],
-        'page_id': 'nunique',
-        'criterion_id': 'nunique'
-    }).round(2)
-    
-    # Flatten column names
-    persona_summary.columns = ['Avg Score', 'Std Dev', 'Evaluations', 'Min Score', 'Max Score', 'Pages', 'Criteria']
+    # Persona Performance Overview, read from the score cube written at packaging time
+    cube = st.session_state.get('score_cube')
+    if cube is None or cube.empty:
+        cube = build_cube(filtered_df, score='avg_score', persona='persona_id', criterion='criterion_id')
+    by_persona = slice_cube(cube, by=['persona']).dropna(subset=['persona'])
+    criteria_counts = slice_cube(cube, by=['persona', 'criterion']).dropna(subset=['criterion']).groupby(
+        'persona', observed=True)['criterion'].count()
+    persona_summary = pd.DataFrame({
+        'Avg Score': by_persona['mean'].round(2).values,
+        'Std Dev': by_persona['std'].round(2).values,
+        'Evaluations': by_persona['score_count'].values,
+        'Min Score': by_persona['score_min'].round(2).values,
+        'Max Score': by_persona['score_max'].round(2).values,
+        'Pages': by_persona['pages'].values,
+        'Criteria': criteria_counts.reindex(by_persona['persona']).fillna(0).astype(int).values
+    }, index=pd.Index(by_persona['persona'].astype(str), name='persona_id'))
     
     # Add status column
     persona_summary['Status'] = persona_summary['Avg Score'].apply(
@@ -13,6 +13,8 @@ from pathlib import Path
 # Add audit_tool to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from components.data_loader import EXPERIENCE_COLUMNS, BrandHealthDataLoader
+
 def main():
     """Main persona experience analysis page"""
     st.set_page_config(page_title="Persona Experience", page_icon="👤", layout="wide")
@@ -22,7 +24,8 @@ def main():
         st.error("❌ No data available. Please go to the main dashboard first to load data.")
         return
     
-    master_df = st.session_state['master_df']
+    # master_df leaves out the experience narratives; read them with this page's columns (cached)
+    master_df = BrandHealthDataLoader().load_unified_data(EXPERIENCE_COLUMNS)
     datasets = st.session_state.get('datasets', {})
     
     st.title("👤 Persona Experience Analysis")
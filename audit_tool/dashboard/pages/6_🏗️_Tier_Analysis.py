@@ -45,7 +45,7 @@ def main():
     """)
     
     # Initialize tier analyzer
-    tier_analyzer = TierAnalyzer(data)
+    tier_analyzer = TierAnalyzer(data, st.session_state.get('score_cube'))
     
     # Render the complete tier dashboard
     tier_analyzer.render_tier_dashboard()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Data Gateway for Brand Audit Dashboard
-Handles loading and caching of structured audit data
+Handles loading and caching of structured audit data, aggregated in the analytics store
+and read from each run's score cube
 """
 
 import streamlit as st
@@ -10,12 +11,16 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from audit_tool.analytics import AnalyticsStore
+from audit_tool.score_cube import PAGE_FACTS_SOURCE, SCORE_CUBE_FILENAME, build_cube, grand_total, slice_cube
+
 class DataGateway:
     def __init__(self):
         # Look for audit_runs from the project root, regardless of where we're running from
         current_dir = Path(__file__).parent
         project_root = current_dir.parent  # Go up from audit_tool to project root
         self.runs_dir = project_root / "audit_runs"
+        self.store = AnalyticsStore(project_root / "audit_data", self.runs_dir)
     
     @st.cache_resource
     def load_available_runs(_self) -> List[str]:
@@ -39,9 +44,13 @@ class DataGateway:
             return None
         
         try:
-            # Load page facts
-            page_facts_path = run_dir / "page_facts.parquet"
-            page_facts = pd.read_parquet(page_facts_path) if page_facts_path.exists() else pd.DataFrame()
+            # Load page facts through the store's view over every run
+            _self.store.refresh()
+            page_facts = _self.store.query("SELECT * FROM run_page_facts WHERE run_id = ?", [run_id])
+            
+            # Load the score cube written at packaging time; older runs get one built here
+            cube_path = run_dir / SCORE_CUBE_FILENAME
+            cube = pd.read_parquet(cube_path) if cube_path.exists() else build_cube(page_facts, **PAGE_FACTS_SOURCE)
             
             # Load evidence
             evidence_path = run_dir / "evidence.parquet"
@@ -54,6 +63,7 @@ class DataGateway:
             
             return {
                 'page_facts': page_facts,
+                'cube': cube,
                 'evidence': evidence,
                 'manifest': manifest,
                 'run_id': run_id
@@ -71,18 +81,21 @@ class DataGateway:
         if not run_data or run_data['page_facts'].empty:
             return pd.DataFrame()
             
-        df = run_data['page_facts'].copy()
-        
+        conditions, params = [], []
         if persona_filter:
-            df = df[df['persona_id'].isin(persona_filter)]
+            conditions.append("list_contains(?, persona_id)")
+            params.append(list(persona_filter))
         
         if score_filter:
-            df = df[(df['raw_score'] >= score_filter[0]) & (df['raw_score'] <= score_filter[1])]
+            conditions.append("raw_score BETWEEN ? AND ?")
+            params.extend(score_filter)
         
         if tier_filter:
-            df = df[df['tier'].isin(tier_filter)]
+            conditions.append("list_contains(?, tier)")
+            params.append(list(tier_filter))
         
-        return df
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return _self.store.query(f"SELECT * FROM run_facts {where}", params, run_facts=run_data['page_facts'])
     
     @st.cache_data
     def get_summary_stats(_self, df: pd.DataFrame) -> Dict:
@@ -90,61 +103,79 @@ class DataGateway:
         if df.empty:
             return {}
         
-        return {
-            'total_pages': len(df['page_id'].unique()),
-            'total_criteria': len(df),
-            'average_score': df['raw_score'].mean(),
-            'median_score': df['raw_score'].median(),
-            'std_score': df['raw_score'].std(),
-            'min_score': df['raw_score'].min(),
-            'max_score': df['raw_score'].max(),
-            'pass_count': len(df[df['descriptor'] == 'PASS']),
-            'warn_count': len(df[df['descriptor'] == 'WARN']),
-            'fail_count': len(df[df['descriptor'] == 'FAIL']),
-            'pass_rate': len(df[df['descriptor'] == 'PASS']) / len(df) * 100 if len(df) > 0 else 0
-        }
+        stats = _self.store.query("""
+            SELECT count(DISTINCT page_id) AS total_pages,
+                   count(*) AS total_criteria,
+                   avg(raw_score) AS average_score,
+                   median(raw_score) AS median_score,
+                   stddev_samp(raw_score) AS std_score,
+                   min(raw_score) AS min_score,
+                   max(raw_score) AS max_score,
+                   count(*) FILTER (WHERE descriptor = 'PASS') AS pass_count,
+                   count(*) FILTER (WHERE descriptor = 'WARN') AS warn_count,
+                   count(*) FILTER (WHERE descriptor = 'FAIL') AS fail_count
+            FROM df
+        """, df=df).to_dict('records')[0]
+        stats['pass_rate'] = stats['pass_count'] / stats['total_criteria'] * 100
+        return stats
     
     @st.cache_data
-    def get_tier_breakdown(_self, df: pd.DataFrame) -> pd.DataFrame:
-        """Get performance breakdown by tier"""
-        if df.empty:
+    def get_score_cube(_self, run_data: Dict, score_filter: Tuple[float, float] = None) -> pd.DataFrame:
+        """Score cube of a run, rebuilt from the matching rows when the score filter excludes any"""
+        if not run_data:
             return pd.DataFrame()
         
-        tier_stats = df.groupby('tier').agg({
-            'raw_score': ['mean', 'count', 'std'],
-            'descriptor': lambda x: (x == 'PASS').sum() / len(x) * 100
-        }).round(2)
+        cube = run_data['cube']
+        total = grand_total(cube)
+        if score_filter and total and (score_filter[0] > total['score_min'] or score_filter[1] < total['score_max']):
+            cube = build_cube(_self.get_filtered_data(run_data, score_filter=score_filter), **PAGE_FACTS_SOURCE)
+        return cube
+    
+    def _cube_breakdown(_self, cube: pd.DataFrame, by: str, persona_filter: List[str] = None,
+                        tier_filter: List[str] = None) -> pd.DataFrame:
+        """Score statistics and pass rate per group of one cube dimension"""
+        filters = {'persona': list(persona_filter) if persona_filter else None,
+                   'tier': list(tier_filter) if tier_filter else None}
+        stats = slice_cube(cube, by=[by], **filters)
+        if stats.empty:
+            return pd.DataFrame()
         
-        tier_stats.columns = ['avg_score', 'count', 'std_dev', 'pass_rate']
-        return tier_stats.reset_index()
+        passed = slice_cube(cube, by=[by], descriptor='PASS', **filters)[[by, 'score_count']]
+        stats = stats.merge(passed.rename(columns={'score_count': 'pass_count'}), on=by, how='left')
+        return pd.DataFrame({
+            by: stats[by],
+            'avg_score': stats['mean'].round(2),
+            'count': stats['score_count'],
+            'std_dev': stats['std'].round(2),
+            'min_score': stats['score_min'],
+            'max_score': stats['score_max'],
+            'pass_rate': (stats['pass_count'].fillna(0) / stats['score_count'] * 100).round(2)
+        })
+    
+    @st.cache_data
+    def get_tier_breakdown(_self, cube: pd.DataFrame, persona_filter: List[str] = None,
+                           tier_filter: List[str] = None) -> pd.DataFrame:
+        """Get performance breakdown by tier"""
+        breakdown = _self._cube_breakdown(cube, 'tier', persona_filter, tier_filter)
+        return breakdown.drop(columns=['min_score', 'max_score'], errors='ignore')
     
     @st.cache_data
-    def get_persona_comparison(_self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_persona_comparison(_self, cube: pd.DataFrame, persona_filter: List[str] = None,
+                               tier_filter: List[str] = None) -> pd.DataFrame:
         """Get comparison data across personas"""
-        if df.empty:
-            return pd.DataFrame()
-        
-        persona_stats = df.groupby('persona_id').agg({
-            'raw_score': ['mean', 'count', 'std'],
-            'descriptor': lambda x: (x == 'PASS').sum() / len(x) * 100
-        }).round(2)
-        
-        persona_stats.columns = ['avg_score', 'count', 'std_dev', 'pass_rate']
-        return persona_stats.reset_index()
+        breakdown = _self._cube_breakdown(cube, 'persona', persona_filter, tier_filter)
+        return breakdown.drop(columns=['min_score', 'max_score'], errors='ignore').rename(
+            columns={'persona': 'persona_id'})
     
     @st.cache_data
-    def get_criteria_performance(_self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_criteria_performance(_self, cube: pd.DataFrame, persona_filter: List[str] = None,
+                                 tier_filter: List[str] = None) -> pd.DataFrame:
         """Get performance by individual criteria"""
-        if df.empty:
-            return pd.DataFrame()
-        
-        criteria_stats = df.groupby('criterion_id').agg({
-            'raw_score': ['mean', 'count', 'std', 'min', 'max'],
-            'descriptor': lambda x: (x == 'PASS').sum() / len(x) * 100
-        }).round(2)
-        
-        criteria_stats.columns = ['avg_score', 'count', 'std_dev', 'min_score', 'max_score', 'pass_rate']
-        return criteria_stats.reset_index().sort_values('avg_score', ascending=False)
+        breakdown = _self._cube_breakdown(cube, 'criterion', persona_filter, tier_filter)
+        if breakdown.empty:
+            return breakdown
+        return breakdown.rename(columns={'criterion': 'criterion_id'}).sort_values(
+            'avg_score', ascending=False, kind='stable', ignore_index=True)
     
     def get_evidence_for_page(_self, run_data: Dict, page_id: str) -> List[Dict]:
         """Get evidence (justifications/recommendations) for a specific page"""
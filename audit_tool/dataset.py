@@ -0,0 +1,385 @@
+"""
+Audit Dataset for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module stores the unified audit data as a typed, partitioned Parquet dataset:
+1. Declares explicit Arrow schemas for the audit, experience, comparison, score cube and page tables
+2. Dictionary-encodes low-cardinality columns (persona, tier, criterion code, descriptor)
+3. Partitions tables Hive-style by run and persona (audit/run=<run>/persona=<persona>/)
+4. Sorts rows by tier and score into small row groups with statistics and page indexes
+5. Reads back only the partitions, row groups and columns a filter and projection need
+
+Each run and persona gets one file, so repackaging a persona rewrites only its
+partition. A reader filtering on a persona opens that persona's files alone,
+and a filter on tier or score skips the row groups whose min/max statistics
+rule them out. CSV is an optional export for spreadsheets and older
+dashboards, written by export_csv() from the dataset.
+"""
+
+import shutil
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Dataset directory inside audit_data, and the single file of each partition
+DATASET_DIRNAME = "dataset"
+PART_FILENAME = "part-0.parquet"
+
+# Small enough for tier and score statistics to prune large audits, large enough to compress well
+ROW_GROUP_SIZE = 8192
+COMPRESSION = "zstd"
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Columns with this suffix (input fingerprints) hold a handful of distinct values
+CATEGORY_SUFFIX = "_fingerprint"
+
+AUDIT_SCHEMA = pa.schema([
+    ('page_id', pa.string()),
+    ('page_key', pa.int32()),
+    ('criterion_code', _CATEGORY),
+    ('criterion_name', _CATEGORY),
+    ('score', pa.float64()),
+    ('evidence', pa.string()),
+    ('weight_pct', pa.float64()),
+    ('tier', _CATEGORY),
+    ('descriptor', _CATEGORY),
+    ('impact_score', pa.float64()),
+])
+
+EXPERIENCE_SCHEMA = pa.schema([
+    ('page_id', pa.string()),
+    ('page_key', pa.int32()),
+    ('persona_id', _CATEGORY),
+    ('first_impression', pa.string()),
+    ('language_tone_feedback', pa.string()),
+    ('information_gaps', pa.string()),
+    ('trust_credibility_assessment', pa.string()),
+    ('business_impact_analysis', pa.string()),
+    ('effective_copy_examples', pa.string()),
+    ('ineffective_copy_examples', pa.string()),
+    ('overall_sentiment', _CATEGORY),
+    ('engagement_level', _CATEGORY),
+    ('conversion_likelihood', _CATEGORY),
+])
+
+COMPARISON_SCHEMA = pa.schema([
+    ('page_count', pa.int64()),
+    ('average_score', pa.float64()),
+    ('tier_1_score', pa.float64()),
+    ('tier_2_score', pa.float64()),
+    ('tier_3_score', pa.float64()),
+    ('onsite_score', pa.float64()),
+    ('offsite_score', pa.float64()),
+    ('overall_score', pa.float64()),
+])
+
+# Roll-ups of the audit table over every persona of a run (see score_cube)
+CUBE_SCHEMA = pa.schema([
+    ('persona', _CATEGORY),
+    ('tier', _CATEGORY),
+    ('criterion', _CATEGORY),
+    ('descriptor', _CATEGORY),
+    ('rolled_up', pa.int32()),
+    ('score_count', pa.int64()),
+    ('score_sum', pa.float64()),
+    ('score_sum_sq', pa.float64()),
+    ('score_min', pa.float64()),
+    ('score_max', pa.float64()),
+    ('pages', pa.int64()),
+])
+
+# Page dimension: one row per canonical URL across runs (see page_dimension)
+PAGE_SCHEMA = pa.schema([
+    ('page_key', pa.int32()),
+    ('url', pa.string()),
+    ('slug', pa.string()),
+    ('tier', _CATEGORY),
+    ('first_run', pa.string()),
+    ('last_run', pa.string()),
+])
+
+@dataclass(frozen=True)
+class TableLayout:
+    """How one unified table is typed, partitioned and ordered on disk."""
+
+    schema: pa.Schema
+    partition_by: Tuple[str, ...]
+    sort_by: Tuple[str, ...] = ()
+    csv_name: str = ''  # File name of the flat CSV export
+
+TABLES: Dict[str, TableLayout] = {
+    'audit': TableLayout(AUDIT_SCHEMA, ('run', 'persona'), ('tier', 'score'), 'unified_audit_data.csv'),
+    'experience': TableLayout(EXPERIENCE_SCHEMA, ('run', 'persona'), ('overall_sentiment',),
+                              'unified_experience_data.csv'),
+    'comparison': TableLayout(COMPARISON_SCHEMA, ('run', 'persona'), (), 'persona_comparison.csv'),
+    # Spans every persona of a run, so it is partitioned by run alone
+    'cube': TableLayout(CUBE_SCHEMA, ('run',), ('rolled_up',), 'score_cube.csv'),
+    # Shared by every run, so it is not partitioned
+    'pages': TableLayout(PAGE_SCHEMA, (), ('page_key',), 'page_dimension.csv'),
+}
+
+def partition_dir(root: Union[str, Path], table: str, **values: str) -> Path:
+    """
+    Directory of one partition of a table.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES
+        **values: Value of each partition column of the table
+
+    Returns:
+        Path such as <root>/audit/run=<run>/persona=<persona>
+    """
+    path = Path(root) / table
+    for column in TABLES[table].partition_by:
+        path = path / f"{column}={quote(str(values[column]), safe='')}"
+    return path
+
+def to_arrow(frame: pd.DataFrame, table: str) -> pa.Table:
+    """
+    Convert a table's rows to Arrow with the table's declared types.
+
+    Declared columns missing from the frame are written as nulls so every file of
+    a table shares one schema; columns that are not declared keep their inferred type.
+
+    Args:
+        frame: Rows of the table, without the partition columns
+        table: Table name, a key of TABLES
+
+    Returns:
+        Arrow table, declared columns first
+    """
+    schema = TABLES[table].schema
+    arrays, fields = [], []
+    for field in schema:
+        if field.name in frame.columns:
+            arrays.append(pa.array(frame[field.name], from_pandas=True).cast(field.type))
+        else:
+            arrays.append(pa.nulls(len(frame), field.type))
+        fields.append(field)
+    for name in frame.columns:
+        if name in schema.names:
+            continue
+        array = pa.array(frame[name], from_pandas=True)
+        if name.endswith(CATEGORY_SUFFIX):
+            array = array.cast(_CATEGORY)
+        arrays.append(array)
+        fields.append(pa.field(name, array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+def write_partition(root: Union[str, Path], table: str, frame: pd.DataFrame, **values: str) -> Path:
+    """
+    Replace one partition of a table with new rows.
+
+    The file is written next to its final name and moved into place, so readers
+    never see a partial partition. Rows are converted to Arrow one row group at a
+    time, so the partition's rows are never held twice.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES
+        frame: Rows of the partition; partition columns in it are dropped
+        **values: Value of each partition column of the table
+
+    Returns:
+        Path of the written file
+    """
+    layout = TABLES[table]
+    frame = frame.drop(columns=[column for column in layout.partition_by if column in frame.columns])
+    sort_by = [column for column in layout.sort_by if column in frame.columns]
+    if sort_by:
+        frame = frame.sort_values(sort_by, kind='stable', na_position='last')
+
+    from .row_writer import ParquetRowWriter
+
+    frame = frame.reset_index(drop=True)
+    # Columns that are not declared are typed from the whole frame, so every row group agrees
+    schema = to_arrow(frame.iloc[:0], table).schema
+    undeclared = [name for name in frame.columns if name not in TABLES[table].schema.names
+                  and not name.endswith(CATEGORY_SUFFIX)]
+    if undeclared:
+        inferred = pa.Schema.from_pandas(frame[undeclared], preserve_index=False)
+        schema = pa.schema([inferred.field(field.name) if field.name in undeclared else field for field in schema])
+
+    path = partition_dir(root, table, **values) / PART_FILENAME
+    with ParquetRowWriter(path, schema, row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION,
+                          write_page_index=True) as writer:
+        for start in range(0, len(frame), ROW_GROUP_SIZE):
+            writer.write_table(to_arrow(frame.iloc[start:start + ROW_GROUP_SIZE], table).cast(schema))
+    return path
+
+def partition_current(root: Union[str, Path], table: str, **values: str) -> bool:
+    """
+    Whether a partition exists and has every column the table declares.
+
+    Partitions written before a column was declared are stale and should be rewritten.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES
+        **values: Value of each partition column of the table
+
+    Returns:
+        True if the partition file exists with the declared columns
+    """
+    path = partition_dir(root, table, **values) / PART_FILENAME
+    if not path.exists():
+        return False
+    return set(TABLES[table].schema.names) <= set(pq.read_schema(path).names)
+
+def run_dir(root: Union[str, Path], table: str, run: str) -> Path:
+    """
+    Directory holding every partition of one run of a table.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES partitioned by run
+        run: Run name
+
+    Returns:
+        Path such as <root>/audit/run=<run>
+    """
+    return Path(root) / table / f"run={quote(str(run), safe='')}"
+
+def latest_run(root: Union[str, Path], table: str = "audit") -> Optional[str]:
+    """
+    The run of a table whose files were written last, i.e. the latest packaging.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES partitioned by run
+
+    Returns:
+        Run name, or None if the table has no run
+    """
+    path = Path(root) / table
+    written = {}
+    if path.is_dir():
+        for directory in path.glob("run=*"):
+            files = [file.stat().st_mtime_ns for file in directory.rglob("*.parquet") if not file.name.startswith(".")]
+            if files:
+                written[unquote(directory.name[len("run="):])] = max(files)
+    return max(written, key=written.get) if written else None
+
+def remove_partitions(root: Union[str, Path], table: str, run: str, keep: List[str]) -> List[str]:
+    """
+    Delete the persona partitions of a run that are not in a list.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES partitioned by persona
+        run: Run whose partitions are pruned
+        keep: Personas whose partitions stay
+
+    Returns:
+        Personas whose partitions were removed
+    """
+    directory = run_dir(root, table, run)
+    kept = {f"persona={quote(str(persona), safe='')}" for persona in keep}
+    removed = []
+    if directory.is_dir():
+        for child in directory.iterdir():
+            if child.is_dir() and child.name.startswith("persona=") and child.name not in kept:
+                shutil.rmtree(child)
+                removed.append(unquote(child.name[len("persona="):]))
+    return removed
+
+def _open(path: Path) -> ds.Dataset:
+    # Partition values are typed as declared: inferred types would make a run named 20240601 an integer
+    layout = TABLES.get(path.name)
+    columns = layout.partition_by if layout else ('run', 'persona')
+    partitioning = ds.HivePartitioning.discover(
+        infer_dictionary=True, schema=pa.schema([(column, _CATEGORY) for column in columns]))
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+    fragments = list(dataset.get_fragments())
+    if len(fragments) > 1:
+        # Files written before a column was added lack it; read them with the merged schema
+        schema = pa.unify_schemas([fragment.physical_schema for fragment in fragments] + [dataset.partitioning.schema])
+        if schema != dataset.schema:
+            dataset = ds.dataset(path, format="parquet", partitioning=partitioning, schema=schema)
+    return dataset
+
+def read_table(root: Union[str, Path], table: str, columns: Optional[List[str]] = None,
+               filters=None, run: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read a table, opening only the partitions and row groups a filter can match.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES
+        columns: Columns to read (all columns when omitted)
+        filters: pyarrow expression, or filters in pyarrow.parquet's list-of-tuples form,
+            e.g. [("persona", "=", "CTO"), ("score", "<", 4)]
+        run: Only read this run (every run when omitted); ignored by tables not partitioned by run
+
+    Returns:
+        DataFrame with categorical dictionary columns, empty if the table was never written
+    """
+    path = Path(root) / table
+    if not path.is_dir() or not any(path.rglob("*.parquet")):
+        return pd.DataFrame(columns=columns or [])
+
+    expression = pq.filters_to_expression(filters) if isinstance(filters, list) else filters
+    if run is not None and 'run' in TABLES[table].partition_by:
+        run_filter = ds.field('run') == run
+        expression = run_filter if expression is None else expression & run_filter
+
+    opened = _open(path)
+    # Declared columns missing from every file (written before they were declared) read as nulls
+    missing = [column for column in columns or [] if column not in opened.schema.names
+               and column in TABLES[table].schema.names]
+    if missing:
+        projection = [column for column in columns if column not in missing]
+        df = opened.to_table(columns=projection, filter=expression).to_pandas()
+        return df.assign(**{column: None for column in missing})[columns]
+    return opened.to_table(columns=columns, filter=expression).to_pandas()
+
+def table_columns(root: Union[str, Path], table: str) -> List[str]:
+    """
+    Columns a table's files hold, partition columns included, read from the file footers.
+
+    Args:
+        root: Dataset directory
+        table: Table name, a key of TABLES
+
+    Returns:
+        Column names, empty if the table was never written
+    """
+    path = Path(root) / table
+    if not path.is_dir() or not any(path.rglob("*.parquet")):
+        return []
+    return _open(path).schema.names
+
+def export_csv(root: Union[str, Path], output_dir: Union[str, Path], run: Optional[str] = None) -> List[Path]:
+    """
+    Write the flat CSV copy of every table.
+
+    Args:
+        root: Dataset directory
+        output_dir: Directory receiving unified_audit_data.csv and the others
+        run: Only export this run (every run when omitted)
+
+    Returns:
+        Paths of the written CSV files
+    """
+    written = []
+    for table, layout in TABLES.items():
+        df = read_table(root, table, run=run)
+        if df.empty:
+            continue
+        path = Path(output_dir) / layout.csv_name
+        df.to_csv(path, index=False)
+        written.append(path)
+        logger.info(f"Exported {table} to {path}: {len(df)} rows")
+    return written
@@ -0,0 +1,308 @@
+"""
+Distributed Audit Mode for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module splits an audit between a coordinator and any number of workers:
+1. Coordinator - enqueues one (url, persona) task per pair into a shared queue
+2. Worker - leases tasks, heartbeats while busy and writes reports to the run directory
+3. Lease recovery - tasks held by a dead worker are reclaimed and retried
+4. Packaging - the coordinator builds persona and unified tables from the run journal
+5. Strategic summaries - written once every task has finished
+
+Workers may run on other cores or hosts as long as they can reach the queue
+(e.g. SQLite on a shared volume) and the common run directory. Each worker
+journals what it writes, so packaging does not depend on which worker
+produced a report. Tasks belong to the run named after the run directory, so
+one queue can serve successive runs; a coordinator restarted on the same run
+directory finds its tasks already queued.
+"""
+
+import os
+import time
+import uuid
+import socket
+import logging
+import threading
+from typing import Dict, List, Any
+
+from .backfill_packager import EnhancedBackfillPackager
+from .multi_persona_packager import StreamingPackager
+from .pipeline import ARTEFACTS, LoadedPersona, PipelineConfig, parse_artefact
+from .run_journal import RunJournal
+from .task_queue import AuditTask, TaskQueue, DONE, FAILED, LEASED, PENDING
+
+logger = logging.getLogger(__name__)
+
+def run_name(tool) -> str:
+    """Run of the tool's output directory: the directory name, as in the unified dataset's run partition."""
+    return tool.audit_outputs_dir.resolve().name
+
+class Coordinator:
+    """Enqueues audit tasks, waits for workers and packages the shared run directory."""
+
+    def __init__(self, tool, task_queue: TaskQueue):
+        """
+        Initialize the coordinator.
+
+        Args:
+            tool: The BrandAuditTool whose output directory is the shared run directory
+            task_queue: Queue shared with the workers
+        """
+        self.tool = tool
+        self.queue = task_queue
+        self.run_id = run_name(tool)
+
+    def submit(self, urls: List[str], persona_paths: List[str]) -> int:
+        """
+        Enqueue one task per (url, persona) pair.
+
+        Args:
+            urls: List of URLs to audit
+            persona_paths: List of paths to persona markdown files
+
+        Returns:
+            Number of tasks added (pairs already queued for this run are skipped)
+        """
+        RunJournal(self.tool.audit_outputs_dir).write_plan(urls, persona_paths, multi_persona=True)
+
+        # Workers lease in enqueue order, so the most valuable pages are queued first
+        if self.tool.scheduler is not None:
+            urls = self.tool.scheduler.order(urls)
+
+        # URL-major order so workers finish whole pages first
+        tasks = [AuditTask.create(url, persona_path, self.run_id) for url in urls for persona_path in persona_paths]
+        added = self.queue.enqueue(tasks)
+        logger.info(f"Enqueued {added} of {len(tasks)} tasks for run {self.run_id}")
+        if added < len(tasks):
+            logger.warning(f"{len(tasks) - added} tasks were already queued for run {self.run_id}; "
+                           f"use a new --output-dir to audit them again")
+        return added
+
+    def wait(self, poll_interval: float = 5.0, timeout: float = None) -> Dict[str, int]:
+        """
+        Wait until no task is pending or leased, reclaiming expired leases meanwhile.
+
+        Args:
+            poll_interval: Seconds between queue checks
+            timeout: Maximum seconds to wait (optional)
+
+        Returns:
+            Final task counts by state
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            self.queue.reclaim_expired()
+            counts = self.queue.counts(self.run_id)
+            logger.info(f"Queue status for run {self.run_id}: {counts}")
+
+            if counts[PENDING] == 0 and counts[LEASED] == 0:
+                return counts
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for workers")
+                return counts
+
+            time.sleep(poll_interval)
+
+    def package(self, write_unified: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the persona and unified tables from the reports journalled by the workers.
+
+        Args:
+            write_unified: Whether to write the unified audit data files
+
+        Returns:
+            Dictionary of audit results by persona file path, then by URL
+        """
+        journal = RunJournal(self.tool.audit_outputs_dir)
+        packager = StreamingPackager(self.tool.unified_packager(), flush_every=0)
+        personas: Dict[str, LoadedPersona] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for task in self.queue.tasks(self.run_id):
+            if task.persona_path not in personas:
+                personas[task.persona_path] = self.tool.load_persona(task.persona_path)
+            persona = personas[task.persona_path]
+            persona_results = results.setdefault(task.persona_path, {})
+
+            reports = {artefact: journal.read_completed(task.url, persona.name, artefact) for artefact in ARTEFACTS}
+            if task.status != DONE or reports["hygiene_scorecard"] is None:
+                persona_results[task.url] = {"status": "error", "message": task.message or task.status}
+                continue
+
+            parser = EnhancedBackfillPackager(persona.name, input_dir=persona.output_dir)
+            parsed = {}
+            for artefact, report in reports.items():
+                if report is not None:
+                    entry = journal.completed(task.url, persona.name, artefact)
+                    parsed[artefact] = parse_artefact(parser, artefact, report, journal.resolve_path(entry),
+                                                      entry.get('fingerprints'))
+
+            packager.add_page(persona.name, persona.output_dir, parsed["hygiene_scorecard"],
+                              parsed.get("experience_report"))
+            persona_results[task.url] = {
+                "status": "success",
+                "hygiene_scorecard": reports["hygiene_scorecard"],
+                "experience_report": reports.get("experience_report") or ""
+            }
+
+        packager.finalize(write_unified=write_unified)
+        self.tool._write_manifest(journal, list(personas.values()))
+
+        for persona in personas.values():
+            self.tool._generate_strategic_summary(persona, packager)
+
+        return results
+
+    def run(self, urls: List[str], persona_paths: List[str], poll_interval: float = 5.0,
+            timeout: float = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit the tasks, wait for the workers and package the results.
+
+        Args:
+            urls: List of URLs to audit
+            persona_paths: List of paths to persona markdown files
+            poll_interval: Seconds between queue checks
+            timeout: Maximum seconds to wait for the workers (optional)
+
+        Returns:
+            Dictionary of audit results by persona file path, then by URL
+        """
+        self.submit(urls, persona_paths)
+        counts = self.wait(poll_interval, timeout)
+        if counts[FAILED]:
+            logger.warning(f"{counts[FAILED]} tasks failed after retries")
+        return self.package()
+
+class Worker:
+    """Leases tasks from the shared queue and audits them into the common run directory."""
+
+    def __init__(self, tool, task_queue: TaskQueue, worker_id: str = None, slots: int = None,
+                 lease_seconds: float = 300.0, poll_interval: float = 2.0):
+        """
+        Initialize the worker.
+
+        Args:
+            tool: The BrandAuditTool used to scrape, prompt and parse
+            task_queue: Queue shared with the coordinator
+            worker_id: Unique worker name (optional, derived from host and process)
+            slots: Number of tasks worked on at once (optional, defaults to the LLM worker count)
+            lease_seconds: Lease length; heartbeats renew it every third of this
+            poll_interval: Seconds to wait when no task is available
+        """
+        self.tool = tool
+        self.queue = task_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.slots = max(1, slots or tool.pipeline_config.llm_workers)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+        self.journal = RunJournal(tool.audit_outputs_dir)
+        self.run_id = run_name(tool)
+        self.completed = 0
+        self._held: Dict[str, AuditTask] = {}
+        self._personas: Dict[str, LoadedPersona] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, max_tasks: int = None) -> int:
+        """
+        Work until the queue is drained (or max_tasks have been processed).
+
+        Args:
+            max_tasks: Stop after this many tasks (optional)
+
+        Returns:
+            Number of tasks processed by this worker
+        """
+        logger.info(f"Worker {self.worker_id} starting with {self.slots} slots")
+        self._stop.clear()
+        self._max_tasks = max_tasks
+        self._taken = 0
+
+        heartbeat = threading.Thread(target=self._heartbeat, name=f"{self.worker_id}-heartbeat", daemon=True)
+        heartbeat.start()
+
+        threads = [threading.Thread(target=self._work, name=f"{self.worker_id}-{i}", daemon=True)
+                   for i in range(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self._stop.set()
+        heartbeat.join()
+
+        logger.info(f"Worker {self.worker_id} finished {self.completed} tasks")
+        return self.completed
+
+    def stop(self) -> None:
+        """Ask the worker to finish its current tasks and exit."""
+        self._stop.set()
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if self._max_tasks is not None and self._taken >= self._max_tasks:
+                    return
+                self._taken += 1
+
+            task = self.queue.lease(self.worker_id, self.lease_seconds, self.run_id)
+            if task is None:
+                with self._lock:
+                    self._taken -= 1
+                if self.queue.is_drained(self.run_id):
+                    return
+                # Other workers still hold leases that may expire and be reclaimed
+                self._stop.wait(self.poll_interval)
+                continue
+
+            with self._lock:
+                self._held[task.task_id] = task
+            try:
+                self._process(task)
+            finally:
+                with self._lock:
+                    self._held.pop(task.task_id, None)
+
+    def _process(self, task: AuditTask) -> None:
+        logger.info(f"Worker {self.worker_id} auditing {task.url} for {task.persona_path} (attempt {task.attempts})")
+
+        try:
+            persona = self._load_persona(task.persona_path)
+            # Each task is a single page, so its own pipeline needs one worker per stage
+            config = PipelineConfig(scrape_workers=1, prompt_workers=1, llm_workers=1, parse_workers=1,
+                                    package_workers=1, queue_size=2, max_pages_in_flight=1)
+            results = self.tool._run_pipeline([task.url], [persona], StreamingPackager(flush_every=0),
+                                              self.journal, config=config)
+            result = results[str(persona.path)][task.url] or {"status": "error", "message": "no result"}
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} failed on {task.url}: {str(e)}")
+            result = {"status": "error", "message": str(e)}
+
+        if result["status"] == "success":
+            if not self.queue.complete(task.task_id, self.worker_id):
+                logger.warning(f"Lease on {task.url} was lost before completion")
+            with self._lock:
+                self.completed += 1
+        else:
+            self.queue.fail(task.task_id, self.worker_id, result.get("message", "error"))
+
+    def _load_persona(self, persona_path: str) -> LoadedPersona:
+        with self._lock:
+            persona = self._personas.get(persona_path)
+        if persona is None:
+            persona = self.tool.load_persona(persona_path)
+            with self._lock:
+                self._personas[persona_path] = persona
+        return persona
+
+    def _heartbeat(self) -> None:
+        interval = max(0.01, self.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            with self._lock:
+                held = list(self._held.values())
+            for task in held:
+                if not self.queue.heartbeat(task.task_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Worker {self.worker_id} lost its lease on {task.url}")
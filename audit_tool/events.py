@@ -0,0 +1,249 @@
+"""
+Run Event Stream for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module gives audit runs a machine-readable progress stream:
+1. RunEventEmitter - appends one JSON object per line to a file or TCP socket
+2. Event types - run and url lifecycle, scrape, LLM (latency and tokens), parse, failure
+3. EventTail - reads new complete events from a file by byte offset
+4. RunStats - folds events into throughput, ETA and per-stage latency
+5. Sinks - "path/to/events.jsonl" or "tcp://host:port"
+
+Consumers such as the Run Audit dashboard tail the stream instead of parsing
+the mixed log output of the audit process. Every event carries the run id,
+a wall-clock timestamp and, where it applies, the url and persona.
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Event types written by the pipeline
+RUN_STARTED = "run_started"
+URL_STARTED = "url_started"
+SCRAPED = "scraped"
+LLM_DONE = "llm_done"
+PARSED = "parsed"
+COMPLETED = "completed"
+FAILED = "failed"
+RUN_FINISHED = "run_finished"
+
+# Events whose latency_ms is reported per stage
+STAGE_EVENTS = {SCRAPED: "scrape", LLM_DONE: "llm", PARSED: "parse"}
+
+class RunEventEmitter:
+    """Thread-safe writer of JSONL run events."""
+
+    def __init__(self, sink: str, run_id: str = None):
+        """
+        Open an event sink.
+
+        Args:
+            sink: File path to append to, or tcp://host:port to stream to
+            run_id: Identifier stamped on every event (optional, generated)
+        """
+        self.sink = sink
+        self.run_id = run_id or f"run-{int(time.time() * 1000)}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._file = None
+
+        if sink.startswith("tcp://"):
+            host, _, port = sink[len("tcp://"):].rpartition(":")
+            self._socket = socket.create_connection((host or "127.0.0.1", int(port)))
+        else:
+            path = Path(sink)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Line buffered so a tailing reader sees each event as soon as it is written
+            self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def emit(self, event: str, **data) -> Dict[str, Any]:
+        """
+        Write an event.
+
+        Args:
+            event: Event type (e.g. "scraped")
+            **data: Event payload
+
+        Returns:
+            The event as written
+        """
+        record = {"ts": round(time.time(), 3), "run_id": self.run_id, "event": event, **data}
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+        with self._lock:
+            try:
+                if self._socket is not None:
+                    self._socket.sendall(line.encode("utf-8"))
+                elif self._file is not None:
+                    self._file.write(line)
+            except OSError as e:
+                # Losing the progress stream must never fail the audit itself
+                logger.warning(f"Could not write run event to {self.sink}: {str(e)}")
+
+        return record
+
+    def close(self) -> None:
+        """Close the sink."""
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class EventTail:
+    """Incremental reader of a JSONL event file."""
+
+    def __init__(self, path: Union[str, Path], offset: int = 0):
+        """
+        Start tailing an event file.
+
+        Args:
+            path: Event file written by a RunEventEmitter
+            offset: Byte offset to start reading from
+        """
+        self.path = Path(path)
+        self.offset = offset
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        Return the events appended since the last call.
+
+        A trailing line without its newline is left for the next call, so an
+        event being written concurrently is never returned half-finished.
+
+        Returns:
+            New events in file order
+        """
+        if not self.path.exists():
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return []
+        self.offset += end + 1
+
+        events = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring unreadable event line in {self.path}")
+        return events
+
+@dataclass
+class RunStats:
+    """Progress of a run folded from its events."""
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    started_at: Optional[float] = None
+    last_event_at: Optional[float] = None
+    finished: bool = False
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+
+    def update(self, events: List[Dict[str, Any]]) -> "RunStats":
+        """
+        Fold new events into the statistics.
+
+        Args:
+            events: Events in stream order
+
+        Returns:
+            The updated statistics
+        """
+        for event in events:
+            kind = event.get("event")
+            self.last_event_at = event.get("ts", self.last_event_at)
+
+            if kind == RUN_STARTED:
+                if self.started_at is None:
+                    self.started_at = event.get("ts")
+                self.total += event.get("total", 0)
+            elif kind == COMPLETED:
+                self.completed += 1
+            elif kind == FAILED:
+                self.failed += 1
+            elif kind == RUN_FINISHED:
+                self.finished = True
+
+            if kind in STAGE_EVENTS and event.get("latency_ms") is not None:
+                self.latencies.setdefault(STAGE_EVENTS[kind], []).append(event["latency_ms"])
+            if kind == LLM_DONE:
+                self.input_tokens += event.get("input_tokens") or 0
+                self.output_tokens += event.get("output_tokens") or 0
+
+        return self
+
+    @property
+    def done(self) -> int:
+        """(url, persona) pairs finished, successfully or not."""
+        return self.completed + self.failed
+
+    def throughput(self, now: float = None) -> float:
+        """
+        Finished pairs per minute since the run started.
+
+        Args:
+            now: Current time (optional, defaults to the last event)
+
+        Returns:
+            Pairs per minute
+        """
+        if self.started_at is None or not self.done:
+            return 0.0
+        elapsed = (now or self.last_event_at or self.started_at) - self.started_at
+        return self.done * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self, now: float = None) -> Optional[float]:
+        """
+        Estimated seconds until every pair is finished.
+
+        Args:
+            now: Current time (optional, defaults to the last event)
+
+        Returns:
+            Seconds remaining, or None before the first pair finishes
+        """
+        rate = self.throughput(now)
+        if not rate:
+            return None
+        return max(0, self.total - self.done) * 60.0 / rate
+
+    def stage_latency(self) -> Dict[str, Dict[str, float]]:
+        """
+        Latency summary of each stage.
+
+        Returns:
+            Count, mean and 95th percentile milliseconds by stage
+        """
+        summary = {}
+        for stage, values in self.latencies.items():
+            ordered = sorted(values)
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            summary[stage] = {
+                "count": len(ordered),
+                "mean_ms": sum(ordered) / len(ordered),
+                "p95_ms": p95
+            }
+        return summary
@@ -0,0 +1,74 @@
+"""
+Content Fingerprints for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module provides the stable hashes used to recognise work that has already
+been done:
+1. Hashing of page content, prompts and generated reports
+2. Hashing of files on disk in fixed-size chunks
+3. Canonical hashing of configuration structures, independent of key order
+
+Hashes are hex SHA-256 digests so they are stable across processes and
+machines and safe to store in journals and manifests.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Union
+
+def content_hash(text: Union[str, bytes]) -> str:
+    """
+    Hash a piece of text.
+
+    Args:
+        text: Text or bytes to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).hexdigest()
+
+def file_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Hash the contents of a file without reading it into memory at once.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read per chunk
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def config_hash(value: Any) -> str:
+    """
+    Hash a configuration structure by its content rather than its formatting.
+
+    Keys are sorted and separators fixed, so reordering or reformatting a YAML
+    file does not change the hash while editing any value does.
+
+    Args:
+        value: JSON-like structure (dicts, lists, scalars)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return content_hash(json.dumps(_canonical(value), sort_keys=True, separators=(',', ':'),
+                                   ensure_ascii=False, default=str))
+
+def _canonical(value: Any) -> Any:
+    """Stringify mapping keys so YAML's mixed int and str keys can be sorted."""
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
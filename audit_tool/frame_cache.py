@@ -0,0 +1,231 @@
+"""
+Frame Cache for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module loads the unified audit data for the dashboard and keeps it in memory:
+1. Reads the latest run of the partitioned dataset, its Parquet export or its CSV export, in that order
+2. Reads only the requested columns, from the Parquet footer's schema without scanning
+3. Stores low-cardinality text columns (persona, tier, criterion, descriptor) as categoricals
+4. Keys each frame by source path, the modification time and size of its files, and projection
+5. Evicts the least recently used frames, and a source's older frames as soon as it changes
+
+The dashboard used to read unified_audit_data.csv on every rerun of every
+page, parsing all its columns as Python strings. A cached frame is read
+once and every rerun is a dictionary lookup; repackaging the audit changes
+the files' signature, so the next rerun reads the new data without a
+restart or a manual cache clear. Callers get a shallow copy they may modify
+without touching the cached frame.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .dataset import DATASET_DIRNAME, latest_run, read_table, run_dir, table_columns
+
+logger = logging.getLogger(__name__)
+
+# Frames kept in memory: a few projections of a few sources
+CACHE_SIZE = 16
+
+# Text columns with few distinct values, read as categoricals
+CATEGORY_COLUMNS = ('persona_id', 'persona', 'tier', 'tier_name', 'criterion_id', 'criterion_code', 'descriptor')
+
+# Unified data sources, tried in order
+UNIFIED_PARQUET = "unified_audit_data.parquet"
+UNIFIED_CSV = "unified_audit_data.csv"
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+_frames: 'OrderedDict[Tuple[str, Signature, Optional[Tuple[str, ...]]], pd.DataFrame]' = OrderedDict()
+_frames_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def file_signature(path: Union[str, Path]) -> Signature:
+    """
+    Name, modification time and size of a file, or of every data file under a directory.
+
+    Args:
+        path: File or dataset table directory
+
+    Returns:
+        Sorted (relative name, mtime_ns, size) tuples; empty when the path does not exist.
+        Hidden files (partial writes) are left out.
+    """
+    path = Path(path)
+    if path.is_file():
+        stat = path.stat()
+        return ((path.name, stat.st_mtime_ns, stat.st_size),)
+    signature = []
+    for directory, dirnames, filenames in os.walk(path):
+        dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+        for name in filenames:
+            if name.startswith('.'):
+                continue
+            file_path = os.path.join(directory, name)
+            stat = os.stat(file_path)
+            signature.append((os.path.relpath(file_path, path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+def categorize(frame: pd.DataFrame, categories: Sequence[str] = CATEGORY_COLUMNS) -> pd.DataFrame:
+    """Convert the listed text columns present in a frame to categoricals."""
+    convert = {column: 'category' for column in categories
+               if column in frame.columns and not isinstance(frame[column].dtype, pd.CategoricalDtype)}
+    return frame.astype(convert) if convert else frame
+
+def read_frame(path: Union[str, Path], columns: Optional[List[str]] = None,
+               categories: Sequence[str] = CATEGORY_COLUMNS) -> pd.DataFrame:
+    """
+    Read a Parquet or CSV file, projecting the columns it has.
+
+    Args:
+        path: .parquet or .csv file
+        columns: Columns to read, in this order; requested columns the file lacks are left out
+            (all columns when omitted)
+        categories: Columns to return as categoricals
+
+    Returns:
+        DataFrame of the projected columns
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        wanted = None if columns is None else set(columns)
+        frame = pd.read_csv(path, usecols=None if wanted is None else lambda column: column in wanted)
+    else:
+        names = pq.read_schema(path).names
+        frame = pq.read_table(path, columns=None if columns is None else
+                              [column for column in columns if column in names]).to_pandas()
+    if columns is not None:
+        frame = frame[[column for column in columns if column in frame.columns]]
+    return categorize(frame, categories)
+
+def cached_frame(source: Union[str, Path], load: Callable[[Optional[List[str]]], pd.DataFrame],
+                 columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Return a source's frame, loading it only when the source changed or was never read.
+
+    Args:
+        source: File or directory the frame is read from; its signature invalidates the entry
+        load: Function reading the frame, given the columns to read (None for all)
+        columns: Projection, part of the cache key
+
+    Returns:
+        Shallow copy of the cached frame
+    """
+    source = os.path.abspath(source)
+    projection = None if columns is None else tuple(columns)
+    key = (source, file_signature(source), projection)
+    with _frames_lock:
+        frame = _frames.get(key)
+        if frame is not None:
+            _frames.move_to_end(key)
+            _stats['hits'] += 1
+            return frame.copy(deep=False)
+
+    frame = load(None if projection is None else list(projection))
+    logger.info(f"Loaded {source}: {len(frame)} rows, {len(frame.columns)} columns")
+    with _frames_lock:
+        _stats['misses'] += 1
+        # A changed source's earlier frames can never be hit again
+        for stale in [cached for cached in _frames if cached[0] == source and cached[1] != key[1]]:
+            del _frames[stale]
+        _frames[key] = frame
+        while len(_frames) > CACHE_SIZE:
+            _frames.popitem(last=False)
+    return frame.copy(deep=False)
+
+def _with_avg_score(frame: pd.DataFrame) -> pd.DataFrame:
+    # Older dashboard pages read avg_score; the dataset only has the scores it derives from
+    if 'avg_score' in frame.columns:
+        return frame
+    for column in ('final_score', 'raw_score', 'score'):
+        if column in frame.columns:
+            return frame.assign(avg_score=frame[column])
+    return frame
+
+def _read_columns(columns: Optional[List[str]]) -> Optional[List[str]]:
+    if columns is None or 'avg_score' not in columns:
+        return columns
+    return columns + [column for column in ('final_score', 'raw_score', 'score') if column not in columns]
+
+def _project(frame: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    frame = _with_avg_score(frame)
+    return frame if columns is None else frame[[column for column in columns if column in frame.columns]]
+
+def load_table(dataset_root: Union[str, Path], table: str, columns: Optional[Sequence[str]] = None,
+               run: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load one run of a dataset table, cached until that run's files change.
+
+    Args:
+        dataset_root: Dataset directory
+        table: Table name partitioned by run, e.g. cube or experience
+        columns: Columns to read (all columns when omitted)
+        run: Run to read (the latest run when omitted)
+
+    Returns:
+        Cached DataFrame, empty if the table has no run
+    """
+    run = run or latest_run(dataset_root, table)
+    if run is None:
+        return pd.DataFrame(columns=list(columns or []))
+    return cached_frame(run_dir(dataset_root, table, run),
+                        lambda projection: categorize(read_table(dataset_root, table, columns=projection, run=run)),
+                        columns)
+
+def load_unified(data_dir: Union[str, Path], columns: Optional[Sequence[str]] = None,
+                 run: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load the unified audit data with an avg_score column, from the first source that exists.
+
+    Sources are one run of the dataset's audit table, unified_audit_data.parquet and
+    unified_audit_data.csv in data_dir. Like the flat files, the dataset source holds a
+    single packaging: every run is kept on disk, but only one is read.
+
+    Args:
+        data_dir: Audit data directory
+        columns: Columns to read (all columns when omitted); avg_score is derived when requested
+        run: Run of the dataset to read (the latest run when omitted)
+
+    Returns:
+        Cached DataFrame, empty if no source exists
+    """
+    data_dir = Path(data_dir)
+    dataset_root = data_dir / DATASET_DIRNAME
+    names = table_columns(dataset_root, "audit")
+    if names:
+        run = run or latest_run(dataset_root, "audit")
+        def load(projection):
+            read = None if projection is None else [column for column in _read_columns(projection) if column in names]
+            return _project(categorize(read_table(dataset_root, "audit", columns=read, run=run)), projection)
+        # The run's directory is the source, so each run is cached, and invalidated, on its own
+        return cached_frame(run_dir(dataset_root, "audit", run), load, columns)
+
+    for name in (UNIFIED_PARQUET, UNIFIED_CSV):
+        path = data_dir / name
+        if path.is_file():
+            return cached_frame(path, lambda projection: _project(read_frame(path, _read_columns(projection)),
+                                                                  projection), columns)
+    return pd.DataFrame(columns=list(columns or []))
+
+def cache_info() -> Dict[str, int]:
+    """
+    Counters of the frame cache.
+
+    Returns:
+        Dictionary with hits, misses and the number of cached frames
+    """
+    with _frames_lock:
+        return {**_stats, 'size': len(_frames)}
+
+def clear_cache():
+    """Forget every cached frame."""
+    with _frames_lock:
+        _frames.clear()
@@ -14,11 +14,12 @@ The generators ensure consistent output formatting and structure across
 different report types, enabling effective communication of audit findings.
 """
 
-import re
 import logging
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from .report_parser import parse_report, ReportRecord
+
 logger = logging.getLogger(__name__)
 
 class HygieneScorecard:
@@ -317,6 +318,11 @@ class StrategicSummary:
         
         return markdown
 
+def _numbered_items(record: ReportRecord, title: str) -> List[str]:
+    """Text of the numbered list items under a heading."""
+    section = record.section(title)
+    return [item.text for item in section.items if item.ordered] if section else []
+
 def parse_ai_scorecard(markdown: str) -> Dict[str, Any]:
     """
     Parse an AI-generated hygiene scorecard.
@@ -334,26 +340,23 @@ def parse_ai_scorecard(markdown: str) -> Dict[str, Any]:
     }
     
     try:
+        record = parse_report(markdown)
+        
         # Extract final score
-        final_score_match = re.search(r"\*\*Final Score:\*\*\s*([\d.]+)/10", markdown)
-        if final_score_match:
-            data["final_score"] = float(final_score_match.group(1))
+        if record.final_score is not None:
+            data["final_score"] = record.final_score
         
         # Extract criteria scores
-        criteria_pattern = r"\|\s*\*\*(.*?)\*\*\s*\|\s*([\d.]+)/10\s*\|\s*(.*?)\s*\|"
-        for match in re.finditer(criteria_pattern, markdown):
-            data["criteria"].append({
-                "name": match.group(1),
-                "score": float(match.group(2)),
-                "evidence": match.group(3)
-            })
+        for row in record.criteria:
+            if row.bold and row.out_of_ten:
+                data["criteria"].append({
+                    "name": row.label,
+                    "score": row.score,
+                    "evidence": row.rationale
+                })
         
         # Extract recommendations
-        recommendations_section = re.search(r"## Recommendations\s*\n\n(.*?)(?:\n\n|$)", markdown, re.DOTALL)
-        if recommendations_section:
-            recommendations_text = recommendations_section.group(1)
-            recommendations = re.findall(r"\d+\.\s*(.*?)(?:\n|$)", recommendations_text)
-            data["recommendations"] = recommendations
+        data["recommendations"] = _numbered_items(record, "Recommendations")
         
     except Exception as e:
         logger.error(f"Error parsing AI scorecard: {str(e)}")
@@ -379,34 +382,22 @@ def parse_ai_experience_report(markdown: str) -> Dict[str, Any]:
     }
     
     try:
+        record = parse_report(markdown)
+        
         # Extract sections
-        section_pattern = r"## (.*?)\n\n(.*?)(?=\n\n## |$)"
-        for match in re.finditer(section_pattern, markdown, re.DOTALL):
-            section_name = match.group(1)
-            section_content = match.group(2).strip()
-            
-            if section_name != "Experience Metrics" and section_name != "Recommendations":
-                data["sections"][section_name] = section_content
+        for section in record.sections:
+            if section.level != 2 or not section.body:
+                continue
+            if section.title != "Experience Metrics" and section.title != "Recommendations":
+                data["sections"][section.title] = section.body
         
         # Extract metrics
-        sentiment_match = re.search(r"\*\*Overall Sentiment:\*\*\s*(.*?)(?:\n|$)", markdown)
-        if sentiment_match:
-            data["sentiment"] = sentiment_match.group(1)
-        
-        engagement_match = re.search(r"\*\*Engagement Level:\*\*\s*(.*?)(?:\n|$)", markdown)
-        if engagement_match:
-            data["engagement"] = engagement_match.group(1)
-        
-        conversion_match = re.search(r"\*\*Conversion Likelihood:\*\*\s*(.*?)(?:\n|$)", markdown)
-        if conversion_match:
-            data["conversion"] = conversion_match.group(1)
+        data["sentiment"] = record.field("Overall Sentiment", data["sentiment"])
+        data["engagement"] = record.field("Engagement Level", data["engagement"])
+        data["conversion"] = record.field("Conversion Likelihood", data["conversion"])
         
         # Extract recommendations
-        recommendations_section = re.search(r"## Recommendations\s*\n\n(.*?)(?:\n\n|$)", markdown, re.DOTALL)
-        if recommendations_section:
-            recommendations_text = recommendations_section.group(1)
-            recommendations = re.findall(r"\d+\.\s*(.*?)(?:\n|$)", recommendations_text)
-            data["recommendations"] = recommendations
+        data["recommendations"] = _numbered_items(record, "Recommendations")
         
     except Exception as e:
         logger.error(f"Error parsing AI experience report: {str(e)}")
@@ -20,46 +20,74 @@ import sys
 import time
 import logging
 import argparse
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, TYPE_CHECKING
 from datetime import datetime
 
 from .scraper import Scraper
 from .ai_interface import AIInterface
 from .methodology_parser import MethodologyParser
 from .persona_parser import PersonaParser
-from .multi_persona_packager import MultiPersonaPackager
-from .strategic_summary_generator import StrategicSummaryGenerator
+from .pipeline import AuditPipeline, PipelineConfig, LoadedPersona, run_fingerprints
+from .run_journal import RunJournal, atomic_write_text, JOURNAL_FILENAME
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('audit_tool.log')
-    ]
-)
+if TYPE_CHECKING:
+    from .events import RunEventEmitter
+    from .multi_persona_packager import MultiPersonaPackager, StreamingPackager
+    from .scheduling import WorkScheduler
 
 logger = logging.getLogger(__name__)
 
+def configure_logging(log_file: str = 'audit_tool.log') -> None:
+    """
+    Configure console and file logging for command-line runs.
+    
+    Only entry points call this, so importing the package never opens a log file.
+    
+    Args:
+        log_file: Path of the log file
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(log_file)
+        ]
+    )
+
 class BrandAuditTool:
     """Main class for running brand audits."""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, pipeline_config: PipelineConfig = None,
+                 methodology: MethodologyParser = None, scraper: Scraper = None, ai: AIInterface = None):
         """
         Initialize the brand audit tool.
         
         Args:
             config_path: Path to configuration file (optional)
+            pipeline_config: Worker counts and queue sizes for the audit pipeline (optional)
+            methodology: Already loaded methodology to share, e.g. from the audit daemon (optional)
+            scraper: Scraper to share (optional)
+            ai: AI interface to share (optional)
         """
         logger.info("Initializing Brand Audit Tool")
         
         # Initialize components
-        self.methodology = MethodologyParser(config_path)
-        self.scraper = Scraper()
-        self.ai = AIInterface()
+        self.methodology = methodology or MethodologyParser(config_path)
+        self.scraper = scraper or Scraper()
+        self.ai = ai or AIInterface()
         self.persona_parser = PersonaParser()
+        self.pipeline_config = pipeline_config or PipelineConfig()
+        self.resume = False
+        self.since: Optional[Path] = None
+        self.persona_digest = False
+        self.export_csv = False
+        self.cancel_event: Optional[threading.Event] = None
+        self.on_page_result: Optional[Callable[[Any], None]] = None
+        self.events: Optional["RunEventEmitter"] = None
+        self.scheduler: Optional["WorkScheduler"] = None
         
         # Set default paths
         self.audit_inputs_dir = Path("audit_inputs")
@@ -71,103 +99,88 @@ class BrandAuditTool:
         
         logger.info("Brand Audit Tool initialized")
     
-    def run_audit(self, urls: List[str], persona_path: str) -> Dict[str, Any]:
+    def load_persona(self, persona_path: str) -> LoadedPersona:
         """
-        Run a brand audit for a list of URLs and a specific persona.
+        Read and parse a persona file and create its output directory.
         
         Args:
-            urls: List of URLs to audit
             persona_path: Path to the persona markdown file
             
         Returns:
-            Dictionary of audit results
+            The loaded persona
         """
-        logger.info(f"Starting audit for {len(urls)} URLs with persona {persona_path}")
-        
-        # Load persona
         with open(persona_path, 'r', encoding='utf-8') as f:
             persona_content = f.read()
         
         persona = self.persona_parser.extract_attributes_from_content(persona_content)
         logger.info(f"Loaded persona: {persona.name}")
         
+        # The compact digest replaces the full markdown in prompts when asked for
+        if self.persona_digest:
+            digest = self.persona_parser.digest_from_content(persona_content)
+            if digest:
+                logger.info(f"Using persona digest ({len(digest)} of {len(persona_content)} characters)")
+                persona_content = digest
+            else:
+                logger.warning(f"Too little structure in {persona_path} for a digest, using the full persona")
+        
         # Create output directory for this persona
         persona_dir = self.audit_outputs_dir / persona.name
         os.makedirs(persona_dir, exist_ok=True)
         
-        results = {}
-        
-        # Process each URL
-        for url in urls:
-            try:
-                logger.info(f"Processing URL: {url}")
-                
-                # Scrape the URL
-                page_data = self.scraper.scrape_url(url)
-                
-                if page_data.is_404:
-                    logger.warning(f"URL returned 404: {url}")
-                    results[url] = {"status": "error", "message": "Page not found (404)"}
-                    continue
-                
-                # Generate hygiene scorecard
-                hygiene_scorecard = self.ai.generate_hygiene_scorecard(
-                    url=url,
-                    page_content=page_data.raw_text,
-                    persona_content=persona_content,
-                    methodology=self.methodology
-                )
-                
-                # Generate experience report
-                experience_report = self.ai.generate_experience_report(
-                    url=url,
-                    page_content=page_data.raw_text,
-                    persona_content=persona_content,
-                    methodology=self.methodology
-                )
-                
-                # Save outputs
-                url_slug = self._url_to_slug(url)
-                
-                with open(persona_dir / f"{url_slug}_hygiene_scorecard.md", 'w', encoding='utf-8') as f:
-                    f.write(hygiene_scorecard)
-                
-                with open(persona_dir / f"{url_slug}_experience_report.md", 'w', encoding='utf-8') as f:
-                    f.write(experience_report)
-                
-                results[url] = {
-                    "status": "success",
-                    "hygiene_scorecard": hygiene_scorecard,
-                    "experience_report": experience_report
-                }
-                
-                logger.info(f"Completed processing for URL: {url}")
-                
-            except Exception as e:
-                logger.error(f"Error processing URL {url}: {str(e)}")
-                results[url] = {"status": "error", "message": str(e)}
+        return LoadedPersona(persona.name, Path(persona_path), persona_content, persona_dir)
+    
+    def run_audit(self, urls: List[str], persona_path: str, packager: "StreamingPackager" = None) -> Dict[str, Any]:
+        """
+        Run a brand audit for a list of URLs and a specific persona.
         
-        # Generate strategic summary
-        try:
-            summary_generator = StrategicSummaryGenerator(str(persona_dir))
-            summary, _, _ = summary_generator.generate_full_report()
-            
-            with open(persona_dir / "Strategic_Summary.md", 'w', encoding='utf-8') as f:
-                f.write(summary)
-            
-            logger.info(f"Generated strategic summary for {persona.name}")
+        Args:
+            urls: List of URLs to audit
+            persona_path: Path to the persona markdown file
+            packager: Streaming packager shared across personas (optional). When omitted,
+                the persona's tables are written but the unified files are left untouched.
             
-        except Exception as e:
-            logger.error(f"Error generating strategic summary: {str(e)}")
+        Returns:
+            Dictionary of audit results
+        """
+        logger.info(f"Starting audit for {len(urls)} URLs with persona {persona_path}")
+        
+        from .multi_persona_packager import StreamingPackager
+        
+        persona = self.load_persona(persona_path)
+        journal = self._open_journal(urls, [persona_path], multi_persona=False)
+        
+        streaming_packager = packager or StreamingPackager(self.unified_packager())
+        results = self._run_pipeline(urls, [persona], streaming_packager, journal)
+        self._write_manifest(journal, [persona])
+        
+        if packager is None:
+            streaming_packager.finalize(write_unified=False)
+        
+        self._generate_strategic_summary(persona, streaming_packager)
         
         logger.info(f"Audit completed for {len(urls)} URLs with persona {persona.name}")
         
-        return results
+        return results[str(persona.path)]
+    
+    def unified_packager(self) -> "MultiPersonaPackager":
+        """
+        Packager writing this run's partitions of the unified audit dataset.
+        
+        Returns:
+            Packager whose run partition is named after the output directory
+        """
+        from .multi_persona_packager import MultiPersonaPackager
+        
+        return MultiPersonaPackager(str(self.audit_outputs_dir), export_csv=self.export_csv)
     
     def run_multi_persona_audit(self, urls: List[str], persona_paths: List[str]) -> Dict[str, Any]:
         """
         Run a brand audit for multiple personas.
         
+        Each URL is scraped and classified once, then evaluated for every persona
+        concurrently, rather than repeating the whole URL list per persona.
+        
         Args:
             urls: List of URLs to audit
             persona_paths: List of paths to persona markdown files
@@ -178,26 +191,32 @@ class BrandAuditTool:
         logger.info(f"Starting multi-persona audit for {len(urls)} URLs with {len(persona_paths)} personas")
         
         results = {}
+        personas = []
         
-        # Process each persona
+        # Load every persona once up front
         for persona_path in persona_paths:
             try:
-                persona_results = self.run_audit(urls, persona_path)
-                
-                # Extract persona name from path
-                persona_name = Path(persona_path).stem
-                results[persona_name] = persona_results
-                
-                logger.info(f"Completed audit for persona: {persona_name}")
-                
+                personas.append(self.load_persona(persona_path))
             except Exception as e:
-                logger.error(f"Error processing persona {persona_path}: {str(e)}")
+                logger.error(f"Error loading persona {persona_path}: {str(e)}")
                 results[Path(persona_path).stem] = {"status": "error", "message": str(e)}
         
-        # Generate unified data files
+        from .multi_persona_packager import StreamingPackager
+        
+        journal = self._open_journal(urls, persona_paths, multi_persona=True)
+        packager = StreamingPackager(self.unified_packager())
+        persona_results = self._run_pipeline(urls, personas, packager, journal)
+        self._write_manifest(journal, personas)
+        
+        for persona in personas:
+            # Results are keyed by the persona file name
+            results[persona.path.stem] = persona_results[str(persona.path)]
+            self._generate_strategic_summary(persona, packager)
+            logger.info(f"Completed audit for persona: {persona.name}")
+        
+        # Write unified data files from the rows streamed during the audit
         try:
-            packager = MultiPersonaPackager()
-            packager.process_all_personas()
+            packager.finalize()
             logger.info("Generated unified data files")
         except Exception as e:
             logger.error(f"Error generating unified data files: {str(e)}")
@@ -206,6 +225,89 @@ class BrandAuditTool:
         
         return results
     
+    def _open_journal(self, urls: List[str], persona_paths: List[str], multi_persona: bool) -> RunJournal:
+        """
+        Open the run journal in the output directory and save the run's inputs.
+        
+        Args:
+            urls: List of URLs to audit
+            persona_paths: List of paths to persona markdown files
+            multi_persona: Whether the run is a multi-persona audit
+            
+        Returns:
+            The run journal
+        """
+        journal = RunJournal(self.audit_outputs_dir)
+        journal.write_plan(urls, persona_paths, multi_persona)
+        return journal
+    
+    def _run_pipeline(self, urls: List[str], personas: List[LoadedPersona],
+                      packager: "StreamingPackager", journal: RunJournal = None,
+                      config: PipelineConfig = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Stream every URL through the staged pipeline for the given personas.
+        
+        Args:
+            urls: List of URLs to audit
+            personas: Loaded personas to evaluate each page for
+            packager: Streaming packager receiving the parsed pages
+            journal: Run journal recording finished artefacts (optional)
+            config: Stage worker counts overriding the tool's pipeline config (optional)
+            
+        Returns:
+            Dictionary of audit results by persona file path, then by URL
+        """
+        previous = RunJournal(self.since) if self.since else None
+        pipeline = AuditPipeline(self, packager, config or self.pipeline_config, journal=journal,
+                                 resume=self.resume, previous=previous, cancel_event=self.cancel_event,
+                                 on_result=self.on_page_result, events=self.events,
+                                 scheduler=self.scheduler)
+        return pipeline.run(urls, personas)
+    
+    def _write_manifest(self, journal: RunJournal, personas: List[LoadedPersona] = None) -> None:
+        """
+        Write the run manifest listing reused and recomputed artefacts.
+        
+        Args:
+            journal: The run journal
+            personas: Personas of the run, whose file hashes are recorded (optional)
+        """
+        try:
+            manifest = journal.write_manifest(run_fingerprints(self.methodology, personas), since=self.since)
+            logger.info(f"Run manifest: {manifest['counts']}")
+        except Exception as e:
+            logger.error(f"Error writing run manifest: {str(e)}")
+    
+    def _generate_strategic_summary(self, persona: LoadedPersona, packager: "StreamingPackager" = None) -> None:
+        """
+        Write the strategic summary for a persona's output directory.
+        
+        The summary is rendered from the statistics the streaming packager kept
+        as pages completed; without them the persona's tables are read back.
+        
+        Args:
+            persona: The loaded persona
+            packager: Streaming packager that received the persona's pages (optional)
+        """
+        from .strategic_summary_generator import StrategicSummaryGenerator
+        
+        try:
+            summary = packager.summary_for(persona.name) if packager is not None else None
+            if summary is not None and len(summary):
+                summary.write(persona.output_dir)
+                logger.info(f"Generated strategic summary for {persona.name} from {len(summary)} packaged pages")
+                return
+            
+            summary_generator = StrategicSummaryGenerator(str(persona.output_dir))
+            summary, _, _ = summary_generator.generate_full_report()
+            
+            atomic_write_text(persona.output_dir / "Strategic_Summary.md", summary)
+            
+            logger.info(f"Generated strategic summary for {persona.name}")
+            
+        except Exception as e:
+            logger.error(f"Error generating strategic summary: {str(e)}")
+    
     def _url_to_slug(self, url: str) -> str:
         """
         Convert a URL to a filename-safe slug.
@@ -237,18 +339,125 @@ def main():
     parser.add_argument('--persona', type=str, help='Path to persona file')
     parser.add_argument('--all-personas', action='store_true', help='Run audit with all personas')
     parser.add_argument('--config', type=str, help='Path to configuration file')
-    parser.add_argument('--output-dir', type=str, help='Output directory')
+    parser.add_argument('--output-dir', '--output', dest='output_dir', type=str, help='Output directory')
+    parser.add_argument('--model', type=str, choices=['anthropic', 'openai'], default='anthropic',
+                        help='Model provider used for the audit')
+    parser.add_argument('--concurrency', type=int,
+                        help='Number of model calls in flight at once (default: %d)' % PipelineConfig.llm_workers)
+    parser.add_argument('--events', type=str, metavar='SINK',
+                        help='Write JSONL progress events to a file or tcp://host:port')
+    parser.add_argument('--prioritize', action='store_true',
+                        help='Audit tier_1 pages first, then pages with the largest previous opportunity score')
+    parser.add_argument('--priority-data', type=str, metavar='PATH',
+                        help='Unified audit data to take opportunity scores from (default: audit_data/dataset/audit)')
+    parser.add_argument('--time-budget', type=float, metavar='MINUTES',
+                        help='Stop starting new work after this many minutes; implies --prioritize')
+    parser.add_argument('--cost-budget', type=float, metavar='USD',
+                        help='Stop starting new model calls once this much has been spent; implies --prioritize')
+    parser.add_argument('--export-csv', action='store_true',
+                        help='Also write the unified data as flat CSV files in audit_data/')
+    parser.add_argument('--persona-digest', action='store_true',
+                        help='Send a compact digest of each persona instead of the full file in prompts')
+    parser.add_argument('--resume', type=str, metavar='RUN_DIR',
+                        help='Resume an interrupted run, skipping artefacts already completed in RUN_DIR')
+    parser.add_argument('--since', type=str, metavar='RUN_DIR',
+                        help='Only re-evaluate (url, persona) pairs whose inputs changed since the run in RUN_DIR')
+    parser.add_argument('--queue', type=str,
+                        help='Shared task queue for distributed runs, e.g. sqlite:///shared/audit_queue.db')
+    parser.add_argument('--coordinator', action='store_true',
+                        help='Enqueue (url, persona) tasks on --queue, wait for workers and package the run')
+    parser.add_argument('--worker', action='store_true', help='Process tasks from --queue until it is drained')
     
     args = parser.parse_args()
+    configure_logging()
+    
+    if (args.coordinator or args.worker) and not args.queue:
+        logger.error("--coordinator and --worker need a shared --queue")
+        sys.exit(1)
+    
+    pipeline_config = PipelineConfig()
+    if args.concurrency:
+        # Keep enough pages in flight to give every model worker something to do
+        pipeline_config.llm_workers = args.concurrency
+        pipeline_config.max_pages_in_flight = max(pipeline_config.max_pages_in_flight, args.concurrency)
     
     # Initialize the tool
-    tool = BrandAuditTool(args.config)
+    tool = BrandAuditTool(args.config, pipeline_config=pipeline_config, ai=AIInterface(args.model))
+    tool.persona_digest = args.persona_digest
+    tool.export_csv = args.export_csv
+    
+    if args.prioritize or args.priority_data or args.time_budget or args.cost_budget:
+        from .scheduling import WorkScheduler, RunBudget, load_opportunity_scores, DEFAULT_PRIORITY_DATA
+        
+        budget = RunBudget(max_seconds=args.time_budget * 60 if args.time_budget else None,
+                           max_cost=args.cost_budget)
+        tool.scheduler = WorkScheduler(tool.methodology,
+                                       load_opportunity_scores(args.priority_data or DEFAULT_PRIORITY_DATA,
+                                                               tool.methodology),
+                                       budget)
     
+    if args.events:
+        from .events import RunEventEmitter
+        
+        tool.events = RunEventEmitter(args.events)
+    
+    try:
+        _run_cli(tool, args)
+    finally:
+        if tool.events is not None:
+            tool.events.close()
+
+def _run_cli(tool: BrandAuditTool, args: argparse.Namespace) -> None:
+    """Run the audit mode selected on the command line."""
     # Set output directory if specified
     if args.output_dir:
         tool.audit_outputs_dir = Path(args.output_dir)
         os.makedirs(tool.audit_outputs_dir, exist_ok=True)
     
+    # Resume into the earlier run's directory, reusing its inputs unless new ones are given
+    plan = None
+    if args.resume:
+        tool.audit_outputs_dir = Path(args.resume)
+        tool.resume = True
+        plan = RunJournal(tool.audit_outputs_dir).load_plan()
+        if plan is None and not ((args.url or args.urls) and (args.persona or args.all_personas)):
+            logger.error(f"No run plan found in {args.resume}. Pass --url/--urls and --persona/--all-personas")
+            sys.exit(1)
+    
+    # Carry unchanged artefacts forward from an earlier run
+    if args.since:
+        since = Path(args.since)
+        if not since.is_dir() and (tool.audit_outputs_dir.parent / args.since).is_dir():
+            since = tool.audit_outputs_dir.parent / args.since
+        if not (since / JOURNAL_FILENAME).exists():
+            logger.error(f"No run journal found in {args.since}")
+            sys.exit(1)
+        if since.resolve() == tool.audit_outputs_dir.resolve():
+            logger.error("--since needs a different --output-dir than the earlier run")
+            sys.exit(1)
+        tool.since = since
+        
+        # A re-audit defaults to the earlier run's URLs and personas
+        if plan is None:
+            plan = RunJournal(since).load_plan()
+    
+    if plan and not (args.url or args.urls or args.persona or args.all_personas):
+        logger.info(f"Auditing {len(plan['urls'])} URLs from the saved run plan")
+        if plan['multi_persona']:
+            tool.run_multi_persona_audit(plan['urls'], plan['persona_paths'])
+        else:
+            tool.run_audit(plan['urls'], plan['persona_paths'][0])
+        logger.info("Audit completed successfully")
+        return
+    
+    # Workers take their URLs and personas from the queue
+    if args.worker:
+        from .distributed import Worker
+        from .task_queue import open_task_queue
+        
+        Worker(tool, open_task_queue(args.queue)).run()
+        return
+    
     # Get URLs
     urls = []
     if args.url:
@@ -261,7 +470,22 @@ def main():
         sys.exit(1)
     
     # Get personas
-    if args.all_personas:
+    if args.coordinator:
+        if args.all_personas:
+            persona_paths = [str(p) for p in Path("audit_inputs/personas").glob("*.md")]
+        else:
+            persona_paths = [args.persona] if args.persona else []
+        if not persona_paths:
+            logger.error("No persona specified. Use --persona or --all-personas")
+            sys.exit(1)
+        
+        from .distributed import Coordinator
+        from .task_queue import open_task_queue
+        
+        # Hand the (url, persona) pairs to the workers and package their output
+        Coordinator(tool, open_task_queue(args.queue)).run(urls, persona_paths)
+        
+    elif args.all_personas:
         persona_paths = list(Path("audit_inputs/personas").glob("*.md"))
         if not persona_paths:
             logger.error("No persona files found in audit_inputs/personas/")
@@ -12,16 +12,20 @@ This module provides functionality to parse and apply the brand audit methodolog
 
 The parser ensures that all audit evaluations follow a consistent methodology,
 with appropriate criteria applied based on content type and tier classification.
+Criteria are compiled into an immutable CriteriaIndex when the methodology is
+loaded, so criterion and weight lookups never walk the configuration.
 """
 
 import os
-import yaml
 import logging
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 
 from .tier_classifier import TierClassifier
 
+if TYPE_CHECKING:
+    from .criteria_index import CriteriaIndex
+
 logger = logging.getLogger(__name__)
 
 class MethodologyParser:
@@ -38,6 +42,11 @@ class MethodologyParser:
         self.config = self._load_config()
         self.tier_classifier = TierClassifier(self.config)
         
+        # NumPy loads with the first methodology, not when the package is imported
+        from .criteria_index import CriteriaIndex
+        
+        self.criteria_index: "CriteriaIndex" = CriteriaIndex(self.config)
+        
         logger.info(f"Methodology parser initialized with config: {self.config_path}")
     
     def _load_config(self) -> Dict[str, Any]:
@@ -48,6 +57,8 @@ class MethodologyParser:
             Dictionary of configuration
         """
         try:
+            import yaml
+            
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 config = yaml.safe_load(f)
                 logger.info(f"Loaded methodology configuration from {self.config_path}")
@@ -351,6 +362,18 @@ class MethodologyParser:
         """
         return self.tier_classifier.classify_url(url)
     
+    def classify_many(self, urls):
+        """
+        Classify a column of URLs into tier or channel names.
+        
+        Args:
+            urls: URLs to classify (list or pandas Series)
+            
+        Returns:
+            Names in input order, as a Series for Series input and a list otherwise
+        """
+        return self.tier_classifier.classify_many(urls)
+    
     def get_criteria_for_tier(self, tier_name: str) -> List[Dict[str, Any]]:
         """
         Get the evaluation criteria for a specific tier.
@@ -361,12 +384,7 @@ class MethodologyParser:
         Returns:
             List of criteria dictionaries
         """
-        # Check if this is an onsite tier
-        if tier_name.startswith('tier_'):
-            return self.config.get('classification', {}).get('onsite', {}).get(tier_name, {}).get('criteria', [])
-        
-        # Otherwise, it's an offsite channel
-        return self.config.get('classification', {}).get('offsite', {}).get(tier_name, {}).get('criteria', [])
+        return list(self.criteria_index.tier_criteria.get(tier_name, ()))
     
     def get_tier_names(self) -> List[str]:
         """
@@ -408,25 +426,7 @@ class MethodologyParser:
         Returns:
             Dictionary of criteria by code
         """
-        all_criteria = {}
-        
-        # Get onsite criteria
-        for tier_name in self.get_tier_names():
-            criteria = self.get_criteria_for_tier(tier_name)
-            for criterion in criteria:
-                code = criterion.get('code')
-                if code and code not in all_criteria:
-                    all_criteria[code] = criterion
-        
-        # Get offsite criteria
-        for channel_name in self.get_channel_names():
-            criteria = self.get_criteria_for_tier(channel_name)
-            for criterion in criteria:
-                code = criterion.get('code')
-                if code and code not in all_criteria:
-                    all_criteria[code] = criterion
-        
-        return all_criteria
+        return dict(self.criteria_index.criteria)
     
     def get_criterion_by_code(self, code: str) -> Optional[Dict[str, Any]]:
         """
@@ -438,5 +438,4 @@ class MethodologyParser:
         Returns:
             Dictionary of criterion details or None if not found
         """
-        all_criteria = self.get_all_criteria()
-        return all_criteria.get(code)
+        return self.criteria_index.get(code)
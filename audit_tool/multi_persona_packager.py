@@ -5,14 +5,18 @@ STATUS: ACTIVE
 
 This module provides functionality to process and package audit data for multiple personas.
 It serves as a critical integration component that:
-1. Processes audit data for multiple personas in parallel
+1. Processes audit data for multiple personas in parallel, parsing reports in a process pool
 2. Aggregates and normalizes scores across different persona perspectives
-3. Generates unified CSV and parquet files for dashboard consumption
+3. Writes the unified tables to a typed Parquet dataset partitioned by run and persona,
+   keyed by integer page keys, with a score cube of each run's roll-ups
 4. Supports cross-persona comparison and analysis
 5. Enables the Brand Health Command Center dashboard with multi-persona data
 
 The packager ensures consistent data structure and format across different persona
 evaluations, enabling meaningful comparison and aggregation of brand health metrics.
+Each persona's package manifest lets a repeat run parse only new or changed reports
+and rewrite only the persona tables, and unified partitions, that they affect.
+The flat unified CSV files are an optional export (export_csv).
 """
 
 import os
@@ -20,37 +24,116 @@ import re
 import glob
 import json
 import logging
+import time
+import threading
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .packager import Packager
+from .backfill_packager import EnhancedBackfillPackager
+from .parallel_packaging import PackagingPool
+from . import dataset
+from .page_dimension import PageDimension
+from .score_cube import build_cube
+from .scoring import ScoringEngine
+from .strategic_summary_generator import SummaryAggregator
 
 logger = logging.getLogger(__name__)
 
 class MultiPersonaPackager:
     """Processes and packages audit data for multiple personas."""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, run_id: str = None, export_csv: bool = False):
         """
         Initialize with base directory containing persona-specific audit outputs.
         
         Args:
             base_dir: Base directory containing persona-specific audit outputs
+            run_id: Run partition of the unified dataset (default: name of the base directory)
+            export_csv: Whether to also write the flat unified CSV files
         """
         self.base_dir = Path(base_dir) if base_dir else Path("audit_outputs")
         self.output_dir = Path("audit_data")
+        self.dataset_dir = self.output_dir / dataset.DATASET_DIRNAME
+        self.run_id = run_id or self.base_dir.resolve().name
+        self.export_csv = export_csv
+        
+        # Tables built for each persona, kept in memory for the unified files
+        self.persona_tables: Dict[str, Dict[str, pd.DataFrame]] = {}
+        self._page_dimension: Optional[PageDimension] = None
+        self._scoring_engine: Optional[ScoringEngine] = None
+        self._dimension_lock = threading.Lock()
         
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def process_all_personas(self, max_workers: int = 4) -> Dict[str, Any]:
+    @property
+    def page_dimension(self) -> PageDimension:
+        """Page dimension of the unified dataset, loaded on first use and shared by persona threads."""
+        with self._dimension_lock:
+            if self._page_dimension is None:
+                self._page_dimension = PageDimension(self.dataset_dir)
+            return self._page_dimension
+    
+    @property
+    def scoring_engine(self) -> ScoringEngine:
+        """Scoring engine of the packaged methodology, loaded on first use."""
+        with self._dimension_lock:
+            if self._scoring_engine is None:
+                self._scoring_engine = ScoringEngine()
+            return self._scoring_engine
+    
+    def persona_comparison(self, pages_df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Whole-audit scores of one persona, from its pages table.
+        
+        Tier averages, the onsite and offsite scores and the overall score come
+        from the scoring engine, with the methodology's tier and site weights.
+        
+        Args:
+            pages_df: The persona's pages table, with final_score and tier columns
+            
+        Returns:
+            One row of the comparison table
+        """
+        engine = self.scoring_engine
+        pages = pages_df[["final_score"]].assign(
+            tier=engine.tier_keys(pages_df["tier"]) if "tier" in pages_df.columns else None)
+        tiers = engine.tier_rollup(pages)
+        overall = engine.overall_scores(tiers)
+        tier_scores = tiers.set_index("tier")["average_score"]
+        site_scores = overall.iloc[0] if len(overall) else {}
+        return {
+            "page_count": len(pages_df),
+            "average_score": pages_df["final_score"].mean(),
+            **{f"{tier}_score": tier_scores.get(tier, float("nan")) for tier in ("tier_1", "tier_2", "tier_3")},
+            **{column: site_scores.get(column, float("nan"))
+               for column in ("onsite_score", "offsite_score", "overall_score")}
+        }
+    
+    def stamp_page_keys(self, tables: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Add the integer page key of every page to a persona's tables.
+        
+        Args:
+            tables: Tables of one persona, keyed by table name
+            
+        Returns:
+            The tables with a page_key column, adding new pages to the page dimension
+        """
+        return self.page_dimension.stamp(tables, run=self.run_id)
+    
+    def process_all_personas(self, max_workers: int = 4, processes: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all persona directories in parallel.
         
+        Personas are handled by threads, and large batches of reports are parsed
+        by a process pool shared by every persona.
+        
         Args:
             max_workers: Maximum number of worker threads
+            processes: Maximum number of parsing processes (default: number of CPUs)
             
         Returns:
             Dictionary of processing results
@@ -67,9 +150,9 @@ class MultiPersonaPackager:
         results = {}
         
         # Process each persona directory in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with PackagingPool(processes) as pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_persona = {
-                executor.submit(self._process_persona, persona_dir): persona_dir.name
+                executor.submit(self._process_persona, persona_dir, pool): persona_dir.name
                 for persona_dir in persona_dirs
             }
             
@@ -83,17 +166,18 @@ class MultiPersonaPackager:
                     logger.error(f"Error processing persona {persona_name}: {str(e)}")
                     results[persona_name] = {"status": "error", "message": str(e)}
         
-        # Generate unified files
+        # Rewrite the unified partitions of personas whose tables changed since they were written
         self._generate_unified_files(results)
         
         return results
     
-    def _process_persona(self, persona_dir: Path) -> Dict[str, Any]:
+    def _process_persona(self, persona_dir: Path, pool: Optional[PackagingPool] = None) -> Dict[str, Any]:
         """
         Process a single persona directory.
         
         Args:
             persona_dir: Path to the persona directory
+            pool: Process pool for parsing large batches of reports (optional)
             
         Returns:
             Dictionary of processing results
@@ -101,123 +185,138 @@ class MultiPersonaPackager:
         logger.info(f"Processing persona directory: {persona_dir}")
         
         try:
-            # Create a packager for this persona
-            packager = Packager(str(persona_dir))
-            
-            # Process the data
-            result = packager.process_all_files()
-            
-            # Save persona-specific parquet files
-            self._save_persona_parquet(persona_dir.name, result)
+            # Parse the persona's new or changed reports and rewrite the parquet files they affect
+            packager = EnhancedBackfillPackager(persona_dir.name, input_dir=persona_dir)
+            tables, written = packager.package_incremental(
+                table_dir=self.output_dir / persona_dir.name,
+                save_table=lambda name, df: self._save_persona_parquet(persona_dir.name, {name: df}),
+                pool=pool,
+                prepare=self.stamp_page_keys
+            )
+            self.persona_tables[persona_dir.name] = tables
             
             return {
                 "status": "success",
-                "page_count": len(result.get("pages", [])),
-                "criteria_count": len(result.get("criteria", [])),
-                "experience_count": len(result.get("experience", [])),
-                "recommendation_count": len(result.get("recommendations", []))
+                "tables_written": written,
+                "page_count": len(tables.get("pages", [])),
+                "criteria_count": len(tables.get("criteria_scores", [])),
+                "experience_count": len(tables.get("experience", [])),
+                "recommendation_count": len(tables.get("recommendations", []))
             }
             
         except Exception as e:
             logger.error(f"Error in _process_persona for {persona_dir}: {str(e)}")
             raise
     
-    def _save_persona_parquet(self, persona_name: str, result: Dict[str, Any]) -> None:
+    def _save_persona_parquet(self, persona_name: str, tables: Dict[str, pd.DataFrame]) -> None:
         """
         Save persona-specific parquet files.
         
         Args:
             persona_name: Name of the persona
-            result: Processing results
+            tables: Tables built for the persona, keyed by table name
         """
         # Create persona-specific directory
         persona_dir = self.output_dir / persona_name
         os.makedirs(persona_dir, exist_ok=True)
         
         # Save each dataframe as parquet
-        for key, data in result.items():
-            if isinstance(data, list) and data:
-                df = pd.DataFrame(data)
+        for key, df in tables.items():
+            if df is not None and not df.empty:
                 output_path = persona_dir / f"{key}.parquet"
                 df.to_parquet(output_path, index=False)
                 logger.info(f"Saved {key} parquet for {persona_name}: {len(df)} rows")
     
     def _generate_unified_files(self, results: Dict[str, Any]) -> None:
         """
-        Generate unified CSV and parquet files from all persona data.
+        Write the unified partitions of changed personas and drop those of removed ones.
         
         Args:
             results: Dictionary of processing results by persona
         """
-        logger.info("Generating unified files")
-        
-        # Initialize dataframes
-        unified_audit_data = []
-        unified_experience_data = []
-        persona_comparison_data = []
-        
-        # Process each persona's data
+        persona_tables = {}
         for persona_name, result in results.items():
             if result.get("status") != "success":
                 logger.warning(f"Skipping {persona_name} due to processing error")
                 continue
-            
+            # Partitions written before a column was added to the table are rewritten too
+            if result.get("tables_written") or not dataset.partition_current(
+                    self.dataset_dir, "audit", run=self.run_id, persona=persona_name):
+                persona_tables[persona_name] = self.persona_tables.get(persona_name, {})
+        
+        kept = [name for name, result in results.items() if result.get("status") == "success"]
+        removed = set()
+        for table, layout in dataset.TABLES.items():
+            if "persona" in layout.partition_by:
+                removed.update(dataset.remove_partitions(self.dataset_dir, table, self.run_id, kept))
+        
+        if persona_tables or removed:
+            # package_incremental stamped this run's page keys before saving the persona tables
+            self.write_unified_files(persona_tables, stamped=True)
+        else:
+            logger.info("Unified dataset is up to date")
+    
+    def write_unified_files(self, persona_tables: Dict[str, Dict[str, pd.DataFrame]], stamped: bool = False) -> None:
+        """
+        Replace the unified dataset partitions of personas from tables already in memory.
+        
+        Partitions of personas not given are left as they are.
+        
+        Args:
+            persona_tables: Tables keyed by persona name, then by table name
+            stamped: Whether the tables already carry this run's page keys (see stamp_page_keys)
+        """
+        logger.info(f"Writing unified dataset partitions for run {self.run_id}")
+        
+        for persona_name, tables in persona_tables.items():
             try:
-                # Load persona-specific parquet files
-                persona_dir = self.output_dir / persona_name
+                if not stamped:
+                    tables = self.stamp_page_keys(tables)
+                pages_df = tables.get("pages")
+                criteria_df = tables.get("criteria_scores")
+                experience_df = tables.get("experience")
                 
-                # Process pages and criteria
-                if (persona_dir / "pages.parquet").exists() and (persona_dir / "criteria_scores.parquet").exists():
-                    pages_df = pd.read_parquet(persona_dir / "pages.parquet")
-                    criteria_df = pd.read_parquet(persona_dir / "criteria_scores.parquet")
-                    
-                    # Add persona column
-                    pages_df["persona"] = persona_name
-                    criteria_df["persona"] = persona_name
-                    
-                    # Add to unified audit data
-                    unified_audit_data.append(criteria_df)
-                    
-                    # Add summary to persona comparison
-                    persona_summary = {
-                        "persona": persona_name,
-                        "page_count": len(pages_df),
-                        "average_score": pages_df["final_score"].mean() if "final_score" in pages_df.columns else 0,
-                        "tier_1_score": pages_df[pages_df["tier"] == "tier_1"]["final_score"].mean() if "tier" in pages_df.columns else 0,
-                        "tier_2_score": pages_df[pages_df["tier"] == "tier_2"]["final_score"].mean() if "tier" in pages_df.columns else 0,
-                        "tier_3_score": pages_df[pages_df["tier"] == "tier_3"]["final_score"].mean() if "tier" in pages_df.columns else 0
-                    }
-                    persona_comparison_data.append(persona_summary)
+                # A persona without rows still gets empty partitions, replacing any earlier rows
+                comparison = []
+                if pages_df is not None and criteria_df is not None and not criteria_df.empty:
+                    comparison.append(self.persona_comparison(pages_df))
+                else:
+                    criteria_df = None
                 
-                # Process experience data
-                if (persona_dir / "experience.parquet").exists():
-                    experience_df = pd.read_parquet(persona_dir / "experience.parquet")
-                    experience_df["persona"] = persona_name
-                    unified_experience_data.append(experience_df)
+                for table, df in (("audit", criteria_df), ("experience", experience_df),
+                                  ("comparison", pd.DataFrame(comparison))):
+                    dataset.write_partition(self.dataset_dir, table, df if df is not None else pd.DataFrame(),
+                                            run=self.run_id, persona=persona_name)
+                logger.info(f"Saved unified partitions for {persona_name}: "
+                            f"{0 if criteria_df is None else len(criteria_df)} audit rows")
                 
             except Exception as e:
                 logger.error(f"Error processing unified files for {persona_name}: {str(e)}")
         
-        # Combine and save unified audit data
-        if unified_audit_data:
-            unified_df = pd.concat(unified_audit_data, ignore_index=True)
-            unified_df.to_parquet(self.output_dir / "unified_audit_data.parquet", index=False)
-            unified_df.to_csv(self.output_dir / "unified_audit_data.csv", index=False)
-            logger.info(f"Saved unified audit data: {len(unified_df)} rows")
-        
-        # Combine and save unified experience data
-        if unified_experience_data:
-            experience_df = pd.concat(unified_experience_data, ignore_index=True)
-            experience_df.to_parquet(self.output_dir / "unified_experience_data.parquet", index=False)
-            experience_df.to_csv(self.output_dir / "unified_experience_data.csv", index=False)
-            logger.info(f"Saved unified experience data: {len(experience_df)} rows")
-        
-        # Save persona comparison data
-        if persona_comparison_data:
-            comparison_df = pd.DataFrame(persona_comparison_data)
-            comparison_df.to_parquet(self.output_dir / "persona_comparison.parquet", index=False)
-            comparison_df.to_csv(self.output_dir / "persona_comparison.csv", index=False)
-            logger.info(f"Saved persona comparison data: {len(comparison_df)} rows")
+        self.page_dimension.save()
+        self.write_score_cube()
+        
+        if self.export_csv:
+            dataset.export_csv(self.dataset_dir, self.output_dir, run=self.run_id)
+    
+    def write_score_cube(self) -> None:
+        """
+        Rebuild the run's score cube from its unified audit partitions.
+        
+        The cube spans every persona of the run, so it is rebuilt whenever any
+        persona's partition changes; only the columns it aggregates are read.
+        """
+        try:
+            rows = dataset.read_table(self.dataset_dir, "audit", run=self.run_id,
+                                      columns=["page_id", "page_key", "persona", "tier", "criterion_code",
+                                               "descriptor", "score"])
+            # Distinct pages are counted on integer keys once every row has one
+            page = "page_key" if rows["page_key"].notna().all() else "page_id"
+            cube = build_cube(rows, page=page, criterion="criterion_code")
+            dataset.write_partition(self.dataset_dir, "cube", cube, run=self.run_id)
+            logger.info(f"Saved score cube for run {self.run_id}: {len(cube)} groups")
+        except Exception as e:
+            logger.error(f"Error writing score cube for run {self.run_id}: {str(e)}")
     
     def generate_cross_persona_insights(self) -> Dict[str, Any]:
         """
@@ -236,58 +335,246 @@ class MultiPersonaPackager:
         }
         
         try:
-            # Load unified audit data
-            audit_df = pd.read_parquet(self.output_dir / "unified_audit_data.parquet")
+            from .analytics import AnalyticsStore
             
-            # Calculate agreement and disagreement areas
-            if "criterion_code" in audit_df.columns and "score" in audit_df.columns and "persona" in audit_df.columns:
-                # Group by criterion and calculate variance across personas
-                criterion_variance = audit_df.groupby("criterion_code")["score"].agg(["mean", "std"]).reset_index()
-                
-                # Identify agreement areas (low variance)
-                agreement_areas = criterion_variance[criterion_variance["std"] < 1.0].sort_values("std")
-                for _, row in agreement_areas.head(5).iterrows():
-                    insights["agreement_areas"].append({
-                        "criterion": row["criterion_code"],
-                        "mean_score": row["mean"],
-                        "std_dev": row["std"]
-                    })
-                
-                # Identify disagreement areas (high variance)
-                disagreement_areas = criterion_variance[criterion_variance["std"] >= 1.0].sort_values("std", ascending=False)
-                for _, row in disagreement_areas.head(5).iterrows():
-                    insights["disagreement_areas"].append({
-                        "criterion": row["criterion_code"],
-                        "mean_score": row["mean"],
-                        "std_dev": row["std"]
-                    })
-                
-                # Calculate persona biases
-                persona_means = audit_df.groupby("persona")["score"].mean().to_dict()
-                global_mean = audit_df["score"].mean()
-                
-                for persona, mean_score in persona_means.items():
-                    bias = mean_score - global_mean
-                    insights["persona_biases"][persona] = {
-                        "mean_score": mean_score,
-                        "bias": bias,
-                        "tendency": "Positive" if bias > 0.5 else ("Negative" if bias < -0.5 else "Neutral")
-                    }
-                
-                # Calculate URL variance if page_id exists
-                if "page_id" in audit_df.columns:
-                    url_variance = audit_df.groupby(["page_id", "persona"])["score"].mean().reset_index()
-                    url_variance = url_variance.groupby("page_id")["score"].agg(["mean", "std"]).reset_index()
-                    
-                    # Get top 5 URLs with highest variance
-                    high_variance_urls = url_variance.sort_values("std", ascending=False).head(5)
-                    for _, row in high_variance_urls.iterrows():
-                        insights["url_variance"][row["page_id"]] = {
-                            "mean_score": row["mean"],
-                            "std_dev": row["std"]
-                        }
+            # Aggregate this run's unified audit data in the analytics store
+            with AnalyticsStore(self.output_dir) as store:
+                criterion_variance = store.score_spread("criterion_code", run=self.run_id)
+                persona_means = store.score_spread("persona", run=self.run_id)
+                global_mean = store.scalar("SELECT avg(score) FROM criteria_scores WHERE run = ?", [self.run_id])
+                # Spread of each page's per-persona mean score, grouped on integer page keys
+                high_variance_urls = store.query("""
+                    SELECT coalesce(any_value(d.url), any_value(s.page_id)) AS page,
+                           avg(persona_mean) AS mean, stddev_samp(persona_mean) AS std
+                    FROM (SELECT page_key, any_value(page_id) AS page_id, persona, avg(score) AS persona_mean
+                          FROM criteria_scores WHERE run = ? GROUP BY page_key, persona) s
+                    LEFT JOIN page_dimension d USING (page_key)
+                    GROUP BY page_key ORDER BY std DESC NULLS LAST LIMIT 5
+                """, [self.run_id])
+            
+            # Identify agreement areas (low variance)
+            agreement_areas = criterion_variance[criterion_variance["std"] < 1.0].sort_values("std")
+            for _, row in agreement_areas.head(5).iterrows():
+                insights["agreement_areas"].append({
+                    "criterion": row["criterion_code"],
+                    "mean_score": row["mean"],
+                    "std_dev": row["std"]
+                })
+            
+            # Identify disagreement areas (high variance)
+            disagreement_areas = criterion_variance[criterion_variance["std"] >= 1.0].sort_values("std", ascending=False)
+            for _, row in disagreement_areas.head(5).iterrows():
+                insights["disagreement_areas"].append({
+                    "criterion": row["criterion_code"],
+                    "mean_score": row["mean"],
+                    "std_dev": row["std"]
+                })
+            
+            # Calculate persona biases
+            for persona, mean_score in zip(persona_means["persona"], persona_means["mean"]):
+                bias = mean_score - global_mean
+                insights["persona_biases"][persona] = {
+                    "mean_score": mean_score,
+                    "bias": bias,
+                    "tendency": "Positive" if bias > 0.5 else ("Negative" if bias < -0.5 else "Neutral")
+                }
+            
+            # Top 5 URLs with the highest variance across personas
+            for _, row in high_variance_urls.iterrows():
+                insights["url_variance"][row["page"]] = {
+                    "mean_score": row["mean"],
+                    "std_dev": row["std"]
+                }
             
         except Exception as e:
             logger.error(f"Error generating cross-persona insights: {str(e)}")
         
         return insights
+
+# Input fingerprints of a parsed report and the columns they are stamped into
+FINGERPRINT_COLUMNS = {
+    'methodology': 'methodology_fingerprint',
+    'criteria': 'criteria_fingerprint',
+    'template': 'template_fingerprint',
+    'persona': 'persona_fingerprint',
+    'page': 'page_fingerprint'
+}
+
+def stamp_fingerprints(df: pd.DataFrame, fingerprints: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Record the fingerprints of the inputs a table's rows were generated from.
+    
+    Args:
+        df: Rows produced from one report
+        fingerprints: The report's input fingerprints (nothing is stamped when missing)
+        
+    Returns:
+        The same DataFrame with one column per fingerprint
+    """
+    for key, column in FINGERPRINT_COLUMNS.items():
+        if fingerprints and fingerprints.get(key):
+            df[column] = fingerprints[key]
+    return df
+
+class StreamingPackager:
+    """Streams parsed pages into the persona and unified tables as each page completes."""
+    
+    def __init__(self, unified_packager: MultiPersonaPackager = None, flush_every: int = 25,
+                 flush_interval: float = 5.0):
+        """
+        Initialize the streaming packager.
+        
+        A persona's tables and strategic summary are rewritten once flush_every
+        pages or flush_interval seconds have passed since its last rewrite,
+        whichever comes first, and always in finalize. Each rewrite covers every
+        page so far, so rewriting after every page costs time quadratic in the
+        number of pages.
+        
+        Args:
+            unified_packager: Packager used to write the unified files (optional)
+            flush_every: Number of completed pages between rewrites of a persona's tables
+                (0 keeps the rows in memory until finalize)
+            flush_interval: Seconds after which a persona's pending pages are rewritten
+                (0 flushes on the page count only)
+        """
+        self.unified_packager = unified_packager or MultiPersonaPackager()
+        self.flush_every = max(0, flush_every)
+        self.flush_interval = max(0.0, flush_interval)
+        
+        self._frames: Dict[str, Dict[str, List[pd.DataFrame]]] = {}
+        self._summaries: Dict[str, SummaryAggregator] = {}
+        self._persona_dirs: Dict[str, Path] = {}
+        self._pending: Dict[str, int] = {}
+        self._flushed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Files are written outside self._lock, one flush of a persona at a time, newest wins
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._generations: Dict[str, int] = {}
+        self._written: Dict[str, int] = {}
+    
+    def add_page(self, persona_name: str, persona_dir: Path, scorecard: Dict[str, Any],
+                 experience: Optional[Dict[str, Any]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Add one parsed page to a persona's tables.
+        
+        Args:
+            persona_name: Name of the persona
+            persona_dir: Directory holding the persona's reports and tables
+            scorecard: Parsed hygiene scorecard, including its 'file_path'
+            experience: Parsed experience report, including its 'file_path' (optional)
+            
+        Returns:
+            The rows produced for this page, keyed by table name
+        """
+        builder = EnhancedBackfillPackager(persona_name, input_dir=persona_dir)
+        if experience is not None:
+            experience = dict(experience, parsed_content=experience)
+        tables = builder.build_tables([scorecard], [experience] if experience else [])
+        for name, df in tables.items():
+            # Experience rows come from the experience report, everything else from the scorecard
+            source = experience if name == "experience" and experience else scorecard
+            stamp_fingerprints(df, source.get('fingerprints'))
+        
+        with self._lock:
+            persona_frames = self._frames.setdefault(persona_name, {})
+            for name, df in tables.items():
+                persona_frames.setdefault(name, []).append(df)
+            self._summaries.setdefault(persona_name, SummaryAggregator(persona_name)).add_tables(tables)
+            self._persona_dirs[persona_name] = Path(persona_dir)
+            self._pending[persona_name] = self._pending.get(persona_name, 0) + 1
+            flushed_at = self._flushed_at.setdefault(persona_name, time.monotonic())
+            
+            snapshot = None
+            if self.flush_every and (self._pending[persona_name] >= self.flush_every or
+                                     (self.flush_interval and time.monotonic() - flushed_at >= self.flush_interval)):
+                snapshot = self._snapshot(persona_name)
+        
+        if snapshot:
+            self._write_snapshot(persona_name, *snapshot)
+        return tables
+    
+    def tables_for(self, persona_name: str) -> Dict[str, pd.DataFrame]:
+        """
+        Get the tables accumulated so far for a persona.
+        
+        Args:
+            persona_name: Name of the persona
+            
+        Returns:
+            Dictionary of DataFrames keyed by table name
+        """
+        persona_frames = self._frames.get(persona_name, {})
+        return {
+            name: pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            for name, frames in persona_frames.items()
+            if frames
+        }
+    
+    def summary_for(self, persona_name: str) -> Optional[SummaryAggregator]:
+        """
+        Get the strategic summary statistics of the pages received so far for a persona.
+        
+        Args:
+            persona_name: Name of the persona
+            
+        Returns:
+            The persona's summary aggregator, or None before its first page
+        """
+        return self._summaries.get(persona_name)
+    
+    def _snapshot(self, persona_name: str) -> Tuple[int, Dict[str, pd.DataFrame], Optional[str]]:
+        """Take a persona's tables and rendered summary for a flush; called holding self._lock."""
+        tables = self.tables_for(persona_name)
+        
+        # Keep the concatenated frames so the next flush starts from them
+        self._frames[persona_name] = {name: [df] for name, df in tables.items()}
+        self._pending[persona_name] = 0
+        self._flushed_at[persona_name] = time.monotonic()
+        self._generations[persona_name] = self._generations.get(persona_name, 0) + 1
+        self._write_locks.setdefault(persona_name, threading.Lock())
+        # A partial run keeps an up-to-date summary; rendering it reads no reports
+        summary = self._summaries[persona_name].render() if len(self._summaries[persona_name]) else None
+        return self._generations[persona_name], tables, summary
+    
+    def _write_snapshot(self, persona_name: str, generation: int, tables: Dict[str, pd.DataFrame],
+                        summary: Optional[str]) -> None:
+        """Rewrite a persona's tables and strategic summary, unless a newer flush got there first."""
+        from .run_journal import atomic_write_text
+        
+        with self._write_locks[persona_name]:
+            if generation <= self._written.get(persona_name, 0):
+                return
+            persona_dir = self._persona_dirs[persona_name]
+            EnhancedBackfillPackager(persona_name, input_dir=persona_dir).save_tables(tables)
+            if summary is not None:
+                atomic_write_text(persona_dir / "Strategic_Summary.md", summary)
+            self._written[persona_name] = generation
+        logger.debug(f"Flushed {len(tables.get('pages', []))} pages for {persona_name}")
+    
+    def finalize(self, write_unified: bool = True) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Flush pending pages and write the unified files from the in-memory tables.
+        
+        Args:
+            write_unified: Whether to write the unified audit data files
+            
+        Returns:
+            Tables keyed by persona name, then by table name
+        """
+        with self._lock:
+            snapshots = {persona_name: self._snapshot(persona_name)
+                         for persona_name, pending in self._pending.items() if pending}
+            persona_tables = {name: self.tables_for(name) for name in self._frames}
+        for persona_name, snapshot in snapshots.items():
+            self._write_snapshot(persona_name, *snapshot)
+        
+        # Page keys are stamped here once, for the persona files and the unified files alike
+        persona_tables = {name: self.unified_packager.stamp_page_keys(tables)
+                          for name, tables in persona_tables.items()}
+        for persona_name, tables in persona_tables.items():
+            self.unified_packager._save_persona_parquet(persona_name, tables)
+        
+        if write_unified and persona_tables:
+            self.unified_packager.write_unified_files(persona_tables, stamped=True)
+        
+        return persona_tables
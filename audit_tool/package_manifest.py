@@ -0,0 +1,165 @@
+"""
+Package Manifest for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module lets packaging skip the reports it has already packaged:
+1. Groups a persona folder's scorecards and experience reports into pages by URL slug
+2. Records each report's content hash, modification time and size
+3. Records the row range each page produced in every packaged table
+4. Tells which pages are new, changed or deleted since the tables were written
+5. Records each table file's modification time and size to detect outside rewrites
+
+The manifest is package_manifest.json, kept next to the tables it describes.
+Files whose modification time and size are unchanged are not hashed again, and
+a touched file whose hash is unchanged does not count as a change. Tables are
+written in page order, so a page's rows are one contiguous slice of each table.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Union
+
+from .fingerprint import file_hash
+from .run_journal import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_MANIFEST_FILENAME = "package_manifest.json"
+MANIFEST_VERSION = 1
+
+# Report kinds and the file name suffix that follows the page's URL slug
+REPORT_SUFFIXES = {
+    'scorecard': '_hygiene_scorecard.md',
+    'experience': '_experience_report.md'
+}
+
+def _stat(path: Path) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class PackageManifest:
+    """Source hashes and row ranges of the tables packaged from a persona folder."""
+
+    def __init__(self, table_dir: Union[str, Path]):
+        """
+        Load the manifest of a table directory, or start an empty one.
+
+        Args:
+            table_dir: Directory holding the packaged tables
+        """
+        self.table_dir = Path(table_dir)
+        self.path = self.table_dir / PACKAGE_MANIFEST_FILENAME
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.tables: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.pages = data.get('pages', {})
+                    self.tables = data.get('tables', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable package manifest {self.path}: {e}")
+
+    def scan(self, input_dir: Union[str, Path]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Find the reports of a folder, hashing only files that changed on disk.
+
+        Args:
+            input_dir: Folder holding the markdown reports
+
+        Returns:
+            Sources keyed by page slug, then by report kind, with file, hash, mtime_ns and size
+        """
+        sources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for kind, suffix in REPORT_SUFFIXES.items():
+            for path in Path(input_dir).glob(f"*{suffix}"):
+                slug = path.name[:-len(suffix)]
+                mtime_ns, size = _stat(path)
+                known = self.pages.get(slug, {}).get('sources', {}).get(kind)
+                if known and known.get('mtime_ns') == mtime_ns and known.get('size') == size:
+                    digest = known['hash']
+                else:
+                    digest = file_hash(path)
+                sources.setdefault(slug, {})[kind] = {
+                    'file': path.name, 'hash': digest, 'mtime_ns': mtime_ns, 'size': size
+                }
+        return sources
+
+    def changes(self, sources: Dict[str, Dict[str, Dict[str, Any]]]) -> Tuple[List[str], List[str]]:
+        """
+        Compare scanned sources with the packaged ones.
+
+        Args:
+            sources: Result of scan()
+
+        Returns:
+            Slugs of new or changed pages, and slugs of deleted pages
+        """
+        def hashes(page_sources):
+            return {kind: source['hash'] for kind, source in page_sources.items()}
+
+        changed = sorted(slug for slug, page_sources in sources.items()
+                         if slug not in self.pages or hashes(self.pages[slug]['sources']) != hashes(page_sources))
+        removed = sorted(slug for slug in self.pages if slug not in sources)
+        return changed, removed
+
+    def rows(self, slug: str, table: str) -> Tuple[int, int]:
+        """
+        Row range a page produced in a table.
+
+        Args:
+            slug: Page slug
+            table: Table name
+
+        Returns:
+            (start, stop) positions, an empty range if the page produced no rows
+        """
+        start, stop = self.pages.get(slug, {}).get('rows', {}).get(table, (0, 0))
+        return start, stop
+
+    def tables_intact(self) -> bool:
+        """
+        Whether every packaged table is on disk exactly as this manifest wrote it.
+
+        Returns:
+            False if the manifest is empty or a table file is missing or was rewritten since
+        """
+        if not self.pages:
+            return False
+        for name, table in self.tables.items():
+            path = self.table_dir / f"{name}.parquet"
+            if table.get('rows') and (not path.exists() or list(_stat(path)) != [table['mtime_ns'], table['size']]):
+                return False
+        return True
+
+    def update(self, sources: Dict[str, Dict[str, Dict[str, Any]]], ranges: Dict[str, Dict[str, Tuple[int, int]]],
+               row_counts: Dict[str, int]) -> None:
+        """
+        Record the sources and row ranges of freshly written tables.
+
+        Args:
+            sources: Sources of the packaged pages, as returned by scan()
+            ranges: Row range of each page in each table, keyed by slug then table name
+            row_counts: Number of rows of each table
+        """
+        self.pages = {slug: {'sources': sources[slug], 'rows': {name: list(r) for name, r in ranges[slug].items()}}
+                      for slug in ranges}
+        self.tables = {}
+        for name, count in row_counts.items():
+            path = self.table_dir / f"{name}.parquet"
+            mtime_ns, size = _stat(path) if path.exists() else (None, None)
+            self.tables[name] = {'rows': count, 'mtime_ns': mtime_ns, 'size': size}
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        os.makedirs(self.table_dir, exist_ok=True)
+        atomic_write_text(self.path, json.dumps({
+            'version': MANIFEST_VERSION,
+            'pages': self.pages,
+            'tables': self.tables
+        }, indent=2))
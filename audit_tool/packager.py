@@ -4,14 +4,48 @@ Data Packager for Brand Audit Tool
 Converts markdown audit outputs into structured Parquet/JSON format
 """
 
+import os
 import pandas as pd
+import pyarrow as pa
 import json
-import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import hashlib
 
+from .report_parser import parse_report_file
+from .score_cube import PAGE_FACTS_SOURCE, SCORE_CUBE_FILENAME, build_cube, grand_total, slice_cube
+from .page_dimension import PageDimension
+from .dataset import DATASET_DIRNAME
+from .row_writer import ParquetRowWriter
+
+# Scorecards parsed and keyed together; bounds what is held before rows reach the writers
+PAGE_BATCH_SIZE = 256
+
+PAGE_FACTS_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('persona_id', pa.string()),
+    ('page_id', pa.string()),
+    ('page_key', pa.int32()),
+    ('url_slug', pa.string()),
+    ('url', pa.string()),
+    ('tier', pa.string()),
+    ('criterion_id', pa.string()),
+    ('raw_score', pa.float64()),
+    ('weighted_score', pa.float64()),
+    ('descriptor', pa.string()),
+])
+
+EVIDENCE_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('persona_id', pa.string()),
+    ('page_id', pa.string()),
+    ('page_key', pa.int32()),
+    ('evidence_type', pa.string()),
+    ('evidence_text', pa.string()),
+    ('sequence', pa.int64()),
+])
+
 class AuditDataPackager:
     def __init__(self, persona_name: str):
         self.persona_name = persona_name
@@ -20,60 +54,47 @@ class AuditDataPackager:
         project_root = current_dir.parent
         self.input_dir = project_root / f"audit_outputs/{persona_name}"
         self.output_dir = project_root / f"audit_runs/{persona_name}_{datetime.now().strftime('%Y%m%d_%H%M')}"
+        # Page keys are shared with the unified dataset, so runs line up with it and each other
+        self.dataset_dir = project_root / "audit_data" / DATASET_DIRNAME
         
     def parse_scorecard_markdown(self, file_path: Path) -> Dict:
         """Parse scorecard markdown into structured data"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        record = parse_report_file(str(file_path))
             
-        # Extract scores using regex patterns for table format
+        # Scores from table rows: | **Criterion Name** | X.X/10 | Rationale |
         scores = {}
-        
-        # Look for table pattern: | **Criterion Name** | X.X/10 | Rationale |
-        table_pattern = r'\|\s*\*\*(.*?)\*\*\s*\|\s*(\d+(?:\.\d+)?)/10\s*\|\s*(.*?)\s*\|'
-        matches = re.findall(table_pattern, content)
-        
-        for criterion, score, rationale in matches:
-            clean_criterion = criterion.lower().replace(' ', '_').replace('-', '_')
-            scores[clean_criterion] = float(score)
+        for row in record.criteria:
+            if row.bold and row.out_of_ten:
+                clean_criterion = row.label.lower().replace(' ', '_').replace('-', '_')
+                scores[clean_criterion] = row.score
             
         # Also look for overall score
-        overall_pattern = r'\*\*Final Score:\*\*\s*(\d+(?:\.\d+)?)/10'
-        overall_match = re.search(overall_pattern, content)
-        if overall_match:
-            scores['overall'] = float(overall_match.group(1))
+        if record.final_score is not None:
+            scores['overall'] = record.final_score
             
-        # Extract justifications and recommendations (if present)
-        justification_pattern = r'Justification:(.*?)(?=Recommendation:|$)'
-        recommendation_pattern = r'Recommendation:(.*?)(?=\*\*|$)'
-        
-        justifications = re.findall(justification_pattern, content, re.DOTALL)
-        recommendations = re.findall(recommendation_pattern, content, re.DOTALL)
-        
+        # Justifications and recommendations (if present)
         return {
+            'url': record.url,
             'scores': scores,
-            'justifications': [j.strip() for j in justifications],
-            'recommendations': [r.strip() for r in recommendations],
-            'raw_content': content
+            'justifications': [f.body for f in record.fields_named('Justification')],
+            'recommendations': [f.body for f in record.fields_named('Recommendation')],
+            'raw_content': record.content
         }
     
     def parse_experience_report(self, file_path: Path) -> Dict:
         """Parse experience report markdown"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        record = parse_report_file(str(file_path))
             
-        # Extract key insights
+        # Key insights: every section with some substance
         insights = []
-        insight_pattern = r'##\s*(.*?)(?=##|$)'
-        matches = re.findall(insight_pattern, content, re.DOTALL)
-        
-        for match in matches:
-            if len(match.strip()) > 50:  # Filter out short matches
-                insights.append(match.strip())
+        for section in record.sections:
+            insight = f"{section.title}\n\n{section.body}".strip()
+            if len(insight) > 50:  # Filter out short matches
+                insights.append(insight)
         
         return {
             'insights': insights,
-            'raw_content': content
+            'raw_content': record.content
         }
     
     def reconstruct_url(self, url_slug: str) -> str:
@@ -110,80 +131,93 @@ class AuditDataPackager:
         else:
             return "FAIL"
     
-    def create_page_facts_table(self) -> pd.DataFrame:
-        """Create the main page_facts Parquet table"""
-        facts = []
+    def scorecard_files(self) -> List[Path]:
+        """Scorecards of the input folder, in slug order"""
+        return [self.input_dir / name for name in self.scorecard_names()]
+    
+    def scorecard_names(self) -> List[str]:
+        """File names of the scorecards, in slug order; plain names stay small for large folders"""
+        if not self.input_dir.is_dir():
+            return []
+        with os.scandir(self.input_dir) as entries:
+            return sorted(entry.name for entry in entries if entry.name.endswith("_hygiene_scorecard.md"))
+    
+    def read_scorecard(self, scorecard_file: Path) -> Optional[Dict]:
+        """Parse one scorecard into the fields its rows are built from, or None if it cannot be parsed"""
+        url_slug = scorecard_file.name.replace("_hygiene_scorecard.md", "")
+        try:
+            scorecard_data = self.parse_scorecard_markdown(scorecard_file)
+        except Exception as e:
+            print(f"Error processing {scorecard_file}: {e}")
+            return None
         
-        # Process all scorecard files
-        for scorecard_file in self.input_dir.glob("*_hygiene_scorecard.md"):
-            url_slug = scorecard_file.name.replace("_hygiene_scorecard.md", "")
-            
-            # Parse scorecard data
-            try:
-                scorecard_data = self.parse_scorecard_markdown(scorecard_file)
-                
-                # Create page_id hash
-                page_id = hashlib.md5(url_slug.encode()).hexdigest()[:8]
-                
-                # Create rows for each criterion
-                for criterion, score in scorecard_data['scores'].items():
-                    facts.append({
-                        'run_id': self.output_dir.name,
-                        'persona_id': self.persona_name,
-                        'page_id': page_id,
-                        'url_slug': url_slug,
-                        'url': self.reconstruct_url(url_slug),
-                        'tier': self.get_tier_from_criterion(criterion),
-                        'criterion_id': criterion,
-                        'raw_score': score,
-                        'weighted_score': score,  # Apply weighting from methodology later
-                        'descriptor': self.score_to_descriptor(score)
-                    })
-                    
-            except Exception as e:
-                print(f"Error processing {scorecard_file}: {e}")
-                continue
+        return {
+            'url_slug': url_slug,
+            'page_id': hashlib.md5(url_slug.encode()).hexdigest()[:8],
+            'page_key': None,
+            'url': scorecard_data['url'] or self.reconstruct_url(url_slug),
+            'scores': scorecard_data['scores'],
+            'justifications': scorecard_data['justifications'],
+            'recommendations': scorecard_data['recommendations']
+        }
+    
+    def iter_pages(self, page_dimension: Optional[PageDimension] = None) -> Iterator[Dict]:
+        """
+        Read the scorecards one batch at a time, keying each batch's pages in one step.
         
-        return pd.DataFrame(facts)
+        Only PAGE_BATCH_SIZE parsed scorecards are held at once, however many the folder has.
+        """
+        names = self.scorecard_names()
+        for start in range(0, len(names), PAGE_BATCH_SIZE):
+            batch = [self.input_dir / name for name in names[start:start + PAGE_BATCH_SIZE]]
+            pages = [page for page in map(self.read_scorecard, batch) if page]
+            if page_dimension is not None and pages:
+                keys = page_dimension.keys(pd.Series([page['url'] for page in pages]),
+                                           pd.Series([page['url_slug'] for page in pages]),
+                                           run=self.output_dir.name)
+                for page, page_key in zip(pages, keys):
+                    page['page_key'] = int(page_key)
+            yield from pages
+    
+    def page_fact_rows(self, page: Dict) -> Iterator[Dict]:
+        """Rows of one page in the page_facts table, one per criterion"""
+        for criterion, score in page['scores'].items():
+            yield {
+                'run_id': self.output_dir.name,
+                'persona_id': self.persona_name,
+                'page_id': page['page_id'],
+                'page_key': page['page_key'],
+                'url_slug': page['url_slug'],
+                'url': page['url'],
+                'tier': self.get_tier_from_criterion(criterion),
+                'criterion_id': criterion,
+                'raw_score': score,
+                'weighted_score': score,  # Apply weighting from methodology later
+                'descriptor': self.score_to_descriptor(score)
+            }
+    
+    def evidence_rows(self, page: Dict) -> Iterator[Dict]:
+        """Rows of one page in the evidence table: its justifications, then its recommendations"""
+        for evidence_type, texts in (('justification', page['justifications']),
+                                     ('recommendation', page['recommendations'])):
+            for i, text in enumerate(texts):
+                yield {
+                    'run_id': self.output_dir.name,
+                    'persona_id': self.persona_name,
+                    'page_id': page['page_id'],
+                    'page_key': page['page_key'],
+                    'evidence_type': evidence_type,
+                    'evidence_text': text,
+                    'sequence': i
+                }
+    
+    def create_page_facts_table(self) -> pd.DataFrame:
+        """Create the main page_facts table in memory (package_run streams it to Parquet instead)"""
+        return pd.DataFrame([row for page in self.iter_pages() for row in self.page_fact_rows(page)])
     
     def create_evidence_table(self) -> pd.DataFrame:
-        """Create evidence table with justifications and recommendations"""
-        evidence = []
-        
-        for scorecard_file in self.input_dir.glob("*_hygiene_scorecard.md"):
-            url_slug = scorecard_file.name.replace("_hygiene_scorecard.md", "")
-            page_id = hashlib.md5(url_slug.encode()).hexdigest()[:8]
-            
-            try:
-                scorecard_data = self.parse_scorecard_markdown(scorecard_file)
-                
-                # Add justifications
-                for i, justification in enumerate(scorecard_data['justifications']):
-                    evidence.append({
-                        'run_id': self.output_dir.name,
-                        'persona_id': self.persona_name,
-                        'page_id': page_id,
-                        'evidence_type': 'justification',
-                        'evidence_text': justification,
-                        'sequence': i
-                    })
-                
-                # Add recommendations
-                for i, recommendation in enumerate(scorecard_data['recommendations']):
-                    evidence.append({
-                        'run_id': self.output_dir.name,
-                        'persona_id': self.persona_name,
-                        'page_id': page_id,
-                        'evidence_type': 'recommendation',
-                        'evidence_text': recommendation,
-                        'sequence': i
-                    })
-                    
-            except Exception as e:
-                print(f"Error processing evidence from {scorecard_file}: {e}")
-                continue
-        
-        return pd.DataFrame(evidence)
+        """Create evidence table with justifications and recommendations in memory"""
+        return pd.DataFrame([row for page in self.iter_pages() for row in self.evidence_rows(page)])
     
     def package_run(self):
         """Main packaging function"""
@@ -192,41 +226,54 @@ class AuditDataPackager:
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create page_facts table
-        print("Creating page_facts table...")
-        page_facts = self.create_page_facts_table()
-        
-        if page_facts.empty:
-            print("❌ No data found to package")
-            return
-        
-        page_facts.to_parquet(self.output_dir / "page_facts.parquet")
-        print(f"✅ Saved {len(page_facts)} page facts")
+        # Stream each page's rows into both tables, keyed by the integer page keys of the page dimension
+        print("Creating page_facts and evidence tables...")
+        page_dimension = PageDimension(self.dataset_dir)
+        facts_path = self.output_dir / "page_facts.parquet"
+        with ParquetRowWriter(facts_path, PAGE_FACTS_SCHEMA) as page_facts, \
+                ParquetRowWriter(self.output_dir / "evidence.parquet", EVIDENCE_SCHEMA) as evidence:
+            total_criteria = 0
+            for page in self.iter_pages(page_dimension):
+                total_criteria += page_facts.write_rows(self.page_fact_rows(page))
+                evidence.write_rows(self.evidence_rows(page))
+            
+            if not total_criteria:
+                page_facts.abort()
+                evidence.abort()
+                print("❌ No data found to package")
+                return
+        page_dimension.save()
+        print(f"✅ Saved {total_criteria} page facts")
+        print(f"✅ Saved {evidence.rows_written} evidence records")
         
-        # Create evidence table
-        print("Creating evidence table...")
-        evidence = self.create_evidence_table()
-        evidence.to_parquet(self.output_dir / "evidence.parquet")
-        print(f"✅ Saved {len(evidence)} evidence records")
+        # Materialise the tier, criterion and descriptor roll-ups the dashboard reads, scanning the file
+        cube = build_cube(facts_path, page='page_key', **PAGE_FACTS_SOURCE)
+        cube.to_parquet(self.output_dir / SCORE_CUBE_FILENAME, index=False)
+        print(f"✅ Saved score cube of {len(cube)} groups")
         
-        # Create run manifest
+        # Create run manifest from the cube, so the facts are never loaded back
         print("Creating run manifest...")
+        total = grand_total(cube)
+        by_tier = slice_cube(cube, by=['tier'])
+        by_criterion = slice_cube(cube, by=['criterion'])
+        by_descriptor = slice_cube(cube, by=['descriptor']).sort_values('score_count', ascending=False, kind='stable')
         manifest = {
             'run_id': self.output_dir.name,
             'timestamp': datetime.now().isoformat(),
             'persona_id': self.persona_name,
-            'total_pages': len(page_facts['page_id'].unique()),
-            'total_criteria': len(page_facts),
-            'average_score': float(page_facts['raw_score'].mean()),
+            'total_pages': int(total['pages']),
+            'total_criteria': total_criteria,
+            'average_score': float(total['mean']),
+            'score_cube': SCORE_CUBE_FILENAME,
             'aggregates': {
-                'by_tier': page_facts.groupby('tier')['raw_score'].mean().to_dict(),
-                'by_descriptor': page_facts['descriptor'].value_counts().to_dict(),
-                'by_criterion': page_facts.groupby('criterion_id')['raw_score'].mean().to_dict()
+                'by_tier': dict(zip(by_tier['tier'], by_tier['mean'].astype(float))),
+                'by_descriptor': dict(zip(by_descriptor['descriptor'], by_descriptor['score_count'].astype(int))),
+                'by_criterion': dict(zip(by_criterion['criterion'], by_criterion['mean'].astype(float)))
             },
             'score_distribution': {
-                'min': float(page_facts['raw_score'].min()),
-                'max': float(page_facts['raw_score'].max()),
-                'std': float(page_facts['raw_score'].std())
+                'min': float(total['score_min']),
+                'max': float(total['score_max']),
+                'std': float(total['std'])
             }
         }
         
@@ -0,0 +1,244 @@
+"""
+Page Dimension for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module gives every audited page one stable integer key across personas and runs:
+1. Canonicalises URLs (scheme, host case, default ports, trailing slashes, query order, fragments)
+2. Maps each canonical URL to an int32 page key that is never reused or renumbered
+3. Keeps the page's latest slug and tier, and the first and last run it was seen in
+4. Stores the dimension as the unpartitioned "pages" table of the unified dataset, shared by
+   every process packaging into the dataset under a file lock
+5. Stamps page keys onto fact tables from the page_id each table already carries
+
+Report slugs, cache file names and page_id hashes are each derived from the URL
+in their own way, so the same page can carry different string ids in different
+tables, and two pages can share one. The canonical URL is the single identity:
+fact tables carry its page key, so joins and group-bys run on int32 and a page
+lines up across runs and personas whichever slug its reports were filed under.
+
+Daemon jobs, distributed workers and packagers may hold the dimension open at
+the same time. New keys are allocated under an exclusive lock on the dataset's
+.pages.lock file, from the stored table re-read inside the lock, and written
+before the lock is released, so no key is handed to two URLs. save() merges
+the attributes this instance changed into the stored table rather than
+replacing it.
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+
+from . import dataset
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_TABLE = "pages"
+LOCK_FILENAME = ".pages.lock"
+
+# Slowly changing attributes, updated to the latest value seen
+ATTRIBUTES = ('slug', 'tier', 'last_run')
+
+# Ports dropped from canonical URLs
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of a page URL, equal for every spelling of the same page.
+
+    http and https are treated as one page, the host is lowercased, default
+    ports, fragments and trailing slashes are dropped and query parameters
+    are sorted.
+
+    Args:
+        url: Page URL, with or without a scheme
+
+    Returns:
+        Canonical URL, or an empty string for an empty URL
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+    path = '/'.join(segment for segment in parts.path.split('/') if segment)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(('https', host, f"/{path}", query, ''))
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a file, across processes and across open handles in this process."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+def _stored_pages(dataset_dir: Path) -> pd.DataFrame:
+    pages = dataset.read_table(dataset_dir, DIMENSION_TABLE)
+    if pages.empty:
+        pages = pd.DataFrame({field.name: pd.Series(dtype=object) for field in dataset.PAGE_SCHEMA})
+    # Plain columns, so attributes can take values the stored dictionaries do not have
+    dtypes = {column: object for column in pages.columns}
+    return pages.astype(dict(dtypes, page_key='int32')).set_index('url', drop=False)
+
+class PageDimension:
+    """Canonical URL to page key mapping, with each page's slug and tier."""
+
+    def __init__(self, dataset_dir: Union[str, Path]):
+        """
+        Load the dimension from the unified dataset.
+
+        Args:
+            dataset_dir: Dataset directory holding the pages table
+        """
+        self.dataset_dir = Path(dataset_dir)
+        self.lock_path = self.dataset_dir / LOCK_FILENAME
+        self._lock = threading.Lock()
+        self._pages = _stored_pages(self.dataset_dir)
+        # Attributes this instance changed and has not saved, by column
+        self._touched: Dict[str, Set[str]] = {column: set() for column in ATTRIBUTES}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def frame(self) -> pd.DataFrame:
+        """Every page of the dimension, in key order."""
+        return self._pages.sort_values('page_key').reset_index(drop=True)
+
+    def keys(self, urls: pd.Series, slugs: Optional[pd.Series] = None, tiers: Optional[pd.Series] = None,
+             run: Optional[str] = None) -> pd.Series:
+        """
+        Page keys of some pages, adding pages not seen before.
+
+        Args:
+            urls: Page URLs, in any spelling
+            slugs: Report slug of each page; also identifies pages without a URL
+            tiers: Tier of each page
+            run: Run the pages were seen in
+
+        Returns:
+            int32 page key of each page, aligned with urls
+        """
+        canonical = urls.fillna('').astype(str).map(canonical_url)
+        if slugs is not None:
+            # A page without a URL is identified by its slug until its URL is known
+            canonical = canonical.where(canonical != '', 'slug:' + slugs.fillna('').astype(str))
+        seen = pd.DataFrame({'url': canonical.values})
+        seen['slug'] = slugs.values if slugs is not None else None
+        seen['tier'] = tiers.values if tiers is not None else None
+        latest = seen.drop_duplicates('url', keep='last').set_index('url', drop=False)
+
+        with self._lock:
+            if len(latest.index.difference(self._pages.index)):
+                self._allocate(latest, run)
+
+            # Slowly changing attributes keep their latest known value
+            before = self._pages.loc[latest.index, list(ATTRIBUTES)].copy()
+            for column in ('slug', 'tier'):
+                values = latest[column].dropna()
+                self._pages.loc[values.index, column] = values
+            if run is not None:
+                self._pages.loc[latest.index, 'last_run'] = run
+            after = self._pages.loc[latest.index, list(ATTRIBUTES)]
+            changed = ~((before == after) | (before.isna() & after.isna()))
+            for column in ATTRIBUTES:
+                self._touched[column].update(latest.index[changed[column].to_numpy()])
+            return pd.Series(self._pages.loc[canonical, 'page_key'].to_numpy(dtype='int32'), index=urls.index,
+                             name='page_key')
+
+    def stamp(self, tables: Dict[str, pd.DataFrame], run: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Add a page_key column to tables sharing the page_id of a pages table.
+
+        Args:
+            tables: Tables keyed by name, including "pages" with url, slug and tier columns
+            run: Run the pages were seen in
+
+        Returns:
+            The tables, each with page_key after page_id; tables without a page_id are returned as they are
+        """
+        pages = tables.get('pages')
+        if pages is None or pages.empty:
+            return tables
+        keys = self.keys(pages['url'], pages.get('slug'), pages.get('tier'), run=run)
+        by_page_id = pd.Series(keys.to_numpy(), index=pages['page_id'].to_numpy())
+        by_page_id = by_page_id[~by_page_id.index.duplicated(keep='last')]
+
+        stamped = {}
+        for name, df in tables.items():
+            if df is None or 'page_id' not in df.columns:
+                stamped[name] = df
+                continue
+            page_keys = df['page_id'].map(by_page_id).astype('Int32')
+            df = df.drop(columns=['page_key'], errors='ignore')
+            df.insert(df.columns.get_loc('page_id') + 1, 'page_key', page_keys)
+            stamped[name] = df
+        return stamped
+
+    def save(self) -> None:
+        """Merge the pages this instance updated into the stored dimension, if there are any."""
+        with self._lock:
+            if not any(self._touched.values()):
+                return
+            with _file_lock(self.lock_path):
+                self._merge_stored()
+                self._write()
+            for urls in self._touched.values():
+                urls.clear()
+        logger.info(f"Saved page dimension: {len(self._pages)} pages")
+
+    def _allocate(self, latest: pd.DataFrame, run: Optional[str]) -> None:
+        # Keys come from the stored table as it is now, and are stored before another process can allocate
+        with _file_lock(self.lock_path):
+            self._merge_stored()
+            new = latest.index.difference(self._pages.index)
+            if not len(new):
+                return
+            start = int(self._pages['page_key'].max()) + 1 if len(self._pages) else 1
+            added = latest.loc[new].assign(page_key=np.arange(start, start + len(new), dtype='int32'),
+                                            first_run=run, last_run=run)
+            self._pages = pd.concat([self._pages, added[self._pages.columns]]).astype({'page_key': 'int32'})
+            self._write()
+        logger.info(f"Added {len(new)} pages to the page dimension")
+
+    def _merge_stored(self) -> None:
+        # Stored rows win, except for the attributes this instance changed since its last save
+        stored = _stored_pages(self.dataset_dir)
+        mine = self._pages.loc[self._pages.index.difference(stored.index)]
+        merged = pd.concat([stored, mine[stored.columns]]) if len(mine) else stored
+        for column, urls in self._touched.items():
+            touched = merged.index.intersection(list(urls))
+            if len(touched):
+                merged.loc[touched, column] = self._pages.loc[touched, column]
+        self._pages = merged.astype({'page_key': 'int32'})
+
+    def _write(self) -> None:
+        dataset.write_partition(self.dataset_dir, DIMENSION_TABLE, self.frame())
@@ -0,0 +1,200 @@
+"""
+Parallel Packaging for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module spreads the parsing behind packaging over a process pool:
+1. Splits the pages to package into chunks of a few dozen pages (the work units)
+2. Parses each chunk's scorecards and experience reports in a worker process, built once per worker
+3. Builds the chunk's rows of every table in the worker
+4. Sends each table back as one Arrow IPC stream rather than pickled DataFrames
+5. Locates each page's rows in the chunk tables, so chunks are assembled without copying pages
+
+Parsing and DataFrame building are pure Python and hold the GIL, so persona
+threads run them one at a time; worker processes run them side by side. One
+pool is shared by every persona of a multi-persona run, so a backfill is spread
+over every core whether it has one large persona or many small ones. A batch of
+only a few pages is parsed in the calling process, where starting workers would
+cost more than it saves.
+"""
+
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Pages parsed per work unit, and the smallest batch worth sending to the pool
+CHUNK_SIZE = 64
+MIN_PARALLEL_PAGES = 2 * CHUNK_SIZE
+
+PageSources = Dict[str, Dict[str, Any]]
+
+@dataclass
+class ChunkResult:
+    """Rows a worker built for one chunk of pages."""
+
+    row_counts: Dict[str, Dict[str, int]]  # Rows of each page in each table it has, in chunk order
+    batches: Dict[str, bytes]               # Arrow IPC stream of each table's rows
+    errors: Dict[str, str]                  # Pages that could not be packaged, with the error
+
+def _to_ipc(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def _from_ipc(data: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+# Packager of each (persona, input folder), built once per worker process
+_packagers: Dict[Tuple[str, str], Any] = {}
+
+def _init_worker() -> None:
+    """Load the methodology's weights and table schemas once, when a worker process starts."""
+    from .backfill_packager import criterion_weights, table_schemas
+
+    criterion_weights()
+    table_schemas()
+
+def _packager(persona_name: str, input_dir: str) -> Any:
+    packager = _packagers.get((persona_name, input_dir))
+    if packager is None:
+        from .backfill_packager import EnhancedBackfillPackager
+
+        packager = EnhancedBackfillPackager(persona_name, input_dir=Path(input_dir))
+        _packagers[(persona_name, input_dir)] = packager
+    return packager
+
+def package_chunk(persona_name: str, input_dir: str, pages: List[Tuple[str, PageSources]]) -> ChunkResult:
+    """
+    Build the table rows of a chunk of pages; runs in a worker process.
+
+    Args:
+        persona_name: Persona whose reports are packaged
+        input_dir: Folder holding the persona's reports
+        pages: (slug, sources) of each page, sources as returned by PackageManifest.scan()
+
+    Returns:
+        The chunk's rows, one Arrow IPC stream per table
+    """
+    packager = _packager(persona_name, input_dir)
+    frames: Dict[str, List[pd.DataFrame]] = {}
+    row_counts, errors = {}, {}
+    for slug, sources in pages:
+        try:
+            tables = packager.build_page_tables(sources)
+        except Exception as e:
+            errors[slug] = str(e)
+            continue
+        row_counts[slug] = {name: len(df) for name, df in tables.items() if df is not None}
+        for name, df in tables.items():
+            if df is not None:
+                frames.setdefault(name, []).append(df)
+
+    batches = {}
+    for name, dfs in frames.items():
+        # Empty frames only carry the columns, keep one when no page has rows
+        rows = [df for df in dfs if len(df)]
+        batches[name] = _to_ipc(pd.concat(rows, ignore_index=True) if rows else dfs[0])
+    return ChunkResult(row_counts, batches, errors)
+
+def split_chunk(result: ChunkResult) -> Dict[str, Dict[str, Tuple[pd.DataFrame, int, int]]]:
+    """
+    Locate each page's rows in a chunk's tables, without copying them.
+
+    Args:
+        result: Chunk returned by package_chunk()
+
+    Returns:
+        (table, start, stop) of each page in each table, keyed by page slug then table name
+    """
+    tables = {name: _from_ipc(data) for name, data in result.batches.items()}
+    positions = dict.fromkeys(tables, 0)
+    pages: Dict[str, Dict[str, Tuple[pd.DataFrame, int, int]]] = {}
+    for slug, counts in result.row_counts.items():
+        pages[slug] = {}
+        for name, count in counts.items():
+            start = positions[name]
+            pages[slug][name] = (tables[name], start, start + count)
+            positions[name] = start + count
+    return pages
+
+class PackagingPool:
+    """Process pool that parses pages in chunks for any number of persona packagers."""
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                 min_pages: int = MIN_PARALLEL_PAGES):
+        """
+        Configure the pool; worker processes are only started for the first large batch.
+
+        Args:
+            max_workers: Worker processes (default: number of CPUs)
+            chunk_size: Pages per work unit
+            min_pages: Smallest batch parsed in the pool rather than the calling process
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_pages = min_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def worthwhile(self, page_count: int) -> bool:
+        """Whether a batch is large enough to send to worker processes."""
+        return page_count >= self.min_pages
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Workers are started from persona threads; fork is unsafe there
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                                 initializer=_init_worker)
+        return self._executor
+
+    def build_pages(self, persona_name: str, input_dir: Path,
+                    page_sources: Dict[str, PageSources]) -> Dict[str, Dict[str, Tuple[pd.DataFrame, int, int]]]:
+        """
+        Parse pages in worker processes and build their rows of every table.
+
+        Args:
+            persona_name: Persona whose reports are packaged
+            input_dir: Folder holding the persona's reports
+            page_sources: Sources of each page to parse, keyed by slug
+
+        Returns:
+            (table, start, stop) of each page's rows, keyed by page slug then table name;
+            pages that failed are left out
+        """
+        pages = list(page_sources.items())
+        chunks = [pages[start:start + self.chunk_size] for start in range(0, len(pages), self.chunk_size)]
+        futures = [self._pool().submit(package_chunk, persona_name, str(input_dir), chunk) for chunk in chunks]
+
+        built: Dict[str, Dict[str, Tuple[pd.DataFrame, int, int]]] = {}
+        for future in futures:
+            result = future.result()
+            for slug, error in result.errors.items():
+                logger.error(f"Error packaging {slug} for {persona_name}: {error}")
+            built.update(split_chunk(result))
+        logger.info(f"Parsed {len(built)} pages of {persona_name} in {len(chunks)} chunks "
+                    f"across {self.max_workers} processes")
+        return built
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PackagingPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -10,14 +10,24 @@ This module provides functionality to parse and extract persona information:
 4. Supports persona-specific analysis and reporting
 5. Enables consistent persona application across the audit process
 
-The parser ensures that persona information is consistently structured and
-available throughout the audit workflow, enabling persona-specific evaluations.
+Persona files are read in a single pass by a line tokenizer that collects the
+"## Heading" sections, numbered brief sections ("5. Motivations") and labelled
+fields ("Role: ...", "Pain Points:" followed by items). Parsed personas are
+cached by content and by file path, modification time and size, so a persona
+shared by many pages or runs is only tokenized once.
+
+Each persona also has a compact, deterministic digest of its key attributes
+that can stand in for the full markdown in prompts, cutting the input tokens
+of every model call.
 """
 
+import os
 import re
+import copy
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +67,312 @@ class Persona:
         if self.information_sources is None:
             self.information_sources = []
 
+# Persona attributes by the "## Heading" sections that hold them
+LINE_SECTIONS = {
+    'role': ('role',),
+    'company': ('company',),
+    'industry': ('industry',),
+    'age': ('age',),
+    'location': ('location',),
+    'tech_comfort': ('tech comfort', 'technology comfort'),
+    'brand_awareness': ('brand awareness',)
+}
+LIST_SECTIONS = {
+    'goals': ('goals',),
+    'challenges': ('challenges',),
+    'pain_points': ('pain points',),
+    'motivations': ('motivations',),
+    'decision_factors': ('decision factors',),
+    'information_sources': ('information sources',)
+}
+
+# Labels persona briefs use for the same attributes, as fields or numbered sections
+FIELD_ALIASES = {
+    'role': ('role', 'job title'),
+    'company': ('company', 'organisation', 'organization'),
+    'industry': ('industry', 'sector'),
+    'age': ('age',),
+    'location': ('location', 'geographic scope', 'region'),
+    'goals': ('goals', 'key priorities', 'priorities', 'objectives', 'user goal statement', 'needs'),
+    'challenges': ('challenges', 'key challenges'),
+    'pain_points': ('pain points', 'frustrations'),
+    'motivations': ('motivations', 'key motivations', 'key motivations and drivers'),
+    'tech_comfort': ('tech comfort', 'technology comfort'),
+    'brand_awareness': ('brand awareness',),
+    'decision_factors': ('decision factors', 'decision criteria'),
+    'information_sources': ('information sources',),
+    'quote': ('quote',),
+    'bio': ('bio', 'business context', 'core belief')
+}
+
+# Field labels that annotate a brief rather than describe the persona
+NOTE_FIELDS = frozenset({'content implication'})
+
+# Order and size of the prompt digest
+DIGEST_FIELDS = ('role', 'company', 'industry', 'location', 'age', 'tech_comfort', 'brand_awareness')
+DIGEST_LISTS = ('goals', 'challenges', 'pain_points', 'motivations', 'decision_factors', 'information_sources')
+DIGEST_MAX_ITEMS = 5
+DIGEST_MAX_CHARS = 160
+
+# Number of parsed persona files and contents kept in memory
+CACHE_SIZE = 128
+
+_FIELD_LINE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9 /&'()-]{0,48}?)\s*:\s*(.*)$")
+_NUMBERED_HEADING = re.compile(r'^\d+\.\s+(\S.{0,78})$')
+_BULLET = re.compile(r'^\s*[-*]\s*(.+?)\s*$')
+_NUMBERED_ITEM = re.compile(r'^\s*\d+\.\s*(.+?)\s*$')
+
+@dataclass
+class PersonaField:
+    """A labelled line of a persona brief and the items listed under it."""
+
+    value: str
+    items: List[str] = field(default_factory=list)
+
+@dataclass
+class PersonaDocument:
+    """Persona markdown split into sections and fields in one pass over its lines."""
+
+    title: str = ""
+    headings: Dict[str, List[str]] = field(default_factory=dict)
+    sections: Dict[str, List[str]] = field(default_factory=dict)
+    fields: Dict[str, PersonaField] = field(default_factory=dict)
+
+def tokenize_persona(content: str) -> PersonaDocument:
+    """
+    Split persona markdown into sections and labelled fields.
+
+    "## Heading" sections keep their body lines up to the next "## Heading".
+    Other headings ("# Title", "### Sub", "5. Motivations") open a section
+    too. A "Label: value" line is a field; a label without a value collects the
+    item lines that follow it. The first occurrence of a heading or label wins.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        The tokenized document
+    """
+    document = PersonaDocument()
+    heading_lines: Optional[List[str]] = None
+    section_lines: Optional[List[str]] = None
+    collecting: Optional[PersonaField] = None
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if not document.title and stripped:
+            document.title = stripped.lstrip('#').strip()
+
+        if line.startswith('#'):
+            collecting = None
+            if line.startswith('##') and line[2:3].isspace():
+                heading_lines = _open_section(document.headings, line[2:])
+                section_lines = None
+                continue
+            if heading_lines is not None:
+                heading_lines.append(line)
+            section_lines = _open_section(document.sections, line.lstrip('#'))
+            continue
+
+        if heading_lines is not None:
+            heading_lines.append(line)
+
+        numbered = _NUMBERED_HEADING.match(line)
+        if numbered and ':' not in line:
+            section_lines = _open_section(document.sections, numbered.group(1))
+            collecting = None
+            continue
+        if section_lines is not None:
+            section_lines.append(line)
+
+        if not stripped:
+            if collecting is not None and collecting.items:
+                collecting = None
+            continue
+
+        labelled = _FIELD_LINE.match(line)
+        label = labelled.group(1).lower() if labelled else None
+        if label in NOTE_FIELDS:
+            collecting = None
+            continue
+        if labelled and not labelled.group(2) and not _BULLET.match(line):
+            collecting = document.fields.setdefault(label, PersonaField(''))
+            if collecting.items:
+                collecting = None
+            continue
+        if collecting is not None:
+            collecting.items.append(_list_item(line))
+            continue
+        if labelled and label not in document.fields:
+            document.fields[label] = PersonaField(labelled.group(2).strip())
+
+    return document
+
+def _open_section(sections: Dict[str, List[str]], title: str) -> Optional[List[str]]:
+    """Start collecting a section's lines, unless a section of that title came earlier."""
+    key = title.strip().lower()
+    if key in sections:
+        return None
+    sections[key] = []
+    return sections[key]
+
+def _list_item(line: str) -> str:
+    """Text of a bullet, numbered or plain item line."""
+    match = _BULLET.match(line) or _NUMBERED_ITEM.match(line)
+    return match.group(1) if match else line.strip()
+
+def _first_paragraph(lines: List[str]) -> List[str]:
+    """Lines from the first non-blank line up to the next empty line or '##' line."""
+    start = 0
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    paragraph = []
+    for line in lines[start:]:
+        if line == '' or line.startswith('##'):
+            break
+        paragraph.append(line)
+    return paragraph
+
+def _list_items(lines: List[str]) -> List[str]:
+    """Bullet items, else numbered items, else the non-blank lines."""
+    bullets = [m.group(1) for m in map(_BULLET.match, lines) if m]
+    if bullets:
+        return bullets
+    numbered = [m.group(1) for m in map(_NUMBERED_ITEM.match, lines) if m]
+    if numbered:
+        return numbered
+    return [line.strip() for line in lines if line.strip()]
+
+def _first_line(lines: List[str]) -> str:
+    """First non-blank line without its indentation."""
+    return next((line.lstrip() for line in lines if line.strip()), "")
+
+def _role_fallback(content: str, title_line: str) -> str:
+    """Role from "# Name (Role)", else the first 50 characters of the first paragraph."""
+    if '(' in title_line and ')' in title_line[title_line.index('('):]:
+        start = title_line.index('(') + 1
+        return title_line[start:title_line.index(')', start)]
+    gap = content.find('\n\n', 2)
+    if gap < 0:
+        return ""
+    rest = content[gap + 2:]
+    end = rest.find('\n\n')
+    paragraph = rest if end < 0 else rest[:end]
+    if end < 0 and paragraph.endswith('\n'):
+        paragraph = paragraph[:-1]
+    return paragraph[:50]
+
+def _build_persona(content: str, document: PersonaDocument) -> Persona:
+    """Fill a Persona from '## Heading' sections, then from brief fields and sections."""
+    first_line = content.split('\n', 1)[0]
+    is_titled = content[:1] == '#' and content[1:2].isspace()
+    name = first_line[1:].lstrip() if is_titled else "Unknown Persona"
+
+    headings = document.headings
+    values: Dict[str, Any] = {}
+    for attribute, titles in LINE_SECTIONS.items():
+        lines = next((headings[t] for t in titles if t in headings), None)
+        values[attribute] = _first_line(lines) if lines else ""
+    for attribute, titles in LIST_SECTIONS.items():
+        lines = next((headings[t] for t in titles if t in headings), None)
+        values[attribute] = _list_items(_first_paragraph(lines)) if lines else []
+
+    quote = _first_line(headings.get('quote', []))
+    if quote.startswith('>'):
+        quote = quote[1:].lstrip()
+    if quote.startswith('"'):
+        quote = quote[1:]
+    if len(quote) > 1 and quote.endswith('"'):
+        quote = quote[:-1]
+    values['quote'] = quote
+    values['bio'] = '\n'.join(_first_paragraph(headings.get('bio', []))).strip()
+
+    if not values['role'] and content.startswith('#'):
+        values['role'] = _role_fallback(content, first_line if is_titled else "")
+
+    # Persona briefs label their attributes instead of using '## Heading' sections
+    for attribute, aliases in FIELD_ALIASES.items():
+        if values[attribute]:
+            continue
+        found = next((document.fields[a] for a in aliases if a in document.fields), None)
+        section = next((document.sections[a] for a in aliases if a in document.sections), None)
+        if isinstance(values[attribute], list):
+            if found is not None and (found.items or found.value):
+                values[attribute] = found.items or [found.value]
+            elif section:
+                # Labelled lines inside a brief section annotate the items rather than list them
+                values[attribute] = [_list_item(line) for line in section if line.strip()
+                                     and not _FIELD_LINE.match(line)]
+        elif found is not None:
+            values[attribute] = found.value or ' '.join(found.items)
+        elif section:
+            values[attribute] = ' '.join(line.strip() for line in _first_paragraph(section))
+
+    return Persona(name=name, **values)
+
+def _shorten(text: str, limit: int = DIGEST_MAX_CHARS) -> str:
+    """Collapse whitespace and cut text to a word boundary within the limit."""
+    text = ' '.join(str(text).split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3].rsplit(' ', 1)[0].rstrip(',;:') + '...'
+
+def persona_digest(persona: Persona, title: str = None) -> Optional[str]:
+    """
+    Compact, deterministic summary of a persona's key attributes for prompts.
+
+    Args:
+        persona: Parsed persona
+        title: Document title used when the persona has no '# Name' heading (optional)
+
+    Returns:
+        Digest text (the same persona always gives the same text), or None when
+        neither a role nor any listed attribute was found to summarise
+    """
+    if not persona.role and not any(getattr(persona, attribute) for attribute in DIGEST_LISTS):
+        return None
+
+    name = persona.name
+    if name == "Unknown Persona" and title:
+        # "Persona Brief: The Strategic Leader" names the persona after the colon
+        label, _, rest = title.partition(':')
+        name = rest.strip() if rest.strip() and label.lower().startswith('persona') else title
+
+    lines = [f"Persona: {_shorten(name)}"]
+    for attribute in DIGEST_FIELDS:
+        value = getattr(persona, attribute)
+        if value:
+            lines.append(f"{attribute.replace('_', ' ').capitalize()}: {_shorten(value, DIGEST_MAX_CHARS * 2)}")
+    for attribute in DIGEST_LISTS:
+        items = [_shorten(item) for item in getattr(persona, attribute) if item.strip()][:DIGEST_MAX_ITEMS]
+        if items:
+            lines.append(f"{attribute.replace('_', ' ').capitalize()}:")
+            lines.extend(f"- {item}" for item in items)
+    if persona.bio:
+        lines.append(f"Context: {_shorten(persona.bio, DIGEST_MAX_CHARS * 2)}")
+    if persona.quote:
+        lines.append(f"Quote: \"{_shorten(persona.quote)}\"")
+    return '\n'.join(lines) + '\n'
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_content(content: str) -> Tuple[Persona, Optional[str]]:
+    """Tokenize persona content once and keep the persona and its digest."""
+    document = tokenize_persona(content)
+    persona = _build_persona(content, document)
+    logger.info(f"Extracted persona: {persona.name}")
+    return persona, persona_digest(persona, document.title)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_file(path: str, mtime_ns: int, size: int) -> Tuple[Persona, Optional[str]]:
+    """Parse a persona file; the modification time and size invalidate the entry."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return _parse_content(f.read())
+
+def _file_key(file_path: str) -> Tuple[str, int, int]:
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
 class PersonaParser:
     """Parses persona information from markdown files."""
     
@@ -77,15 +393,12 @@ class PersonaParser:
         logger.info(f"Extracting persona attributes from {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return self.extract_attributes_from_content(content)
+            persona, _ = _parse_file(*_file_key(file_path))
+            return copy.deepcopy(persona)
             
         except Exception as e:
             logger.error(f"Error extracting persona attributes from {file_path}: {str(e)}")
             # Return a minimal persona with just a name based on the filename
-            import os
             name = os.path.basename(file_path).replace('.md', '')
             return Persona(name=name, role="Unknown")
     
@@ -99,105 +412,32 @@ class PersonaParser:
         Returns:
             Persona object with extracted attributes
         """
-        # Extract name from title
-        name_match = re.search(r'^#\s+(.+?)(?:\n|$)', content)
-        name = name_match.group(1) if name_match else "Unknown Persona"
-        
-        # Extract role
-        role_match = re.search(r'(?:^|\n)##\s+Role\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        role = role_match.group(1) if role_match else ""
-        
-        # If no explicit role section, try to extract from title or first paragraph
-        if not role:
-            role_from_title = re.search(r'^#\s+.+?\((.*?)\)', content)
-            if role_from_title:
-                role = role_from_title.group(1)
-            else:
-                first_para = re.search(r'^#.+?\n\n(.+?)(?:\n\n|$)', content, re.DOTALL)
-                if first_para:
-                    role = first_para.group(1)[:50]  # Limit to 50 chars
-        
-        # Create persona with required fields
-        persona = Persona(name=name, role=role)
-        
-        # Extract company
-        company_match = re.search(r'(?:^|\n)##\s+Company\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if company_match:
-            persona.company = company_match.group(1)
-        
-        # Extract industry
-        industry_match = re.search(r'(?:^|\n)##\s+Industry\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if industry_match:
-            persona.industry = industry_match.group(1)
-        
-        # Extract age
-        age_match = re.search(r'(?:^|\n)##\s+Age\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if age_match:
-            persona.age = age_match.group(1)
-        
-        # Extract location
-        location_match = re.search(r'(?:^|\n)##\s+Location\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if location_match:
-            persona.location = location_match.group(1)
-        
-        # Extract goals
-        goals_match = re.search(r'(?:^|\n)##\s+Goals\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if goals_match:
-            goals_text = goals_match.group(1)
-            persona.goals = self._extract_list_items(goals_text)
-        
-        # Extract challenges
-        challenges_match = re.search(r'(?:^|\n)##\s+Challenges\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if challenges_match:
-            challenges_text = challenges_match.group(1)
-            persona.challenges = self._extract_list_items(challenges_text)
-        
-        # Extract pain points
-        pain_points_match = re.search(r'(?:^|\n)##\s+Pain Points\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if pain_points_match:
-            pain_points_text = pain_points_match.group(1)
-            persona.pain_points = self._extract_list_items(pain_points_text)
-        
-        # Extract motivations
-        motivations_match = re.search(r'(?:^|\n)##\s+Motivations\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if motivations_match:
-            motivations_text = motivations_match.group(1)
-            persona.motivations = self._extract_list_items(motivations_text)
-        
-        # Extract tech comfort
-        tech_comfort_match = re.search(r'(?:^|\n)##\s+Tech(?:nology)? Comfort\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if tech_comfort_match:
-            persona.tech_comfort = tech_comfort_match.group(1)
-        
-        # Extract brand awareness
-        brand_awareness_match = re.search(r'(?:^|\n)##\s+Brand Awareness\s*\n\s*(.+?)(?:\n|$)', content, re.IGNORECASE)
-        if brand_awareness_match:
-            persona.brand_awareness = brand_awareness_match.group(1)
-        
-        # Extract decision factors
-        decision_factors_match = re.search(r'(?:^|\n)##\s+Decision Factors\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if decision_factors_match:
-            decision_factors_text = decision_factors_match.group(1)
-            persona.decision_factors = self._extract_list_items(decision_factors_text)
-        
-        # Extract information sources
-        info_sources_match = re.search(r'(?:^|\n)##\s+Information Sources\s*\n(.*?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if info_sources_match:
-            info_sources_text = info_sources_match.group(1)
-            persona.information_sources = self._extract_list_items(info_sources_text)
-        
-        # Extract quote
-        quote_match = re.search(r'(?:^|\n)##\s+Quote\s*\n\s*(?:>)?\s*"?(.+?)"?(?:\n|$)', content, re.IGNORECASE)
-        if quote_match:
-            persona.quote = quote_match.group(1)
+        persona, _ = _parse_content(content)
+        return copy.deepcopy(persona)
+    
+    def digest_from_content(self, content: str) -> Optional[str]:
+        """
+        Compact prompt digest of persona markdown.
         
-        # Extract bio
-        bio_match = re.search(r'(?:^|\n)##\s+Bio\s*\n\s*(.+?)(?:\n\n|\n##|$)', content, re.DOTALL | re.IGNORECASE)
-        if bio_match:
-            persona.bio = bio_match.group(1).strip()
+        Args:
+            content: Markdown content
+            
+        Returns:
+            Digest text, or None if too little was extracted to summarise
+        """
+        return _parse_content(content)[1]
+    
+    def digest_from_file(self, file_path: str) -> Optional[str]:
+        """
+        Compact prompt digest of a persona file.
         
-        logger.info(f"Extracted persona: {persona.name}")
-        return persona
+        Args:
+            file_path: Path to the persona markdown file
+            
+        Returns:
+            Digest text, or None if too little was extracted to summarise
+        """
+        return _parse_file(*_file_key(file_path))[1]
     
     def _extract_list_items(self, text: str) -> List[str]:
         """
@@ -209,24 +449,7 @@ class PersonaParser:
         Returns:
             List of extracted items
         """
-        items = []
-        
-        # Extract bullet points
-        bullet_matches = re.finditer(r'(?:^|\n)\s*[-*]\s*(.+?)(?:\n|$)', text)
-        for match in bullet_matches:
-            items.append(match.group(1).strip())
-        
-        # If no bullet points found, try numbered lists
-        if not items:
-            numbered_matches = re.finditer(r'(?:^|\n)\s*\d+\.\s*(.+?)(?:\n|$)', text)
-            for match in numbered_matches:
-                items.append(match.group(1).strip())
-        
-        # If still no items found, split by newlines
-        if not items and text.strip():
-            items = [line.strip() for line in text.strip().split('\n') if line.strip()]
-        
-        return items
+        return _list_items(text.split('\n'))
     
     def persona_to_markdown(self, persona: Persona) -> str:
         """
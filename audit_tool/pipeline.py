@@ -0,0 +1,583 @@
+"""
+Staged Audit Pipeline for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module runs an audit as a pipeline of concurrent stages:
+1. Scrape - fetches each page once and classifies it once for every persona
+2. Prompt - builds the hygiene and experience prompts for each persona
+3. LLM - sends the prompts to the configured model provider
+4. Parse - saves the generated markdown and parses it into structured data
+5. Package - streams the parsed rows into the persona and unified tables
+
+Scheduling is URL-major: a page is scraped, tier-classified and its criteria
+looked up a single time, then fanned out into one task per persona that share
+that page context. Stages are connected by bounded queues and the number of
+pages in flight is capped, so memory stays flat however many URLs are audited
+while slow model calls for different personas overlap.
+
+When a run journal is supplied every saved artefact is recorded in it with the
+fingerprints of its inputs (page content, persona file, prompt template,
+methodology settings and, for scorecards, the criteria of the page's tier).
+The same fingerprints are stamped onto every packaged row. A resumed run reloads artefacts the journal lists as complete,
+and an incremental run carries forward artefacts of an earlier run whose
+fingerprints are unchanged, instead of prompting for them again.
+
+When an event emitter is supplied the pipeline also writes a JSONL event per
+url started, page scraped, model call (with latency and tokens), report parsed
+and pair completed or failed, for dashboards to follow the run.
+
+A work scheduler, when supplied, decides the order pages are fed in and holds
+the run's time and cost budget. Once the budget is spent no further page or
+model call is started and the remaining pairs are reported as deferred.
+"""
+
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple, TYPE_CHECKING
+
+from .ai_interface import ERROR_RESPONSE_PREFIX, PROMPT_TEMPLATES, ProviderError
+from . import events as run_events
+from .fingerprint import content_hash
+from .run_journal import RunJournal, atomic_write_text
+
+if TYPE_CHECKING:
+    from .backfill_packager import EnhancedBackfillPackager
+    from .events import RunEventEmitter
+    from .multi_persona_packager import StreamingPackager
+    from .scheduling import WorkScheduler
+
+logger = logging.getLogger(__name__)
+
+# Sentinel pushed through the queues to stop stage workers
+_STOP = object()
+
+# Artefacts generated for every (url, persona) pair
+ARTEFACTS = ("hygiene_scorecard", "experience_report")
+
+# Result of work skipped because the run was cancelled
+CANCELLED = {"status": "error", "message": "cancelled"}
+
+# Result of work skipped because the run's budget was used up
+DEFERRED = {"status": "error", "message": "deferred: budget exhausted"}
+
+def parse_artefact(parser: "EnhancedBackfillPackager", artefact: str, report: str, path: Path,
+                   fingerprints: Dict[str, str] = None) -> Dict[str, Any]:
+    """
+    Parse a generated report into the structure the packagers consume.
+
+    Args:
+        parser: Backfill packager providing the markdown parsers
+        artefact: Artefact name (hygiene_scorecard or experience_report)
+        report: Markdown text of the report
+        path: Where the report is saved
+        fingerprints: Hashes of the inputs the report was generated from (optional)
+
+    Returns:
+        Parsed report including its 'file_path' and, when given, its 'fingerprints'
+    """
+    if artefact == "hygiene_scorecard":
+        parsed = parser.parse_scorecard_content(report)
+    else:
+        parsed = parser.parse_experience_content(report)
+    parsed['file_path'] = str(path)
+    if fingerprints:
+        parsed['fingerprints'] = dict(fingerprints)
+    return parsed
+
+def run_fingerprints(methodology, personas: List["LoadedPersona"] = None) -> Dict[str, Any]:
+    """
+    Hash the run-wide inputs every artefact depends on.
+
+    The methodology is split in two: 'methodology' covers everything but the
+    criteria, and 'criteria' holds one hash per tier or channel, so editing one
+    tier's criteria only invalidates the scorecards of that tier.
+
+    Args:
+        methodology: The methodology parser of the run
+        personas: Personas of the run (optional)
+
+    Returns:
+        Methodology, criteria, prompt template and persona hashes
+    """
+    index = methodology.criteria_index
+    fingerprints = {
+        'methodology': index.settings_fingerprint,
+        'criteria': dict(index.fingerprints),
+        'templates': {artefact: content_hash(PROMPT_TEMPLATES[artefact]) for artefact in ARTEFACTS}
+    }
+    if personas is not None:
+        fingerprints['personas'] = {persona.name: content_hash(persona.content) for persona in personas}
+    return fingerprints
+
+@dataclass
+class PipelineConfig:
+    """Worker counts and queue sizes for each pipeline stage."""
+
+    scrape_workers: int = 2
+    prompt_workers: int = 1
+    llm_workers: int = 4
+    parse_workers: int = 1
+    package_workers: int = 1
+    queue_size: int = 8
+    max_pages_in_flight: int = 4
+
+@dataclass
+class LoadedPersona:
+    """A persona file read and parsed once per run."""
+
+    name: str
+    path: Path
+    # Persona text sent in prompts: the file itself or its digest
+    content: str
+    output_dir: Path
+
+@dataclass
+class PageContext:
+    """Per-URL state shared by every persona evaluating the page."""
+
+    url: str
+    page_data: Any = None
+    tier_name: Optional[str] = None
+    tier_config: Optional[Dict[str, Any]] = None
+    criteria: Optional[List[Dict[str, Any]]] = None
+    content_hash: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    pending: int = 0
+    resumed: bool = False
+
+    @property
+    def failed(self) -> bool:
+        """Whether scraping or classifying the page failed."""
+        return self.result is not None and self.result.get("status") == "error"
+
+@dataclass
+class PageTask:
+    """A single URL travelling through the pipeline for one persona."""
+
+    page: PageContext
+    persona: LoadedPersona
+    prompts: Dict[str, str] = field(default_factory=dict)
+    reports: Dict[str, str] = field(default_factory=dict)
+    parsed: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    reused: Dict[str, Tuple[RunJournal, Dict[str, Any]]] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether an earlier stage already recorded an error for this task."""
+        return self.result is not None and self.result.get("status") == "error"
+
+    @property
+    def url(self) -> str:
+        """URL of the page being evaluated."""
+        return self.page.url
+
+class _Stage:
+    """A pool of worker threads reading from one queue and writing to the next."""
+
+    def __init__(self, name: str, func: Callable[[Any], None], workers: int,
+                 inbox: queue.Queue, outbox: Optional[queue.Queue], downstream_workers: int = 0,
+                 fan_out: Optional[Callable[[Any], List[Any]]] = None, run_failed: bool = False,
+                 cancel_event: threading.Event = None):
+        self.name = name
+        self.func = func
+        self.cancel_event = cancel_event
+        self.fan_out = fan_out
+        self.run_failed = run_failed
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = downstream_workers
+        self.threads: List[threading.Thread] = []
+        self._finished = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the stage's worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def join(self) -> None:
+        """Wait for every worker of the stage to exit."""
+        for thread in self.threads:
+            thread.join()
+
+    def _work(self) -> None:
+        while True:
+            task = self.inbox.get()
+
+            if task is _STOP:
+                self._worker_done()
+                return
+
+            if self.cancel_event is not None and self.cancel_event.is_set() and not task.failed:
+                task.result = dict(CANCELLED)
+
+            # Failed tasks skip the remaining work but still reach the package stage
+            if self.run_failed or not task.failed:
+                try:
+                    self.func(task)
+                except Exception as e:
+                    logger.error(f"Error in {self.name} stage for URL {task.url}: {str(e)}")
+                    task.result = {"status": "error", "message": str(e)}
+
+            if self.outbox is not None:
+                for item in (self.fan_out(task) if self.fan_out else [task]):
+                    self.outbox.put(item)
+
+    def _worker_done(self) -> None:
+        # The last worker to finish tells every worker of the next stage to stop
+        with self._lock:
+            self._finished += 1
+            last = self._finished == self.workers
+
+        if last and self.outbox is not None:
+            for _ in range(self.downstream_workers):
+                self.outbox.put(_STOP)
+
+class AuditPipeline:
+    """Runs URLs for one or more personas through the scrape, prompt, LLM, parse and package stages."""
+
+    def __init__(self, tool, packager: "StreamingPackager", config: PipelineConfig = None,
+                 journal: RunJournal = None, resume: bool = False, previous: RunJournal = None,
+                 cancel_event: threading.Event = None, on_result: Callable[["PageTask"], None] = None,
+                 events: "RunEventEmitter" = None, scheduler: "WorkScheduler" = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tool: The BrandAuditTool providing the scraper, AI interface and methodology
+            packager: Streaming packager that receives each parsed page
+            config: Stage worker counts and queue sizes (optional)
+            journal: Run journal recording each finished artefact (optional)
+            resume: Reuse artefacts the journal already lists as complete
+            previous: Journal of an earlier run to carry unchanged artefacts forward from (optional)
+            cancel_event: Event that stops the run; unfinished work is reported as cancelled (optional)
+            on_result: Called with each (url, persona) task once it is packaged or failed (optional)
+            events: Emitter receiving the run's progress events (optional)
+            scheduler: Orders the URLs and enforces the run's time and cost budget (optional)
+        """
+        self.tool = tool
+        self.packager = packager
+        self.config = config or PipelineConfig()
+        self.journal = journal
+        self.resume = resume and journal is not None
+        self.previous = previous
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_result = on_result
+        self.events = events
+        self.scheduler = scheduler
+        self._deferring = False
+        self._in_flight = threading.BoundedSemaphore(max(1, self.config.max_pages_in_flight))
+        self._lock = threading.Lock()
+
+    def run(self, urls: List[str], personas: List[LoadedPersona]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every URL through the pipeline for every persona.
+
+        Args:
+            urls: List of URLs to audit; repeated URLs are audited once
+            personas: Personas loaded once for the whole run
+
+        Returns:
+            Dictionary of audit results by persona file path, then by URL in input order
+        """
+        # Results are keyed by URL, so a URL listed twice is audited, counted and packaged once
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) < len(urls):
+            logger.warning(f"Dropped {len(urls) - len(unique_urls)} duplicate URLs from the run")
+        urls = unique_urls
+
+        config = self.config
+        stage_specs = [
+            ("scrape", self._scrape, config.scrape_workers, self._fan_out),
+            ("prompt", self._build_prompts, config.prompt_workers, None),
+            ("llm", self._call_llm, config.llm_workers, None),
+            ("parse", self._parse, config.parse_workers, None),
+            ("package", self._package, config.package_workers, None),
+        ]
+
+        queues = [queue.Queue(maxsize=config.queue_size) for _ in stage_specs]
+        stages = []
+        for i, (name, func, workers, fan_out) in enumerate(stage_specs):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            downstream = max(1, stage_specs[i + 1][2]) if outbox is not None else 0
+            stages.append(_Stage(name, func, workers, queues[i], outbox, downstream,
+                                 fan_out=fan_out, run_failed=outbox is None, cancel_event=self.cancel_event))
+
+        self._personas = list(personas)
+        self._run_fingerprints = run_fingerprints(self.tool.methodology, self._personas)
+        self._tasks: List[PageTask] = []
+        self._emit(run_events.RUN_STARTED, total=len(urls) * len(self._personas), urls=len(urls),
+                   personas=[persona.name for persona in self._personas],
+                   workers={name: max(1, workers) for name, _, workers, _ in stage_specs})
+
+        for stage in stages:
+            stage.start()
+
+        feed_order = urls
+        if self.scheduler is not None:
+            self.scheduler.budget.start()
+            feed_order = self.scheduler.order(urls)
+
+        # Feed the first stage; each page holds an in-flight slot until every persona is packaged
+        unfed = None
+        for url in feed_order:
+            self._in_flight.acquire()
+            if self.cancel_event.is_set() or self._budget_exhausted():
+                self._in_flight.release()
+                unfed = CANCELLED if self.cancel_event.is_set() else DEFERRED
+                break
+            queues[0].put(PageContext(url))
+        for _ in range(stages[0].workers):
+            queues[0].put(_STOP)
+
+        for stage in stages:
+            stage.join()
+
+        by_key = {(str(task.persona.path), task.url): task.result for task in self._tasks}
+        results: Dict[str, Dict[str, Any]] = {}
+        for persona in self._personas:
+            key = str(persona.path)
+            results[key] = {url: by_key.get((key, url)) or dict(unfed or CANCELLED) for url in urls}
+
+        succeeded = sum(1 for persona_results in results.values()
+                        for result in persona_results.values() if result.get("status") == "success")
+        self._emit(run_events.RUN_FINISHED, completed=succeeded,
+                   failed=len(urls) * len(self._personas) - succeeded, cancelled=self.cancel_event.is_set())
+
+        return results
+
+    def _budget_exhausted(self) -> bool:
+        if self.scheduler is None:
+            return False
+        reason = self.scheduler.budget.exhausted()
+        if reason and not self._deferring:
+            self._deferring = True
+            logger.warning(f"Deferring remaining work: {reason}")
+        return reason is not None
+
+    def _emit(self, event: str, task: Any = None, **data) -> None:
+        if self.events is None:
+            return
+        if task is not None:
+            data["url"] = task.url
+            if isinstance(task, PageTask):
+                data["persona"] = task.persona.name
+        self.events.emit(event, **data)
+
+    def _is_complete(self, url: str, persona: LoadedPersona, artefact: str) -> bool:
+        return self.resume and self.journal.completed(url, persona.name, artefact) is not None
+
+    def _scrape(self, page: PageContext) -> None:
+        self._emit(run_events.URL_STARTED, page)
+
+        # A page whose artefacts are all journalled needs neither a fetch nor a prompt
+        if self.resume and all(self._is_complete(page.url, persona, artefact)
+                               for persona in self._personas for artefact in ARTEFACTS):
+            logger.info(f"Resuming completed URL: {page.url}")
+            page.resumed = True
+            return
+
+        logger.info(f"Processing URL: {page.url}")
+
+        started = time.perf_counter()
+        page.page_data = self.tool.scraper.fetch_page(page.url)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if page.page_data.is_404:
+            logger.warning(f"URL returned 404: {page.url}")
+            page.result = {"status": "error", "message": "Page not found (404)"}
+            self._emit(run_events.SCRAPED, page, latency_ms=latency_ms, status="not_found")
+            return
+
+        page.content_hash = content_hash(page.page_data.raw_text)
+
+        # Tier and criteria depend only on the URL, so they are shared by every persona
+        methodology = self.tool.methodology
+        page.tier_name, page.tier_config = methodology.classify_url(page.url)
+        page.criteria = methodology.get_criteria_for_tier(page.tier_name)
+
+        self._emit(run_events.SCRAPED, page, latency_ms=latency_ms, status="ok", tier=page.tier_name,
+                   chars=len(page.page_data.raw_text))
+
+    def _fan_out(self, page: PageContext) -> List[PageTask]:
+        tasks = []
+        for persona in self._personas:
+            task = PageTask(page, persona)
+            if page.failed:
+                task.result = dict(page.result)
+            tasks.append(task)
+
+        page.pending = len(tasks)
+        with self._lock:
+            self._tasks.extend(tasks)
+
+        if not tasks:
+            self._in_flight.release()
+        return tasks
+
+    def _build_prompts(self, task: PageTask) -> None:
+        ai = self.tool.ai
+        methodology = self.tool.methodology
+        page = task.page
+
+        for artefact in ARTEFACTS:
+            source, entry = self._find_reusable(task, artefact)
+            if entry is not None:
+                task.reports[artefact] = source.resolve_path(entry).read_text(encoding='utf-8')
+                task.reused[artefact] = (source, entry)
+
+        if "hygiene_scorecard" not in task.reports:
+            task.prompts["hygiene_scorecard"] = ai.build_hygiene_prompt(
+                page.url, page.page_data.raw_text, task.persona.content, methodology,
+                tier_name=page.tier_name, tier_config=page.tier_config, criteria=page.criteria
+            )
+        if "experience_report" not in task.reports:
+            task.prompts["experience_report"] = ai.build_experience_prompt(
+                page.url, page.page_data.raw_text, task.persona.content, methodology,
+                tier_name=page.tier_name, tier_config=page.tier_config
+            )
+
+    def _fingerprints(self, task: PageTask, artefact: str) -> Dict[str, str]:
+        fingerprints = {
+            'page': task.page.content_hash,
+            'persona': self._run_fingerprints['personas'][task.persona.name],
+            'template': self._run_fingerprints['templates'][artefact],
+            'methodology': self._run_fingerprints['methodology']
+        }
+        # Only the scorecard is generated from the tier's criteria
+        if artefact == "hygiene_scorecard":
+            fingerprints['criteria'] = self._run_fingerprints['criteria'].get(task.page.tier_name)
+        return fingerprints
+
+    def _find_reusable(self, task: PageTask, artefact: str) -> Tuple[Optional[RunJournal], Optional[Dict[str, Any]]]:
+        # Artefacts finished by an earlier attempt of this run
+        if self.resume:
+            entry = self.journal.completed(task.url, task.persona.name, artefact)
+            if entry is not None:
+                return self.journal, entry
+
+        # Artefacts of an earlier run whose inputs have not changed
+        if self.previous is not None and task.page.content_hash is not None:
+            entry = self.previous.matching(task.url, task.persona.name, artefact, self._fingerprints(task, artefact))
+            if entry is not None:
+                return self.previous, entry
+
+        return None, None
+
+    def _call_llm(self, task: PageTask) -> None:
+        ai = self.tool.ai
+        provider = getattr(ai, "model_provider", None)
+        for artefact, prompt in task.prompts.items():
+            # A model call already under way finishes; no new one starts once the budget is spent
+            if self._budget_exhausted():
+                task.result = dict(DEFERRED)
+                return
+
+            started = time.perf_counter()
+            report = ai.generate_response(prompt)
+            # An error text is not a report: fail the task so it is journalled as an error and retried
+            if isinstance(report, str) and report.startswith(ERROR_RESPONSE_PREFIX):
+                raise ProviderError(report[len(ERROR_RESPONSE_PREFIX):])
+            task.reports[artefact] = report
+            usage = ai.last_usage()
+            self._emit(run_events.LLM_DONE, task, artefact=artefact,
+                       latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                       provider=provider, **usage)
+
+            if self.scheduler is not None:
+                self.scheduler.budget.charge(provider, usage, prompt, task.reports[artefact])
+
+    def _parse(self, task: PageTask) -> None:
+        # pandas-backed packagers load with the first page to parse, not at import
+        from .backfill_packager import EnhancedBackfillPackager
+
+        started = time.perf_counter()
+        url_slug = self.tool._url_to_slug(task.url)
+        persona_dir = task.persona.output_dir
+        parser = EnhancedBackfillPackager(task.persona.name, input_dir=persona_dir)
+
+        # Save outputs
+        for artefact, report in task.reports.items():
+            if artefact in task.reused:
+                # Carried-forward artefacts are referenced in place, not copied
+                source, entry = task.reused[artefact]
+                path = source.resolve_path(entry)
+                fingerprints = entry.get('fingerprints')
+                if source is not self.journal and self.journal is not None:
+                    self.journal.record(task.url, task.persona.name, artefact, "reused",
+                                        content=report, path=path, fingerprints=entry.get('fingerprints'),
+                                        source_run=entry.get('source_run') or str(source.run_dir.resolve()))
+            else:
+                path = persona_dir / f"{url_slug}_{artefact}.md"
+                fingerprints = self._fingerprints(task, artefact)
+                atomic_write_text(path, report)
+                if self.journal is not None:
+                    self.journal.record(task.url, task.persona.name, artefact, "success",
+                                        content=report, prompt=task.prompts.get(artefact), path=path,
+                                        fingerprints=fingerprints)
+
+            task.parsed[artefact] = parse_artefact(parser, artefact, report, path, fingerprints)
+
+        self._emit(run_events.PARSED, task, latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                   reused=sorted(task.reused))
+
+    def _package(self, task: PageTask) -> None:
+        try:
+            if task.failed:
+                self._record_failure(task)
+                return
+
+            self.packager.add_page(
+                task.persona.name,
+                task.persona.output_dir,
+                task.parsed["hygiene_scorecard"],
+                task.parsed.get("experience_report")
+            )
+
+            task.result = {
+                "status": "success",
+                "hygiene_scorecard": task.reports.get("hygiene_scorecard", ""),
+                "experience_report": task.reports.get("experience_report", "")
+            }
+
+            logger.info(f"Completed processing for URL: {task.url} ({task.persona.name})")
+        finally:
+            if task.failed:
+                self._emit(run_events.FAILED, task, message=task.result.get("message"))
+            elif task.result is not None:
+                self._emit(run_events.COMPLETED, task)
+            if self.on_result is not None:
+                try:
+                    self.on_result(task)
+                except Exception as e:
+                    logger.error(f"Error in result callback for URL {task.url}: {str(e)}")
+            self._page_done(task.page)
+
+    def _record_failure(self, task: PageTask) -> None:
+        # Artefacts that were not saved are journalled as failed so a resume retries them
+        if self.journal is None:
+            return
+
+        for artefact in ARTEFACTS:
+            if artefact not in task.parsed and artefact not in task.reused:
+                self.journal.record(task.url, task.persona.name, artefact, "error",
+                                    message=task.result.get("message"))
+
+    def _page_done(self, page: PageContext) -> None:
+        # The last persona to finish a page drops the page text and frees its slot
+        with self._lock:
+            page.pending -= 1
+            done = page.pending == 0
+
+        if done:
+            page.page_data = None
+            self._in_flight.release()
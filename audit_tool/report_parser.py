@@ -0,0 +1,328 @@
+"""
+Report Parser for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module reads generated markdown reports into one typed record that every
+packager and summary generator consumes:
+1. Tokenizes a hygiene scorecard or experience report in a single pass over its lines
+2. Collects labelled fields ("**URL:** ...", "First Impression:") with the text they introduce
+3. Collects table rows and the criteria rows among them ("| Name | 8 | Rationale |", "| **Name** | 8/10 | ... |")
+4. Collects heading sections with their text and list items (recommendations)
+5. Memoises records by content hash, and files by path, modification time and size
+
+Packagers used to run a dozen regular expressions over the whole text of each
+report, and some parsed the same file more than once. Here a report is read
+and tokenized once; the record is immutable, so the same instance is shared by
+every caller and by identical files.
+"""
+
+import os
+import re
+import logging
+import threading
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Records kept in memory, enough for every report of a large audit
+CACHE_SIZE = 4096
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+# "**URL:** value", "- **Tier/Channel:** value", "First Impression:" -- a short capitalised label
+_FIELD = re.compile(r"^\s*(?:[-*+]\s+)?(?:\*\*)?([A-Z][A-Za-z0-9 &/'()-]{0,48}?)(?::\*\*|\*\*:|:)[ \t]*(.*)$")
+_FIELD_MAX_WORDS = 6
+_LIST_ITEM = re.compile(r'^\s*(?:(\d+)[.)]|[-*+])\s+(.*)$')
+_SCORE = re.compile(r'(\d+(?:\.\d+)?)(/10)?')
+_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_SEPARATOR_CHARS = frozenset('-: ')
+
+@dataclass(frozen=True)
+class Field:
+    """A labelled line and the text it introduces."""
+
+    name: str
+    value: str  # Rest of the label's own line, as written
+    body: str   # Value plus the following lines up to the next label, heading or table
+
+@dataclass(frozen=True)
+class CriterionRow:
+    """A table row whose second cell is a score."""
+
+    name: str  # First cell as written, bold markers included
+    score: float
+    rationale: str
+    out_of_ten: bool  # Score written as "8/10" rather than "8"
+
+    @property
+    def bold(self) -> bool:
+        return _BOLD.fullmatch(self.name) is not None
+
+    @property
+    def label(self) -> str:
+        """Criterion name without bold markers."""
+        match = _BOLD.fullmatch(self.name)
+        return match.group(1) if match else self.name
+
+@dataclass(frozen=True)
+class ListItem:
+    """A numbered or bulleted list item."""
+
+    text: str  # First line, after the marker
+    ordered: bool
+    detail: str = ''  # Indented continuation lines and nested items
+
+@dataclass(frozen=True)
+class Section:
+    """A heading, its text up to the next heading of the same or higher level, and its list items."""
+
+    title: str
+    level: int
+    body: str
+    items: Tuple[ListItem, ...]
+
+@dataclass(frozen=True)
+class ReportRecord:
+    """Everything the packagers read from one markdown report."""
+
+    digest: str
+    fields: Tuple[Field, ...]
+    rows: Tuple[Tuple[str, ...], ...]  # Table data rows, headers and separators left out
+    criteria: Tuple[CriterionRow, ...]
+    sections: Tuple[Section, ...]
+    content: str = dataclasses.field(repr=False, compare=False)
+
+    def field(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Value of the first field with a label.
+
+        Args:
+            name: Label as written in the report, e.g. "Final Score"
+            default: Value returned when the label is missing
+
+        Returns:
+            The rest of the label's line
+        """
+        for item in self.fields:
+            if item.name == name:
+                return item.value
+        return default
+
+    def fields_named(self, name: str) -> List[Field]:
+        """Every field with a label, in document order."""
+        return [item for item in self.fields if item.name == name]
+
+    def section(self, title: str, level: Optional[int] = None) -> Optional[Section]:
+        """
+        First section with a heading title.
+
+        Args:
+            title: Heading text without the leading hashes
+            level: Heading level to match (any level when omitted)
+
+        Returns:
+            The section, or None if the report has no such heading
+        """
+        for section in self.sections:
+            if section.title == title and (level is None or section.level == level):
+                return section
+        return None
+
+    @property
+    def url(self) -> str:
+        match = re.match(r'https?://\S+', self.field('URL') or '')
+        return match.group(0) if match else ''
+
+    @property
+    def final_score(self) -> Optional[float]:
+        """The "Final Score: X/10" value, or None when the report has none."""
+        match = re.match(r'(\d+(?:\.\d+)?)/10', self.field('Final Score') or '')
+        return float(match.group(1)) if match else None
+
+def _cells(line: str) -> List[str]:
+    """Cells of a table line; the closing pipe of the last cell is optional."""
+    cells = [cell.strip() for cell in line.strip().split('|')[1:]]
+    if cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+def _criterion(cells: List[str]) -> Optional[CriterionRow]:
+    if len(cells) < 3 or not cells[0]:
+        return None
+    match = _SCORE.fullmatch(cells[1])
+    if not match:
+        return None
+    return CriterionRow(cells[0], float(match.group(1)), cells[2], match.group(2) is not None)
+
+def tokenize_report(content: str) -> ReportRecord:
+    """
+    Tokenize a markdown report in a single pass over its lines, without caching.
+
+    Args:
+        content: Markdown text of a scorecard or experience report
+
+    Returns:
+        The report record
+    """
+    lines = content.splitlines()
+    fields: List[Field] = []
+    rows: List[Tuple[str, ...]] = []
+    criteria: List[CriterionRow] = []
+    items: List[Tuple[int, str, bool, List[str]]] = []
+    open_item: Optional[Tuple[int, List[str]]] = None
+    headings: List[Tuple[int, int, str]] = []
+    table: List[List[str]] = []
+    open_field: Optional[Tuple[str, str, int]] = None
+
+    def close_field(end: int):
+        nonlocal open_field
+        if open_field:
+            name, value, start = open_field
+            body = '\n'.join([value] + lines[start + 1:end]).strip()
+            fields.append(Field(name, value, body))
+            open_field = None
+
+    def flush_table():
+        # A row directly above a separator row is the table header
+        for position, cells in enumerate(table):
+            if not cells or all(cell and set(cell) <= _SEPARATOR_CHARS for cell in cells):
+                continue
+            following = table[position + 1] if position + 1 < len(table) else None
+            if following and all(cell and set(cell) <= _SEPARATOR_CHARS for cell in following):
+                continue
+            rows.append(tuple(cells))
+            criterion = _criterion(cells)
+            if criterion:
+                criteria.append(criterion)
+        table.clear()
+
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+        if open_item and stripped:
+            # Indented lines continue the open list item, anything else ends it
+            if indent > open_item[0]:
+                open_item[1].append(stripped)
+            else:
+                open_item = None
+
+        if stripped.startswith('|'):
+            close_field(index)
+            table.append(_cells(line))
+            continue
+        if table:
+            flush_table()
+
+        if line.startswith('#'):
+            heading = _HEADING.match(line)
+            if heading:
+                close_field(index)
+                headings.append((index, len(heading.group(1)), heading.group(2)))
+                continue
+
+        if ':' in line:
+            match = _FIELD.match(line)
+            if match and match.group(1).count(' ') < _FIELD_MAX_WORDS:
+                close_field(index)
+                open_field = (match.group(1).strip(), match.group(2), index)
+
+        item = _LIST_ITEM.match(line)
+        if item:
+            detail: List[str] = []
+            items.append((index, item.group(2).strip(), item.group(1) is not None, detail))
+            if open_item is None:
+                open_item = (indent, detail)
+
+    if table:
+        flush_table()
+    close_field(len(lines))
+
+    # A section runs to the next heading of the same or a higher level
+    ends = [len(lines)] * len(headings)
+    open_sections: List[int] = []
+    for position, (index, level, _) in enumerate(headings):
+        while open_sections and headings[open_sections[-1]][1] >= level:
+            ends[open_sections.pop()] = index
+        open_sections.append(position)
+
+    sections = []
+    for (index, level, title), end in zip(headings, ends):
+        sections.append(Section(
+            title, level, '\n'.join(lines[index + 1:end]).strip(),
+            tuple(ListItem(text, ordered, '\n'.join(detail))
+                  for line_index, text, ordered, detail in items if index < line_index < end)
+        ))
+
+    return ReportRecord(content_hash(content), tuple(fields), tuple(rows), tuple(criteria), tuple(sections), content)
+
+_records: 'OrderedDict[str, ReportRecord]' = OrderedDict()
+_records_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def parse_report(content: str) -> ReportRecord:
+    """
+    Parse a markdown report, reusing the record of any report with the same content.
+
+    Args:
+        content: Markdown text of a scorecard or experience report
+
+    Returns:
+        The shared, immutable report record
+    """
+    digest = content_hash(content)
+    with _records_lock:
+        record = _records.get(digest)
+        if record is not None:
+            _records.move_to_end(digest)
+            _stats['hits'] += 1
+            return record
+
+    record = tokenize_report(content)
+    with _records_lock:
+        _stats['misses'] += 1
+        _records[digest] = record
+        while len(_records) > CACHE_SIZE:
+            _records.popitem(last=False)
+    return record
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_file(path: str, mtime_ns: int, size: int) -> ReportRecord:
+    """Parse a report file; the modification time and size invalidate the entry."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_report(f.read())
+
+def parse_report_file(file_path: str) -> ReportRecord:
+    """
+    Parse a markdown report file, reading it again only after it changes.
+
+    Args:
+        file_path: Path to the report
+
+    Returns:
+        The shared, immutable report record
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _parse_file(path, stat.st_mtime_ns, stat.st_size)
+
+def cache_info() -> Dict[str, int]:
+    """
+    Counters of the content-hash cache.
+
+    Returns:
+        Dictionary with hits, misses and the number of cached records
+    """
+    with _records_lock:
+        return {**_stats, 'size': len(_records)}
+
+def clear_cache():
+    """Forget every cached record."""
+    with _records_lock:
+        _records.clear()
+    _parse_file.cache_clear()
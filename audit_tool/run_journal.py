@@ -0,0 +1,306 @@
+"""
+Run Journal for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module makes audit runs checkpointed and resumable:
+1. Appends one JSON line per finished (url, persona, artefact) to run_journal.jsonl
+2. Records the status, content hash, prompt hash and output path of each artefact
+3. Answers whether an artefact is already complete so a resumed run can skip it
+4. Tolerates a truncated last line left behind by a crash
+5. Writes artefacts atomically so a crash never leaves half-written files
+
+The journal lives in the run's output directory. Later entries for the same
+key supersede earlier ones, so a retried artefact simply appends a new line.
+Artefacts carried forward from an earlier run are journalled as "reused" and
+point at the earlier run's file instead of a copy.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from .fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "run_journal.jsonl"
+PLAN_FILENAME = "run_plan.json"
+MANIFEST_FILENAME = "run_manifest.json"
+
+# Entry statuses whose artefact is part of the run's dataset
+COMPLETE_STATUSES = ("success", "reused")
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8') -> None:
+    """
+    Write text to a file atomically.
+
+    The text is written to a temporary file in the same directory and moved
+    into place with os.replace, so readers see either the old or the new file.
+
+    Args:
+        path: Destination path
+        text: Text to write
+        encoding: Text encoding
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class RunJournal:
+    """Append-only record of the artefacts completed in an audit run."""
+
+    def __init__(self, run_dir: Union[str, Path]):
+        """
+        Open (or create) the journal of a run.
+
+        Args:
+            run_dir: Output directory of the run
+        """
+        self.run_dir = Path(run_dir)
+        self.path = self.run_dir / JOURNAL_FILENAME
+        self.entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        self._load()
+
+    def write_plan(self, urls: List[str], persona_paths: List[str], multi_persona: bool) -> None:
+        """
+        Save the inputs of the run so it can be resumed without repeating them.
+
+        Args:
+            urls: URLs being audited
+            persona_paths: Persona files being used
+            multi_persona: Whether the run is a multi-persona audit
+        """
+        plan = {
+            'urls': list(urls),
+            'persona_paths': [str(p) for p in persona_paths],
+            'multi_persona': multi_persona,
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }
+        atomic_write_text(self.run_dir / PLAN_FILENAME, json.dumps(plan, indent=2))
+
+    def load_plan(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved inputs of the run.
+
+        Returns:
+            The run plan, or None if the run never saved one
+        """
+        plan_path = self.run_dir / PLAN_FILENAME
+        if not plan_path.exists():
+            return None
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _load(self) -> None:
+        """Replay the journal file into the latest entry per key."""
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                self.entries[self._key(entry['url'], entry['persona'], entry['artefact'])] = entry
+
+        logger.info(f"Loaded {len(self.entries)} journal entries from {self.path}")
+
+    @staticmethod
+    def _key(url: str, persona: str, artefact: str) -> Tuple[str, str, str]:
+        return (url, persona, artefact)
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        """Store paths relative to the run directory so runs can be moved."""
+        try:
+            return Path(path).resolve().relative_to(self.run_dir.resolve()).as_posix()
+        except ValueError:
+            # Artefacts outside the run (e.g. carried forward) are referenced absolutely
+            return str(Path(path).resolve())
+
+    def resolve_path(self, entry: Dict[str, Any]) -> Path:
+        """
+        Return the absolute location of an entry's artefact.
+
+        Args:
+            entry: Journal entry
+
+        Returns:
+            Path of the artefact
+        """
+        return self.run_dir / entry['path']
+
+    def record(self, url: str, persona: str, artefact: str, status: str,
+               content: str = None, prompt: str = None, path: Union[str, Path] = None,
+               message: str = None, fingerprints: Dict[str, str] = None,
+               source_run: str = None) -> Dict[str, Any]:
+        """
+        Append an entry for an artefact.
+
+        Args:
+            url: Audited URL
+            persona: Persona name
+            artefact: Artefact name (e.g. hygiene_scorecard)
+            status: "success", "reused" or "error"
+            content: Generated artefact text (optional, hashed)
+            prompt: Prompt that produced the artefact (optional, hashed)
+            path: Where the artefact was written (optional)
+            message: Error message for failed artefacts (optional)
+            fingerprints: Hashes of the inputs the artefact depends on (optional)
+            source_run: Run directory a reused artefact was carried forward from (optional)
+
+        Returns:
+            The recorded entry
+        """
+        entry = {
+            'url': url,
+            'persona': persona,
+            'artefact': artefact,
+            'status': status,
+            'content_hash': content_hash(content) if content is not None else None,
+            'prompt_hash': content_hash(prompt) if prompt is not None else None,
+            'path': self._relative(path) if path is not None else None,
+            'message': message,
+            'fingerprints': fingerprints,
+            'source_run': source_run,
+            'recorded_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[self._key(url, persona, artefact)] = entry
+
+        return entry
+
+    def completed(self, url: str, persona: str, artefact: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the entry of a completed artefact whose output is still intact.
+
+        An artefact counts as complete when its latest entry succeeded (or was
+        reused) and the file it points to exists with the recorded content hash.
+
+        Args:
+            url: Audited URL
+            persona: Persona name
+            artefact: Artefact name
+
+        Returns:
+            The journal entry, or None if the artefact must be (re)generated
+        """
+        entry = self.entries.get(self._key(url, persona, artefact))
+        if not entry or entry.get('status') not in COMPLETE_STATUSES or not entry.get('path'):
+            return None
+
+        path = self.resolve_path(entry)
+        if not path.exists():
+            return None
+
+        if entry.get('content_hash') and content_hash(path.read_text(encoding='utf-8')) != entry['content_hash']:
+            logger.warning(f"Output changed since it was journalled, regenerating: {path}")
+            return None
+
+        return entry
+
+    def read_completed(self, url: str, persona: str, artefact: str) -> Optional[str]:
+        """
+        Return the text of a completed artefact.
+
+        Args:
+            url: Audited URL
+            persona: Persona name
+            artefact: Artefact name
+
+        Returns:
+            The artefact text, or None if the artefact is not complete
+        """
+        entry = self.completed(url, persona, artefact)
+        if entry is None:
+            return None
+        return self.resolve_path(entry).read_text(encoding='utf-8')
+
+    def matching(self, url: str, persona: str, artefact: str,
+                 fingerprints: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Return a completed artefact whose input fingerprints are unchanged.
+
+        Args:
+            url: Audited URL
+            persona: Persona name
+            artefact: Artefact name
+            fingerprints: Current hashes of the artefact's inputs
+
+        Returns:
+            The journal entry, or None if the artefact is missing or stale
+        """
+        entry = self.entries.get(self._key(url, persona, artefact))
+        if not entry or entry.get('fingerprints') != fingerprints:
+            return None
+        return self.completed(url, persona, artefact)
+
+    def write_manifest(self, run_fingerprints: Dict[str, Any], since: Union[str, Path] = None) -> Dict[str, Any]:
+        """
+        Write run_manifest.json listing every artefact and whether it was reused or recomputed.
+
+        Args:
+            run_fingerprints: Run-wide hashes (methodology, criteria, prompt templates, personas)
+            since: Earlier run the audit was compared against (optional)
+
+        Returns:
+            The manifest
+        """
+        outcomes = {'success': 'recomputed', 'reused': 'reused', 'error': 'failed'}
+        entries = [
+            {
+                'url': entry['url'],
+                'persona': entry['persona'],
+                'artefact': entry['artefact'],
+                'outcome': outcomes.get(entry['status'], entry['status']),
+                'path': entry.get('path'),
+                'source_run': entry.get('source_run'),
+                'fingerprints': entry.get('fingerprints')
+            }
+            for entry in self.entries.values()
+        ]
+
+        counts: Dict[str, int] = {}
+        for entry in entries:
+            counts[entry['outcome']] = counts.get(entry['outcome'], 0) + 1
+
+        manifest = {
+            'run_dir': str(self.run_dir.resolve()),
+            'since': str(Path(since).resolve()) if since else None,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'fingerprints': run_fingerprints,
+            'counts': counts,
+            'reused': [e for e in entries if e['outcome'] == 'reused'],
+            'recomputed': [e for e in entries if e['outcome'] == 'recomputed'],
+            'failed': [e for e in entries if e['outcome'] == 'failed']
+        }
+        atomic_write_text(self.run_dir / MANIFEST_FILENAME, json.dumps(manifest, indent=2))
+        return manifest
@@ -0,0 +1,239 @@
+"""
+Work Scheduling for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module decides which pages an audit spends its time and money on:
+1. Tier priority - tier_1 pages are audited before everything else
+2. Opportunity priority - then pages with the largest previous opportunity score
+3. Input order - remaining pages keep the order they were given in
+4. Budgets - a wall-clock and a model-cost budget shared by the whole run
+5. Clean deferral - once a budget is spent no new page or model call is started
+
+Opportunity scores are computed from the previous unified audit data with the
+same definition as BrandHealthMetricsCalculator.get_top_opportunities:
+(10 - average score) * tier weight. The dataset's audit table stores neither
+URLs nor tier weights, so its latest run is joined to the page dimension for
+the URL and the weights come from the methodology. A run cut short by its budget therefore
+still covers the pages that matter most, and the deferred pairs are journalled
+as failed so `--resume` picks them up later.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Previous results the dashboard reads, used for opportunity scores by default
+DEFAULT_PRIORITY_DATA = Path("audit_data") / "dataset" / "audit"
+
+# USD per 1,000 (input, output) tokens of each provider's default model
+MODEL_PRICES = {
+    "anthropic": (0.015, 0.075),
+    "openai": (0.01, 0.03),
+}
+
+# Rough characters per token, used when a provider reports no usage
+CHARS_PER_TOKEN = 4
+
+def _dataset_scores(table_dir: Path, methodology=None):
+    """
+    Scores of the latest run of a dataset table, with each page's URL and tier weight.
+
+    Args:
+        table_dir: Audit table directory of the dataset
+        methodology: Methodology classifying the URLs and weighting their tiers
+            (the packaged methodology when omitted)
+
+    Returns:
+        DataFrame with url, score and tier_weight columns
+    """
+    import pandas as pd
+
+    from .dataset import latest_run, read_table
+    from .scoring import ScoringEngine
+
+    root, table = table_dir.parent, table_dir.name
+    scores = read_table(root, table, columns=['page_key', 'score'], run=latest_run(root, table))
+    pages = read_table(root, 'pages', columns=['page_key', 'url'])
+    if scores.empty or pages.empty:
+        return scores
+
+    if methodology is None:
+        from .criteria_index import DEFAULT_METHODOLOGY_PATH
+        from .methodology_parser import MethodologyParser
+
+        methodology = MethodologyParser(str(DEFAULT_METHODOLOGY_PATH))
+    # The stored tier is the report's free-text page type; the URL's tier is what the weights are keyed by
+    tiers = pd.Series(methodology.classify_many(pages['url'].tolist()), index=pages.index)
+    pages['tier_weight'] = tiers.map(ScoringEngine(methodology).tier_weights)
+    return scores.merge(pages, on='page_key')
+
+def load_opportunity_scores(path: Union[str, Path] = DEFAULT_PRIORITY_DATA, methodology=None) -> Dict[str, float]:
+    """
+    Compute each previously audited URL's opportunity score.
+
+    Args:
+        path: Unified audit data from an earlier run: the audit table of the dataset, a parquet or a CSV file
+        methodology: Methodology giving the tier weights of dataset rows (the packaged methodology when omitted)
+
+    Returns:
+        Opportunity score by URL, or an empty dict if there is no earlier data. URLs read from the
+        dataset are canonical (see page_dimension.canonical_url).
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.info(f"No previous audit data at {path}, ordering by tier only")
+        return {}
+
+    import pandas as pd
+
+    if path.is_dir():
+        df = _dataset_scores(path, methodology)
+    else:
+        df = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    score_col = next((col for col in ['avg_score', 'raw_score', 'final_score', 'score'] if col in df.columns), None)
+    if score_col is None or 'tier_weight' not in df.columns or 'url' not in df.columns:
+        logger.warning(f"{path} has no score, tier_weight or url column, ordering by tier only")
+        return {}
+
+    pages = df.groupby('url').agg({score_col: 'mean', 'tier_weight': 'first'})
+    opportunity = (10 - pages[score_col]) * pages['tier_weight']
+    return opportunity.dropna().to_dict()
+
+@dataclass
+class RunBudget:
+    """Limits on how long and how expensive a run may be."""
+
+    max_seconds: Optional[float] = None
+    max_cost: Optional[float] = None
+
+    @property
+    def limited(self) -> bool:
+        """Whether any limit is set."""
+        return self.max_seconds is not None or self.max_cost is not None
+
+class BudgetTracker:
+    """Tracks elapsed time and model spend against a run budget."""
+
+    def __init__(self, budget: RunBudget = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            budget: Limits to enforce (optional, unlimited when omitted)
+        """
+        self.budget = budget or RunBudget()
+        self.started_at: Optional[float] = None
+        self.cost = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the clock; later calls keep the original start so one budget spans several pipelines."""
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the tracker was started."""
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+    def charge(self, provider: str, usage: Dict[str, int], prompt: str = "", response: str = "") -> float:
+        """
+        Add the cost of one model call.
+
+        Args:
+            provider: Model provider name
+            usage: Token usage reported by the provider (may be empty)
+            prompt: Prompt sent, used to estimate tokens when usage is missing
+            response: Response received, used to estimate tokens when usage is missing
+
+        Returns:
+            Cost of the call in USD
+        """
+        input_price, output_price = MODEL_PRICES.get(provider, (0.0, 0.0))
+        input_tokens = usage.get("input_tokens", len(prompt or "") // CHARS_PER_TOKEN)
+        output_tokens = usage.get("output_tokens", len(response or "") // CHARS_PER_TOKEN)
+        cost = (input_tokens * input_price + output_tokens * output_price) / 1000
+
+        with self._lock:
+            self.cost += cost
+            self.calls += 1
+        return cost
+
+    def exhausted(self) -> Optional[str]:
+        """
+        Check the budget.
+
+        Returns:
+            Why the budget is used up, or None while work may continue
+        """
+        budget = self.budget
+        if budget.max_seconds is not None and self.elapsed >= budget.max_seconds:
+            return f"time budget of {budget.max_seconds:.0f}s used"
+        if budget.max_cost is not None and self.cost >= budget.max_cost:
+            return f"cost budget of ${budget.max_cost:.2f} used"
+        return None
+
+class WorkScheduler:
+    """Orders URLs by business value and holds the run's budget."""
+
+    def __init__(self, methodology, opportunity_scores: Dict[str, float] = None, budget: RunBudget = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            methodology: Methodology used to classify URLs into tiers
+            opportunity_scores: Previous opportunity score by URL (optional)
+            budget: Time and cost limits for the run (optional)
+        """
+        self.methodology = methodology
+        self.opportunity_scores = opportunity_scores or {}
+        self.budget = BudgetTracker(budget)
+
+    def priority(self, url: str) -> Tuple[int, float]:
+        """
+        Sort key of a URL; lower keys are audited first.
+
+        Args:
+            url: URL to rank
+
+        Returns:
+            (group, negative opportunity score)
+        """
+        tier_name, _ = self.methodology.classify_url(url)
+        opportunity = self.opportunity_scores.get(url)
+        if opportunity is None and self.opportunity_scores:
+            # Scores from the dataset are keyed by the page dimension's canonical URL
+            from .page_dimension import canonical_url
+
+            opportunity = self.opportunity_scores.get(canonical_url(url))
+
+        if tier_name == "tier_1":
+            group = 0
+        elif opportunity is not None:
+            group = 1
+        else:
+            group = 2
+        return group, -(opportunity or 0.0)
+
+    def order(self, urls: List[str]) -> List[str]:
+        """
+        Order URLs for auditing.
+
+        Args:
+            urls: URLs in input order
+
+        Returns:
+            The same URLs, tier_1 first, then by previous opportunity score, then in input order
+        """
+        # sorted is stable, so ties keep their input order
+        ordered = sorted(urls, key=self.priority)
+        logger.info(f"Scheduled {len(ordered)} URLs by priority; first: {ordered[:3]}")
+        return ordered
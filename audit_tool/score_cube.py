@@ -0,0 +1,165 @@
+"""
+Score Cube for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module materialises the score roll-ups the dashboard shows, once, at packaging time:
+1. Groups criterion scores by every combination of persona, tier, criterion and descriptor
+2. Keeps the count, sum, sum of squares, min and max of each group, plus its distinct pages
+3. Marks each row with the dimensions rolled up into it, so totals never mix with groups
+4. Slices the cube by any dimensions, with equality or list filters on the others
+5. Derives means and sample standard deviations from the sums
+
+A cube holds one row per group of each of the 16 combinations, so its size
+depends on the number of personas, tiers, criteria and descriptors rather
+than on the number of pages audited, and a slice reads a few hundred rows
+however large the audit. Counts, sums and extremes add up across rows, so a
+slice that filters on several values of a dimension combines rows exactly;
+only the distinct page count becomes the sum of the combined rows' counts.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Dimensions of the cube, the first one in the most significant bit of rolled_up
+DIMENSIONS = ('persona', 'tier', 'criterion', 'descriptor')
+MEASURES = ('score_count', 'score_sum', 'score_sum_sq', 'score_min', 'score_max', 'pages')
+
+# File of the cube inside an audit_runs/<run> folder
+SCORE_CUBE_FILENAME = "score_cube.parquet"
+
+# Source columns of run page facts and the dashboard frames, for build_cube()
+PAGE_FACTS_SOURCE = {'score': 'raw_score', 'persona': 'persona_id', 'criterion': 'criterion_id'}
+
+# How slices combine the rows of one group
+_COMBINE = {'score_count': 'sum', 'score_sum': 'sum', 'score_sum_sq': 'sum',
+            'score_min': 'min', 'score_max': 'max', 'pages': 'sum'}
+
+def rolled_up(grouped: Iterable[str]) -> int:
+    """
+    Value of the rolled_up column for rows grouped by some dimensions.
+
+    Args:
+        grouped: Dimensions the rows are grouped by; every other one is rolled up
+
+    Returns:
+        Bit mask with one bit per rolled-up dimension, as SQL GROUPING() numbers them
+    """
+    grouped = set(grouped)
+    unknown = grouped - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+    return sum(1 << (len(DIMENSIONS) - 1 - i) for i, dim in enumerate(DIMENSIONS) if dim not in grouped)
+
+def _column(names: Sequence[str], source: str, name: str, sql_type: str) -> str:
+    if source in names:
+        return f'CAST("{source}" AS {sql_type}) AS {name}'
+    return f'CAST(NULL AS {sql_type}) AS {name}'
+
+def build_cube(rows: Union[pd.DataFrame, str, Path], score: str = 'score', page: str = 'page_id',
+               **columns: str) -> pd.DataFrame:
+    """
+    Aggregate criterion score rows into a cube.
+
+    Args:
+        rows: One row per page, persona and criterion, or a Parquet file of them,
+            which is aggregated as it is scanned rather than loaded
+        score: Column holding the score
+        page: Column identifying the page
+        **columns: Source column of each dimension whose column is not named after it,
+            e.g. criterion='criterion_code'; dimensions without a column are left empty
+
+    Returns:
+        One row per group of every combination of DIMENSIONS, with rolled_up and MEASURES
+    """
+    import duckdb
+
+    if isinstance(rows, pd.DataFrame):
+        names = list(rows.columns)
+    else:
+        import pyarrow.parquet as pq
+        names = pq.read_schema(rows).names
+    dims = ", ".join(DIMENSIONS)
+    select = ", ".join([_column(names, columns.get(dim, dim), dim, 'VARCHAR') for dim in DIMENSIONS] +
+                       [_column(names, score, 'score', 'DOUBLE'), _column(names, page, 'page', 'VARCHAR')])
+    connection = duckdb.connect()
+    try:
+        if isinstance(rows, pd.DataFrame):
+            connection.register('score_rows', rows)
+        else:
+            connection.read_parquet(str(rows)).create_view('score_rows')
+        cube = connection.execute(f"""
+            SELECT {dims},
+                   CAST(GROUPING({dims}) AS INTEGER) AS rolled_up,
+                   count(score) AS score_count,
+                   sum(score) AS score_sum,
+                   sum(score * score) AS score_sum_sq,
+                   min(score) AS score_min,
+                   max(score) AS score_max,
+                   count(DISTINCT page) AS pages
+            FROM (SELECT {select} FROM score_rows)
+            GROUP BY CUBE ({dims})
+            ORDER BY rolled_up, {dims}
+        """).df()
+    finally:
+        connection.close()
+    logger.info(f"Built score cube: {len(cube)} groups from {cube['score_count'].iloc[-1] if len(cube) else 0} scores")
+    return cube
+
+def add_stats(cells: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the mean and sample standard deviation of each row's scores.
+
+    Args:
+        cells: Rows with the cube measures
+
+    Returns:
+        The rows with mean and std columns; std is NaN for fewer than two scores
+    """
+    count = cells['score_count'].astype(float)
+    mean = cells['score_sum'] / count.where(count > 0)
+    variance = (cells['score_sum_sq'] - cells['score_sum'] * mean) / (count - 1).where(count > 1)
+    return cells.assign(mean=mean, std=np.sqrt(variance.clip(lower=0)))
+
+def slice_cube(cube: pd.DataFrame, by: Iterable[str] = (), **filters: Any) -> pd.DataFrame:
+    """
+    Read the groups of some dimensions from a cube.
+
+    Args:
+        cube: Cube returned by build_cube(), or several runs' cubes stacked
+        by: Dimensions to group by (the grand total when empty)
+        **filters: Value or list of values to keep for a dimension; None keeps every value
+
+    Returns:
+        One row per group, sorted by the group columns, with MEASURES, mean and std
+    """
+    if 'rolled_up' not in cube.columns:
+        cube = pd.DataFrame(columns=[*DIMENSIONS, 'rolled_up', *MEASURES])
+    by = list(by)
+    filters: Dict[str, Any] = {dim: value for dim, value in filters.items() if value is not None}
+    cells = cube[cube['rolled_up'] == rolled_up(set(by) | set(filters))]
+    for dim, value in filters.items():
+        values = [value] if isinstance(value, str) or not isinstance(value, Iterable) else list(value)
+        cells = cells[cells[dim].isin(values)]
+
+    if by:
+        combined = cells.groupby(by, dropna=False, sort=True, observed=True).agg(_COMBINE).reset_index()
+    else:
+        combined = pd.DataFrame([{measure: getattr(cells[measure], how)() for measure, how in _COMBINE.items()}])
+    return add_stats(combined)
+
+def grand_total(cube: pd.DataFrame, **filters: Any) -> Optional[Dict[str, Any]]:
+    """
+    Totals of a whole cube, or of the groups matching filters.
+
+    Returns:
+        MEASURES, mean and std, or None if no score matches
+    """
+    total = slice_cube(cube, **filters).to_dict('records')[0]
+    return total if total['score_count'] else None
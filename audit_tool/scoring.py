@@ -0,0 +1,360 @@
+"""
+Scoring Engine for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module scores a whole audit in one vectorised pass over the long-format
+criteria table (one row per page, persona and criterion):
+1. Resolves every row's methodology weight through one tier-by-code lookup table
+2. Computes weighted final scores per (persona, page) with grouped sums
+3. Labels scores with the methodology's descriptor bands
+4. Rolls page scores up per tier and channel, then into onsite, offsite and overall scores
+5. Derives the brand health index from hygiene score, sentiment and engagement
+
+Nothing loops over rows in Python: per-row work is done by NumPy on aligned
+arrays and per-group work by pandas groupby sums, so a million criteria rows
+score in well under a second.
+"""
+
+import logging
+from typing import Dict, List, Any, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .methodology_parser import MethodologyParser
+
+logger = logging.getLogger(__name__)
+
+# Weight of criteria the methodology does not know and the row does not carry
+DEFAULT_WEIGHT = 10.0
+
+# Experience labels as points out of 10
+SENTIMENT_SCORES = {'Positive': 8.0, 'Mixed': 5.0, 'Negative': 2.0, 'Neutral': 5.0}
+ENGAGEMENT_SCORES = {'High': 8.0, 'Medium': 5.0, 'Low': 2.0}
+NEUTRAL_SCORE = 5.0
+
+# Brand health index weights: hygiene score, sentiment, engagement
+BRAND_HEALTH_WEIGHTS = (0.60, 0.25, 0.15)
+
+# Descriptor bands used when the methodology defines none
+DEFAULT_DESCRIPTORS = {
+    '0-3': {'status': 'FAIL', 'label': 'Missing / Broken / Off-brand'},
+    '4-5': {'status': 'WARNING', 'label': 'Basic presence, no differentiation'},
+    '6-7': {'status': 'WARNING', 'label': 'Competent but generic'},
+    '8-9': {'status': 'PASS', 'label': 'Strong, differentiated, persona-relevant'},
+    '10': {'status': 'EXCELLENT', 'label': 'Exceptional, best-in-class'}
+}
+
+def _descriptor_bands(descriptors: Dict[Any, Dict[str, Any]]) -> Tuple[np.ndarray, List[str], List[Dict[str, Any]]]:
+    """Sort descriptor bands by their lower bound ('4-5' starts at 4, 10 at 10)."""
+    bands = []
+    for band, descriptor in descriptors.items():
+        lower = float(str(band).split('-')[0])
+        bands.append((lower, str(band), descriptor or {}))
+    bands.sort(key=lambda band: band[0])
+    return np.array([b[0] for b in bands]), [b[1] for b in bands], [b[2] for b in bands]
+
+def brand_health_index(hygiene: Any, sentiment: Any = NEUTRAL_SCORE, engagement: Any = NEUTRAL_SCORE) -> Any:
+    """
+    Composite brand health index, element-wise over arrays or for single values.
+
+    Args:
+        hygiene: Hygiene (final) scores out of 10
+        sentiment: Sentiment as points out of 10
+        engagement: Engagement as points out of 10
+
+    Returns:
+        Index rounded to two decimals, with the shape of the inputs
+    """
+    hygiene_weight, sentiment_weight, engagement_weight = BRAND_HEALTH_WEIGHTS
+    return np.round(np.asarray(hygiene, dtype=np.float64) * hygiene_weight
+                    + np.asarray(sentiment, dtype=np.float64) * sentiment_weight
+                    + np.asarray(engagement, dtype=np.float64) * engagement_weight, 2)
+
+def _take(uniques: pd.Index, codes: np.ndarray) -> Any:
+    """Values of factorized codes, missing where the code is -1."""
+    if not len(uniques):
+        return np.full(len(codes), None, dtype=object)
+    values = pd.Series(uniques.take(np.clip(codes, 0, None)))
+    return values.where(codes >= 0).to_numpy() if (codes < 0).any() else values.to_numpy()
+
+class ScoringEngine:
+    """Vectorised scoring of long-format criteria tables against a methodology."""
+
+    def __init__(self, methodology: "MethodologyParser" = None):
+        """
+        Initialize the engine with a methodology's weights, bands and tier weights.
+
+        Args:
+            methodology: Methodology parser (the packaged methodology when omitted)
+        """
+        if methodology is None:
+            from .criteria_index import DEFAULT_METHODOLOGY_PATH
+            from .methodology_parser import MethodologyParser
+
+            methodology = MethodologyParser(str(DEFAULT_METHODOLOGY_PATH))
+
+        config = methodology.config
+        self.index = methodology.criteria_index
+
+        scoring = config.get('scoring', {}) or {}
+        self._band_bounds, self.bands, self._band_descriptors = _descriptor_bands(
+            scoring.get('descriptors') or DEFAULT_DESCRIPTORS
+        )
+
+        # Tier keys by key and by display name, with their share of the onsite or offsite score
+        classification = config.get('classification', {}) or {}
+        self.tier_sites: Dict[str, str] = {}
+        self.tier_weights: Dict[str, float] = {}
+        self._tier_aliases: Dict[str, str] = {}
+        for site in ('onsite', 'offsite'):
+            for tier, tier_config in (classification.get(site, {}) or {}).items():
+                tier_config = tier_config or {}
+                self.tier_sites[tier] = site
+                self.tier_weights[tier] = float(tier_config.get(f'weight_in_{site}', 0) or 0)
+                self._tier_aliases[tier.lower()] = tier
+                if tier_config.get('name'):
+                    self._tier_aliases[str(tier_config['name']).lower()] = tier
+
+        calculation = config.get('calculation', {}) or {}
+        self.site_weights = {
+            'onsite': float(calculation.get('onsite_weight', 0.7)),
+            'offsite': float(calculation.get('offsite_weight', 0.3))
+        }
+
+    def tier_keys(self, tiers: Any) -> pd.Series:
+        """
+        Resolve tier labels (keys such as tier_1 or names such as Brand Positioning) to tier keys.
+
+        Args:
+            tiers: Column of tier labels
+
+        Returns:
+            Tier keys, with unrecognised labels left unchanged
+        """
+        tiers = pd.Series(tiers, copy=False)
+        tier_ids, keys = self._factorize_tiers(tiers)
+        return pd.Series(np.array(keys + [None], dtype=object)[tier_ids], index=tiers.index)
+
+    def _factorize_tiers(self, tiers: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+        # Labels are resolved once per distinct value, rows only carry integer ids
+        tier_ids, labels = pd.factorize(tiers)
+        keys = [self._tier_aliases.get(str(label).strip().lower(), label) for label in labels]
+        return tier_ids, keys
+
+    def weights(self, criteria: pd.DataFrame, code_column: str = 'criterion_code',
+                tier_column: str = 'tier', fallback_column: str = 'weight_pct') -> np.ndarray:
+        """
+        Methodology weight of every criteria row.
+
+        The weight comes from the row's tier definition of the criterion, then from
+        the criterion's shared definition, then from the row's own fallback column,
+        and DEFAULT_WEIGHT otherwise. Each distinct (tier, code) pair is looked up
+        once; rows are filled by array indexing.
+
+        Args:
+            criteria: Long-format criteria table
+            code_column: Column holding criterion codes
+            tier_column: Column holding tier keys or names (optional)
+            fallback_column: Column of weights used for codes the methodology lacks (optional)
+
+        Returns:
+            Weights aligned with the rows of the table
+        """
+        if tier_column in criteria:
+            tier_ids, tiers = self._factorize_tiers(criteria[tier_column])
+        else:
+            tier_ids, tiers = np.zeros(len(criteria), dtype=np.intp), [None]
+        fallback = criteria[fallback_column] if fallback_column in criteria else None
+        return self._weights(criteria[code_column], tier_ids, tiers, fallback)
+
+    def _weights(self, code_column: pd.Series, tier_ids: np.ndarray, tiers: List[Any],
+                 fallback: Optional[pd.Series]) -> np.ndarray:
+        code_ids, codes = pd.factorize(code_column)
+        table = np.array([[self.index.weight(code, tier=tier if tier in self.index.tier_codes else None,
+                                             default=np.nan)
+                           for code in codes] + [np.nan]
+                          for tier in list(tiers) + [None]], dtype=np.float64).reshape(len(tiers) + 1, len(codes) + 1)
+        # Shared definitions for codes the row's own tier does not define
+        shared = np.array([self.index.weight(code, default=np.nan) for code in codes] + [np.nan], dtype=np.float64)
+        table = np.where(np.isnan(table), shared, table)
+
+        weights = table[tier_ids, code_ids]
+        missing = np.isnan(weights)
+        if missing.any() and fallback is not None:
+            fallback = pd.to_numeric(fallback, errors='coerce').to_numpy(dtype=np.float64)
+            weights = np.where(missing, fallback, weights)
+        return np.where(np.isnan(weights), DEFAULT_WEIGHT, weights)
+
+    def descriptors(self, scores: Any, field: str = 'status') -> pd.Categorical:
+        """
+        Methodology descriptor of every score.
+
+        Args:
+            scores: Scores out of 10
+            field: Descriptor field to return ('status', 'label', 'color') or 'band'
+
+        Returns:
+            Categorical of descriptors, missing where the score is missing
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        positions = np.searchsorted(self._band_bounds, np.floor(scores), side='right') - 1
+        if field == 'band':
+            values = self.bands
+        else:
+            values = [descriptor.get(field, band) for band, descriptor in zip(self.bands, self._band_descriptors)]
+        categories = list(dict.fromkeys(values))
+        value_codes = np.array([categories.index(value) for value in values])
+        codes = np.where(np.isnan(scores) | (positions < 0), -1, value_codes[np.clip(positions, 0, None)])
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+    def score_pages(self, criteria: pd.DataFrame, experience: pd.DataFrame = None,
+                    keys: Sequence[str] = ('persona', 'page_id')) -> pd.DataFrame:
+        """
+        Weighted final score, descriptor and brand health index of every page.
+
+        Args:
+            criteria: Long-format criteria table with 'score' and 'criterion_code' columns
+            experience: Experience table with 'overall_sentiment' and 'engagement_level' (optional)
+            keys: Columns identifying a page; those missing from the table are ignored
+
+        Returns:
+            One row per page with final_score, mean_score, criteria_count, tier,
+            descriptor and brand_health_index
+        """
+        keys = [key for key in keys if key in criteria]
+        if not keys:
+            raise ValueError("criteria table has none of the page key columns")
+
+        if 'tier' in criteria:
+            tier_ids, tiers = self._factorize_tiers(criteria['tier'])
+        else:
+            tier_ids, tiers = np.zeros(len(criteria), dtype=np.intp), [None]
+
+        scores = pd.to_numeric(criteria['score'], errors='coerce').to_numpy(dtype=np.float64)
+        scored = ~np.isnan(scores)
+        weights = np.where(scored, self._weights(criteria['criterion_code'], tier_ids, tiers,
+                                                 criteria.get('weight_pct')), 0.0)
+
+        # Group on integer codes; string keys are only looked up again for the page rows
+        key_uniques = {}
+        sums = pd.DataFrame({
+            'weighted': np.where(scored, scores, 0.0) * weights,
+            'weight': weights,
+            'score': np.where(scored, scores, 0.0),
+            'criteria_count': scored.astype(np.int64),
+            'tier': tier_ids
+        })
+        for key in keys:
+            sums[key], key_uniques[key] = pd.factorize(criteria[key])
+
+        grouped = sums.groupby(keys, sort=False)
+        pages = grouped[['weighted', 'weight', 'score', 'criteria_count']].sum()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pages['final_score'] = np.where(pages['weight'] > 0, pages['weighted'] / pages['weight'], np.nan)
+            pages['mean_score'] = np.where(pages['criteria_count'] > 0,
+                                           pages['score'] / pages['criteria_count'], np.nan)
+        page_tiers = grouped['tier'].first().to_numpy()
+        pages = pages.drop(columns=['weighted', 'weight', 'score']).reset_index()
+        for key in keys:
+            pages[key] = _take(key_uniques[key], pages[key].to_numpy())
+        if 'tier' in criteria:
+            pages['tier'] = np.array(tiers + [None], dtype=object)[page_tiers]
+        pages['descriptor'] = self.descriptors(pages['final_score'])
+
+        sentiment = engagement = NEUTRAL_SCORE
+        if experience is not None and not experience.empty:
+            experience = self._experience_scores(experience, keys)
+            aligned = pages[keys].merge(experience, on=keys, how='left')
+            sentiment = aligned['sentiment_score'].fillna(NEUTRAL_SCORE).to_numpy()
+            engagement = aligned['engagement_score'].fillna(NEUTRAL_SCORE).to_numpy()
+        pages['brand_health_index'] = brand_health_index(pages['final_score'].fillna(0.0), sentiment, engagement)
+        return pages
+
+    def _experience_scores(self, experience: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        # The experience table names the persona persona_id
+        if 'persona' in keys and 'persona' not in experience and 'persona_id' in experience:
+            experience = experience.rename(columns={'persona_id': 'persona'})
+        scores = pd.DataFrame({key: experience[key].to_numpy() for key in keys})
+        scores['sentiment_score'] = experience.get('overall_sentiment', pd.Series(index=experience.index, dtype=object)) \
+            .map(SENTIMENT_SCORES).to_numpy()
+        scores['engagement_score'] = experience.get('engagement_level', pd.Series(index=experience.index, dtype=object)) \
+            .map(ENGAGEMENT_SCORES).to_numpy()
+        return scores.drop_duplicates(keys, keep='last')
+
+    def tier_rollup(self, pages: pd.DataFrame, group: str = 'persona') -> pd.DataFrame:
+        """
+        Average page score per tier or channel.
+
+        Args:
+            pages: Page scores as returned by score_pages
+            group: Column grouping the roll-up, usually the persona (ignored when missing)
+
+        Returns:
+            One row per (group, tier) with page_count, average_score, site and tier_weight,
+            and average_health when the pages carry a brand_health_index
+        """
+        keys = ([group] if group in pages else []) + ['tier']
+        measures = dict(page_count=('final_score', 'count'), average_score=('final_score', 'mean'))
+        if 'brand_health_index' in pages:
+            measures['average_health'] = ('brand_health_index', 'mean')
+        rollup = pages.groupby(keys, sort=True, observed=True).agg(**measures).reset_index()
+        rollup['site'] = rollup['tier'].map(self.tier_sites)
+        rollup['tier_weight'] = rollup['tier'].map(self.tier_weights)
+        return rollup
+
+    def overall_scores(self, rollup: pd.DataFrame, group: str = 'persona') -> pd.DataFrame:
+        """
+        Onsite, offsite and overall scores from a tier roll-up.
+
+        Each site's score is the tier-weighted average of its tiers' scores over the
+        tiers that were audited; the overall score combines the sites by the
+        methodology's onsite and offsite weights, renormalised when a site is missing.
+
+        Args:
+            rollup: Tier roll-up as returned by tier_rollup
+            group: Column grouping the scores, usually the persona (ignored when missing)
+
+        Returns:
+            One row per group with onsite_score, offsite_score and overall_score
+        """
+        keys = [group] if group in rollup else []
+        known = rollup[rollup['site'].notna() & (rollup['tier_weight'] > 0) & rollup['average_score'].notna()]
+        known = known.assign(weighted=known['average_score'] * known['tier_weight'])
+        sites = known.groupby(keys + ['site'], observed=True)[['weighted', 'tier_weight']].sum()
+        site_scores = sites['weighted'] / sites['tier_weight']
+        site_scores = site_scores.unstack('site') if keys else site_scores.to_frame().T.reset_index(drop=True)
+        for site in ('onsite', 'offsite'):
+            if site not in site_scores:
+                site_scores[site] = np.nan
+
+        onsite = site_scores['onsite'].to_numpy(dtype=np.float64)
+        offsite = site_scores['offsite'].to_numpy(dtype=np.float64)
+        onsite_weight = np.where(np.isnan(onsite), 0.0, self.site_weights['onsite'])
+        offsite_weight = np.where(np.isnan(offsite), 0.0, self.site_weights['offsite'])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            overall = (np.nan_to_num(onsite) * onsite_weight + np.nan_to_num(offsite) * offsite_weight) \
+                / (onsite_weight + offsite_weight)
+
+        result = pd.DataFrame({'onsite_score': onsite, 'offsite_score': offsite, 'overall_score': overall},
+                              index=site_scores.index)
+        return result.reset_index() if keys else result.reset_index(drop=True)
+
+    def score(self, criteria: pd.DataFrame, experience: pd.DataFrame = None) -> Dict[str, pd.DataFrame]:
+        """
+        Score a whole audit in one pass.
+
+        Args:
+            criteria: Long-format criteria table covering every page and persona
+            experience: Experience table (optional)
+
+        Returns:
+            Dictionary with 'pages', 'tiers' and 'overall' tables
+        """
+        pages = self.score_pages(criteria, experience)
+        tiers = self.tier_rollup(pages)
+        overall = self.overall_scores(tiers)
+        logger.debug(f"Scored {len(criteria)} criteria rows into {len(pages)} page scores")
+        return {'pages': pages, 'tiers': tiers, 'overall': overall}
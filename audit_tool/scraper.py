@@ -1,15 +1,19 @@
 """
 This module is responsible for scraping web content.
 """
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 from .models import PageData
-from typing import List
+from typing import List, TYPE_CHECKING
 import logging
 import os
+import queue
 import pickle
+import threading
+from concurrent.futures import Future
 from urllib.parse import urlparse
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 CACHE_DIR = "cache"
 
 class Scraper:
@@ -17,7 +21,13 @@ class Scraper:
     A class to handle web scraping operations using Playwright and BeautifulSoup.
     It includes a caching mechanism to avoid re-fetching pages.
     """
-    def __init__(self):
+    def __init__(self, browser: "WarmBrowser" = None):
+        """
+        Args:
+            browser: Long-lived browser to fetch pages with (optional). Without one,
+                a fresh Chromium is launched for every cache miss.
+        """
+        self.browser = browser
         if not os.path.exists(CACHE_DIR):
             os.makedirs(CACHE_DIR)
 
@@ -56,21 +66,21 @@ class Scraper:
                 logging.error(f"Could not load cache for {url}. Error: {e}")
         return None
 
-    def _check_tagline(self, soup: BeautifulSoup) -> bool:
+    def _check_tagline(self, soup: "BeautifulSoup") -> bool:
         """Checks if the corporate tagline is present on the page."""
         tagline = "The world is how we shape it"
         return tagline.lower() in soup.get_text().lower()
 
-    def _check_placeholder_content(self, soup: BeautifulSoup) -> bool:
+    def _check_placeholder_content(self, soup: "BeautifulSoup") -> bool:
         """Checks for lorem ipsum placeholder text."""
         return "lorem ipsum" in soup.get_text().lower()
 
-    def _get_h1_text(self, soup: BeautifulSoup) -> str:
+    def _get_h1_text(self, soup: "BeautifulSoup") -> str:
         """Gets the text of the first h1 tag, lowercased."""
         h1 = soup.find('h1')
         return h1.get_text(strip=True).lower() if h1 else ""
 
-    def _get_nav_links(self, soup: BeautifulSoup) -> List[str]:
+    def _get_nav_links(self, soup: "BeautifulSoup") -> List[str]:
         """Gets a list of all link texts within <nav> elements, lowercased."""
         nav_links = []
         for nav in soup.find_all('nav'):
@@ -78,6 +88,28 @@ class Scraper:
                 nav_links.append(link.get_text(strip=True).lower())
         return nav_links
 
+    def _build_page_data(self, url: str, html_content: str) -> PageData:
+        """Extracts the text and objective findings from a page's HTML."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        raw_text = soup.get_text(separator=' ', strip=True)
+
+        findings = {
+            "has_tagline": self._check_tagline(soup),
+            "has_placeholder_content": self._check_placeholder_content(soup),
+            "h1_text": self._get_h1_text(soup),
+            "nav_links": self._get_nav_links(soup),
+        }
+
+        return PageData(
+            url=url,
+            raw_text=raw_text,
+            is_404=False,
+            objective_findings=findings
+        )
+
     def fetch_page(self, url: str) -> PageData:
         """
         Fetches the page, extracts text, and performs objective checks.
@@ -94,36 +126,120 @@ class Scraper:
         # If not in cache, fetch live
         logging.info(f"No cache found for {url}. Fetching live.")
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                page.goto(url, wait_until='networkidle')
-                
-                html_content = page.content()
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                raw_text = soup.get_text(separator=' ', strip=True)
-
-                findings = {
-                    "has_tagline": self._check_tagline(soup),
-                    "has_placeholder_content": self._check_placeholder_content(soup),
-                    "h1_text": self._get_h1_text(soup),
-                    "nav_links": self._get_nav_links(soup),
-                }
+            if self.browser is not None:
+                html_content = self.browser.fetch_html(url)
+            else:
+                # Playwright is only needed on a cache miss
+                from playwright.sync_api import sync_playwright
 
-                browser.close()
-                page_data_obj = PageData(
-                    url=url,
-                    raw_text=raw_text,
-                    is_404=False,
-                    objective_findings=findings
-                )
-                
-                # Save to cache before returning
-                self._save_to_cache(url, page_data_obj)
-                
-                return page_data_obj
+                with sync_playwright() as p:
+                    browser = p.chromium.launch()
+                    page = browser.new_page()
+                    page.goto(url, wait_until='networkidle')
+                    html_content = page.content()
+                    browser.close()
+
+            page_data_obj = self._build_page_data(url, html_content)
+
+            # Save to cache before returning
+            self._save_to_cache(url, page_data_obj)
+
+            return page_data_obj
 
         except Exception as e:
             logging.error(f"An error occurred while fetching {url}: {e}")
-            return PageData(url=url, raw_text="", is_404=True, objective_findings={}) 
\ No newline at end of file
+            return PageData(url=url, raw_text="", is_404=True, objective_findings={}) 
+
+class WarmBrowser:
+    """
+    A Chromium instance kept running on a dedicated thread.
+
+    Playwright's sync API must be used from the thread that started it, so
+    every fetch is handed to that thread and waited for. This lets a
+    long-running process (the audit daemon) reuse one browser for all jobs
+    instead of launching Chromium for every page.
+    """
+    def __init__(self, navigation_timeout_ms: int = 30000):
+        self.navigation_timeout_ms = navigation_timeout_ms
+        self._requests = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts the browser thread if it is not already running."""
+        with self._lock:
+            self._start_locked()
+
+    def fetch_html(self, url: str, timeout: float = 120.0) -> str:
+        """Loads a URL in the warm browser and returns the rendered HTML."""
+        future = Future()
+        # Queued under the lock, so a request is never left behind by a browser thread that just failed
+        with self._lock:
+            self._start_locked()
+            self._requests.put((url, future))
+        return future.result(timeout=timeout)
+
+    def close(self):
+        """Stops the browser thread and closes Chromium."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._requests.put(None)
+            thread.join(timeout=30)
+
+    def _start_locked(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="warm-browser", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self._serve()
+        except Exception as e:
+            logging.error(f"Warm browser failed: {e}")
+            self._fail_pending(e)
+
+    def _fail_pending(self, error: Exception):
+        # Waiting fetches fail now instead of at their timeout; the next fetch starts a new thread
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+            while True:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    return
+                if request is not None and request[1].set_running_or_notify_cancel():
+                    request[1].set_exception(error)
+
+    def _serve(self):
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            logging.info("Warm browser started.")
+            try:
+                while True:
+                    request = self._requests.get()
+                    if request is None:
+                        break
+                    url, future = request
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        page = browser.new_page()
+                    except Exception as e:
+                        # The browser itself is gone; the remaining requests fail in _run
+                        future.set_exception(e)
+                        raise
+                    try:
+                        page.goto(url, wait_until='networkidle', timeout=self.navigation_timeout_ms)
+                        future.set_result(page.content())
+                    except Exception as e:
+                        future.set_exception(e)
+                    finally:
+                        page.close()
+            finally:
+                browser.close()
+                logging.info("Warm browser stopped.")
@@ -0,0 +1,552 @@
+"""
+Audit Daemon for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module keeps the audit machinery warm in one long-running process:
+1. Loads methodology.yaml, the AI interfaces and a Chromium instance once
+2. Accepts audit jobs over a local HTTP API (submit, status, cancel, events)
+3. Runs several jobs at once, sharing one rate limiter for model calls
+4. Streams per-page progress events that clients can long-poll
+5. Provides AuditClient, the thin client used by the dashboard
+
+Start it with `python -m audit_tool serve`. The API only listens on
+localhost by default and is intended for the dashboard running alongside it.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import argparse
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+from urllib.parse import urlparse, parse_qs, quote
+
+from .ai_interface import AIInterface, RateLimiter
+from .main import BrandAuditTool, configure_logging
+from .methodology_parser import MethodologyParser
+from .pipeline import PipelineConfig
+from .scraper import Scraper, WarmBrowser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Job states after which nothing else happens
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+@dataclass
+class AuditJob:
+    """An audit submitted to the daemon, with its progress events."""
+
+    job_id: str
+    urls: List[str]
+    persona_paths: List[str]
+    model: str
+    output_dir: str
+    resume: bool = False
+    since: Optional[str] = None
+    persona_digest: bool = False
+    status: str = "queued"
+    submitted_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    counts: Dict[str, int] = field(default_factory=lambda: {"success": 0, "error": 0})
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    _changed: threading.Condition = field(default_factory=threading.Condition)
+
+    @property
+    def total(self) -> int:
+        """Number of (url, persona) pairs in the job."""
+        return len(self.urls) * len(self.persona_paths)
+
+    def emit(self, event_type: str, **data) -> Dict[str, Any]:
+        """
+        Append an event and wake any client waiting for one.
+
+        Args:
+            event_type: Event name (e.g. "page", "finished")
+            **data: Event payload
+
+        Returns:
+            The event
+        """
+        with self._changed:
+            event = {"seq": len(self.events) + 1, "type": event_type, "time": time.time(), **data}
+            self.events.append(event)
+            self._changed.notify_all()
+        return event
+
+    def events_after(self, after: int, wait: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Return events with a sequence number above `after`, waiting for one if none exist yet.
+
+        Args:
+            after: Last sequence number the client has seen
+            wait: Seconds to wait for a new event
+
+        Returns:
+            New events, possibly empty
+        """
+        with self._changed:
+            if len(self.events) <= after and wait > 0 and self.status not in TERMINAL_STATES:
+                self._changed.wait(timeout=wait)
+            return self.events[after:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status as returned by the API."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "model": self.model,
+            "urls": len(self.urls),
+            "personas": len(self.persona_paths),
+            "total": self.total,
+            "completed": self.counts["success"] + self.counts["error"],
+            "counts": dict(self.counts),
+            "output_dir": self.output_dir,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "last_event": len(self.events)
+        }
+
+class AuditService:
+    """Runs audit jobs against warm, shared components."""
+
+    def __init__(self, config_path: str = None, max_jobs: int = 2, llm_concurrency: int = 4,
+                 requests_per_minute: int = None, warm_browser: bool = True,
+                 jobs_dir: str = "audit_jobs", pipeline_config: PipelineConfig = None,
+                 output_root: str = "audit_outputs"):
+        """
+        Load the shared components.
+
+        Args:
+            config_path: Path to the methodology configuration (optional)
+            max_jobs: Jobs run at the same time; further jobs wait in the queue
+            llm_concurrency: Model calls in flight across all jobs
+            requests_per_minute: Model calls started per minute across all jobs (optional)
+            warm_browser: Keep one Chromium running for cache misses
+            jobs_dir: Where uploaded persona files are stored
+            pipeline_config: Stage worker counts for each job (optional)
+            output_root: Directory holding each job's output directory, <output_root>/<job_id>,
+                when the job does not name one
+        """
+        self.methodology = MethodologyParser(config_path)
+        self.browser = WarmBrowser() if warm_browser else None
+        self.scraper = Scraper(browser=self.browser)
+        self.rate_limiter = RateLimiter(llm_concurrency, requests_per_minute)
+        self.pipeline_config = pipeline_config or PipelineConfig()
+        self.jobs_dir = Path(jobs_dir)
+        self.output_root = Path(output_root)
+
+        self.jobs: Dict[str, AuditJob] = {}
+        self._ai: Dict[str, AIInterface] = {}
+        self._lock = threading.Lock()
+        # Jobs naming the same output directory would share its journal, tables and run partition
+        self._dir_locks: Dict[str, threading.Lock] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="audit-job")
+
+        logger.info(f"Audit service ready: {max_jobs} concurrent jobs, {llm_concurrency} model calls in flight")
+
+    def ai_for(self, model: str) -> AIInterface:
+        """
+        Return the shared AI interface for a provider, creating it on first use.
+
+        Args:
+            model: Provider name ("anthropic" or "openai")
+
+        Returns:
+            The AI interface
+        """
+        with self._lock:
+            if model not in self._ai:
+                self._ai[model] = AIInterface(model, rate_limiter=self.rate_limiter)
+            return self._ai[model]
+
+    def submit(self, spec: Dict[str, Any]) -> AuditJob:
+        """
+        Queue an audit job.
+
+        Args:
+            spec: Job request with "urls" and either "persona_paths" or "personas"
+                ([{"filename", "content"}]), plus optional "model", "output_dir",
+                "resume", "since" and "persona_digest". Without "output_dir" the job
+                writes to <output_root>/<job_id>; jobs naming the same directory run
+                one after another
+
+        Returns:
+            The queued job
+        """
+        urls = [url.strip() for url in spec.get("urls", []) if url and url.strip()]
+        if not urls:
+            raise ValueError("A job needs at least one URL")
+
+        job_id = uuid.uuid4().hex[:12]
+        persona_paths = [str(p) for p in spec.get("persona_paths", [])]
+
+        # Uploaded personas are saved so the job can read them after the request returns
+        for persona in spec.get("personas", []):
+            job_dir = self.jobs_dir / job_id
+            job_dir.mkdir(parents=True, exist_ok=True)
+            path = job_dir / Path(persona.get("filename") or "persona.md").name
+            path.write_text(persona["content"], encoding="utf-8")
+            persona_paths.append(str(path))
+
+        if not persona_paths:
+            raise ValueError("A job needs at least one persona")
+
+        job = AuditJob(
+            job_id=job_id,
+            urls=urls,
+            persona_paths=persona_paths,
+            model=spec.get("model", "anthropic"),
+            output_dir=spec.get("output_dir") or str(self.output_root / job_id),
+            resume=bool(spec.get("resume", False)),
+            since=spec.get("since"),
+            persona_digest=bool(spec.get("persona_digest", False))
+        )
+
+        with self._lock:
+            self.jobs[job_id] = job
+        job.emit("queued", total=job.total)
+        self._executor.submit(self._run_job, job)
+
+        logger.info(f"Queued job {job_id}: {len(urls)} URLs x {len(persona_paths)} personas")
+        return job
+
+    def get(self, job_id: str) -> Optional[AuditJob]:
+        """Look up a job by id."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[AuditJob]:
+        """Return every job, oldest first."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[AuditJob]:
+        """
+        Cancel a job. Queued jobs never start; running jobs stop feeding pages
+        and skip the work that has not started yet.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        job = self.get(job_id)
+        if job is not None and job.status not in TERMINAL_STATES:
+            job.cancel_event.set()
+            job.emit("cancelling")
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and release the warm browser."""
+        for job in self.list_jobs():
+            self.cancel(job.job_id)
+        self._executor.shutdown(wait=True)
+        if self.browser is not None:
+            self.browser.close()
+
+    def _output_lock(self, output_dir: str) -> threading.Lock:
+        with self._lock:
+            return self._dir_locks.setdefault(os.path.abspath(output_dir), threading.Lock())
+
+    def _run_job(self, job: AuditJob) -> None:
+        output_lock = self._output_lock(job.output_dir)
+        if not output_lock.acquire(blocking=False):
+            job.emit("waiting", output_dir=job.output_dir)
+            while not output_lock.acquire(timeout=0.5):
+                if job.cancel_event.is_set():
+                    self._finish(job, "cancelled")
+                    return
+        try:
+            self._run_job_in_dir(job)
+        finally:
+            output_lock.release()
+
+    def _run_job_in_dir(self, job: AuditJob) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, "cancelled")
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now().isoformat(timespec='seconds')
+        job.emit("started")
+
+        try:
+            tool = BrandAuditTool(
+                pipeline_config=self.pipeline_config,
+                methodology=self.methodology,
+                scraper=self.scraper,
+                ai=self.ai_for(job.model)
+            )
+            tool.audit_outputs_dir = Path(job.output_dir)
+            os.makedirs(tool.audit_outputs_dir, exist_ok=True)
+            tool.resume = job.resume
+            tool.since = Path(job.since) if job.since else None
+            tool.persona_digest = job.persona_digest
+            tool.cancel_event = job.cancel_event
+            tool.on_page_result = lambda task: self._on_page_result(job, task)
+
+            if len(job.persona_paths) > 1:
+                tool.run_multi_persona_audit(job.urls, job.persona_paths)
+            else:
+                tool.run_audit(job.urls, job.persona_paths[0])
+
+            self._finish(job, "cancelled" if job.cancel_event.is_set() else "completed")
+
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}")
+            job.error = str(e)
+            self._finish(job, "failed")
+
+    def _on_page_result(self, job: AuditJob, task) -> None:
+        status = (task.result or {}).get("status", "error")
+        with job._changed:
+            job.counts["success" if status == "success" else "error"] += 1
+        job.emit(
+            "page",
+            url=task.url,
+            persona=task.persona.name,
+            status=status,
+            message=(task.result or {}).get("message"),
+            completed=job.counts["success"] + job.counts["error"],
+            total=job.total
+        )
+
+    def _finish(self, job: AuditJob, status: str) -> None:
+        job.status = status
+        job.finished_at = datetime.now().isoformat(timespec='seconds')
+        job.emit("finished", status=status, counts=dict(job.counts), error=job.error)
+        logger.info(f"Job {job.job_id} {status}: {job.counts}")
+
+class _AuditRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the audit service."""
+
+    server_version = "AuditDaemon/1.0"
+
+    @property
+    def service(self) -> AuditService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_or_404(self, job_id: str) -> Optional[AuditJob]:
+        job = self.service.get(job_id)
+        if job is None:
+            self._send(404, {"error": f"Unknown job: {job_id}"})
+        return job
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        query = parse_qs(parsed.query)
+
+        if parts == ["health"]:
+            self._send(200, {"status": "ok", "jobs": len(self.service.list_jobs())})
+        elif parts == ["jobs"]:
+            self._send(200, {"jobs": [job.to_dict() for job in self.service.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._send(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                after = int(query.get("after", ["0"])[0])
+                wait = min(float(query.get("wait", ["0"])[0]), 60.0)
+                events = job.events_after(after, wait)
+                self._send(200, {"status": job.status, "events": events})
+        else:
+            self._send(404, {"error": f"Unknown path: {parsed.path}"})
+
+    def do_POST(self):
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+
+        if parts == ["jobs"]:
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                spec = json.loads(self.rfile.read(length) or b"{}")
+                job = self.service.submit(spec)
+            except (ValueError, KeyError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            self._send(202, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            job = self.service.cancel(parts[1])
+            if job is None:
+                self._send(404, {"error": f"Unknown job: {parts[1]}"})
+            else:
+                self._send(200, job.to_dict())
+        else:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+
+class AuditServer(ThreadingHTTPServer):
+    """HTTP server exposing an AuditService."""
+
+    daemon_threads = True
+
+    def __init__(self, service: AuditService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        super().__init__((host, port), _AuditRequestHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        """Base URL of the API."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+class AuditClient:
+    """Thin client for the audit daemon's API."""
+
+    def __init__(self, base_url: str = None, timeout: float = 10.0):
+        """
+        Args:
+            base_url: Daemon URL (optional, defaults to $AUDIT_DAEMON_URL or localhost)
+            timeout: Socket timeout for requests that do not long-poll
+        """
+        self.base_url = (base_url or os.environ.get("AUDIT_DAEMON_URL")
+                         or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib_request.Request(self.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib_request.urlopen(req, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read() or b"{}")
+        except HTTPError as e:
+            detail = json.loads(e.read() or b"{}").get("error", e.reason)
+            raise RuntimeError(f"Audit daemon returned {e.code}: {detail}") from None
+
+    def is_available(self) -> bool:
+        """Whether the daemon answers its health check."""
+        try:
+            return self._request("GET", "/health", timeout=1.0).get("status") == "ok"
+        except Exception:
+            return False
+
+    def submit(self, urls: List[str], persona_paths: List[str] = None, personas: List[Dict[str, str]] = None,
+               model: str = "anthropic", output_dir: str = None, **options) -> Dict[str, Any]:
+        """
+        Submit an audit job.
+
+        Args:
+            urls: URLs to audit
+            persona_paths: Persona files readable by the daemon (optional)
+            personas: Uploaded personas as [{"filename", "content"}] (optional)
+            model: Provider name
+            output_dir: Output directory for the run (optional)
+            **options: Further job options ("resume", "since", "persona_digest")
+
+        Returns:
+            The job status
+        """
+        spec = {"urls": urls, "persona_paths": persona_paths or [], "personas": personas or [], "model": model}
+        if output_dir:
+            spec["output_dir"] = output_dir
+        spec.update(options)
+        return self._request("POST", "/jobs", spec)
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """Return a job's status."""
+        return self._request("GET", f"/jobs/{quote(job_id)}")
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a job."""
+        return self._request("POST", f"/jobs/{quote(job_id)}/cancel")
+
+    def events(self, job_id: str, after: int = 0, wait: float = 0.0) -> Dict[str, Any]:
+        """Return events after a sequence number, long-polling up to `wait` seconds."""
+        return self._request("GET", f"/jobs/{quote(job_id)}/events?after={after}&wait={wait}",
+                             timeout=self.timeout + wait)
+
+    def stream_events(self, job_id: str, wait: float = 10.0):
+        """
+        Yield a job's events until it finishes.
+
+        Args:
+            job_id: Job to follow
+            wait: Long-poll duration per request
+        """
+        after = 0
+        while True:
+            response = self.events(job_id, after, wait)
+            for event in response["events"]:
+                after = event["seq"]
+                yield event
+            if response["status"] in TERMINAL_STATES and not response["events"]:
+                return
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **service_options) -> None:
+    """
+    Run the audit daemon until interrupted.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        **service_options: Options passed to AuditService
+    """
+    service = AuditService(**service_options)
+    server = AuditServer(service, host, port)
+    logger.info(f"Audit daemon listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down audit daemon")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+def main(argv: List[str] = None) -> None:
+    """Command-line entry point for `python -m audit_tool serve`."""
+    parser = argparse.ArgumentParser(prog="audit_tool serve", description="Brand Audit daemon")
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--config', type=str, help='Path to configuration file')
+    parser.add_argument('--max-jobs', type=int, default=2, help='Jobs run at the same time')
+    parser.add_argument('--llm-concurrency', type=int, default=4, help='Model calls in flight across all jobs')
+    parser.add_argument('--requests-per-minute', type=int, help='Model calls started per minute across all jobs')
+    parser.add_argument('--no-warm-browser', action='store_true', help='Launch Chromium per page instead')
+    parser.add_argument('--output-root', type=str, default="audit_outputs",
+                        help='Directory of per-job output directories for jobs that do not name one')
+
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    serve(
+        args.host,
+        args.port,
+        config_path=args.config,
+        max_jobs=args.max_jobs,
+        llm_concurrency=args.llm_concurrency,
+        requests_per_minute=args.requests_per_minute,
+        warm_browser=not args.no_warm_browser,
+        output_root=args.output_root
+    )
@@ -13,24 +13,103 @@ It serves as a critical analysis component that:
 
 The generator supports both direct AI-based summary generation and
 data-driven statistical analysis approaches, providing a comprehensive
-view of brand health across the audited digital estate.
+view of brand health across the audited digital estate. SummaryAggregator
+keeps the same statistics online as each page is packaged, so a run can
+render its summary at any point without reading the scorecards back.
 """
 
 import os
-import re
 import glob
 import json
+import heapq
 import logging
+import math
 import pandas as pd
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
-from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple, Any, Optional
 
 from .ai_interface import AIInterface
 from .methodology_parser import MethodologyParser
+from .report_parser import parse_report_file
 
 logger = logging.getLogger(__name__)
 
+def render_summary_markdown(persona_name: str, page_count: int, stats: Dict) -> str:
+    """
+    Render the strategic summary markdown from pre-aggregated statistics.
+    
+    Args:
+        persona_name: Name of the persona
+        page_count: Number of pages audited
+        stats: Statistics shaped like StrategicSummaryGenerator._calculate_summary_stats() returns
+        
+    Returns:
+        Markdown formatted report
+    """
+    # Format the report
+    report = f"""# Strategic Brand Audit Summary for {persona_name}
+
+## Executive Summary
+
+This report presents a comprehensive analysis of Sopra Steria's brand presence across {page_count} digital touchpoints, evaluated from the perspective of {persona_name}. The overall brand health score is **{stats['overall_score']:.1f}/10**.
+
+"""
+    
+    # Add tier breakdown
+    report += "## Tier Performance\n\n"
+    for tier, avg in stats['tier_averages'].items():
+        tier_name = str(tier).replace('_', ' ').title()
+        report += f"- **{tier_name}**: {avg:.1f}/10\n"
+    
+    report += "\n"
+    
+    # Add strengths and weaknesses
+    report += "## Key Strengths\n\n"
+    for criterion, score in stats['strengths'].items():
+        report += f"- **{criterion}**: {score:.1f}/10\n"
+    
+    report += "\n## Key Weaknesses\n\n"
+    for criterion, score in stats['weaknesses'].items():
+        report += f"- **{criterion}**: {score:.1f}/10\n"
+    
+    report += "\n"
+    
+    # Add top and bottom pages
+    report += "## Top Performing Pages\n\n"
+    for url, final_score in zip(stats['top_pages']['url'], stats['top_pages']['final_score']):
+        report += f"- [{url}]({url}): {final_score:.1f}/10\n"
+    
+    report += "\n## Lowest Performing Pages\n\n"
+    for url, final_score in zip(stats['bottom_pages']['url'], stats['bottom_pages']['final_score']):
+        report += f"- [{url}]({url}): {final_score:.1f}/10\n"
+    
+    report += "\n"
+    
+    # Add strategic recommendations
+    report += """## Strategic Recommendations
+
+1. **Strengthen Brand Positioning**: Focus on improving the clarity and consistency of brand messaging across all digital touchpoints.
+
+2. **Enhance Persona Relevance**: Tailor content more specifically to address the needs and priorities of this persona.
+
+3. **Address Content Gaps**: Develop more comprehensive content in areas identified as weaknesses.
+
+4. **Optimize Top Performers**: Use insights from top-performing pages to improve lower-performing content.
+
+5. **Implement Regular Audits**: Establish a regular cadence of brand audits to track improvements over time.
+
+## Next Steps
+
+1. Prioritize recommendations based on business impact and implementation effort
+2. Develop a detailed implementation plan with clear ownership and timelines
+3. Establish metrics to track progress and impact
+4. Schedule follow-up audit to measure improvements
+
+"""
+    
+    return report
+
 class StrategicSummaryGenerator:
     """Generates strategic summaries from audit data."""
     
@@ -48,30 +127,30 @@ class StrategicSummaryGenerator:
         if not self.audit_dir.exists():
             raise ValueError(f"Audit directory does not exist: {self.audit_dir}")
     
-    def generate_full_report(self) -> Tuple[str, List[Dict], Dict]:
+    def generate_full_report(self) -> Tuple[str, pd.DataFrame, Dict]:
         """
         Generate a complete strategic summary report.
         
         Returns:
-            Tuple of (report_markdown, page_data, summary_stats)
+            Tuple of (report_markdown, pages, summary_stats), pages holding one row per page
         """
         logger.info(f"Generating strategic summary for {self.audit_dir}")
         
         # Extract persona name from directory
         persona_name = self.audit_dir.name
         
-        # Load and process all scorecard data
-        page_data = self._load_scorecard_data()
+        # Load every page and criterion score as two frames
+        pages, criteria = self._load_frames()
         
-        if not page_data:
+        if pages.empty:
             logger.warning("No scorecard data found, cannot generate summary")
-            return "# No Data Available\n\nNo scorecard data was found to generate a summary.", [], {}
+            return "# No Data Available\n\nNo scorecard data was found to generate a summary.", pages, {}
         
         # Calculate summary statistics
-        summary_stats = self._calculate_summary_stats(page_data)
+        summary_stats = self._calculate_summary_stats(pages, criteria)
         
         # Generate the report
-        report = self._generate_report_markdown(persona_name, page_data, summary_stats)
+        report = self._generate_report_markdown(persona_name, len(pages), summary_stats)
         
         # Save the report
         output_path = self.audit_dir / "Strategic_Summary.md"
@@ -80,118 +159,108 @@ class StrategicSummaryGenerator:
         
         logger.info(f"Strategic summary saved to {output_path}")
         
-        return report, page_data, summary_stats
+        return report, pages, summary_stats
     
-    def _load_scorecard_data(self) -> List[Dict]:
+    def _load_frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Load and parse all scorecard data from the audit directory.
+        Load every page and its criterion scores from the audit directory.
         
         Returns:
-            List of page data dictionaries
+            Tuple of (pages, criteria): pages has page_id, url, tier and final_score,
+            one row per page with criteria; criteria has page_id, name, score and evidence
         """
-        page_data = []
-        
         # First try to load from CSV (newer format)
         csv_path = self.audit_dir / "criteria_scores.csv"
         pages_path = self.audit_dir / "pages.csv"
         
         if csv_path.exists() and pages_path.exists():
             try:
-                # Load CSV data
-                criteria_df = pd.read_csv(csv_path)
-                pages_df = pd.read_csv(pages_path)
-                
-                # Process each page
-                for page_id in pages_df['page_id'].unique():
-                    page_row = pages_df[pages_df['page_id'] == page_id].iloc[0]
-                    criteria_rows = criteria_df[criteria_df['page_id'] == page_id]
-                    
-                    # Skip if no criteria data
-                    if criteria_rows.empty:
-                        continue
-                    
-                    # Get URL and tier
-                    url = page_row['url']
-                    tier = page_row.get('tier', 'tier_2')  # Default to tier_2 if not specified
-                    
-                    # Extract criteria scores
-                    criteria = []
-                    for _, row in criteria_rows.iterrows():
-                        criteria.append({
-                            'name': row['criterion_code'],
-                            'score': row['score'],
-                            'evidence': row.get('evidence', '')
-                        })
-                    
-                    # Calculate final score
-                    final_score = criteria_rows['score'].mean()
-                    
-                    # Add to page data
-                    page_data.append({
-                        'page_id': page_id,
-                        'url': url,
-                        'tier': tier,
-                        'criteria': criteria,
-                        'final_score': final_score
-                    })
-                
-                logger.info(f"Loaded {len(page_data)} pages from CSV data")
-                return page_data
-                
+                frames = self._frames_from_csv(pd.read_csv(pages_path), pd.read_csv(csv_path))
+                logger.info(f"Loaded {len(frames[0])} pages from CSV data")
+                return frames
             except Exception as e:
                 logger.error(f"Error loading CSV data: {e}")
                 # Fall back to markdown parsing
         
-        # Fall back to parsing markdown files
+        frames = self._frames_from_markdown()
+        logger.info(f"Loaded {len(frames[0])} pages from markdown files")
+        return frames
+    
+    def _frames_from_csv(self, pages_df: pd.DataFrame, criteria_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Join the pages and criteria_scores tables on page_id in one pass.
+        
+        Args:
+            pages_df: pages.csv rows; the first row of a page is used
+            criteria_df: criteria_scores.csv rows
+            
+        Returns:
+            Tuple of (pages, criteria), pages in pages.csv order without pages that have no criteria
+        """
+        criteria = pd.DataFrame({
+            'page_id': criteria_df['page_id'],
+            'name': criteria_df['criterion_code'],
+            'score': criteria_df['score'],
+            'evidence': criteria_df['evidence'] if 'evidence' in criteria_df.columns else ''
+        })
+        final_scores = criteria.groupby('page_id', sort=False)['score'].mean()
+        
+        pages = pages_df.drop_duplicates('page_id')
+        pages = pd.DataFrame({
+            'page_id': pages['page_id'],
+            'url': pages['url'],
+            'tier': pages['tier'] if 'tier' in pages.columns else 'tier_2',  # Default when not specified
+        })
+        pages = pages[pages['page_id'].isin(final_scores.index)]
+        pages = pages.assign(final_score=pages['page_id'].map(final_scores)).reset_index(drop=True)
+        criteria = criteria[criteria['page_id'].isin(pages['page_id'])].reset_index(drop=True)
+        return pages, criteria
+    
+    def _frames_from_markdown(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Parse the scorecard markdown files into pages and criteria frames"""
         scorecard_files = list(self.audit_dir.glob("*_hygiene_scorecard.md"))
         
         if not scorecard_files:
             logger.warning("No scorecard files found")
-            return []
         
+        pages, criteria = [], []
         for scorecard_file in scorecard_files:
             try:
                 # Extract URL slug from filename
                 url_slug = scorecard_file.stem.replace("_hygiene_scorecard", "")
                 
-                # Reconstruct URL from slug
-                url = self._reconstruct_url(url_slug)
-                
                 # Parse scorecard content
-                with open(scorecard_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                # Extract final score
-                final_score_match = re.search(r"\*\*Final Score:\*\*\s*([\d.]+)/10", content)
-                final_score = float(final_score_match.group(1)) if final_score_match else 5.0
+                record = parse_report_file(str(scorecard_file))
                 
-                # Extract criteria scores
-                criteria = []
-                criteria_pattern = r"\|\s*\*\*(.*?)\*\*\s*\|\s*([\d.]+)/10\s*\|\s*(.*?)\s*\|"
-                for match in re.finditer(criteria_pattern, content):
-                    criteria.append({
-                        'name': match.group(1),
-                        'score': float(match.group(2)),
-                        'evidence': match.group(3)
-                    })
+                # Extract criteria scores from "| **Name** | X/10 | Evidence |" rows
+                criteria.extend((url_slug, row.label, row.score, row.rationale)
+                                for row in record.criteria if row.bold and row.out_of_ten)
                 
-                # Determine tier based on URL
-                tier_name, _ = self.methodology.classify_url(url)
-                
-                # Add to page data
-                page_data.append({
-                    'page_id': url_slug,
-                    'url': url,
-                    'tier': tier_name,
-                    'criteria': criteria,
-                    'final_score': final_score
-                })
+                # Extract final score
+                final_score = record.final_score if record.final_score is not None else 5.0
+                pages.append((url_slug, self._reconstruct_url(url_slug), final_score))
                 
             except Exception as e:
                 logger.error(f"Error parsing scorecard {scorecard_file}: {e}")
         
-        logger.info(f"Loaded {len(page_data)} pages from markdown files")
-        return page_data
+        pages = pd.DataFrame(pages, columns=['page_id', 'url', 'final_score'])
+        # Determine tiers based on URL, every page in one call
+        pages.insert(2, 'tier', self.methodology.classify_many(pages['url']) if len(pages) else pd.Series(dtype=object))
+        criteria = pd.DataFrame(criteria, columns=['page_id', 'name', 'score', 'evidence'])
+        return pages, criteria
+    
+    def _load_scorecard_data(self) -> List[Dict]:
+        """
+        Load and parse all scorecard data from the audit directory.
+        
+        Returns:
+            List of page data dictionaries, each with its criteria
+        """
+        pages, criteria = self._load_frames()
+        by_page = {page_id: rows.drop(columns='page_id').to_dict('records')
+                   for page_id, rows in criteria.groupby('page_id', sort=False)}
+        pages = pages.assign(criteria=[by_page.get(page_id, []) for page_id in pages['page_id']])
+        return pages[['page_id', 'url', 'tier', 'criteria', 'final_score']].to_dict('records')
     
     def _reconstruct_url(self, url_slug: str) -> str:
         """
@@ -211,138 +280,50 @@ class StrategicSummaryGenerator:
         else:
             return f"https://www.soprasteria.be/{url_slug.replace('_', '/')}"
     
-    def _calculate_summary_stats(self, page_data: List[Dict]) -> Dict:
+    def _calculate_summary_stats(self, pages: pd.DataFrame, criteria: pd.DataFrame) -> Dict:
         """
-        Calculate summary statistics from page data.
+        Calculate summary statistics with one groupby per breakdown.
         
         Args:
-            page_data: List of page data dictionaries
+            pages: One row per page with tier and final_score
+            criteria: One row per page and criterion with name and score
             
         Returns:
-            Dictionary of summary statistics
+            Dictionary of summary statistics: overall_score, tier_averages and
+            criterion_averages (Series in order of first appearance), top_pages and
+            bottom_pages (frames of five pages), strengths and weaknesses (three criteria each)
         """
-        # Initialize stats
-        stats = {
-            'overall_score': 0.0,
-            'tier_scores': defaultdict(list),
-            'criterion_scores': defaultdict(list),
-            'top_pages': [],
-            'bottom_pages': [],
-            'strengths': [],
-            'weaknesses': []
-        }
+        stats = {'overall_score': float(pages['final_score'].mean()) if len(pages) else 0.0}
         
-        # Calculate overall score
-        if page_data:
-            stats['overall_score'] = sum(p['final_score'] for p in page_data) / len(page_data)
-        
-        # Calculate tier scores
-        for page in page_data:
-            tier = page['tier']
-            stats['tier_scores'][tier].append(page['final_score'])
-            
-            # Add to criterion scores
-            for criterion in page['criteria']:
-                stats['criterion_scores'][criterion['name']].append(criterion['score'])
-        
-        # Calculate average tier scores
-        stats['tier_averages'] = {
-            tier: sum(scores) / len(scores) if scores else 0.0
-            for tier, scores in stats['tier_scores'].items()
-        }
-        
-        # Calculate average criterion scores
-        stats['criterion_averages'] = {
-            criterion: sum(scores) / len(scores) if scores else 0.0
-            for criterion, scores in stats['criterion_scores'].items()
-        }
+        # Average tier and criterion scores
+        stats['tier_averages'] = pages.groupby('tier', sort=False, dropna=False)['final_score'].mean()
+        stats['criterion_averages'] = criteria.groupby('name', sort=False, dropna=False)['score'].mean()
         
         # Identify top and bottom pages
-        sorted_pages = sorted(page_data, key=lambda p: p['final_score'], reverse=True)
-        stats['top_pages'] = sorted_pages[:5]
-        stats['bottom_pages'] = sorted_pages[-5:] if len(sorted_pages) >= 5 else sorted_pages
+        ranked = pages.sort_values('final_score', ascending=False, kind='stable')
+        stats['top_pages'] = ranked.head(5)
+        stats['bottom_pages'] = ranked.tail(5)
         
         # Identify strengths and weaknesses
-        sorted_criteria = sorted(stats['criterion_averages'].items(), key=lambda x: x[1], reverse=True)
-        stats['strengths'] = sorted_criteria[:3]
-        stats['weaknesses'] = sorted_criteria[-3:] if len(sorted_criteria) >= 3 else sorted_criteria
+        ranked_criteria = stats['criterion_averages'].sort_values(ascending=False, kind='stable')
+        stats['strengths'] = ranked_criteria.head(3)
+        stats['weaknesses'] = ranked_criteria.tail(3)
         
         return stats
     
-    def _generate_report_markdown(self, persona_name: str, page_data: List[Dict], stats: Dict) -> str:
+    def _generate_report_markdown(self, persona_name: str, page_count: int, stats: Dict) -> str:
         """
-        Generate the markdown report.
+        Generate the markdown report from the pre-aggregated statistics.
         
         Args:
             persona_name: Name of the persona
-            page_data: List of page data dictionaries
-            stats: Summary statistics
+            page_count: Number of pages audited
+            stats: Summary statistics from _calculate_summary_stats()
             
         Returns:
             Markdown formatted report
         """
-        # Format the report
-        report = f"""# Strategic Brand Audit Summary for {persona_name}
-
-## Executive Summary
-
-This report presents a comprehensive analysis of Sopra Steria's brand presence across {len(page_data)} digital touchpoints, evaluated from the perspective of {persona_name}. The overall brand health score is **{stats['overall_score']:.1f}/10**.
-
-"""
-        
-        # Add tier breakdown
-        report += "## Tier Performance\n\n"
-        for tier, avg in stats['tier_averages'].items():
-            tier_name = tier.replace('_', ' ').title()
-            report += f"- **{tier_name}**: {avg:.1f}/10\n"
-        
-        report += "\n"
-        
-        # Add strengths and weaknesses
-        report += "## Key Strengths\n\n"
-        for criterion, score in stats['strengths']:
-            report += f"- **{criterion}**: {score:.1f}/10\n"
-        
-        report += "\n## Key Weaknesses\n\n"
-        for criterion, score in stats['weaknesses']:
-            report += f"- **{criterion}**: {score:.1f}/10\n"
-        
-        report += "\n"
-        
-        # Add top and bottom pages
-        report += "## Top Performing Pages\n\n"
-        for page in stats['top_pages']:
-            report += f"- [{page['url']}]({page['url']}): {page['final_score']:.1f}/10\n"
-        
-        report += "\n## Lowest Performing Pages\n\n"
-        for page in stats['bottom_pages']:
-            report += f"- [{page['url']}]({page['url']}): {page['final_score']:.1f}/10\n"
-        
-        report += "\n"
-        
-        # Add strategic recommendations
-        report += """## Strategic Recommendations
-
-1. **Strengthen Brand Positioning**: Focus on improving the clarity and consistency of brand messaging across all digital touchpoints.
-
-2. **Enhance Persona Relevance**: Tailor content more specifically to address the needs and priorities of this persona.
-
-3. **Address Content Gaps**: Develop more comprehensive content in areas identified as weaknesses.
-
-4. **Optimize Top Performers**: Use insights from top-performing pages to improve lower-performing content.
-
-5. **Implement Regular Audits**: Establish a regular cadence of brand audits to track improvements over time.
-
-## Next Steps
-
-1. Prioritize recommendations based on business impact and implementation effort
-2. Develop a detailed implementation plan with clear ownership and timelines
-3. Establish metrics to track progress and impact
-4. Schedule follow-up audit to measure improvements
-
-"""
-        
-        return report
+        return render_summary_markdown(persona_name, page_count, stats)
     
     def generate_ai_summary(self, model_provider: str = "anthropic") -> str:
         """
@@ -381,3 +362,194 @@ This report presents a comprehensive analysis of Sopra Steria's brand presence a
         logger.info(f"AI summary saved to {output_path}")
         
         return summary
+
+@dataclass
+class RunningStats:
+    """Count, mean and squared deviations of a stream of values (Welford's method)."""
+    
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def remove(self, value: float) -> None:
+        """Remove a value added before."""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(0.0, self.m2 - (value - self.mean) * (value - mean))
+        self.count -= 1
+        self.mean = mean
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, NaN for fewer than two values."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
+
+class SummaryAggregator:
+    """Strategic summary statistics of one persona, updated as each page is packaged."""
+    
+    def __init__(self, persona_name: str, top_k: int = 5):
+        """
+        Start an empty summary.
+        
+        Args:
+            persona_name: Name of the persona
+            top_k: Number of best and worst pages kept
+        """
+        self.persona_name = persona_name
+        self.top_k = top_k
+        self.overall = RunningStats()
+        self.tiers: Dict[Any, RunningStats] = {}
+        self.criteria: Dict[Any, RunningStats] = {}
+        
+        # Each page's contribution, so a page packaged again replaces its previous result
+        self._pages: Dict[str, Tuple[int, str, Any, float, Tuple[Tuple[Any, float], ...]]] = {}
+        # Rank of a page is (-score, arrival); best keeps the top_k smallest, worst the top_k largest
+        self._best: List[Tuple[float, int, str]] = []
+        self._worst: List[Tuple[float, int, str]] = []
+        self._arrivals = 0
+    
+    def __len__(self) -> int:
+        return len(self._pages)
+    
+    def add_page(self, page_id: str, url: str, tier: Any, final_score: float,
+                 criteria: Iterable[Tuple[Any, float]]) -> None:
+        """
+        Add one page's result, replacing any earlier result for the same page.
+        
+        Args:
+            page_id: Page identifier
+            url: Page URL
+            tier: Tier of the page
+            final_score: Page score; pages without a score are ignored
+            criteria: (criterion name, score) of each scored criterion
+        """
+        if final_score is None or math.isnan(final_score):
+            return
+        criteria = tuple((name, float(score)) for name, score in criteria
+                         if score is not None and not math.isnan(score))
+        
+        previous = self._pages.pop(page_id, None)
+        if previous is not None:
+            self._subtract(previous)
+            arrival = previous[0]
+        else:
+            arrival = self._arrivals
+            self._arrivals += 1
+        
+        page = (arrival, url, tier, float(final_score), criteria)
+        self._pages[page_id] = page
+        self.overall.add(page[3])
+        self.tiers.setdefault(tier, RunningStats()).add(page[3])
+        for name, score in criteria:
+            self.criteria.setdefault(name, RunningStats()).add(score)
+        
+        if previous is not None and any(entry[2] == page_id for entry in self._best + self._worst):
+            self._rebuild_rankings()
+        else:
+            self._rank(page_id, page)
+    
+    def add_tables(self, tables: Dict[str, pd.DataFrame]) -> None:
+        """
+        Add the pages of packaged tables, scored as the mean of their criteria.
+        
+        Args:
+            tables: Tables of a few pages with "pages" and "criteria_scores", as build_tables() returns
+        """
+        pages, criteria = tables.get('pages'), tables.get('criteria_scores')
+        if pages is None or criteria is None or pages.empty or criteria.empty:
+            return
+        by_page: Dict[str, List[Tuple[Any, float]]] = {}
+        for page_id, code, score in zip(criteria['page_id'], criteria['criterion_code'], criteria['score']):
+            by_page.setdefault(page_id, []).append((code, score))
+        
+        for page_id, url, tier in zip(pages['page_id'], pages['url'], pages['tier']):
+            scores = [score for _, score in by_page.get(page_id, []) if not pd.isna(score)]
+            # Pages without criteria are left out, as when summarising the tables on disk
+            if page_id in by_page:
+                self.add_page(page_id, url, tier, sum(scores) / len(scores) if scores else float('nan'),
+                              by_page[page_id])
+    
+    def stats(self) -> Dict:
+        """
+        Current statistics, shaped like StrategicSummaryGenerator._calculate_summary_stats() returns.
+        
+        Returns:
+            Summary statistics plus score_std, tier_counts and tier_std
+        """
+        tier_averages = pd.Series({tier: stats.mean for tier, stats in self.tiers.items() if stats.count},
+                                  dtype=float)
+        criterion_averages = pd.Series({name: stats.mean for name, stats in self.criteria.items() if stats.count},
+                                       dtype=float)
+        ranked_criteria = criterion_averages.sort_values(ascending=False, kind='stable')
+        return {
+            'overall_score': self.overall.mean if self.overall.count else 0.0,
+            'score_std': self.overall.std,
+            'tier_averages': tier_averages,
+            'tier_counts': {tier: stats.count for tier, stats in self.tiers.items() if stats.count},
+            'tier_std': {tier: stats.std for tier, stats in self.tiers.items() if stats.count},
+            'criterion_averages': criterion_averages,
+            'top_pages': self._ranked_pages(sorted(self._best, key=lambda entry: (-entry[0], -entry[1]))),
+            'bottom_pages': self._ranked_pages(sorted(self._worst)),
+            'strengths': ranked_criteria.head(3),
+            'weaknesses': ranked_criteria.tail(3)
+        }
+    
+    def render(self) -> str:
+        """Markdown of the summary so far."""
+        return render_summary_markdown(self.persona_name, len(self._pages), self.stats())
+    
+    def write(self, output_dir: Path) -> Optional[Path]:
+        """
+        Write Strategic_Summary.md into a persona's output directory.
+        
+        Returns:
+            Path of the summary, or None before any page has been added
+        """
+        if not self._pages:
+            return None
+        from .run_journal import atomic_write_text
+        
+        path = Path(output_dir) / "Strategic_Summary.md"
+        atomic_write_text(path, self.render())
+        return path
+    
+    def _subtract(self, page: Tuple) -> None:
+        _, _, tier, final_score, criteria = page
+        self.overall.remove(final_score)
+        self.tiers[tier].remove(final_score)
+        for name, score in criteria:
+            self.criteria[name].remove(score)
+    
+    def _rank(self, page_id: str, page: Tuple) -> None:
+        arrival, _, _, final_score, _ = page
+        # Min-heaps: best pops its lowest score (latest first), worst its highest (earliest first)
+        best, worst = (final_score, -arrival, page_id), (-final_score, arrival, page_id)
+        if len(self._best) < self.top_k:
+            heapq.heappush(self._best, best)
+        elif best > self._best[0]:
+            heapq.heapreplace(self._best, best)
+        if len(self._worst) < self.top_k:
+            heapq.heappush(self._worst, worst)
+        elif worst > self._worst[0]:
+            heapq.heapreplace(self._worst, worst)
+    
+    def _rebuild_rankings(self) -> None:
+        self._best, self._worst = [], []
+        for page_id, page in self._pages.items():
+            self._rank(page_id, page)
+    
+    def _ranked_pages(self, entries: List[Tuple[float, int, str]]) -> pd.DataFrame:
+        pages = [self._pages[page_id] for _, _, page_id in entries]
+        return pd.DataFrame({'page_id': [page_id for _, _, page_id in entries],
+                             'url': [page[1] for page in pages],
+                             'tier': [page[2] for page in pages],
+                             'final_score': [page[3] for page in pages]})
@@ -0,0 +1,426 @@
+"""
+Shared Task Queue for Brand Audit Tool
+
+STATUS: ACTIVE
+
+This module provides the work queue shared by a coordinator and its workers:
+1. Idempotent enqueueing of (url, persona) audit tasks, scoped to a run
+2. Time-limited leases so each task is worked on by one worker at a time
+3. Heartbeats that extend a lease while the worker is still busy
+4. Reclaiming of expired leases so tasks held by dead workers are retried
+5. Pluggable backends: an in-process queue for tests and SQLite on a shared volume
+
+Backends are opened from a spec string with open_task_queue(), e.g.
+"memory://" or "sqlite:///mnt/shared/audit_queue.db". Further brokers can be
+added by registering a factory in QUEUE_BACKENDS. One queue can serve many
+runs: a task belongs to the run it was enqueued for, and leasing, counting
+and packaging only see the tasks of the run asked for.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+from .fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Task states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+@dataclass
+class AuditTask:
+    """One (url, persona) audit unit in the shared queue."""
+
+    task_id: str
+    url: str
+    persona_path: str
+    run: str = ""
+    status: str = PENDING
+    worker_id: Optional[str] = None
+    lease_expires: Optional[float] = None
+    attempts: int = 0
+    message: Optional[str] = None
+
+    @classmethod
+    def create(cls, url: str, persona_path: str, run: str = "") -> "AuditTask":
+        """
+        Create a task whose id is derived from its run, url and persona.
+
+        Args:
+            url: URL to audit
+            persona_path: Persona file to audit it with
+            run: Run the task belongs to
+
+        Returns:
+            A pending task
+        """
+        key = f"{url}\n{persona_path}"
+        return cls(content_hash(f"{run}\n{key}" if run else key)[:16], url, str(persona_path), run)
+
+class TaskQueue:
+    """Interface shared by all task queue backends."""
+
+    def __init__(self, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        """
+        Initialize the queue.
+
+        Args:
+            max_attempts: Leases a task may receive before it is marked failed
+            clock: Wall-clock source, shared by every worker of the queue
+        """
+        self.max_attempts = max_attempts
+        self.clock = clock
+
+    def enqueue(self, tasks: Iterable[AuditTask]) -> int:
+        """Add tasks, ignoring ones already queued. Returns the number added."""
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: float, run: Optional[str] = None) -> Optional[AuditTask]:
+        """Lease the next pending task of a run (of any run when omitted), reclaiming expired leases first."""
+        raise NotImplementedError
+
+    def heartbeat(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease. Returns False if the worker no longer holds it."""
+        raise NotImplementedError
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        """Mark a leased task done. Returns False if the lease was lost."""
+        raise NotImplementedError
+
+    def fail(self, task_id: str, worker_id: str, message: str) -> bool:
+        """Release a leased task for retry, or mark it failed after max_attempts."""
+        raise NotImplementedError
+
+    def reclaim_expired(self) -> int:
+        """Return tasks whose lease has expired to the queue. Returns the number reclaimed."""
+        raise NotImplementedError
+
+    def tasks(self, run: Optional[str] = None) -> List[AuditTask]:
+        """Return the tasks of a run in enqueue order (every task when omitted)."""
+        raise NotImplementedError
+
+    def counts(self, run: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count tasks by state.
+
+        Args:
+            run: Only count this run's tasks (every task when omitted)
+
+        Returns:
+            Dictionary of task counts keyed by state
+        """
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for task in self.tasks(run):
+            counts[task.status] += 1
+        return counts
+
+    def is_drained(self, run: Optional[str] = None) -> bool:
+        """Whether no task of the run (of any run when omitted) is pending or leased."""
+        counts = self.counts(run)
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def _after_lost_lease(self, task: AuditTask) -> None:
+        """Apply the retry policy to a task that is no longer being worked on."""
+        task.worker_id = None
+        task.lease_expires = None
+        task.status = PENDING if task.attempts < self.max_attempts else FAILED
+
+class InMemoryTaskQueue(TaskQueue):
+    """Thread-safe in-process queue, used for tests and single-host runs."""
+
+    def __init__(self, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        super().__init__(max_attempts, clock)
+        self._tasks: Dict[str, AuditTask] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, tasks: Iterable[AuditTask]) -> int:
+        added = 0
+        with self._lock:
+            for task in tasks:
+                if task.task_id not in self._tasks:
+                    self._tasks[task.task_id] = AuditTask(**asdict(task))
+                    added += 1
+        return added
+
+    def lease(self, worker_id: str, lease_seconds: float, run: Optional[str] = None) -> Optional[AuditTask]:
+        with self._lock:
+            self._reclaim_locked()
+            for task in self._tasks.values():
+                if task.status == PENDING and (run is None or task.run == run):
+                    task.status = LEASED
+                    task.worker_id = worker_id
+                    task.lease_expires = self.clock() + lease_seconds
+                    task.attempts += 1
+                    return AuditTask(**asdict(task))
+        return None
+
+    def heartbeat(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            task = self._held(task_id, worker_id)
+            if task is None:
+                return False
+            task.lease_expires = self.clock() + lease_seconds
+            return True
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        with self._lock:
+            task = self._held(task_id, worker_id)
+            if task is None:
+                return False
+            task.status = DONE
+            task.worker_id = None
+            task.lease_expires = None
+            task.message = None
+            return True
+
+    def fail(self, task_id: str, worker_id: str, message: str) -> bool:
+        with self._lock:
+            task = self._held(task_id, worker_id)
+            if task is None:
+                return False
+            task.message = message
+            self._after_lost_lease(task)
+            return True
+
+    def reclaim_expired(self) -> int:
+        with self._lock:
+            return self._reclaim_locked()
+
+    def tasks(self, run: Optional[str] = None) -> List[AuditTask]:
+        with self._lock:
+            return [AuditTask(**asdict(task)) for task in self._tasks.values() if run is None or task.run == run]
+
+    def _held(self, task_id: str, worker_id: str) -> Optional[AuditTask]:
+        task = self._tasks.get(task_id)
+        if task is None or task.status != LEASED or task.worker_id != worker_id:
+            return None
+        return task
+
+    def _reclaim_locked(self) -> int:
+        now = self.clock()
+        reclaimed = 0
+        for task in self._tasks.values():
+            if task.status == LEASED and task.lease_expires is not None and task.lease_expires <= now:
+                logger.warning(f"Lease on {task.url} expired for worker {task.worker_id}, reclaiming")
+                task.message = "lease expired"
+                self._after_lost_lease(task)
+                reclaimed += 1
+        return reclaimed
+
+class SQLiteTaskQueue(TaskQueue):
+    """Queue stored in a SQLite database that every worker can open, e.g. on a shared volume."""
+
+    def __init__(self, path: str, max_attempts: int = 3, clock: Callable[[], float] = time.time,
+                 busy_timeout: float = 30.0):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            path: Path to the SQLite database file
+            max_attempts: Leases a task may receive before it is marked failed
+            clock: Wall-clock source, shared by every worker of the queue
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        super().__init__(max_attempts, clock)
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    persona_path TEXT NOT NULL,
+                    run TEXT NOT NULL DEFAULT '',
+                    status TEXT NOT NULL,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    message TEXT,
+                    seq INTEGER
+                )
+            """)
+            # Queues created before tasks were scoped to a run hold tasks of the unnamed run
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if 'run' not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN run TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run, status, seq)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the queue safe to share between threads and processes
+        conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+        finally:
+            conn.close()
+
+    def enqueue(self, tasks: Iterable[AuditTask]) -> int:
+        tasks = list(tasks)
+
+        def insert(conn):
+            start = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM tasks").fetchone()[0]
+            added = 0
+            for offset, task in enumerate(tasks, 1):
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO tasks (task_id, url, persona_path, run, status, attempts, seq) "
+                    "VALUES (?, ?, ?, ?, ?, 0, ?)",
+                    (task.task_id, task.url, task.persona_path, task.run, PENDING, start + offset)
+                )
+                added += cursor.rowcount
+            return added
+
+        return self._transaction(insert)
+
+    def lease(self, worker_id: str, lease_seconds: float, run: Optional[str] = None) -> Optional[AuditTask]:
+        def take(conn):
+            self._reclaim(conn)
+            if run is None:
+                row = conn.execute(
+                    "SELECT * FROM tasks WHERE status = ? ORDER BY seq LIMIT 1", (PENDING,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT * FROM tasks WHERE run = ? AND status = ? ORDER BY seq LIMIT 1", (run, PENDING)
+                ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE task_id = ?",
+                (LEASED, worker_id, self.clock() + lease_seconds, row['task_id'])
+            )
+            return self._get(conn, row['task_id'])
+
+        return self._transaction(take)
+
+    def heartbeat(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        def extend(conn):
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE task_id = ? AND status = ? AND worker_id = ?",
+                (self.clock() + lease_seconds, task_id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(extend)
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        def finish(conn):
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = NULL, lease_expires = NULL, message = NULL "
+                "WHERE task_id = ? AND status = ? AND worker_id = ?",
+                (DONE, task_id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(finish)
+
+    def fail(self, task_id: str, worker_id: str, message: str) -> bool:
+        def release(conn):
+            task = self._get(conn, task_id)
+            if task is None or task.status != LEASED or task.worker_id != worker_id:
+                return False
+            task.message = message
+            self._after_lost_lease(task)
+            self._save(conn, task)
+            return True
+
+        return self._transaction(release)
+
+    def reclaim_expired(self) -> int:
+        return self._transaction(self._reclaim)
+
+    def tasks(self, run: Optional[str] = None) -> List[AuditTask]:
+        conn = self._connect()
+        try:
+            if run is None:
+                rows = conn.execute("SELECT * FROM tasks ORDER BY seq").fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM tasks WHERE run = ? ORDER BY seq", (run,)).fetchall()
+            return [self._row_to_task(row) for row in rows]
+        finally:
+            conn.close()
+
+    def _reclaim(self, conn: sqlite3.Connection) -> int:
+        rows = conn.execute(
+            "SELECT * FROM tasks WHERE status = ? AND lease_expires <= ?", (LEASED, self.clock())
+        ).fetchall()
+        for row in rows:
+            task = self._row_to_task(row)
+            logger.warning(f"Lease on {task.url} expired for worker {task.worker_id}, reclaiming")
+            task.message = "lease expired"
+            self._after_lost_lease(task)
+            self._save(conn, task)
+        return len(rows)
+
+    def _get(self, conn: sqlite3.Connection, task_id: str) -> Optional[AuditTask]:
+        row = conn.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return self._row_to_task(row) if row is not None else None
+
+    def _save(self, conn: sqlite3.Connection, task: AuditTask) -> None:
+        conn.execute(
+            "UPDATE tasks SET status = ?, worker_id = ?, lease_expires = ?, attempts = ?, message = ? "
+            "WHERE task_id = ?",
+            (task.status, task.worker_id, task.lease_expires, task.attempts, task.message, task.task_id)
+        )
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> AuditTask:
+        return AuditTask(
+            task_id=row['task_id'],
+            url=row['url'],
+            persona_path=row['persona_path'],
+            run=row['run'],
+            status=row['status'],
+            worker_id=row['worker_id'],
+            lease_expires=row['lease_expires'],
+            attempts=row['attempts'],
+            message=row['message']
+        )
+
+# Queue backends by spec scheme; register additional brokers here
+QUEUE_BACKENDS: Dict[str, Callable[[str], TaskQueue]] = {
+    "memory": lambda location: InMemoryTaskQueue(),
+    "sqlite": lambda location: SQLiteTaskQueue(location),
+}
+
+def open_task_queue(spec: str) -> TaskQueue:
+    """
+    Open a task queue from a spec string.
+
+    Args:
+        spec: "memory://", "sqlite:///path/to/queue.db" or a bare path to a SQLite file
+
+    Returns:
+        The task queue
+    """
+    if "://" not in spec:
+        return SQLiteTaskQueue(spec)
+
+    scheme, location = spec.split("://", 1)
+    if scheme not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown task queue backend: {scheme}")
+
+    # sqlite:///abs/path keeps the leading slash, sqlite://rel/path is relative
+    return QUEUE_BACKENDS[scheme](location)
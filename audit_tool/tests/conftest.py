@@ -0,0 +1,28 @@
+"""
+Shared pytest configuration for the audit tool tests
+
+Tests marked benchmark assert on wall-clock timings, which depend on the
+machine and its load. They are skipped unless requested with
+--run-benchmarks or AUDIT_BENCHMARKS=1; the default suite keeps only
+behavioural assertions.
+"""
+
+import os
+
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmarks", action="store_true", default=False,
+                     help="run the wall-clock benchmarks marked benchmark")
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: wall-clock timing assertion, skipped unless --run-benchmarks or AUDIT_BENCHMARKS=1")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks", default=False) or os.environ.get("AUDIT_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --run-benchmarks or AUDIT_BENCHMARKS=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
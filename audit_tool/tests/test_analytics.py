@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the embedded DuckDB analytics store
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import dataset
+from audit_tool.analytics import AnalyticsStore
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from test_package_manifest import _persona_folder
+
+@pytest.fixture
+def packaged(tmp_path, monkeypatch):
+    """Two personas packaged into audit_data, and one legacy audit run"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    _persona_folder(tmp_path, "B")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+
+    run_dir = tmp_path / "audit_runs" / "P1_20250621_1510"
+    run_dir.mkdir(parents=True)
+    pd.DataFrame({
+        "run_id": "P1_20250621_1510", "persona_id": "P1", "page_id": ["p1", "p1", "p2"], "url_slug": "s",
+        "url": "https://example.com", "tier": "tier_1", "criterion_id": ["c1", "c2", "c1"],
+        "raw_score": [4.0, 6.0, 8.0], "weighted_score": [1.0, 1.0, 1.0], "descriptor": "PASS"
+    }).to_parquet(run_dir / "page_facts.parquet", index=False)
+    return packager
+
+def test_views_cover_dataset_persona_tables_and_runs(packaged):
+    """Every view reads its files, with the persona taken from partitions or folders"""
+    with AnalyticsStore("audit_data", "audit_runs") as store:
+        assert store.views() == ["criteria_scores", "experience", "page_dimension", "page_facts",
+                                 "persona_comparison", "recommendations", "run_history", "run_page_facts",
+                                 "score_cube"]
+
+        expected = dataset.read_table(packaged.dataset_dir, "audit")
+        counts = store.query("SELECT persona, count(*) AS n FROM criteria_scores GROUP BY persona ORDER BY persona")
+        assert counts.to_dict("list") == {"persona": ["A", "B"],
+                                          "n": [int((expected["persona"] == p).sum()) for p in ("A", "B")]}
+
+        assert store.scalar("SELECT count(*) FROM page_facts") == 2 * len(list(Path("audit_outputs/A").glob(
+            "*_hygiene_scorecard.md")))
+        assert sorted(store.query("SELECT DISTINCT persona FROM recommendations")["persona"]) == ["A", "B"]
+        assert store.scalar("SELECT sum(raw_score) FROM run_page_facts WHERE run_id = ?", ["P1_20250621_1510"]) == 18
+
+def test_run_history_spans_dataset_runs_and_audit_runs(packaged):
+    """One row per run and persona, whichever layout the run was written in"""
+    with AnalyticsStore("audit_data", "audit_runs") as store:
+        history = store.query("SELECT * FROM run_history ORDER BY source, run, persona")
+
+    assert history[["run", "persona", "source"]].values.tolist() == [
+        ["P1_20250621_1510", "P1", "audit_runs"], ["audit_outputs", "A", "dataset"], ["audit_outputs", "B", "dataset"]
+    ]
+    assert history.loc[0, ["pages", "criteria_rows", "average_score"]].tolist() == [2, 3, 6.0]
+
+def test_empty_views_keep_their_columns_until_refreshed(tmp_path):
+    """Queries work before any file exists and see the files once refreshed"""
+    store = AnalyticsStore(tmp_path / "audit_data", tmp_path / "audit_runs")
+    assert store.query("SELECT * FROM criteria_scores").columns.tolist()[-2:] == ["run", "persona"]
+    assert store.scalar("SELECT count(*) FROM run_history") == 0
+
+    frame = pd.DataFrame({"page_id": ["a", "b"], "criterion_code": ["x", "x"], "score": [2.0, 4.0]})
+    dataset.write_partition(tmp_path / "audit_data" / "dataset", "audit", frame, run="r1", persona="P")
+    store.refresh()
+    assert store.score_spread("criterion_code", run="r1").to_dict("records") == [
+        {"criterion_code": "x", "mean": 3.0, "std": pytest.approx(2 ** 0.5), "count": 2}
+    ]
+    assert store.query("SELECT sum(v) AS total FROM extra WHERE v > ?", [1], extra=pd.DataFrame({"v": [1, 2, 3]})
+                       )["total"].tolist() == [5]
+    store.close()
+
+def test_cross_persona_insights_match_pandas(packaged):
+    """The SQL aggregates give the figures the pandas groupbys used to"""
+    insights = packaged.generate_cross_persona_insights()
+    df = dataset.read_table(packaged.dataset_dir, "audit", run=packaged.run_id)
+
+    criterion = df.groupby("criterion_code", observed=True)["score"].agg(["mean", "std"])
+    for area in insights["agreement_areas"] + insights["disagreement_areas"]:
+        assert area["mean_score"] == pytest.approx(criterion.loc[area["criterion"], "mean"])
+        assert area["std_dev"] == pytest.approx(criterion.loc[area["criterion"], "std"])
+    assert len(insights["agreement_areas"]) == min(5, int((criterion["std"] < 1.0).sum()))
+
+    for persona, bias in insights["persona_biases"].items():
+        assert bias["bias"] == pytest.approx(df[df["persona"] == persona]["score"].mean() - df["score"].mean())
+    assert set(insights["persona_biases"]) == {"A", "B"}
+    assert len(insights["url_variance"]) == 5
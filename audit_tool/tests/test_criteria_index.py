@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the criteria index compiled from the methodology
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.criteria_index import CriteriaIndex
+from audit_tool.methodology_parser import MethodologyParser
+from test_pipeline import CONFIG_PATH
+
+def test_yaml_layout_is_indexed_by_tier_and_code():
+    """Grouped brand/performance criteria become ordered codes, weights and memberships"""
+    methodology = MethodologyParser(str(CONFIG_PATH))
+    index = methodology.criteria_index
+
+    assert index.tier_codes["tier_1"] == ("corporate_positioning_alignment", "brand_differentiation",
+                                          "emotional_resonance", "visual_brand_integrity",
+                                          "strategic_clarity", "trust_credibility_signals")
+    assert index.tier_weights["tier_1"].tolist() == [25, 20, 20, 15, 10, 10]
+    assert index.code_tiers["overall_sentiment"] == frozenset({"independent"})
+
+    criterion = methodology.get_criterion_by_code("strategic_value_clarity")
+    assert (criterion["tier"], criterion["group"], criterion["weight"]) == ("tier_2", "performance", 25)
+    assert [c["code"] for c in methodology.get_criteria_for_tier("tier_3")] == list(index.tier_codes["tier_3"])
+
+def test_inline_layout_keeps_first_definition_of_shared_codes(tmp_path):
+    """The built-in layout indexes each tier's own weights while shared codes resolve to the first tier"""
+    index = MethodologyParser(str(tmp_path / "missing.yaml")).criteria_index
+
+    assert index.code_tiers["BP1"] == frozenset({"tier_1", "tier_2", "tier_3"})
+    assert index.get("BP1")["name"] == "Brand Clarity"
+    assert index.weight("BP1") == 0.2
+    assert index.weight("BP1", tier="tier_2") == 0.1
+    assert index.weight("XX9", default=0.0) == 0.0
+
+def test_weighted_score_is_vectorised_and_skips_missing_scores():
+    """Rows of scores in tier order give their weighted average, ignoring NaN"""
+    index = MethodologyParser(str(CONFIG_PATH)).criteria_index
+    scores = np.array([[10, 10, 10, 10, 10, 10],
+                       [8, 6, 4, 2, 0, 10],
+                       [np.nan, 5, np.nan, np.nan, np.nan, np.nan]])
+
+    expected = (8 * 25 + 6 * 20 + 4 * 20 + 2 * 15 + 0 * 10 + 10 * 10) / 100
+    assert np.allclose(index.weighted_score("tier_1", scores), [10, expected, 5])
+    assert index.weighted_score("tier_1", scores[1]) == pytest.approx(expected)
+
+def test_index_is_immutable_and_feeds_the_packager():
+    """The index cannot be modified and the backfill packager's weights come from it"""
+    index = MethodologyParser(str(CONFIG_PATH)).criteria_index
+
+    with pytest.raises(TypeError):
+        index.criteria["new"] = {}
+    with pytest.raises(ValueError):
+        index.tier_weights["tier_1"][0] = 99
+
+    weights = EnhancedBackfillPackager("P").criterion_weights
+    assert all(weights[code] == weight for code, weight in index.weights.items())
+    assert weights["value_proposition_clarity"] == 20
+
+def test_fingerprints_follow_content_not_layout():
+    """Reordering keys keeps every fingerprint; a criteria edit only moves its own tier's"""
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    index = CriteriaIndex(config)
+
+    reordered = CriteriaIndex(dict(reversed(list(config.items()))))
+    assert dict(reordered.fingerprints) == dict(index.fingerprints)
+    assert reordered.settings_fingerprint == index.settings_fingerprint
+
+    config["criteria"]["tier_2"]["brand_criteria"]["brand_promise_delivery"]["description"] = "edited"
+    edited = CriteriaIndex(config)
+    changed = {tier for tier in index.tiers if edited.fingerprints[tier] != index.fingerprints[tier]}
+    assert changed == {"tier_2"}
+    assert edited.settings_fingerprint == index.settings_fingerprint
+
+    config["scoring"] = {"changed": True}
+    assert CriteriaIndex(config).settings_fingerprint != index.settings_fingerprint
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed, partitioned unified audit dataset
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import dataset
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from test_package_manifest import _persona_folder
+
+FILTERS = [("persona", "=", "Persona 3"), ("tier", "=", "tier_1"), ("score", "<", 3)]
+
+def _criteria(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = [f"criterion_{i}" for i in range(12)]
+    return pd.DataFrame({
+        "page_id": [f"{page:08x}" for page in rng.integers(0, 2**32, rows)],
+        "criterion_code": rng.choice(codes, rows),
+        "criterion_name": rng.choice([code.title() for code in codes], rows),
+        "score": rng.integers(0, 11, rows).astype(float),
+        "evidence": rng.choice(["Clear value proposition on the page", "No proof points are visible",
+                                "Generic claims without evidence"], rows),
+        "weight_pct": rng.choice([10, 15, 20, 25], rows),
+        "tier": rng.choice(["tier_1", "tier_2", "tier_3"], rows),
+        "descriptor": rng.choice(["FAIL", "POOR", "GOOD", "EXCELLENT"], rows),
+        "impact_score": rng.random(rows) * 10
+    })
+
+def test_partitions_are_typed_sorted_and_read_back(tmp_path):
+    """Low-cardinality columns are dictionary-encoded and rows sorted by tier and score"""
+    frame = _criteria(500).assign(methodology_fingerprint="abc")
+    path = dataset.write_partition(tmp_path, "audit", frame, run="audit_outputs", persona="The CTO/CIO")
+
+    assert path == tmp_path / "audit" / "run=audit_outputs" / "persona=The%20CTO%2FCIO" / "part-0.parquet"
+    schema = pq.read_schema(path)
+    for column in ("criterion_code", "tier", "descriptor", "methodology_fingerprint"):
+        assert str(schema.field(column).type) == "dictionary<values=string, indices=int32, ordered=0>"
+
+    df = dataset.read_table(tmp_path, "audit")
+    assert df["persona"].unique().tolist() == ["The CTO/CIO"]
+    assert df["tier"].dtype == "category" and df["weight_pct"].dtype == "float64"
+    assert df[["tier", "score"]].astype({"tier": str}).equals(
+        df[["tier", "score"]].astype({"tier": str}).sort_values(["tier", "score"], ignore_index=True))
+    assert len(df) == 500
+
+def test_numeric_run_and_persona_names_stay_strings(tmp_path):
+    """Partition values that look like numbers are read and filtered as the strings they were written as"""
+    for run in ("20240601", "007"):
+        dataset.write_partition(tmp_path, "audit", _criteria(50, seed=int(run)), run=run, persona="42")
+
+    df = dataset.read_table(tmp_path, "audit", run="007")
+    assert len(df) == 50
+    assert df["run"].astype(str).unique().tolist() == ["007"] and df["persona"].astype(str).unique().tolist() == ["42"]
+    assert len(dataset.read_table(tmp_path, "audit", filters=[("run", "=", "20240601")])) == 50
+
+def test_filters_skip_other_partitions_and_row_groups(tmp_path, monkeypatch):
+    """A persona filter opens one file and tier/score statistics prune row groups"""
+    monkeypatch.setattr(dataset, "ROW_GROUP_SIZE", 1000)
+    frames = {f"Persona {i}": _criteria(6000, seed=i) for i in range(4)}
+    for persona, frame in frames.items():
+        dataset.write_partition(tmp_path, "audit", frame, run="r", persona=persona)
+
+    expected = frames["Persona 3"].query("tier == 'tier_1' and score < 3")
+    df = dataset.read_table(tmp_path, "audit", columns=["page_id", "score"], filters=FILTERS)
+    assert sorted(df["page_id"]) == sorted(expected["page_id"])
+
+    opened = dataset._open(tmp_path / "audit")
+    expression = pq.filters_to_expression(FILTERS)
+    fragments = list(opened.get_fragments(filter=expression))
+    assert len(fragments) == 1
+    row_groups = fragments[0].split_by_row_group(pq.filters_to_expression(FILTERS[1:]))
+    assert 0 < len(row_groups) < fragments[0].metadata.num_row_groups
+
+def test_repackaging_rewrites_changed_personas_and_drops_removed_ones(tmp_path, monkeypatch):
+    """Only the changed persona's partition is rewritten; CSV is written only on request"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    folder = _persona_folder(tmp_path, "B")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+
+    assert packager.run_id == "audit_outputs"
+    assert not list((tmp_path / "audit_data").glob("*.csv"))
+    df = dataset.read_table(packager.dataset_dir, "audit", run=packager.run_id)
+    assert sorted(df["persona"].unique()) == ["A", "B"]
+    assert len(dataset.read_table(packager.dataset_dir, "comparison")) == 2
+
+    for path in folder.iterdir():
+        path.unlink()
+    folder.rmdir()
+    packager.export_csv = True
+    packager.process_all_personas()
+
+    df = dataset.read_table(packager.dataset_dir, "audit")
+    assert df["persona"].unique().tolist() == ["A"]
+    csv = pd.read_csv(tmp_path / "audit_data" / "unified_audit_data.csv")
+    assert len(csv) == len(df)
+    assert packager.generate_cross_persona_insights()["persona_biases"]["A"]["bias"] == 0
+
+def _layouts(tmp_path):
+    """The same eight personas of criteria written as a flat parquet and CSV pair and as a dataset"""
+    frames = {f"Persona {i}": _criteria(15000, seed=i) for i in range(8)}
+
+    flat = pd.concat([frame.assign(persona=persona) for persona, frame in frames.items()], ignore_index=True)
+    flat.to_parquet(tmp_path / "unified_audit_data.parquet", index=False)
+    flat.to_csv(tmp_path / "unified_audit_data.csv", index=False)
+    for persona, frame in frames.items():
+        dataset.write_partition(tmp_path / "dataset", "audit", frame, run="r", persona=persona)
+
+def _read_flat(tmp_path):
+    df = pd.read_parquet(tmp_path / "unified_audit_data.parquet")
+    return df[(df["persona"] == "Persona 3") & (df["tier"] == "tier_1") & (df["score"] < 3)]
+
+def test_dataset_is_smaller_than_flat_files(tmp_path):
+    """The dataset is smaller than the flat parquet and answers filtered reads with the same rows"""
+    _layouts(tmp_path)
+    flat_size = sum((tmp_path / name).stat().st_size for name in ("unified_audit_data.parquet",
+                                                                  "unified_audit_data.csv"))
+    dataset_size = sum(path.stat().st_size for path in (tmp_path / "dataset").rglob("*.parquet"))
+
+    print(f"\nsize: flat parquet+csv {flat_size / 1e6:.1f} MB, dataset {dataset_size / 1e6:.1f} MB")
+    assert len(_read_flat(tmp_path)) == len(dataset.read_table(tmp_path / "dataset", "audit", filters=FILTERS))
+    assert dataset_size < (tmp_path / "unified_audit_data.parquet").stat().st_size
+
+@pytest.mark.benchmark
+def test_layout_benchmark_against_flat_files(tmp_path):
+    """The dataset answers filtered reads faster than the flat parquet"""
+    _layouts(tmp_path)
+
+    def best_of(read, repeat=3):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            read()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    flat_time = best_of(lambda: _read_flat(tmp_path))
+    dataset_time = best_of(lambda: dataset.read_table(tmp_path / "dataset", "audit", filters=FILTERS))
+
+    print(f"\nfiltered read: flat {flat_time * 1e3:.1f} ms, dataset {dataset_time * 1e3:.1f} ms")
+    assert dataset_time < flat_time
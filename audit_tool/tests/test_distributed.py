@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the coordinator/worker split
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.dataset import read_table
+from audit_tool.distributed import Coordinator, Worker
+from audit_tool.task_queue import InMemoryTaskQueue, SQLiteTaskQueue, DONE
+from test_pipeline import _make_tool
+
+def test_workers_share_queue_and_dead_leases_are_retried(tmp_path, monkeypatch):
+    """Two workers drain the queue, a task held by a dead worker is reclaimed"""
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)]
+    persona_paths = []
+    for name in ("Persona A", "Persona B"):
+        path = tmp_path / f"{name.replace(' ', '_')}.md"
+        path.write_text(f"# {name}\n\nA test persona.\n", encoding="utf-8")
+        persona_paths.append(str(path))
+
+    queue = InMemoryTaskQueue()
+    coordinator = Coordinator(_make_tool(tmp_path, monkeypatch), queue)
+    assert coordinator.submit(urls, persona_paths) == 6
+
+    # A worker that dies right after leasing
+    assert queue.lease("dead-worker", lease_seconds=0.05) is not None
+
+    workers = [Worker(_make_tool(tmp_path, monkeypatch), queue, worker_id=f"w{i}", slots=2,
+                      lease_seconds=0.3, poll_interval=0.02) for i in range(2)]
+    threads = [threading.Thread(target=worker.run) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sum(worker.completed for worker in workers) == 6
+    assert all(task.status == DONE for task in queue.tasks())
+
+    results = coordinator.package()
+    assert all(r["status"] == "success" for persona in results.values() for r in persona.values())
+
+    unified = read_table(tmp_path / "audit_data" / "dataset", "audit")
+    assert len(unified) == 2 * 3 * 5
+    assert unified["persona"].nunique() == 2
+
+def test_a_later_run_on_the_same_queue_audits_and_packages_only_its_tasks(tmp_path, monkeypatch):
+    """Reusing the queue database for a new run directory queues every pair again and packages that run alone"""
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(2)]
+    persona = tmp_path / "Persona_A.md"
+    persona.write_text("# Persona A\n\nA test persona.\n", encoding="utf-8")
+    queue_path = str(tmp_path / "queue.db")
+
+    def run(name, run_urls):
+        tool = _make_tool(tmp_path, monkeypatch)
+        tool.audit_outputs_dir = tmp_path / name
+        coordinator = Coordinator(tool, SQLiteTaskQueue(queue_path))
+        added = coordinator.submit(run_urls, [str(persona)])
+        worker_tool = _make_tool(tmp_path, monkeypatch)
+        worker_tool.audit_outputs_dir = tmp_path / name
+        Worker(worker_tool, SQLiteTaskQueue(queue_path), slots=1, poll_interval=0.02).run()
+        return added, worker_tool.scraper.calls, coordinator.package()
+
+    first_added, _, _ = run("run1", urls)
+    added, fetched, results = run("run2", urls[:1])
+
+    assert first_added == 2 and added == 1
+    assert fetched == urls[:1]
+    assert list(results[str(persona)]) == urls[:1]
+    assert {task.run for task in SQLiteTaskQueue(queue_path).tasks()} == {"run1", "run2"}
+    assert len(read_table(tmp_path / "audit_data" / "dataset", "audit", run="run2")) == 5
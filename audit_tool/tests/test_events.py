@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSONL run event stream
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.events import RunEventEmitter, EventTail, RunStats
+from audit_tool.pipeline import PipelineConfig
+from test_pipeline import _make_tool, PERSONA_PATH
+
+def test_tail_reads_by_offset_and_waits_for_whole_lines(tmp_path):
+    """Each read returns only new events and leaves a half-written line for later"""
+    path = tmp_path / "events.jsonl"
+    emitter = RunEventEmitter(str(path), run_id="r1")
+    tail = EventTail(path)
+
+    emitter.emit("run_started", total=2)
+    emitter.emit("url_started", url="https://a")
+    assert [e["event"] for e in tail.read()] == ["run_started", "url_started"]
+    assert tail.read() == []
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "comp')
+    assert tail.read() == []
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('leted", "ts": 1}\n')
+    assert [e["event"] for e in tail.read()] == ["completed"]
+    emitter.close()
+
+def test_pipeline_events_give_throughput_and_stage_latency(tmp_path, monkeypatch):
+    """A run emits one terminal event per pair plus timed scrape, model and parse events"""
+    tool = _make_tool(tmp_path, monkeypatch, PipelineConfig(llm_workers=2, queue_size=2))
+    tool.events = RunEventEmitter(str(tmp_path / "events.jsonl"))
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)] + ["https://www.soprasteria.be/missing"]
+
+    tool.run_audit(urls, str(PERSONA_PATH))
+    tool.events.close()
+
+    events = EventTail(tmp_path / "events.jsonl").read()
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "run_started" and kinds[-1] == "run_finished"
+    assert kinds.count("url_started") == 4
+    assert kinds.count("llm_done") == 6
+
+    stats = RunStats().update(events)
+    assert (stats.total, stats.completed, stats.failed, stats.finished) == (4, 3, 1, True)
+    assert stats.input_tokens == 600 and stats.output_tokens == 120
+    assert set(stats.stage_latency()) == {"scrape", "llm", "parse"}
+    assert stats.stage_latency()["llm"]["mean_ms"] >= 50
+    assert stats.eta_seconds() == 0
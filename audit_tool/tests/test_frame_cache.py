@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, projected loading of the unified audit data
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import frame_cache
+from audit_tool.dataset import DATASET_DIRNAME, read_table
+from audit_tool.frame_cache import cache_info, file_signature, load_table, load_unified, read_frame
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from test_package_manifest import _persona_folder
+
+NARRATIVES = ["language_tone_feedback", "information_gaps", "trust_credibility_assessment",
+              "business_impact_analysis", "effective_copy_examples", "ineffective_copy_examples"]
+PAGE_COLUMNS = ["persona_id", "page_id", "tier", "criterion_id", "raw_score", "descriptor", "avg_score"]
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    frame_cache.clear_cache()
+    yield
+    frame_cache.clear_cache()
+
+def _unified(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Legacy wide unified frame: codes and descriptors, scores, and long narratives per row"""
+    rng = np.random.default_rng(seed)
+    pages = rows // 10
+    page = rng.integers(0, pages, rows)
+    frame = pd.DataFrame({
+        "persona_id": rng.choice(["CTO", "CFO", "CIO", "Board Member", "Procurement Lead"], rows),
+        "page_id": [f"page_{i:05d}" for i in page],
+        "url": [f"https://www.example.com/section/page-{i}" for i in page],
+        "tier": rng.choice(["tier_1", "tier_2", "tier_3"], rows),
+        "criterion_id": rng.choice([f"criterion_{i}" for i in range(12)], rows),
+        "raw_score": rng.integers(0, 11, rows).astype(float),
+        "final_score": rng.integers(0, 11, rows).astype(float),
+        "descriptor": rng.choice(["EXCELLENT", "GOOD", "CONCERN", "FAIL"], rows),
+        "evidence": [f"Evidence for page {i}: the hero copy states the offer but offers little proof." for i in page],
+    })
+    for column in NARRATIVES:
+        frame[column] = [f"{column} of page {i}: " + "a sentence of persona feedback. " * 8 for i in page]
+    return frame
+
+def test_projection_reads_only_the_requested_columns_as_categoricals(tmp_path):
+    """Parquet and CSV sources return the projection, in order, with low-cardinality text as categoricals"""
+    frame = _unified(500)
+    frame.to_parquet(tmp_path / "unified_audit_data.parquet", index=False)
+
+    loaded = load_unified(tmp_path, PAGE_COLUMNS + ["not_a_column"])
+    assert loaded.columns.tolist() == PAGE_COLUMNS
+    assert isinstance(loaded["persona_id"].dtype, pd.CategoricalDtype)
+    assert isinstance(loaded["descriptor"].dtype, pd.CategoricalDtype)
+    assert loaded["page_id"].dtype != "category" and loaded["raw_score"].dtype == "float64"
+    assert loaded["avg_score"].tolist() == frame["final_score"].tolist()
+    assert loaded["persona_id"].astype(str).tolist() == frame["persona_id"].tolist()
+
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    frame.drop(columns=NARRATIVES).to_csv(csv_dir / "unified_audit_data.csv", index=False)
+    from_csv = read_frame(csv_dir / "unified_audit_data.csv", ["tier", "page_id"])
+    assert from_csv.columns.tolist() == ["tier", "page_id"]
+    assert isinstance(from_csv["tier"].dtype, pd.CategoricalDtype)
+    assert load_unified(tmp_path / "missing", PAGE_COLUMNS).empty
+
+def test_reruns_hit_the_cache_until_the_file_changes(tmp_path):
+    """Repeated loads are hits returning frames safe to modify; rewriting the file is picked up at once"""
+    path = tmp_path / "unified_audit_data.parquet"
+    _unified(200).to_parquet(path, index=False)
+
+    before = cache_info()
+    first = load_unified(tmp_path, PAGE_COLUMNS)
+    first["raw_score"] = -1.0
+    second = load_unified(tmp_path, PAGE_COLUMNS)
+    assert cache_info()["hits"] == before["hits"] + 1 and cache_info()["misses"] == before["misses"] + 1
+    assert (second["raw_score"] >= 0).all()
+    load_unified(tmp_path, ["page_id"])
+    assert cache_info()["size"] == 2
+
+    _unified(300, seed=1).to_parquet(path, index=False)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = load_unified(tmp_path, PAGE_COLUMNS)
+    assert len(changed) == 300 and cache_info()["misses"] == before["misses"] + 3
+    # The frames of the earlier file are dropped, not left to age out
+    assert cache_info()["size"] == 1
+
+def test_dataset_takes_precedence_and_repackaging_invalidates_it(tmp_path, monkeypatch):
+    """The partitioned dataset is read before the exports, and a repackage changes its signature"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+    data_dir = tmp_path / "audit_data"
+    _unified(50).to_parquet(data_dir / "unified_audit_data.parquet", index=False)
+
+    audit = load_unified(data_dir, ["persona", "page_id", "criterion_code", "score", "avg_score"])
+    expected = read_table(data_dir / DATASET_DIRNAME, "audit")
+    assert len(audit) == len(expected)
+    assert audit["avg_score"].tolist() == audit["score"].tolist()
+    assert isinstance(audit["criterion_code"].dtype, pd.CategoricalDtype)
+    signature = file_signature(data_dir / DATASET_DIRNAME / "audit")
+    assert signature and all(not name.startswith(".") for name, _, _ in signature)
+
+    _persona_folder(tmp_path, "B")
+    MultiPersonaPackager(str(tmp_path / "audit_outputs")).process_all_personas()
+    assert file_signature(data_dir / DATASET_DIRNAME / "audit") != signature
+    before = cache_info()
+    both = load_unified(data_dir, ["persona", "page_id"])
+    assert set(both["persona"]) == {"A", "B"} and cache_info()["misses"] == before["misses"] + 1
+
+def test_only_the_latest_run_is_loaded_unless_another_is_chosen(tmp_path, monkeypatch):
+    """Two packaged runs are not counted twice: the latest is read, or the run asked for"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    for run in ("r1", "r2"):
+        MultiPersonaPackager(str(tmp_path / "audit_outputs"), run_id=run).process_all_personas()
+    data_dir = tmp_path / "audit_data"
+    one_run = read_table(data_dir / DATASET_DIRNAME, "audit", run="r1")
+
+    latest = load_unified(data_dir, ["run", "page_id", "score"])
+    assert len(latest) == len(one_run) and set(latest["run"]) == {"r2"}
+    assert set(load_unified(data_dir, ["run", "page_id"], run="r1")["run"]) == {"r1"}
+    cube = load_table(data_dir / DATASET_DIRNAME, "cube")
+    assert len(cube) == len(read_table(data_dir / DATASET_DIRNAME, "cube", run="r2")) and set(cube["run"]) == {"r2"}
+    assert load_table(data_dir / DATASET_DIRNAME, "experience", run="missing").empty
+
+def test_projected_parquet_is_a_fraction_of_the_csv_in_memory(tmp_path):
+    """The dashboard's projection holds every row in a quarter of the memory of pd.read_csv of the export"""
+    frame = _unified(20000)
+    frame.to_parquet(tmp_path / "unified_audit_data.parquet", index=False)
+    frame.to_csv(tmp_path / "unified_audit_data.csv", index=False)
+
+    csv_frame = pd.read_csv(tmp_path / "unified_audit_data.csv")
+    parquet_frame = load_unified(tmp_path, PAGE_COLUMNS)
+    csv_memory = csv_frame.memory_usage(deep=True).sum()
+    parquet_memory = parquet_frame.memory_usage(deep=True).sum()
+
+    print(f"\nunified data of {len(frame)} rows: read_csv {csv_memory / 2**20:.1f} MiB, "
+          f"projected parquet {parquet_memory / 2**20:.1f} MiB")
+    assert len(parquet_frame) == len(csv_frame)
+    assert parquet_memory < csv_memory / 4
+
+@pytest.mark.benchmark
+def test_cached_projected_parquet_beats_reading_the_csv(tmp_path):
+    """Load time of the dashboard's projection against pd.read_csv of the whole export"""
+    frame = _unified(20000)
+    frame.to_parquet(tmp_path / "unified_audit_data.parquet", index=False)
+    frame.to_csv(tmp_path / "unified_audit_data.csv", index=False)
+
+    def timed(load):
+        started = time.perf_counter()
+        load()
+        return time.perf_counter() - started
+
+    csv_time = timed(lambda: pd.read_csv(tmp_path / "unified_audit_data.csv"))
+    parquet_time = timed(lambda: load_unified(tmp_path, PAGE_COLUMNS))
+    cached_time = timed(lambda: load_unified(tmp_path, PAGE_COLUMNS))
+
+    print(f"\nunified data of {len(frame)} rows: read_csv {csv_time * 1e3:.0f} ms, "
+          f"projected parquet {parquet_time * 1e3:.0f} ms, cached rerun {cached_time * 1e3:.2f} ms")
+    assert parquet_time < csv_time
+    assert cached_time < parquet_time / 10
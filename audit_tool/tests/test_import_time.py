@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the audit_tool package and CLI module
+"""
+
+import os
+import re
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Regression thresholds for the cumulative import time, in microseconds
+THRESHOLDS_US = {
+    "audit_tool": 50_000,
+    "audit_tool.main": 300_000,
+}
+
+HEAVY_MODULES = ("pandas", "numpy", "yaml", "requests", "playwright", "bs4", "streamlit")
+
+def _import_in_subprocess(module: str, cwd: Path):
+    """Import a module in a fresh interpreter and return its cumulative import time and loaded heavy modules."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", line)
+        if match and match.group(2) == module:
+            cumulative = int(match.group(1))
+
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative, loaded
+
+@pytest.mark.parametrize("module", sorted(THRESHOLDS_US))
+def test_import_is_lazy(module, tmp_path):
+    """Importing the package or CLI module loads no heavy dependency and has no side effects"""
+    cumulative, loaded = _import_in_subprocess(module, tmp_path)
+
+    assert cumulative is not None
+    assert loaded == []
+    # Logging is configured by the entry point, not as an import side effect
+    assert not (tmp_path / "audit_tool.log").exists()
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("module", sorted(THRESHOLDS_US))
+def test_import_stays_under_budget(module, tmp_path):
+    """Cumulative import time of the package or CLI module stays under its regression threshold"""
+    cumulative, _ = _import_in_subprocess(module, tmp_path)
+
+    print(f"{module}: {cumulative / 1000:.1f} ms")
+    assert cumulative < THRESHOLDS_US[module]
+
+def test_public_names_resolve_lazily():
+    import audit_tool
+
+    assert "BrandAuditTool" in dir(audit_tool)
+    assert audit_tool.TierClassifier.__name__ == "TierClassifier"
+    with pytest.raises(AttributeError):
+        audit_tool.DoesNotExist
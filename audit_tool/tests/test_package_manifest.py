@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental packaging driven by the package manifest
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import backfill_packager
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.dataset import partition_dir, PART_FILENAME
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from audit_tool.package_manifest import PackageManifest
+from test_pipeline import SAMPLE_DIR
+
+def _persona_folder(tmp_path, name="Persona"):
+    folder = tmp_path / "audit_outputs" / name
+    folder.mkdir(parents=True)
+    for path in SAMPLE_DIR.glob("*.md"):
+        if path.name.endswith(("_hygiene_scorecard.md", "_experience_report.md")):
+            shutil.copy(path, folder)
+    return folder
+
+def _touch(path, text):
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+def _parsed_slugs(packager, monkeypatch):
+    parsed = []
+    build = packager.build_page_tables
+    monkeypatch.setattr(packager, "build_page_tables",
+                        lambda sources: parsed.append(sources["scorecard"]["file"]) or build(sources))
+    return parsed
+
+def test_only_changed_pages_are_parsed_and_match_a_full_build(tmp_path, monkeypatch):
+    """An edited page is parsed again on its own and the tables equal a from-scratch build"""
+    folder = _persona_folder(tmp_path)
+    packager = EnhancedBackfillPackager("Persona", input_dir=folder)
+    tables, written = packager.package_incremental()
+    assert written == ["pages", "criteria_scores", "recommendations", "experience"]
+
+    parsed = _parsed_slugs(packager, monkeypatch)
+    assert packager.package_incremental()[1] == []
+    assert parsed == []
+
+    scorecard = sorted(folder.glob("*_hygiene_scorecard.md"))[3]
+    _touch(scorecard, scorecard.read_text(encoding="utf-8").replace("Final Score:** ", "Final Score:** 1"))
+    tables, written = packager.package_incremental()
+
+    assert parsed == [scorecard.name]
+    full, _ = EnhancedBackfillPackager("Persona", input_dir=folder).package_incremental(full=True)
+    for name, df in full.items():
+        pd.testing.assert_frame_equal(tables[name], df)
+        pd.testing.assert_frame_equal(pd.read_parquet(folder / f"{name}.parquet"), df)
+
+def test_streamed_backfill_writes_the_tables_of_an_in_memory_build(tmp_path, monkeypatch):
+    """stream_incremental writes the same Parquet, CSV and row ranges as package_incremental, full and incremental"""
+    monkeypatch.setattr(backfill_packager, "PAGE_BATCH_SIZE", 2)
+    streamed, in_memory = _persona_folder(tmp_path / "streamed"), _persona_folder(tmp_path / "in_memory")
+    for step in range(2):
+        counts, written, _ = EnhancedBackfillPackager("Persona", input_dir=streamed).stream_incremental()
+        tables, expected = EnhancedBackfillPackager("Persona", input_dir=in_memory).package_incremental()
+        assert written == expected
+        assert counts == {name: len(df) for name, df in tables.items()}
+        for name in tables:
+            pd.testing.assert_frame_equal(pd.read_parquet(streamed / f"{name}.parquet"),
+                                          pd.read_parquet(in_memory / f"{name}.parquet"))
+            assert (streamed / f"{name}.csv").read_text() == (in_memory / f"{name}.csv").read_text()
+        stream_manifest, memory_manifest = PackageManifest(streamed), PackageManifest(in_memory)
+        assert {slug: stream_manifest.rows(slug, "criteria_scores") for slug in stream_manifest.pages} \
+            == {slug: memory_manifest.rows(slug, "criteria_scores") for slug in memory_manifest.pages}
+
+        # Edit one page and delete another in both folders, then package again
+        for folder in (streamed, in_memory):
+            scorecards = sorted(folder.glob("*_hygiene_scorecard.md"))
+            _touch(scorecards[1], scorecards[1].read_text(encoding="utf-8").replace("Final Score:** ", "Final Score:** 1"))
+            scorecards[0].unlink()
+
+def test_deleted_pages_drop_their_rows(tmp_path):
+    """Removing a page's reports removes its rows and row ranges stay contiguous"""
+    folder = _persona_folder(tmp_path)
+    packager = EnhancedBackfillPackager("Persona", input_dir=folder)
+    before, _ = packager.package_incremental()
+
+    scorecard = sorted(folder.glob("*_hygiene_scorecard.md"))[0]
+    slug = scorecard.name[:-len("_hygiene_scorecard.md")]
+    scorecard.unlink()
+    (folder / f"{slug}_experience_report.md").unlink()
+    after, _ = packager.package_incremental()
+
+    assert len(after["pages"]) == len(before["pages"]) - 1
+    assert slug not in set(after["pages"]["slug"])
+    manifest = PackageManifest(folder)
+    assert slug not in manifest.pages
+    assert sum(stop - start for start, stop in (manifest.rows(s, "criteria_scores") for s in manifest.pages)) \
+        == len(after["criteria_scores"])
+
+def test_tables_rewritten_elsewhere_trigger_a_full_rebuild(tmp_path, monkeypatch):
+    """Row ranges are only trusted while the table files are the ones the manifest wrote"""
+    folder = _persona_folder(tmp_path)
+    packager = EnhancedBackfillPackager("Persona", input_dir=folder)
+    tables, _ = packager.package_incremental()
+
+    tables["pages"].iloc[:2].to_parquet(folder / "pages.parquet", index=False)
+    parsed = _parsed_slugs(packager, monkeypatch)
+    rebuilt, written = packager.package_incremental()
+
+    assert len(parsed) == len(tables["pages"])
+    assert "pages" in written
+    pd.testing.assert_frame_equal(rebuilt["pages"], tables["pages"])
+
+def test_unified_files_are_kept_when_no_persona_changed(tmp_path, monkeypatch):
+    """A repeat multi-persona run writes nothing; a change rewrites that persona's tables and partitions"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    folder = _persona_folder(tmp_path, "B")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+
+    packager.process_all_personas()
+    unified = {name: partition_dir(packager.dataset_dir, "audit", run=packager.run_id, persona=name) / PART_FILENAME
+               for name in ("A", "B")}
+    mtimes = {name: path.stat().st_mtime_ns for name, path in unified.items()}
+
+    results = packager.process_all_personas()
+    assert [r["tables_written"] for r in results.values()] == [[], []]
+    assert {name: path.stat().st_mtime_ns for name, path in unified.items()} == mtimes
+
+    scorecard = sorted(folder.glob("*_hygiene_scorecard.md"))[0]
+    _touch(scorecard, scorecard.read_text(encoding="utf-8").replace("Final Score:** ", "Final Score:** 1"))
+    results = packager.process_all_personas()
+    assert results["A"]["tables_written"] == [] and results["B"]["tables_written"]
+    assert unified["A"].stat().st_mtime_ns == mtimes["A"]
+    assert unified["B"].stat().st_mtime_ns != mtimes["B"]
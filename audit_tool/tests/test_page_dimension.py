@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the page dimension and integer page keys
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import dataset
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from audit_tool.packager import AuditDataPackager
+from audit_tool.page_dimension import PageDimension, canonical_url
+from test_package_manifest import _persona_folder
+
+def test_spellings_of_one_page_share_a_canonical_url():
+    """Scheme, host case, default ports, slashes, query order and fragments do not make a new page"""
+    spellings = ["https://www.soprasteria.be/industries/", "HTTP://WWW.SopraSteria.be:80/industries",
+                 "www.soprasteria.be//industries#top", "https://www.soprasteria.be:443/industries/"]
+    assert {canonical_url(url) for url in spellings} == {"https://www.soprasteria.be/industries"}
+    assert canonical_url("https://x.com/a?b=2&a=1") == canonical_url("https://x.com/a/?a=1&b=2")
+    assert canonical_url("https://x.com/a") != canonical_url("https://x.com/b")
+    assert canonical_url("https://x.com:8443/a") == "https://x.com:8443/a"
+    assert canonical_url("") == ""
+
+def test_keys_are_stable_across_loads_and_never_reused(tmp_path):
+    """Known pages keep their key, new pages get the next one and attributes follow the latest run"""
+    dimension = PageDimension(tmp_path)
+    keys = dimension.keys(pd.Series(["https://a.com/x", "http://a.com/x/", "https://b.com", None]),
+                          pd.Series(["ax", "ax", "b", "orphan"]), pd.Series(["tier_1", "tier_1", "tier_2", None]),
+                          run="r1")
+    assert keys.tolist() == [1, 1, 2, 3] and keys.dtype == "int32"
+    dimension.save()
+    path = tmp_path / "pages" / dataset.PART_FILENAME
+    written = path.stat().st_mtime_ns
+
+    reloaded = PageDimension(tmp_path)
+    assert reloaded.keys(pd.Series(["https://b.com/"]), tiers=pd.Series(["tier_2"])).tolist() == [2]
+    reloaded.save()
+    assert path.stat().st_mtime_ns == written
+
+    assert reloaded.keys(pd.Series(["https://c.com", "https://b.com"]), tiers=pd.Series(["tier_3", "tier_1"]),
+                         run="r2").tolist() == [4, 2]
+    reloaded.save()
+    pages = PageDimension(tmp_path).frame()
+    assert pages["page_key"].tolist() == [1, 2, 3, 4]
+    assert pages.set_index("page_key").loc[2, ["tier", "first_run", "last_run"]].tolist() == ["tier_1", "r1", "r2"]
+    assert pages.set_index("page_key").loc[3, "url"] == "slug:orphan"
+
+def test_fact_tables_carry_the_same_keys_across_personas_and_runs(tmp_path, monkeypatch):
+    """Every persona's rows of a page carry one int32 key, and a later run reuses it"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    _persona_folder(tmp_path, "B")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+
+    pages = dataset.read_table(packager.dataset_dir, "pages")
+    audit = dataset.read_table(packager.dataset_dir, "audit")
+    assert len(pages) == len(list(Path("audit_outputs/A").glob("*_hygiene_scorecard.md")))
+    assert pq.read_schema(dataset.partition_dir(packager.dataset_dir, "audit", run=packager.run_id, persona="A")
+                          / dataset.PART_FILENAME).field("page_key").type == "int32"
+    keys = audit.groupby("persona", observed=True).apply(
+        lambda rows: dict(zip(rows["page_id"], rows["page_key"])), include_groups=False)
+    assert keys["A"] == keys["B"] and set(keys["A"].values()) == set(pages["page_key"])
+    assert not dataset.read_table(packager.dataset_dir, "experience")["page_key"].isna().any()
+    assert pd.read_parquet(tmp_path / "audit_data" / "A" / "recommendations.parquet")["page_key"].notna().all()
+    assert set(packager.generate_cross_persona_insights()["url_variance"]) <= set(pages["url"])
+
+    later = MultiPersonaPackager(str(tmp_path / "audit_outputs"), run_id="second")
+    later.write_unified_files({"A": packager.persona_tables["A"]})
+    second = dataset.read_table(later.dataset_dir, "audit", run="second")
+    assert dict(zip(second["page_id"], second["page_key"])) == keys["A"]
+    assert len(dataset.read_table(later.dataset_dir, "pages")) == len(pages)
+
+def test_partitions_without_keys_are_rewritten_and_runs_share_the_dimension(tmp_path, monkeypatch):
+    """Partitions written before page keys existed are upgraded; audit runs reuse the dataset's keys"""
+    monkeypatch.chdir(tmp_path)
+    folder = _persona_folder(tmp_path, "A")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+
+    path = dataset.partition_dir(packager.dataset_dir, "audit", run=packager.run_id, persona="A") / dataset.PART_FILENAME
+    pq.write_table(pq.read_table(path).drop_columns(["page_key"]), path)
+    assert not dataset.partition_current(packager.dataset_dir, "audit", run=packager.run_id, persona="A")
+    MultiPersonaPackager(str(tmp_path / "audit_outputs")).process_all_personas()
+    assert dataset.read_table(packager.dataset_dir, "audit")["page_key"].notna().all()
+
+    run = AuditDataPackager("A")
+    run.input_dir, run.output_dir, run.dataset_dir = folder, tmp_path / "audit_runs" / "A_1", packager.dataset_dir
+    run.package_run()
+    facts = pd.read_parquet(run.output_dir / "page_facts.parquet")
+    pages = dataset.read_table(packager.dataset_dir, "pages").set_index("slug")
+    assert facts["page_key"].tolist() == pages.loc[facts["url_slug"], "page_key"].tolist()
+    assert len(dataset.read_table(packager.dataset_dir, "pages")) == len(pages)
+
+def test_instances_sharing_a_dataset_never_hand_out_one_key_twice(tmp_path):
+    """Two dimensions loaded before either allocates agree on keys, and saving one keeps the other's pages"""
+    first, second = PageDimension(tmp_path), PageDimension(tmp_path)
+    assert first.keys(pd.Series(["https://a.com/x"]), tiers=pd.Series(["tier_1"]), run="r1").tolist() == [1]
+    assert second.keys(pd.Series(["https://a.com/y"]), tiers=pd.Series(["tier_2"]), run="r2").tolist() == [2]
+    assert second.keys(pd.Series(["https://a.com/x"]), run="r2").tolist() == [1]
+    assert first.keys(pd.Series(["https://a.com/z", "https://a.com/y"]), run="r1").tolist() == [3, 2]
+    second.save()
+    first.keys(pd.Series(["https://a.com/x"]), tiers=pd.Series(["tier_3"]))
+    first.save()
+
+    pages = PageDimension(tmp_path).frame().set_index("url")
+    assert pages["page_key"].to_dict() == {"https://a.com/x": 1, "https://a.com/y": 2, "https://a.com/z": 3}
+    assert pages.loc["https://a.com/x", ["tier", "first_run", "last_run"]].tolist() == ["tier_3", "r1", "r2"]
+    assert pages.loc["https://a.com/y", ["tier", "first_run"]].tolist() == ["tier_2", "r2"]
+
+def test_concurrent_writers_allocate_unique_keys(tmp_path):
+    """Threads with their own dimensions on one dataset allocate disjoint keys and every page is saved"""
+    dimensions = [PageDimension(tmp_path) for _ in range(4)]
+
+    def allocate(index):
+        dimension = dimensions[index]
+        keys = {}
+        for batch in range(10):
+            urls = [f"https://a.com/{index}/{batch}/{page}" for page in range(5)] + ["https://a.com/shared"]
+            keys.update(zip(urls, dimension.keys(pd.Series(urls), run=f"r{index}").tolist()))
+        dimension.save()
+        return keys
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        allocated = list(pool.map(allocate, range(4)))
+    assert len({allocation["https://a.com/shared"] for allocation in allocated}) == 1
+    merged = {url: key for allocation in allocated for url, key in allocation.items()}
+    assert len(set(merged.values())) == len(merged) == 4 * 50 + 1
+    pages = PageDimension(tmp_path).frame()
+    assert dict(zip(pages["url"], pages["page_key"])) == merged
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for packaging reports across a process pool
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import backfill_packager, parallel_packaging
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.package_manifest import PackageManifest
+from audit_tool.parallel_packaging import PackagingPool, package_chunk, split_chunk
+from test_package_manifest import _persona_folder
+
+def test_pool_builds_the_same_tables_as_the_calling_process(tmp_path):
+    """Chunks parsed in worker processes reassemble into the tables of a serial build"""
+    folder = _persona_folder(tmp_path)
+    serial, _ = EnhancedBackfillPackager("Persona", input_dir=folder).package_incremental(
+        table_dir=tmp_path / "serial", save_table=lambda name, df: None, full=True)
+
+    with PackagingPool(max_workers=2, chunk_size=5, min_pages=1) as pool:
+        parallel, written = EnhancedBackfillPackager("Persona", input_dir=folder).package_incremental(
+            full=True, pool=pool)
+        assert pool._executor is not None
+
+    assert written == ["pages", "criteria_scores", "recommendations", "experience"]
+    for name, df in serial.items():
+        pd.testing.assert_frame_equal(parallel[name], df)
+        pd.testing.assert_frame_equal(pd.read_parquet(folder / f"{name}.parquet"), df)
+
+def test_chunks_round_trip_through_arrow_per_page(tmp_path):
+    """Each page's slice of the chunk tables holds exactly the rows built for it"""
+    folder = _persona_folder(tmp_path)
+    packager = EnhancedBackfillPackager("Persona", input_dir=folder)
+    pages = sorted(PackageManifest(folder).scan(folder).items())[:6]
+
+    result = package_chunk("Persona", str(folder), pages)
+    assert all(isinstance(data, bytes) for data in result.batches.values())
+
+    split = split_chunk(result)
+    assert list(split) == [slug for slug, _ in pages]
+    for slug, sources in pages:
+        for name, df in packager.build_page_tables(sources).items():
+            table, start, stop = split[slug][name]
+            assert stop - start == len(df)
+            if len(df):
+                pd.testing.assert_frame_equal(table.iloc[start:stop].reset_index(drop=True), df)
+
+def test_a_worker_builds_one_packager_per_persona(tmp_path, monkeypatch):
+    """Later chunks of a persona reuse the worker's packager instead of loading the methodology again"""
+    folder = _persona_folder(tmp_path)
+    pages = sorted(PackageManifest(folder).scan(folder).items())[:4]
+    built = []
+    monkeypatch.setattr(parallel_packaging, "_packagers", {})
+    monkeypatch.setattr(backfill_packager, "EnhancedBackfillPackager",
+                        lambda *args, **kwargs: built.append(args) or EnhancedBackfillPackager(*args, **kwargs))
+
+    parallel_packaging._init_worker()
+    for chunk in (pages[:2], pages[2:]):
+        package_chunk("Persona", str(folder), chunk)
+    package_chunk("Other", str(folder), pages[:1])
+
+    assert built == [("Persona",), ("Other",)]
+
+def test_failed_pages_are_reported_and_the_rest_kept(tmp_path):
+    """A page whose report disappeared is reported without losing the chunk"""
+    folder = _persona_folder(tmp_path)
+    pages = sorted(PackageManifest(folder).scan(folder).items())[:3]
+    pages.insert(1, ("gone", {"scorecard": {"file": "gone_hygiene_scorecard.md"}}))
+
+    result = package_chunk("Persona", str(folder), pages)
+
+    assert list(result.errors) == ["gone"]
+    assert list(split_chunk(result)) == [pages[0][0], pages[2][0], pages[3][0]]
+
+def test_small_batches_are_parsed_without_starting_workers(tmp_path):
+    """Repackaging a few pages never pays for starting worker processes"""
+    folder = _persona_folder(tmp_path)
+
+    with PackagingPool() as pool:
+        tables, _ = EnhancedBackfillPackager("Persona", input_dir=folder).package_incremental(pool=pool)
+        assert pool._executor is None
+
+    assert len(tables["pages"]) == len(list(folder.glob("*_hygiene_scorecard.md")))
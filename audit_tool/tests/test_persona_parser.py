@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass, cached persona parser and its prompt digest
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.persona_parser import PersonaParser, _parse_file
+from test_pipeline import _make_tool, PERSONA_PATH
+
+MARKDOWN_PERSONA = """# Jane Doe (CTO)
+
+## Company
+Acme Bank
+
+## Location
+Brussels
+
+## Goals
+- Modernise the core platform
+- Cut run costs
+- Pass the DORA audit
+
+## Pain Points
+1. Legacy mainframe
+2. Talent shortages
+
+## Quote
+> "Show me the numbers"
+"""
+
+def test_markdown_sections_become_persona_attributes():
+    """'## Heading' sections fill the persona and every list item is kept"""
+    persona = PersonaParser().extract_attributes_from_content(MARKDOWN_PERSONA)
+
+    assert (persona.name, persona.role, persona.company, persona.location) == ("Jane Doe (CTO)", "CTO",
+                                                                                "Acme Bank", "Brussels")
+    assert persona.goals == ["Modernise the core platform", "Cut run costs", "Pass the DORA audit"]
+    assert persona.pain_points == ["Legacy mainframe", "Talent shortages"]
+    assert persona.quote == "Show me the numbers"
+
+def test_brief_fields_and_digest():
+    """Labelled brief fields are read and summarised into a short, deterministic digest"""
+    parser = PersonaParser()
+    content = PERSONA_PATH.read_text(encoding="utf-8")
+    persona = parser.extract_attributes_from_content(content)
+
+    assert (persona.role, persona.industry, persona.location) == ("Chief Executive Officer", "Financial Services",
+                                                                  "BENELUX")
+    assert persona.goals == ["Digital transformation", "Regulatory compliance", "Cost optimization"]
+    assert persona.decision_factors == ["ROI", "Security", "Compliance"]
+
+    digest = parser.digest_from_content(content)
+    assert digest.splitlines()[:4] == ["Persona: Test CEO", "Role: Chief Executive Officer",
+                                       "Industry: Financial Services", "Location: BENELUX"]
+    assert "- Legacy systems" in digest.splitlines()
+    assert parser.digest_from_content(str(content)) == digest
+    assert len(digest) < len(content)
+
+    # Nothing to summarise: callers keep the full markdown
+    assert parser.digest_from_content("Some notes without any structure\n") is None
+
+def test_files_are_cached_by_path_and_mtime(tmp_path):
+    """A file is tokenized once until it changes, and callers get independent copies"""
+    path = tmp_path / "persona.md"
+    path.write_text(MARKDOWN_PERSONA, encoding="utf-8")
+    parser = PersonaParser()
+
+    first = parser.extract_attributes_from_file(str(path))
+    first.goals.append("mutated")
+    misses = _parse_file.cache_info().misses
+    assert parser.extract_attributes_from_file(str(path)).goals[-1] == "Pass the DORA audit"
+    assert _parse_file.cache_info().misses == misses
+
+    path.write_text(MARKDOWN_PERSONA.replace("Acme Bank", "Globex"), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert parser.extract_attributes_from_file(str(path)).company == "Globex"
+    assert _parse_file.cache_info().misses == misses + 1
+
+def test_digest_replaces_persona_in_prompts(tmp_path, monkeypatch):
+    """With persona_digest on, prompts and the persona fingerprint use the digest"""
+    tool = _make_tool(tmp_path, monkeypatch)
+    tool.persona_digest = True
+    seen = []
+    build = tool.ai.build_hygiene_prompt
+    tool.ai.build_hygiene_prompt = lambda url, page, persona, *args, **kwargs: (
+        seen.append(persona) or build(url, page, persona, *args, **kwargs))
+
+    tool.run_audit(["https://www.soprasteria.be/"], str(PERSONA_PATH))
+
+    assert seen == [tool.persona_parser.digest_from_file(str(PERSONA_PATH))]
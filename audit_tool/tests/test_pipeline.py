@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged audit pipeline
+"""
+
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.ai_interface import ERROR_RESPONSE_PREFIX, AIInterface
+from audit_tool.dataset import read_table
+from audit_tool.main import BrandAuditTool
+from audit_tool.pipeline import PipelineConfig
+from audit_tool.run_journal import RunJournal
+
+SAMPLE_DIR = Path(__file__).parent.parent.parent / "audit_outputs" / "The Technical Influencer"
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "methodology.yaml"
+PERSONA_PATH = Path(__file__).parent / "test_persona_simple.md"
+
+class FakeScraper:
+    """Scraper stand-in that never touches the network."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_page(self, url):
+        self.calls.append(url)
+        return SimpleNamespace(url=url, raw_text=f"content of {url}", is_404=url.endswith("/missing"))
+
+class FakeAI:
+    """AI stand-in returning stored reports after a short delay."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.scorecard = (SAMPLE_DIR / "wwwsoprasteriabe_hygiene_scorecard.md").read_text(encoding="utf-8")
+        self.experience = (SAMPLE_DIR / "wwwsoprasteriabe_experience_report.md").read_text(encoding="utf-8")
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def build_hygiene_prompt(self, url, page_content, persona_content, methodology, **tier):
+        return f"hygiene:{url}"
+
+    def build_experience_prompt(self, url, page_content, persona_content, methodology, **tier):
+        return f"experience:{url}"
+
+    def generate_response(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return self.scorecard if prompt.startswith("hygiene:") else self.experience
+
+    def last_usage(self):
+        return {"input_tokens": 100, "output_tokens": 20}
+
+def _make_tool(tmp_path, monkeypatch, config=None):
+    monkeypatch.chdir(tmp_path)
+    tool = BrandAuditTool(str(CONFIG_PATH), pipeline_config=config)
+    tool.scraper = FakeScraper()
+    tool.ai = FakeAI()
+    tool.audit_outputs_dir = tmp_path / "audit_outputs"
+    return tool
+
+def test_pipeline_streams_rows_and_reports_errors(tmp_path, monkeypatch):
+    """Every URL gets a result and the persona tables hold one row set per page"""
+    tool = _make_tool(tmp_path, monkeypatch, PipelineConfig(llm_workers=4, queue_size=2))
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(8)] + ["https://www.soprasteria.be/missing"]
+
+    results = tool.run_audit(urls, str(PERSONA_PATH))
+
+    assert list(results) == urls
+    assert sum(r["status"] == "success" for r in results.values()) == 8
+    assert results[urls[-1]] == {"status": "error", "message": "Page not found (404)"}
+
+    # LLM calls overlap instead of running one after another
+    assert tool.ai.peak > 1
+
+    persona_dir = next(p for p in (tmp_path / "audit_outputs").iterdir() if p.is_dir())
+    pages = pd.read_csv(persona_dir / "pages.csv")
+    criteria = pd.read_csv(persona_dir / "criteria_scores.csv")
+    assert len(pages) == 8
+    assert len(criteria) == 8 * 5
+    assert len(list(persona_dir.glob("*_hygiene_scorecard.md"))) == 8
+
+def test_repeated_urls_are_audited_once(tmp_path, monkeypatch):
+    """A URL listed twice is scraped, counted and packaged once, keeping its first position"""
+    tool = _make_tool(tmp_path, monkeypatch)
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in (0, 1, 0, 2, 1)]
+
+    results = tool.run_audit(urls, str(PERSONA_PATH))
+
+    assert list(results) == urls[:2] + urls[3:4]
+    assert sorted(tool.scraper.calls) == sorted(set(urls))
+    persona_dir = next(p for p in (tmp_path / "audit_outputs").iterdir() if p.is_dir())
+    assert len(pd.read_csv(persona_dir / "pages.csv")) == 3
+
+def test_multi_persona_writes_unified_files_without_reparse(tmp_path, monkeypatch):
+    """Unified files are written from the streamed rows at the end of a multi-persona run"""
+    tool = _make_tool(tmp_path, monkeypatch)
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)]
+
+    tool.run_multi_persona_audit(urls, [str(PERSONA_PATH)])
+
+    unified = read_table(tmp_path / "audit_data" / "dataset", "audit")
+    assert len(unified) == 3 * 5
+    assert unified["persona"].nunique() == 1
+
+def test_multi_persona_scrapes_and_classifies_each_url_once(tmp_path, monkeypatch):
+    """Pages are fetched and classified once and shared by every persona"""
+    tool = _make_tool(tmp_path, monkeypatch, PipelineConfig(llm_workers=4, max_pages_in_flight=2))
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(4)] + ["https://www.soprasteria.be/missing"]
+
+    persona_paths = []
+    for name in ("Persona A", "Persona B", "Persona C"):
+        path = tmp_path / f"{name.replace(' ', '_')}.md"
+        path.write_text(f"# {name}\n\nA test persona.\n", encoding="utf-8")
+        persona_paths.append(str(path))
+
+    classified = []
+    classify_url = tool.methodology.classify_url
+    monkeypatch.setattr(tool.methodology, "classify_url", lambda url: classified.append(url) or classify_url(url))
+
+    results = tool.run_multi_persona_audit(urls, persona_paths)
+
+    assert sorted(tool.scraper.calls) == sorted(urls)
+    assert sorted(classified) == sorted(urls[:-1])
+    assert set(results) == {"Persona_A", "Persona_B", "Persona_C"}
+    for persona_results in results.values():
+        assert list(persona_results) == urls
+        assert persona_results[urls[-1]]["status"] == "error"
+
+    unified = read_table(tmp_path / "audit_data" / "dataset", "audit")
+    assert len(unified) == 3 * 4 * 5
+    assert unified["persona"].nunique() == 3
+
+def test_resume_only_regenerates_failed_artefacts(tmp_path, monkeypatch):
+    """A resumed run reuses journalled reports and retries only what failed"""
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(4)]
+
+    class FlakyAI(FakeAI):
+        def generate_response(self, prompt):
+            if prompt.endswith("page-2"):
+                raise RuntimeError("API outage")
+            return super().generate_response(prompt)
+
+    tool = _make_tool(tmp_path, monkeypatch)
+    tool.ai = FlakyAI(delay=0)
+    first = tool.run_audit(urls, str(PERSONA_PATH))
+    assert first[urls[2]]["status"] == "error"
+
+    resumed = _make_tool(tmp_path, monkeypatch)
+    resumed.resume = True
+    prompts = []
+    generate = resumed.ai.generate_response
+    resumed.ai.generate_response = lambda prompt: prompts.append(prompt) or generate(prompt)
+    results = resumed.run_audit(urls, str(PERSONA_PATH))
+
+    assert all(r["status"] == "success" for r in results.values())
+    assert prompts == [f"hygiene:{urls[2]}", f"experience:{urls[2]}"]
+    assert resumed.scraper.calls == [urls[2]]
+
+    persona_dir = next(p for p in (tmp_path / "audit_outputs").iterdir() if p.is_dir())
+    assert len(pd.read_csv(persona_dir / "pages.csv")) == 4
+
+def test_provider_failure_is_journalled_as_an_error_and_retried(tmp_path, monkeypatch):
+    """A failed provider call is not saved as a report, so --resume calls the model again for that page"""
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)]
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    stored = FakeAI(delay=0)
+
+    def post_json(self, url, headers, data):
+        if urls[1] in data["prompt"]:
+            raise ConnectionError("429 Too Many Requests")
+        return {"completion": stored.scorecard if "Evaluation Criteria" in data["prompt"] else stored.experience}
+
+    monkeypatch.setattr(AIInterface, "_post_json", post_json)
+    tool = _make_tool(tmp_path, monkeypatch)
+    tool.ai = AIInterface()
+    first = tool.run_audit(urls, str(PERSONA_PATH))
+
+    assert first[urls[1]]["status"] == "error" and "429" in first[urls[1]]["message"]
+    journal = RunJournal(tool.audit_outputs_dir)
+    persona = next(iter(journal.entries))[1]
+    assert journal.entries[(urls[1], persona, "hygiene_scorecard")]["status"] == "error"
+    assert journal.completed(urls[1], persona, "hygiene_scorecard") is None
+    assert not list(tool.audit_outputs_dir.rglob("*page-1*.md"))
+    # The single-call generators keep returning the error text
+    assert tool.ai.generate_hygiene_scorecard(urls[1], "text", "persona", tool.methodology).startswith(
+        ERROR_RESPONSE_PREFIX)
+
+    monkeypatch.setattr(AIInterface, "_post_json", lambda self, url, headers, data: {
+        "completion": stored.scorecard if "Evaluation Criteria" in data["prompt"] else stored.experience})
+    resumed = _make_tool(tmp_path, monkeypatch)
+    resumed.ai = AIInterface()
+    resumed.resume = True
+    results = resumed.run_audit(urls, str(PERSONA_PATH))
+
+    assert all(r["status"] == "success" for r in results.values())
+    assert resumed.scraper.calls == [urls[1]]
+    assert RunJournal(tool.audit_outputs_dir).completed(urls[1], persona, "hygiene_scorecard") is not None
+
+def test_since_recomputes_only_changed_pairs(tmp_path, monkeypatch):
+    """Unchanged (url, persona) pairs are carried forward by reference from the earlier run"""
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)]
+
+    first = _make_tool(tmp_path, monkeypatch)
+    first.audit_outputs_dir = tmp_path / "run1"
+    first.run_audit(urls, str(PERSONA_PATH))
+
+    second = _make_tool(tmp_path, monkeypatch)
+    second.audit_outputs_dir = tmp_path / "run2"
+    second.since = tmp_path / "run1"
+    fetch = second.scraper.fetch_page
+
+    def changed_page(url):
+        page = fetch(url)
+        if url == urls[1]:
+            page.raw_text += " (updated)"
+        return page
+
+    second.scraper.fetch_page = changed_page
+    prompts = []
+    generate = second.ai.generate_response
+    second.ai.generate_response = lambda prompt: prompts.append(prompt) or generate(prompt)
+    results = second.run_audit(urls, str(PERSONA_PATH))
+
+    assert all(r["status"] == "success" for r in results.values())
+    assert prompts == [f"hygiene:{urls[1]}", f"experience:{urls[1]}"]
+
+    manifest = json.loads((tmp_path / "run2" / "run_manifest.json").read_text())
+    assert manifest["counts"] == {"reused": 4, "recomputed": 2}
+    assert {e["url"] for e in manifest["recomputed"]} == {urls[1]}
+    assert all(Path(e["path"]).is_relative_to(tmp_path / "run1") for e in manifest["reused"])
+
+    # The new run's tables are complete even though only one page was re-evaluated
+    persona_dir = next(p for p in (tmp_path / "run2").iterdir() if p.is_dir())
+    assert len(pd.read_csv(persona_dir / "pages.csv")) == 3
+    assert len(list(persona_dir.glob("*.md"))) == 2 + 1
+
+def test_criteria_change_invalidates_only_that_tiers_scorecards(tmp_path, monkeypatch):
+    """Editing tier 1 criteria regenerates tier 1 scorecards; rows and manifest carry the fingerprints"""
+    import yaml
+    from audit_tool.methodology_parser import MethodologyParser
+
+    urls = ["https://www.soprasteria.be/", "https://www.soprasteria.be/page-0"]
+    first = _make_tool(tmp_path, monkeypatch)
+    first.audit_outputs_dir = tmp_path / "run1"
+    first.run_audit(urls, str(PERSONA_PATH))
+
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    config["criteria"]["tier_1"]["brand_criteria"]["brand_differentiation"]["weight"] = 21
+    edited = tmp_path / "methodology.yaml"
+    edited.write_text(yaml.safe_dump(config), encoding="utf-8")
+
+    second = _make_tool(tmp_path, monkeypatch)
+    second.methodology = MethodologyParser(str(edited))
+    second.audit_outputs_dir = tmp_path / "run2"
+    second.since = tmp_path / "run1"
+    prompts = []
+    generate = second.ai.generate_response
+    second.ai.generate_response = lambda prompt: prompts.append(prompt) or generate(prompt)
+    second.run_audit(urls, str(PERSONA_PATH))
+
+    assert prompts == [f"hygiene:{urls[0]}"]
+
+    manifest = json.loads((tmp_path / "run2" / "run_manifest.json").read_text())
+    fingerprints = manifest["fingerprints"]
+    assert set(fingerprints) == {"methodology", "criteria", "templates", "personas"}
+    assert fingerprints["criteria"]["tier_1"] == second.methodology.criteria_index.fingerprints["tier_1"]
+    assert fingerprints["criteria"]["tier_2"] == first.methodology.criteria_index.fingerprints["tier_2"]
+    assert fingerprints["methodology"] == first.methodology.criteria_index.settings_fingerprint
+
+    persona_dir = next(p for p in (tmp_path / "run2").iterdir() if p.is_dir())
+    pages = pd.read_csv(persona_dir / "pages.csv")
+    assert sorted(pages["criteria_fingerprint"]) == sorted(fingerprints["criteria"][t] for t in ("tier_1", "tier_2"))
+    assert (pages["persona_fingerprint"] == next(iter(fingerprints["personas"].values()))).all()
+    experience = pd.read_csv(persona_dir / "experience.csv")
+    assert (experience["template_fingerprint"] == fingerprints["templates"]["experience_report"]).all()
+    assert "criteria_fingerprint" not in experience
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared, memoised markdown report parser
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.generators import HygieneScorecard, parse_ai_scorecard
+from audit_tool.packager import AuditDataPackager
+from audit_tool.report_parser import parse_report, parse_report_file, tokenize_report, cache_info
+from test_pipeline import SAMPLE_DIR
+
+SCORECARD = """# Brand Hygiene Scorecard
+
+**URL:** https://www.soprasteria.be/
+**Persona:** The Technical Influencer
+**Audited:** 2025-06-22 12:37:10
+
+## Overall Assessment
+
+- **Tier/Channel:** Corporate Homepage
+- **Final Score:** 7.4/10
+
+## Detailed Scoring
+
+| Category | Score | Rationale |
+|----------|-------|-----------|
+| Brand Differentiation | 6 | Generic claims
+| Trust & Credibility Signals | 8 | Certifications and client stories
+| Call-to-Action Effectiveness | 7 | Present but not persona-targeted |
+
+## Priority Recommendations
+
+1. **Sharpen differentiation**
+   - State what is unique about the delivery model
+
+2. **Clarify CTAs** - Add "Request a consultation"
+"""
+
+EXPERIENCE = """| Finding | Example from Text | Strategic Analysis |
+| ------- | ----------------- | ------------------ |
+| Effective Copy | "The world is how we shape it" | Memorable and confident |
+| Ineffective Copy | "Welcome" | Generic |
+
+First Impression:
+A solid, if generic, corporate homepage.
+
+Language & Tone:
+Confident but broad.
+
+Business Impact & Next Steps:
+Limited until the CTAs improve.
+
+1) Add persona-specific CTAs
+"""
+
+def test_scorecard_record_feeds_backfill_packager():
+    """Metadata, every criteria row and nested recommendation descriptions are read in one pass"""
+    record = parse_report(SCORECARD)
+
+    assert (record.url, record.final_score) == ("https://www.soprasteria.be/", 7.4)
+    assert [(row.name, row.score) for row in record.criteria] == [
+        ("Brand Differentiation", 6.0), ("Trust & Credibility Signals", 8.0), ("Call-to-Action Effectiveness", 7.0)
+    ]
+
+    parsed = EnhancedBackfillPackager("P").parse_scorecard_content(SCORECARD)
+    assert parsed["metadata"]["tier"] == "Corporate Homepage"
+    assert [c["criterion_code"] for c in parsed["criteria_scores"]] == [
+        "brand_differentiation", "trust_credibility_signals", "calltoaction_effectiveness"
+    ]
+    assert [r["recommendation"] for r in parsed["recommendations"]] == [
+        "Sharpen differentiation: State what is unique about the delivery model",
+        'Clarify CTAs: Add "Request a consultation"'
+    ]
+
+def test_experience_record_keeps_labelled_sections_and_findings():
+    """Findings rows skip the header and each labelled section keeps the text under it"""
+    parsed = EnhancedBackfillPackager("P").parse_experience_content(EXPERIENCE)
+
+    assert [f["finding_type"] for f in parsed["findings"]] == ["Effective Copy", "Ineffective Copy"]
+    assert parsed["sections"]["first_impression"] == "A solid, if generic, corporate homepage."
+    assert parsed["sections"]["language_tone"] == "Confident but broad."
+    assert parsed["sections"]["business_impact"] == ("Limited until the CTAs improve.\n\n"
+                                                     "1) Add persona-specific CTAs")
+
+def test_generated_scorecards_round_trip():
+    """The "| **Name** | X/10 |" layout written by the generators parses back unchanged"""
+    scorecard = HygieneScorecard("https://example.com", "P")
+    scorecard.criteria_scores = [{"name": "Brand Clarity", "score": 7.5, "evidence": "Clear"}]
+    scorecard.set_final_score(7.5)
+    scorecard.add_recommendation("Add proof points")
+
+    assert parse_ai_scorecard(scorecard.generate()) == {
+        "criteria": [{"name": "Brand Clarity", "score": 7.5, "evidence": "Clear"}],
+        "final_score": 7.5,
+        "recommendations": ["Add proof points"]
+    }
+
+def test_reports_are_memoised_by_content_and_file(tmp_path, monkeypatch):
+    """Identical content shares one record and a file is read again only after it changes"""
+    assert parse_report(SCORECARD + "\n") is parse_report(SCORECARD + "\n")
+
+    path = tmp_path / "page_hygiene_scorecard.md"
+    path.write_text(SCORECARD, encoding="utf-8")
+    misses = cache_info()["misses"]
+    packager = AuditDataPackager("P")
+    monkeypatch.setattr(packager, "input_dir", tmp_path)
+    packager.create_page_facts_table()
+    packager.create_evidence_table()
+    assert parse_report_file(str(path)) is parse_report(SCORECARD)
+    assert cache_info()["misses"] <= misses + 1
+
+    path.write_text(SCORECARD.replace("7.4/10", "5.0/10"), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert parse_report_file(str(path)).final_score == 5.0
+
+@pytest.mark.benchmark
+def test_parse_time_grows_linearly_with_files():
+    """Per-file parse time stays flat from a few hundred to a few thousand reports"""
+    samples = [path.read_text(encoding="utf-8") for path in sorted(SAMPLE_DIR.glob("*.md"))]
+
+    def per_file(count):
+        reports = [f"{samples[i % len(samples)]}\n<!-- {count}:{i} -->" for i in range(count)]
+        started = time.perf_counter()
+        for report in reports:
+            tokenize_report(report)
+        return (time.perf_counter() - started) / count
+
+    small, large = per_file(200), per_file(2000)
+    print(f"\nparse time per file: {small * 1e6:.0f}us for 200 reports, {large * 1e6:.0f}us for 2000")
+    assert large < small * 3, f"{small * 1e6:.0f}us vs {large * 1e6:.0f}us per file"
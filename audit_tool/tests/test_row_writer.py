@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming packager rows to Parquet
+"""
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import backfill_packager, packager as packager_module, row_writer
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.packager import AuditDataPackager
+from audit_tool.report_parser import tokenize_report
+from audit_tool.row_writer import ParquetRowWriter
+from test_pipeline import SAMPLE_DIR
+
+CRITERIA = ["Brand Clarity", "Trust Signals", "Call to Action", "Visual Identity", "Proof Points",
+            "Tone of Voice", "Navigation", "Accessibility"]
+
+def _scorecard(page: int) -> str:
+    rows = "\n".join(f"| **{name}** | {(page * (i + 3)) % 11}/10 | Rationale for {name.lower()} on page {page} |"
+                     for i, name in enumerate(CRITERIA))
+    notes = "\n\n".join(f"**Justification:** Page {page} point {i} is stated plainly but given little proof.\n\n"
+                         f"**Recommendation:** Add client outcomes next to claim {i} on page {page}."
+                         for i in range(3))
+    return (f"# Brand Hygiene Scorecard\n\n**URL:** https://www.example.com/page-{page}\n\n"
+            f"## Detailed Scoring\n\n| Category | Score | Rationale |\n|---|---|---|\n{rows}\n\n"
+            f"**Final Score:** {page % 11}/10\n\n{notes}\n")
+
+def _reports(folder: Path, pages: int) -> Path:
+    folder.mkdir(parents=True)
+    for page in range(pages):
+        (folder / f"page_{page:05d}_hygiene_scorecard.md").write_text(_scorecard(page), encoding="utf-8")
+    return folder
+
+def _run(tmp_path: Path, name: str, pages: int) -> AuditDataPackager:
+    run = AuditDataPackager("P")
+    run.input_dir = _reports(tmp_path / "reports" / name, pages)
+    run.output_dir = tmp_path / "audit_runs" / name
+    run.dataset_dir = tmp_path / "dataset" / name
+    return run
+
+def test_rows_are_written_in_fixed_row_groups_with_the_schema(tmp_path):
+    """Rows land in row groups of the writer's size with the declared types, missing values as nulls"""
+    schema = pa.schema([("page_id", pa.string()), ("page_key", pa.int32()), ("score", pa.float64())])
+    path = tmp_path / "facts.parquet"
+    with ParquetRowWriter(path, schema, row_group_size=4) as writer:
+        assert writer.write_rows({"page_id": f"p{i}", "page_key": i, "score": i / 2} for i in range(9)) == 9
+        writer.write({"page_id": "last"})
+        assert not path.exists()
+
+    metadata = pq.ParquetFile(path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [4, 4, 2]
+    assert pq.read_schema(path).field("page_key").type == "int32"
+    assert pd.read_parquet(path)["score"].iloc[-1:].isna().all()
+
+    with ParquetRowWriter(tmp_path / "empty.parquet", schema):
+        pass
+    assert pq.read_table(tmp_path / "empty.parquet").schema.equals(schema)
+
+def test_a_failed_write_leaves_the_previous_file(tmp_path):
+    """Unknown columns are refused, and an aborted writer leaves no partial file behind"""
+    path = tmp_path / "facts.parquet"
+    with ParquetRowWriter(path, row_group_size=2) as writer:
+        writer.write_rows({"page_id": f"p{i}", "score": float(i)} for i in range(3))
+    with pytest.raises(ValueError):
+        with ParquetRowWriter(path, row_group_size=2) as writer:
+            writer.write_rows({"page_id": "new", "score": 1.0} for _ in range(5))
+            writer.write({"page_id": "bad", "grade": "A"})
+
+    assert pd.read_parquet(path)["page_id"].tolist() == ["p0", "p1", "p2"]
+    assert [p.name for p in tmp_path.iterdir()] == ["facts.parquet"]
+
+def test_package_run_streams_facts_and_derives_the_manifest_from_the_cube(tmp_path):
+    """Streamed tables hold every row, keyed and typed, and the manifest matches pandas over them"""
+    run = _run(tmp_path, "run", 30)
+    run.package_run()
+
+    facts = pd.read_parquet(run.output_dir / "page_facts.parquet")
+    evidence = pd.read_parquet(run.output_dir / "evidence.parquet")
+    manifest = json.loads((run.output_dir / "run_manifest.json").read_text())
+    assert len(facts) == 30 * (len(CRITERIA) + 1) and len(evidence) == 30 * 6
+    assert pq.read_schema(run.output_dir / "page_facts.parquet").field("page_key").type == "int32"
+    assert facts["page_key"].nunique() == manifest["total_pages"] == 30
+    assert evidence.groupby("evidence_type").size().to_dict() == {"justification": 90, "recommendation": 90}
+
+    assert manifest["total_criteria"] == len(facts)
+    assert manifest["average_score"] == pytest.approx(facts["raw_score"].mean())
+    assert manifest["score_distribution"]["std"] == pytest.approx(facts["raw_score"].std())
+    assert manifest["aggregates"]["by_descriptor"] == facts["descriptor"].value_counts().to_dict()
+    assert manifest["aggregates"]["by_criterion"] == pytest.approx(
+        facts.groupby("criterion_id")["raw_score"].mean().to_dict())
+
+def test_packaging_memory_stays_flat_as_reports_grow(tmp_path, monkeypatch):
+    """The Python heap high-water mark of package_run grows only by the page dimension's row per report"""
+    monkeypatch.setattr(row_writer, "ROW_GROUP_SIZE", 200)
+    monkeypatch.setattr(packager_module, "PAGE_BATCH_SIZE", 25)
+    # The report cache is bounded on its own (report_parser.CACHE_SIZE); measure the packager alone
+    monkeypatch.setattr(packager_module, "parse_report_file",
+                        lambda path: tokenize_report(Path(path).read_text(encoding="utf-8")))
+    _run(tmp_path, "warm_up", 5).package_run()
+
+    def peak(work):
+        tracemalloc.start()
+        try:
+            work()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def in_memory(run):
+        return lambda: (run.create_page_facts_table(), run.create_evidence_table())
+
+    small, large = _run(tmp_path, "small", 150), _run(tmp_path, "large", 600)
+    small_peak, large_peak = peak(small.package_run), peak(large.package_run)
+    small_lists, large_lists = peak(in_memory(small)), peak(in_memory(large))
+
+    print(f"\npeak for 150 and 600 reports: package_run {small_peak / 1024:.0f} and {large_peak / 1024:.0f} KiB, "
+          f"list-of-dicts tables {small_lists / 1024:.0f} and {large_lists / 1024:.0f} KiB")
+    assert len(pd.read_parquet(large.output_dir / "page_facts.parquet")) == 600 * (len(CRITERIA) + 1)
+    assert large_peak < 2 * small_peak
+    assert large_peak - small_peak < (large_lists - small_lists) / 4
+
+def test_backfill_memory_stays_flat_as_reports_grow(tmp_path, monkeypatch):
+    """stream_incremental grows only by the manifest's entry per page; the create_*_table path by every row"""
+    monkeypatch.setattr(row_writer, "ROW_GROUP_SIZE", 100)
+    monkeypatch.setattr(backfill_packager, "ROW_GROUP_SIZE", 100)
+    monkeypatch.setattr(backfill_packager, "PAGE_BATCH_SIZE", 20)
+    monkeypatch.setattr(backfill_packager, "parse_report_file",
+                        lambda path: tokenize_report(Path(path).read_text(encoding="utf-8")))
+    scorecard = sorted(SAMPLE_DIR.glob("*_hygiene_scorecard.md"))[0]
+    experience = SAMPLE_DIR / scorecard.name.replace("_hygiene_scorecard.md", "_experience_report.md")
+
+    def persona(name, pages):
+        folder = tmp_path / name
+        folder.mkdir()
+        for page in range(pages):
+            (folder / f"page_{page:05d}_hygiene_scorecard.md").write_bytes(scorecard.read_bytes())
+            if experience.exists():
+                (folder / f"page_{page:05d}_experience_report.md").write_bytes(experience.read_bytes())
+        return EnhancedBackfillPackager(name, input_dir=folder)
+
+    def peak(work):
+        tracemalloc.start()
+        try:
+            work()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    persona("warm_up", 5).stream_incremental()
+    small, large = persona("small", 80), persona("large", 320)
+    small_peak, large_peak = peak(small.stream_incremental), peak(large.stream_incremental)
+    small_lists = peak(persona("small_lists", 80).package_incremental)
+    large_lists = peak(persona("large_lists", 320).package_incremental)
+
+    print(f"\npeak for 80 and 320 pages: stream_incremental {small_peak / 1024:.0f} and {large_peak / 1024:.0f} KiB, "
+          f"list-of-dicts tables {small_lists / 1024:.0f} and {large_lists / 1024:.0f} KiB")
+    assert len(pd.read_parquet(large.output_dir / "pages.parquet")) == 320
+    assert large_peak - small_peak < (large_lists - small_lists) / 4
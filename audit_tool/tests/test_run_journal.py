@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the run journal used to checkpoint and resume audits
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.run_journal import RunJournal, atomic_write_text, JOURNAL_FILENAME
+
+def test_journal_replays_latest_entry_and_skips_torn_lines(tmp_path):
+    """Later entries win and a half-written last line is ignored"""
+    journal = RunJournal(tmp_path)
+    report = tmp_path / "page_hygiene_scorecard.md"
+    atomic_write_text(report, "# Scorecard")
+
+    journal.record("https://a", "P", "hygiene_scorecard", "error", message="timeout")
+    journal.record("https://a", "P", "hygiene_scorecard", "success", content="# Scorecard", prompt="p", path=report)
+    with open(tmp_path / JOURNAL_FILENAME, "a", encoding="utf-8") as f:
+        f.write('{"url": "https://b", "pers')
+
+    reloaded = RunJournal(tmp_path)
+    assert reloaded.read_completed("https://a", "P", "hygiene_scorecard") == "# Scorecard"
+    assert reloaded.entries[("https://a", "P", "hygiene_scorecard")]["path"] == report.name
+    assert reloaded.completed("https://b", "P", "hygiene_scorecard") is None
+
+def test_completed_requires_intact_output(tmp_path):
+    """Edited or missing artefacts are not treated as complete"""
+    journal = RunJournal(tmp_path)
+    report = tmp_path / "page_experience_report.md"
+    atomic_write_text(report, "original")
+    journal.record("https://a", "P", "experience_report", "success", content="original", path=report)
+
+    report.write_text("truncat", encoding="utf-8")
+    assert journal.completed("https://a", "P", "experience_report") is None
+
+    report.unlink()
+    assert journal.completed("https://a", "P", "experience_report") is None
+    assert not list(tmp_path.glob("*.tmp"))
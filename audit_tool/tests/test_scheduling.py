@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for tier-priority ordering and run budgets
+"""
+
+import sys
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.dataset import DATASET_DIRNAME, read_table
+from audit_tool.methodology_parser import MethodologyParser
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from audit_tool.pipeline import PipelineConfig
+from audit_tool.scheduling import WorkScheduler, RunBudget, load_opportunity_scores
+from test_package_manifest import _persona_folder
+from test_pipeline import _make_tool, CONFIG_PATH, PERSONA_PATH
+
+BASE = "https://www.soprasteria.be"
+
+def _previous_data(path):
+    rows = []
+    for url, score, weight in [(f"{BASE}/page-1", 8.0, 0.5), (f"{BASE}/page-2", 4.0, 0.5), (f"{BASE}/", 9.0, 0.3)]:
+        for criterion in ("a", "b"):
+            rows.append({"page_id": url[-6:], "url": url, "url_slug": url, "tier": "tier_2", "tier_name": "t",
+                         "tier_weight": weight, "avg_score": score, "criterion_id": criterion})
+    pd.DataFrame(rows).to_parquet(path, index=False)
+    return path
+
+def test_order_is_tier_1_then_opportunity_then_input(tmp_path):
+    """Tier 1 pages lead, previously weak pages follow and unseen pages keep their order"""
+    scores = load_opportunity_scores(_previous_data(tmp_path / "unified.parquet"))
+    assert scores == {f"{BASE}/page-1": 1.0, f"{BASE}/page-2": 3.0, f"{BASE}/": 0.3}
+
+    scheduler = WorkScheduler(MethodologyParser(str(CONFIG_PATH)), scores)
+    urls = [f"{BASE}/new-b", f"{BASE}/page-1", f"{BASE}/new-a", f"{BASE}/page-2", f"{BASE}/"]
+
+    assert scheduler.order(urls) == [f"{BASE}/", f"{BASE}/page-2", f"{BASE}/page-1", f"{BASE}/new-b", f"{BASE}/new-a"]
+
+def test_opportunity_matches_dashboard_definition(tmp_path):
+    """Scores rank pages the same way as BrandHealthMetricsCalculator.get_top_opportunities"""
+    module_path = Path(__file__).parent.parent / "dashboard" / "components" / "metrics_calculator.py"
+    spec = importlib.util.spec_from_file_location("metrics_calculator", module_path)
+    metrics_calculator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(metrics_calculator)
+
+    path = _previous_data(tmp_path / "unified.parquet")
+    calculator = metrics_calculator.BrandHealthMetricsCalculator(pd.read_parquet(path))
+    expected = {row["url"]: row["potential_impact"] for row in calculator.get_top_opportunities(limit=10)}
+
+    scores = load_opportunity_scores(path)
+    assert {url: round(scores[url], 1) for url in expected} == expected
+
+def test_opportunity_scores_come_from_the_default_dataset(tmp_path, monkeypatch):
+    """The packaged dataset gives every page a score through the page dimension and the methodology's tier weights"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    MultiPersonaPackager(str(tmp_path / "audit_outputs")).process_all_personas()
+    methodology = MethodologyParser(str(CONFIG_PATH))
+
+    scores = load_opportunity_scores(methodology=methodology)
+    pages = read_table(tmp_path / "audit_data" / DATASET_DIRNAME, "pages")
+    audit = read_table(tmp_path / "audit_data" / DATASET_DIRNAME, "audit").merge(pages[["page_key", "url"]])
+    assert set(scores) == set(audit["url"])
+
+    url = f"{BASE}/industries/financial-services"
+    tier = methodology.classify_url(url)[0]
+    weight = methodology.config["classification"]["onsite"][tier]["weight_in_onsite"]
+    assert scores[url] == pytest.approx((10 - audit.loc[audit["url"] == url, "score"].mean()) * weight)
+
+    # Input URLs are matched to the dimension's canonical URLs
+    scheduler = WorkScheduler(methodology, scores)
+    assert scheduler.priority(url + "/") == (1, -scores[url])
+
+def test_cost_budget_defers_remaining_pages(tmp_path, monkeypatch):
+    """Once the budget is spent no new page starts and the rest are reported as deferred"""
+    tool = _make_tool(tmp_path, monkeypatch, PipelineConfig(llm_workers=1, max_pages_in_flight=1, queue_size=1))
+    tool.ai.model_provider = "anthropic"
+    # Each page costs two calls of 100 input and 20 output tokens: $0.006
+    tool.scheduler = WorkScheduler(tool.methodology, budget=RunBudget(max_cost=0.005))
+    urls = [f"{BASE}/page-1", f"{BASE}/page-2", f"{BASE}/"]
+
+    results = tool.run_audit(urls, str(PERSONA_PATH))
+
+    assert results[f"{BASE}/"]["status"] == "success"
+    assert [results[url]["message"] for url in urls[:2]] == ["deferred: budget exhausted"] * 2
+    assert tool.scraper.calls == [f"{BASE}/"]
+    assert tool.scheduler.budget.calls == 2
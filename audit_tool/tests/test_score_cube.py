@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the materialised score cube
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import dataset
+from audit_tool.analytics import AnalyticsStore
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from audit_tool.score_cube import build_cube, grand_total, rolled_up, slice_cube
+from test_package_manifest import _persona_folder
+
+def _facts(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 11, rows).astype(float)
+    return pd.DataFrame({
+        "page_id": [f"page-{page}" for page in rng.integers(0, 200, rows)],
+        "persona_id": rng.choice(["CTO", "CFO", "CMO"], rows),
+        "tier": rng.choice(["tier_1", "tier_2", "tier_3"], rows),
+        "criterion_id": rng.choice([f"criterion_{i}" for i in range(10)], rows),
+        "raw_score": scores,
+        "descriptor": np.where(scores >= 4, "PASS", np.where(scores >= 2, "WARN", "FAIL"))
+    })
+
+def test_slices_match_groupbys_over_the_rows():
+    """Means, standard deviations, extremes and page counts come out as pandas computes them"""
+    facts = _facts(3000)
+    cube = build_cube(facts, score="raw_score", persona="persona_id", criterion="criterion_id")
+
+    for by, columns in ((["tier"], ["tier"]), (["persona", "criterion"], ["persona_id", "criterion_id"])):
+        expected = facts.groupby(columns)["raw_score"].agg(["count", "mean", "std", "min", "max"])
+        expected["pages"] = facts.groupby(columns)["page_id"].nunique()
+        sliced = slice_cube(cube, by=by)
+        assert list(sliced.set_index(by).index) == list(expected.index)
+        assert sliced["score_count"].tolist() == expected["count"].tolist()
+        assert sliced["mean"].to_numpy() == pytest.approx(expected["mean"].to_numpy())
+        assert sliced["std"].to_numpy() == pytest.approx(expected["std"].to_numpy())
+        assert sliced["score_min"].tolist() == expected["min"].tolist()
+        assert sliced["pages"].tolist() == expected["pages"].tolist()
+
+    # Several personas are combined exactly, a single value is read from its own rows
+    subset = facts[facts["persona_id"].isin(["CTO", "CFO"]) & (facts["descriptor"] == "PASS")]
+    sliced = slice_cube(cube, by=["tier"], persona=["CTO", "CFO"], descriptor="PASS")
+    assert sliced["score_count"].tolist() == subset.groupby("tier").size().tolist()
+    assert sliced["std"].to_numpy() == pytest.approx(subset.groupby("tier")["raw_score"].std().to_numpy())
+    assert grand_total(cube)["pages"] == facts["page_id"].nunique()
+
+def test_rolled_up_rows_never_mix_with_missing_values():
+    """A row whose dimension is empty stays apart from the total over that dimension"""
+    facts = pd.DataFrame({"page_id": ["a", "b", "c"], "tier": ["tier_1", None, "tier_1"],
+                          "score": [2.0, 4.0, 9.0]})
+    cube = build_cube(facts)
+
+    assert rolled_up(["tier"]) == 0b1011
+    sliced = slice_cube(cube, by=["tier"])
+    assert sliced["tier"].iloc[0] == "tier_1" and pd.isna(sliced["tier"].iloc[1])
+    assert sliced["score_sum"].tolist() == [11.0, 4.0]
+    assert grand_total(cube)["score_count"] == 3
+    assert grand_total(cube, tier="tier_2") is None
+    assert grand_total(build_cube(facts.iloc[:0])) is None
+    with pytest.raises(ValueError):
+        slice_cube(cube, by=["page"])
+
+def test_packaging_writes_one_cube_per_run(tmp_path, monkeypatch):
+    """The run's cube spans every persona and follows their partitions as they change"""
+    monkeypatch.chdir(tmp_path)
+    _persona_folder(tmp_path, "A")
+    folder = _persona_folder(tmp_path, "B")
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    packager.process_all_personas()
+
+    audit = dataset.read_table(packager.dataset_dir, "audit", run=packager.run_id)
+    cube = dataset.read_table(packager.dataset_dir, "cube", run=packager.run_id)
+    assert (packager.dataset_dir / "cube" / f"run={packager.run_id}" / dataset.PART_FILENAME).exists()
+    by_persona = slice_cube(cube, by=["persona"])
+    assert by_persona["persona"].tolist() == ["A", "B"]
+    assert by_persona["mean"].to_numpy() == pytest.approx(
+        audit.groupby("persona", observed=True)["score"].mean().to_numpy())
+    with AnalyticsStore("audit_data") as store:
+        assert store.scalar("SELECT score_count FROM score_cube WHERE rolled_up = ?", [rolled_up([])]) == len(audit)
+
+    for path in folder.iterdir():
+        path.unlink()
+    folder.rmdir()
+    packager.process_all_personas()
+
+    cube = dataset.read_table(packager.dataset_dir, "cube", run=packager.run_id)
+    assert slice_cube(cube, by=["persona"])["persona"].tolist() == ["A"]
+
+def test_cube_size_does_not_grow_with_the_audit():
+    """The cube of a large audit has no more groups than a small one"""
+    small, large = _facts(20000), _facts(400000, seed=1)
+    small_cube = build_cube(small, score="raw_score", persona="persona_id", criterion="criterion_id")
+    large_cube = build_cube(large, score="raw_score", persona="persona_id", criterion="criterion_id")
+
+    print(f"\ncube: {len(large_cube)} groups for {len(large)} rows")
+    assert len(large_cube) == len(small_cube)
+
+@pytest.mark.benchmark
+def test_cube_slice_beats_a_groupby():
+    """Slicing the cube of a large audit is faster than a groupby of its facts"""
+    large = _facts(400000, seed=1)
+    large_cube = build_cube(large, score="raw_score", persona="persona_id", criterion="criterion_id")
+
+    def best_of(work, repeat=3):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            work()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    groupby_time = best_of(lambda: large.groupby(["tier", "persona_id"])["raw_score"].agg(
+        ["count", "mean", "std", "min", "max"]).join(large.groupby(["tier", "persona_id"])["page_id"].nunique()))
+    slice_time = best_of(lambda: slice_cube(large_cube, by=["tier", "persona"]))
+
+    print(f"\ntier x persona: groupby {groupby_time * 1e3:.1f} ms, cube slice {slice_time * 1e3:.1f} ms")
+    assert slice_time < groupby_time
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorised scoring engine
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool import dataset
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.methodology_parser import MethodologyParser
+from audit_tool.models import CriterionScore, PageScore
+from audit_tool.multi_persona_packager import MultiPersonaPackager
+from audit_tool.scoring import ScoringEngine, DEFAULT_WEIGHT
+from test_pipeline import CONFIG_PATH
+
+@pytest.fixture(scope="module")
+def engine():
+    return ScoringEngine(MethodologyParser(str(CONFIG_PATH)))
+
+def _criteria_table(engine, pages, personas=("A", "B"), seed=3):
+    """Long-format rows: every persona scores every criterion of each page's tier"""
+    rng = np.random.default_rng(seed)
+    tiers = np.array(["tier_1", "tier_2", "tier_3", "owned"])
+    page_tiers = tiers[rng.integers(0, len(tiers), pages)]
+    frames = []
+    for tier in tiers:
+        page_ids = np.flatnonzero(page_tiers == tier)
+        codes = np.array(engine.index.tier_codes[tier])
+        for persona in personas:
+            frames.append(pd.DataFrame({"persona": persona,
+                                        "page_id": np.repeat(page_ids, len(codes)).astype(str),
+                                        "criterion_code": np.tile(codes, len(page_ids)),
+                                        "tier": tier}))
+    criteria = pd.concat(frames, ignore_index=True)
+    criteria["score"] = rng.integers(0, 11, len(criteria)).astype(float)
+    return criteria
+
+def test_final_scores_match_page_score_model(engine):
+    """Grouped weighted sums give the same scores as PageScore.calculate_final_score"""
+    criteria = _criteria_table(engine, 50)
+    criteria.loc[::7, "score"] = np.nan
+
+    pages = engine.score_pages(criteria).set_index(["persona", "page_id"])
+
+    for (persona, page_id), rows in criteria.dropna(subset=["score"]).groupby(["persona", "page_id"]):
+        model = PageScore(page_id, "", rows["tier"].iloc[0], 0.0, [
+            CriterionScore(page_id, code, "", score, weight=engine.index.weight(code, tier=tier))
+            for code, score, tier in zip(rows["criterion_code"], rows["score"], rows["tier"])
+        ])
+        page = pages.loc[(persona, page_id)]
+        assert page["final_score"] == pytest.approx(model.calculate_final_score())
+        assert page["mean_score"] == pytest.approx(rows["score"].mean())
+        assert page["criteria_count"] == len(rows)
+
+def test_weights_fall_back_from_tier_to_code_to_row(engine):
+    """Tier names resolve to keys, unknown codes use the row's weight_pct and then the default"""
+    criteria = pd.DataFrame({
+        "criterion_code": ["brand_differentiation", "brand_differentiation", "legacy_code", "unknown_code"],
+        "tier": ["Brand Positioning", "Value Propositions", "tier_1", "tier_1"],
+        "weight_pct": [1, 1, 15, None]
+    })
+    assert engine.weights(criteria).tolist() == [20.0, 20.0, 15.0, DEFAULT_WEIGHT]
+    assert engine.tier_keys(criteria["tier"]).tolist() == ["tier_1", "tier_2", "tier_1", "tier_1"]
+
+def test_descriptors_follow_methodology_bands(engine):
+    """Scores fall into the band of their whole-number part"""
+    descriptors = engine.descriptors([0, 3.9, 4, 7.5, 8, 9.9, 10, np.nan])
+    assert list(descriptors[:-1]) == ["FAIL", "FAIL", "WARNING", "WARNING", "PASS", "PASS", "EXCELLENT"]
+    assert pd.isna(descriptors[-1])
+    assert list(engine.descriptors([5], field="band")) == ["4-5"]
+
+def test_brand_health_and_rollups(engine):
+    """Experience labels feed the health index; tiers roll up into onsite, offsite and overall"""
+    criteria = pd.DataFrame({
+        "persona": "A", "page_id": ["p1", "p2", "p3"],
+        "criterion_code": ["brand_differentiation", "brand_message_consistency", "overall_sentiment"],
+        "tier": ["tier_1", "tier_2", "independent"], "score": [8.0, 6.0, 4.0]
+    })
+    experience = pd.DataFrame({"persona_id": "A", "page_id": ["p1"],
+                               "overall_sentiment": ["Positive"], "engagement_level": ["Low"]})
+
+    result = engine.score(criteria, experience)
+
+    health = result["pages"].set_index("page_id")["brand_health_index"]
+    packager = EnhancedBackfillPackager("A")
+    assert health["p1"] == packager.calculate_brand_health_index(8.0, 8.0, 2.0)
+    assert health["p2"] == packager.calculate_brand_health_index(6.0, 5.0, 5.0)
+
+    overall = result["overall"].iloc[0]
+    onsite = (8.0 * 0.3 + 6.0 * 0.5) / 0.8
+    assert overall["onsite_score"] == pytest.approx(onsite)
+    assert overall["offsite_score"] == pytest.approx(4.0)
+    assert overall["overall_score"] == pytest.approx(onsite * 0.7 + 4.0 * 0.3)
+
+def test_persona_comparison_comes_from_the_engine(tmp_path, monkeypatch):
+    """The unified comparison table carries the engine's tier, onsite, offsite and overall scores"""
+    monkeypatch.chdir(tmp_path)
+    packager = MultiPersonaPackager(str(tmp_path / "audit_outputs"))
+    pages = pd.DataFrame({"page_id": ["p1", "p2", "p3", "p4"], "url": [f"https://a.com/{i}" for i in range(4)],
+                          "tier": ["tier_1", "Value Propositions", "independent", "Corporate Homepage"],
+                          "final_score": [8.0, 6.0, 4.0, 5.0]})
+    criteria = pages[["page_id", "tier"]].assign(criterion_code="brand_differentiation", score=pages["final_score"])
+
+    packager.write_unified_files({"A": {"pages": pages, "criteria_scores": criteria}})
+    row = dataset.read_table(packager.dataset_dir, "comparison").iloc[0]
+    onsite = (8.0 * 0.3 + 6.0 * 0.5) / 0.8
+    assert row["page_count"] == 4 and row["average_score"] == pytest.approx(5.75)
+    assert (row["tier_1_score"], row["tier_2_score"]) == (8.0, 6.0) and np.isnan(row["tier_3_score"])
+    assert row["onsite_score"] == pytest.approx(onsite) and row["offsite_score"] == pytest.approx(4.0)
+    assert row["overall_score"] == pytest.approx(onsite * 0.7 + 4.0 * 0.3)
+    assert np.isnan(packager.persona_comparison(pages.iloc[3:])["overall_score"])
+
+def test_scores_many_personas_in_one_pass(engine):
+    """Criteria rows of several personas are all scored, with an overall score per persona"""
+    criteria = _criteria_table(engine, 4_000, personas=("A", "B", "C", "D", "E")).iloc[:100_000]
+    result = engine.score(criteria)
+
+    assert result["pages"]["criteria_count"].sum() == 100_000
+    assert set(result["overall"]["persona"]) == {"A", "B", "C", "D", "E"}
+
+@pytest.mark.benchmark
+def test_scores_a_million_rows_in_one_pass(engine):
+    """A million criteria rows across personas are scored well within two seconds"""
+    criteria = _criteria_table(engine, 40_000, personas=("A", "B", "C", "D", "E")).iloc[:1_000_000]
+
+    started = time.perf_counter()
+    result = engine.score(criteria)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nscored {len(criteria)} criteria rows in {elapsed:.2f}s")
+    assert result["pages"]["criteria_count"].sum() == 1_000_000
+    assert elapsed < 2.0, f"{elapsed:.2f}s"
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the audit daemon and its client
+"""
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.scraper import WarmBrowser
+from audit_tool.server import AuditService, AuditServer, AuditClient
+from test_pipeline import FakeScraper, FakeAI, CONFIG_PATH
+
+class LimitedAI(FakeAI):
+    """FakeAI that goes through the daemon's shared rate limiter like AIInterface does."""
+
+    rate_limiter = None
+
+    def generate_response(self, prompt):
+        with self.rate_limiter:
+            return super().generate_response(prompt)
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service = AuditService(str(CONFIG_PATH), max_jobs=2, llm_concurrency=2, warm_browser=False,
+                           jobs_dir=str(tmp_path / "jobs"))
+    service.scraper = FakeScraper()
+    service._ai["fake"] = LimitedAI(delay=0.02)
+    service._ai["fake"].rate_limiter = service.rate_limiter
+
+    server = AuditServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield service, AuditClient(server.url)
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+def _personas(n):
+    return [{"filename": f"persona_{i}.md", "content": f"# Persona {i}\n\nA test persona.\n"} for i in range(n)]
+
+def test_jobs_run_concurrently_with_shared_rate_limit(daemon, tmp_path):
+    """Two jobs run at once, stream page events and never exceed the shared model-call limit"""
+    service, client = daemon
+    assert client.is_available()
+
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(3)]
+    jobs = [client.submit(urls, personas=_personas(2), model="fake", output_dir=str(tmp_path / f"run{i}"))
+            for i in range(2)]
+
+    for job in jobs:
+        events = list(client.stream_events(job["job_id"], wait=5))
+        assert [e["type"] for e in events][-1] == "finished"
+        assert sum(e["type"] == "page" for e in events) == 6
+        assert client.status(job["job_id"])["status"] == "completed"
+
+    # Both jobs shared one scraper and AI interface and the model-call limit held across them
+    assert service._ai["fake"].peak == 2
+    assert service.ai_for("openai").rate_limiter is service.rate_limiter
+    assert len(service.scraper.calls) == 6
+
+def test_cancel_stops_feeding_pages(daemon, tmp_path):
+    service, client = daemon
+    service._ai["fake"].delay = 0.1
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(30)]
+    job = client.submit(urls, personas=_personas(1), model="fake", output_dir=str(tmp_path / "run"))
+
+    for event in client.stream_events(job["job_id"], wait=5):
+        if event["type"] == "page":
+            client.cancel(job["job_id"])
+
+    status = client.status(job["job_id"])
+    assert status["status"] == "cancelled"
+    assert status["counts"]["success"] < len(urls)
+
+def test_submit_validation(daemon):
+    _, client = daemon
+    with pytest.raises(RuntimeError, match="400"):
+        client.submit([], personas=_personas(1))
+    with pytest.raises(RuntimeError, match="404"):
+        client.status("missing")
+
+def test_jobs_get_their_own_output_directory(daemon, tmp_path):
+    """Jobs without an output_dir write to their own run; jobs naming the same one run one after another"""
+    service, client = daemon
+    urls = [f"https://www.soprasteria.be/page-{i}" for i in range(2)]
+    own = [client.submit(urls, personas=_personas(1), model="fake") for _ in range(2)]
+    shared = [client.submit(urls, personas=_personas(1), model="fake", output_dir=str(tmp_path / "shared"))
+              for _ in range(2)]
+
+    times = {}
+    for job in own + shared:
+        events = list(client.stream_events(job["job_id"], wait=5))
+        assert events[-1]["type"] == "finished"
+        times[job["job_id"]] = {e["type"]: e["time"] for e in events}
+    assert {client.status(job["job_id"])["output_dir"] for job in own} == {
+        str(service.output_root / job["job_id"]) for job in own}
+    assert all((service.output_root / job["job_id"] / "run_manifest.json").exists() for job in own)
+
+    first, second = sorted((times[job["job_id"]] for job in shared), key=lambda t: t["started"])
+    assert first["finished"] <= second["started"]
+
+def test_warm_browser_fails_waiting_fetches_when_chromium_does_not_start(monkeypatch):
+    """Fetches queued while the browser fails to launch fail at once, not at their timeout"""
+    def launch_failure(self):
+        time.sleep(0.2)
+        raise RuntimeError("Executable doesn't exist")
+
+    monkeypatch.setattr(WarmBrowser, "_serve", launch_failure)
+    browser = WarmBrowser()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(browser.fetch_html, f"https://example.com/{i}", 60) for i in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="Executable"):
+                future.result()
+    with pytest.raises(RuntimeError, match="Executable"):
+        browser.fetch_html("https://example.com/later", 60)
+    assert time.perf_counter() - started < 30
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorised strategic summary
+"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.strategic_summary_generator import StrategicSummaryGenerator
+from test_pipeline import SAMPLE_DIR
+
+def _tables(folder: Path, pages: int, seed: int = 0) -> Path:
+    """pages.csv and criteria_scores.csv with ten criteria rows per page"""
+    rng = np.random.default_rng(seed)
+    folder.mkdir(parents=True)
+    ids = [f"p{i}" for i in range(pages)]
+    pd.DataFrame({"page_id": ids, "url": [f"https://example.com/{i}" for i in ids],
+                  "tier": rng.choice(["tier_1", "tier_2", "tier_3"], pages)}).to_csv(folder / "pages.csv", index=False)
+    rows = pages * 10
+    pd.DataFrame({"page_id": rng.choice(ids, rows), "criterion_code": rng.choice([f"c{i}" for i in range(12)], rows),
+                  "score": rng.integers(0, 11, rows).astype(float), "evidence": "seen"
+                  }).to_csv(folder / "criteria_scores.csv", index=False)
+    return folder
+
+def test_csv_pages_join_their_criteria_in_one_pass(tmp_path):
+    """Each page takes its first pages.csv row and the mean of its scores; pages without scores are left out"""
+    folder = tmp_path / "P"
+    folder.mkdir()
+    pd.DataFrame({"page_id": ["a", "b", "a", "c"], "url": ["https://a", "https://b", "https://other", "https://c"],
+                  "tier": ["tier_1", "tier_2", "tier_3", "tier_1"]}).to_csv(folder / "pages.csv", index=False)
+    pd.DataFrame({"page_id": ["b", "a", "b", "x"], "criterion_code": ["c1", "c1", "c2", "c1"],
+                  "score": [2.0, 6.0, 4.0, 9.0], "evidence": ["e1", "e2", "e3", "e4"]
+                  }).to_csv(folder / "criteria_scores.csv", index=False)
+
+    generator = StrategicSummaryGenerator(str(folder))
+    pages, criteria = generator._load_frames()
+    assert pages[["page_id", "url", "tier", "final_score"]].values.tolist() == [
+        ["a", "https://a", "tier_1", 6.0], ["b", "https://b", "tier_2", 3.0]]
+    assert criteria["page_id"].tolist() == ["b", "a", "b"]
+    assert generator._load_scorecard_data()[1]["criteria"] == [{"name": "c1", "score": 2.0, "evidence": "e1"},
+                                                               {"name": "c2", "score": 4.0, "evidence": "e3"}]
+
+def test_stats_match_the_per_page_figures(tmp_path):
+    """Tier and criterion averages, rankings, strengths and weaknesses come from the frames as before"""
+    generator = StrategicSummaryGenerator(str(_tables(tmp_path / "P", 200)))
+    pages, criteria = generator._load_frames()
+    stats = generator._calculate_summary_stats(pages, criteria)
+    scores = pd.read_csv(tmp_path / "P" / "criteria_scores.csv")
+    page_means = scores.groupby("page_id")["score"].mean()
+
+    assert stats["overall_score"] == pytest.approx(page_means.mean())
+    assert stats["criterion_averages"].to_dict() == pytest.approx(
+        scores.groupby("criterion_code")["score"].mean().to_dict())
+    assert stats["top_pages"]["final_score"].tolist() == sorted(page_means, reverse=True)[:5]
+    assert stats["bottom_pages"]["final_score"].tolist() == sorted(page_means, reverse=True)[-5:]
+    assert list(stats["strengths"].index) == list(
+        stats["criterion_averages"].sort_values(ascending=False, kind="stable").index[:3])
+
+def test_report_renders_from_markdown_scorecards(tmp_path):
+    """Without tables the scorecards are parsed, tiered in one call and summarised"""
+    folder = shutil.copytree(SAMPLE_DIR, tmp_path / SAMPLE_DIR.name)
+    report, pages, stats = StrategicSummaryGenerator(str(folder)).generate_full_report()
+
+    assert len(pages) == len(list(SAMPLE_DIR.glob("*_hygiene_scorecard.md")))
+    assert f"across {len(pages)} digital touchpoints" in report
+    assert f"**{stats['overall_score']:.1f}/10**" in report
+    assert report.count("/10\n") >= 10
+    assert (folder / "Strategic_Summary.md").read_text(encoding="utf-8") == report
+
+def test_summary_of_hundreds_of_pages_renders_from_tables(tmp_path):
+    """Every page of the packaged tables is summarised and the report has all its sections"""
+    report, pages, _ = StrategicSummaryGenerator(str(_tables(tmp_path / "P", 500))).generate_full_report()
+
+    assert len(pages) == 500 and "## Key Weaknesses" in report
+
+@pytest.mark.benchmark
+def test_summary_of_thousands_of_pages_takes_well_under_a_second(tmp_path):
+    """Loading, statistics and rendering stay one groupby each however many pages there are"""
+    generator = StrategicSummaryGenerator(str(_tables(tmp_path / "P", 5000)))
+
+    started = time.perf_counter()
+    report, pages, _ = generator.generate_full_report()
+    elapsed = time.perf_counter() - started
+
+    print(f"\nstrategic summary of {len(pages)} pages: {elapsed * 1e3:.0f} ms")
+    assert len(pages) == 5000 and "## Key Weaknesses" in report
+    assert elapsed < 1.0
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the online strategic summary aggregator
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.backfill_packager import EnhancedBackfillPackager
+from audit_tool.dataset import read_table
+from audit_tool.multi_persona_packager import MultiPersonaPackager, StreamingPackager
+from audit_tool.pipeline import parse_artefact
+from audit_tool.strategic_summary_generator import StrategicSummaryGenerator, SummaryAggregator
+from test_pipeline import SAMPLE_DIR
+
+def _page_tables(pages: int, seed: int = 0):
+    """One pages and criteria_scores table per page, with tied scores and a page without criteria"""
+    rng = np.random.default_rng(seed)
+    for i in range(pages):
+        page_id = f"p{i}"
+        count = 0 if i == 3 else int(rng.integers(1, 6))
+        yield {
+            "pages": pd.DataFrame({"page_id": [page_id], "url": [f"https://example.com/{i}"],
+                                   "tier": [rng.choice(["tier_1", "tier_2", "tier_3"])]}),
+            "criteria_scores": pd.DataFrame({"page_id": [page_id] * count,
+                                             "criterion_code": rng.choice([f"c{j}" for j in range(8)], count),
+                                             "score": rng.integers(0, 5, count).astype(float)})
+        }
+
+def test_online_stats_render_the_summary_of_the_tables(tmp_path):
+    """Fed page by page, the aggregator renders the report the generator builds from the written tables"""
+    aggregator = SummaryAggregator("P")
+    tables = list(_page_tables(300))
+    for page in tables:
+        aggregator.add_tables(page)
+
+    folder = tmp_path / "P"
+    folder.mkdir()
+    for name in ("pages", "criteria_scores"):
+        pd.concat([page[name] for page in tables], ignore_index=True).to_csv(folder / f"{name}.csv", index=False)
+    report, pages, stats = StrategicSummaryGenerator(str(folder)).generate_full_report()
+
+    assert aggregator.render() == report
+    online = aggregator.stats()
+    assert len(aggregator) == len(pages) == 299
+    assert online["score_std"] == pytest.approx(pages["final_score"].std())
+    assert online["tier_counts"] == pages["tier"].value_counts().to_dict()
+    assert online["tier_std"]["tier_1"] == pytest.approx(pages.loc[pages["tier"] == "tier_1", "final_score"].std())
+    assert online["bottom_pages"]["page_id"].tolist() == stats["bottom_pages"]["page_id"].tolist()
+
+def test_a_page_packaged_again_replaces_its_result():
+    """Means, variances and rankings drop the earlier result, even when it was among the best pages"""
+    aggregator = SummaryAggregator("P", top_k=2)
+    for i, score in enumerate([9.0, 2.0, 5.0, 7.0]):
+        aggregator.add_page(f"p{i}", f"https://example.com/{i}", "tier_1", score, [("clarity", score)])
+    aggregator.add_page("p0", "https://example.com/0", "tier_2", 1.0, [("clarity", 1.0), ("trust", 3.0)])
+    aggregator.add_page("p9", "https://example.com/9", "tier_2", float("nan"), [])
+
+    stats = aggregator.stats()
+    assert stats["overall_score"] == pytest.approx(statistics.mean([1.0, 2.0, 5.0, 7.0]))
+    assert stats["score_std"] == pytest.approx(statistics.stdev([1.0, 2.0, 5.0, 7.0]))
+    assert stats["tier_averages"].to_dict() == pytest.approx({"tier_1": 14 / 3, "tier_2": 1.0})
+    assert stats["criterion_averages"].to_dict() == pytest.approx({"clarity": 3.75, "trust": 3.0})
+    assert stats["top_pages"]["page_id"].tolist() == ["p3", "p2"]
+    assert stats["bottom_pages"]["page_id"].tolist() == ["p1", "p0"]
+
+def test_streaming_packager_keeps_the_summary_current(tmp_path, monkeypatch):
+    """Each flush rewrites Strategic_Summary.md, and the last one matches a summary read back from disk"""
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / "audit_outputs" / "P"
+    folder.mkdir(parents=True)
+    parser = EnhancedBackfillPackager("P", input_dir=folder)
+    packager = StreamingPackager(MultiPersonaPackager(str(tmp_path / "audit_outputs")), flush_every=4)
+    scorecards = sorted(SAMPLE_DIR.glob("*_hygiene_scorecard.md"))
+
+    for i, path in enumerate(scorecards):
+        packager.add_page("P", folder, parse_artefact(parser, "hygiene_scorecard", path.read_text(encoding="utf-8"),
+                                                      folder / path.name))
+        if i == 3:
+            partial = (folder / "Strategic_Summary.md").read_text(encoding="utf-8")
+            assert "across 4 digital touchpoints" in partial
+    packager.finalize(write_unified=False)
+
+    summary = (folder / "Strategic_Summary.md").read_text(encoding="utf-8")
+    assert f"across {len(scorecards)} digital touchpoints" in summary
+    assert summary == StrategicSummaryGenerator(str(folder)).generate_full_report()[0]
+    assert packager.summary_for("P").render() == summary and packager.summary_for("Q") is None
+
+def test_streamed_pages_are_stamped_once_in_finalize(tmp_path, monkeypatch):
+    """finalize stamps page keys once for both the persona files and the unified partitions"""
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / "audit_outputs" / "P"
+    folder.mkdir(parents=True)
+    parser = EnhancedBackfillPackager("P", input_dir=folder)
+    packager = StreamingPackager(MultiPersonaPackager(str(tmp_path / "audit_outputs")), flush_every=2)
+    stamped = []
+    stamp = packager.unified_packager.stamp_page_keys
+    monkeypatch.setattr(packager.unified_packager, "stamp_page_keys", lambda tables: stamped.append(1) or stamp(tables))
+
+    scorecards = sorted(SAMPLE_DIR.glob("*_hygiene_scorecard.md"))[:5]
+    for path in scorecards:
+        packager.add_page("P", folder, parse_artefact(parser, "hygiene_scorecard", path.read_text(encoding="utf-8"),
+                                                      folder / path.name))
+    tables = packager.finalize()
+
+    assert len(stamped) == 1
+    assert tables["P"]["pages"]["page_key"].notna().all()
+    audit = read_table(tmp_path / "audit_data" / "dataset", "audit")
+    assert set(audit["page_key"]) == set(tables["P"]["pages"]["page_key"])
+
+def test_streaming_packager_flushes_on_a_page_count_or_interval(tmp_path, monkeypatch):
+    """Pages are not rewritten one by one: a flush waits for the page count or the interval, and finalize flushes"""
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / "audit_outputs" / "P"
+    folder.mkdir(parents=True)
+    parser = EnhancedBackfillPackager("P", input_dir=folder)
+    scorecards = [parse_artefact(parser, "hygiene_scorecard", path.read_text(encoding="utf-8"), folder / path.name)
+                  for path in sorted(SAMPLE_DIR.glob("*_hygiene_scorecard.md"))]
+    assert len(scorecards) >= 3
+
+    packager = StreamingPackager(MultiPersonaPackager(str(tmp_path / "audit_outputs")))
+    assert (packager.flush_every, packager.flush_interval) == (25, 5.0)
+    for scorecard in scorecards[:2]:
+        packager.add_page("P", folder, scorecard)
+    assert not (folder / "pages.csv").exists() and not (folder / "Strategic_Summary.md").exists()
+
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    timed = StreamingPackager(MultiPersonaPackager(str(tmp_path / "audit_outputs")), flush_interval=2.0)
+    timed.add_page("P", folder, scorecards[0])
+    assert not (folder / "pages.csv").exists()
+    clock[0] += 2.0
+    timed.add_page("P", folder, scorecards[1])
+    assert len(pd.read_csv(folder / "pages.csv")) == 2
+    timed.add_page("P", folder, scorecards[2])
+    assert len(pd.read_csv(folder / "pages.csv")) == 2
+
+    timed.finalize(write_unified=False)
+    assert len(pd.read_csv(folder / "pages.csv")) == 3
+    assert "across 3 digital touchpoints" in (folder / "Strategic_Summary.md").read_text(encoding="utf-8")
+
+def test_renders_thousands_of_pages():
+    """The summary of pages added one at a time counts every page"""
+    aggregator = SummaryAggregator("P")
+    for i in range(2000):
+        aggregator.add_page(f"p{i}", f"https://example.com/{i}", f"tier_{i % 3 + 1}", float(i % 11),
+                            [(f"c{j}", float((i + j) % 11)) for j in range(10)])
+
+    assert "across 2000 digital touchpoints" in aggregator.render()
+
+@pytest.mark.benchmark
+def test_updates_and_renders_do_not_grow_with_the_pages():
+    """Adding a page and rendering the summary cost the same after ten or ten thousand pages"""
+    aggregator = SummaryAggregator("P")
+    rng = np.random.default_rng(1)
+    scores = rng.integers(0, 11, 10000).astype(float)
+
+    def add(start, stop):
+        started = time.perf_counter()
+        for i in range(start, stop):
+            aggregator.add_page(f"p{i}", f"https://example.com/{i}", f"tier_{i % 3 + 1}", scores[i],
+                                [(f"c{j}", scores[(i + j) % 10000]) for j in range(10)])
+        return (time.perf_counter() - started) / (stop - start)
+
+    early = add(0, 500)
+    add(500, 9500)
+    late = add(9500, 10000)
+    started = time.perf_counter()
+    report = aggregator.render()
+    render_time = time.perf_counter() - started
+
+    print(f"\nsummary aggregator: {early * 1e6:.0f} us per page early, {late * 1e6:.0f} us late, "
+          f"render of 10000 pages {render_time * 1e3:.1f} ms")
+    assert "across 10000 digital touchpoints" in report
+    assert late < 3 * early
+    assert render_time < 0.1
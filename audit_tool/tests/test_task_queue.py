@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared task queue backends
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.task_queue import (AuditTask, InMemoryTaskQueue, SQLiteTaskQueue, open_task_queue,
+                                   DONE, FAILED, LEASED, PENDING)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue_and_clock(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        return InMemoryTaskQueue(max_attempts=2, clock=clock), clock
+    return SQLiteTaskQueue(str(tmp_path / "queue.db"), max_attempts=2, clock=clock), clock
+
+def test_lease_heartbeat_and_reclaim(queue_and_clock):
+    """Expired leases are reclaimed, heartbeats keep them alive, attempts are capped"""
+    queue, clock = queue_and_clock
+    tasks = [AuditTask.create("https://a", "p.md"), AuditTask.create("https://b", "p.md")]
+    assert queue.enqueue(tasks) == 2
+    assert queue.enqueue(tasks) == 0
+
+    first = queue.lease("w1", lease_seconds=10)
+    second = queue.lease("w1", lease_seconds=10)
+    assert (first.url, second.url) == ("https://a", "https://b")
+    assert queue.lease("w2", lease_seconds=10) is None
+
+    # w1 keeps "b" alive but dies holding "a"
+    clock.now += 8
+    assert queue.heartbeat(second.task_id, "w1", lease_seconds=10)
+    clock.now += 5
+    retried = queue.lease("w2", lease_seconds=10)
+    assert retried.url == "https://a" and retried.attempts == 2
+    assert not queue.complete(first.task_id, "w1")
+
+    assert queue.complete(second.task_id, "w1")
+    assert queue.fail(retried.task_id, "w2", "API outage")
+
+    statuses = {task.url: task.status for task in queue.tasks()}
+    assert statuses == {"https://a": FAILED, "https://b": DONE}
+    assert queue.is_drained()
+
+def test_runs_sharing_a_queue_see_only_their_own_tasks(queue_and_clock):
+    """The same pairs queue again for a later run, and leases, counts and listings are scoped to a run"""
+    queue, _ = queue_and_clock
+    pairs = [("https://a", "p.md"), ("https://b", "p.md")]
+    assert queue.enqueue(AuditTask.create(url, persona, "run1") for url, persona in pairs) == 2
+    assert queue.enqueue(AuditTask.create(url, persona, "run2") for url, persona in pairs) == 2
+    assert queue.enqueue(AuditTask.create(url, persona, "run2") for url, persona in pairs) == 0
+
+    while (task := queue.lease("w1", lease_seconds=10, run="run1")) is not None:
+        assert task.run == "run1"
+        queue.complete(task.task_id, "w1")
+    assert queue.is_drained("run1") and not queue.is_drained("run2") and not queue.is_drained()
+    assert queue.counts("run2") == {PENDING: 2, LEASED: 0, DONE: 0, FAILED: 0}
+    assert [task.url for task in queue.tasks("run2")] == ["https://a", "https://b"]
+    assert {task.run for task in queue.tasks()} == {"run1", "run2"}
+
+def test_queue_created_before_runs_keeps_its_tasks(tmp_path):
+    """An existing database gains the run column; its tasks belong to the unnamed run"""
+    path = tmp_path / "queue.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE tasks (task_id TEXT PRIMARY KEY, url TEXT NOT NULL, persona_path TEXT NOT NULL, "
+                     "status TEXT NOT NULL, worker_id TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+                     "message TEXT, seq INTEGER)")
+        conn.execute("INSERT INTO tasks VALUES (?, 'https://a', 'p.md', 'done', NULL, NULL, 1, NULL, 1)",
+                     (AuditTask.create("https://a", "p.md").task_id,))
+
+    queue = SQLiteTaskQueue(str(path))
+    assert [(task.url, task.run, task.status) for task in queue.tasks("")] == [("https://a", "", DONE)]
+    assert queue.enqueue([AuditTask.create("https://a", "p.md")]) == 0
+    assert queue.enqueue([AuditTask.create("https://a", "p.md", "later")]) == 1
+
+def test_open_task_queue_specs(tmp_path):
+    assert isinstance(open_task_queue("memory://"), InMemoryTaskQueue)
+    assert open_task_queue(f"sqlite://{tmp_path}/q.db").path == tmp_path / "q.db"
+    with pytest.raises(ValueError):
+        open_task_queue("redis://localhost")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled, cached tier classifier
+"""
+
+import re
+import sys
+import time
+import random
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import audit_tool modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from audit_tool.tier_classifier import TierClassifier, ONSITE_DOMAINS
+
+HOSTS = ["https://www.soprasteria.be", "http://soprasteria.com", "https://blog.soprasteria.nl", "//soprasteria.be",
+         "https://www.linkedin.com/company/soprasteria", "https://www.techzine.be/nieuws", "https://nl.digital.nl",
+         "https://soprasteria.be.example.com", "https://www.youtube.com/SopraSteria_Benelux"]
+PATHS = ["", "/", "/about-us", "/About-Us/", "/industries", "/industries/banking", "/what-we-do/data-ai/genai",
+         "/newsroom/blog/details/llms", "/contact-us", "/sopra-steria-helps", "/random/{}"]
+
+def _reference(classifier, url):
+    """The original sequential classification, pattern by pattern"""
+    domain = urlparse(url).netloc.lower()
+    onsite = any(domain == d or domain.endswith('.' + d) for d in ONSITE_DOMAINS)
+    patterns, default = ((classifier.tier_patterns, classifier.default_tier) if onsite
+                         else (classifier.channel_patterns, classifier.default_channel))
+    for name, name_patterns in patterns.items():
+        if any(re.match(pattern, url, re.IGNORECASE) for pattern in name_patterns):
+            return name
+    return default
+
+def _urls(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(HOSTS) + rng.choice(PATHS).format(rng.randrange(count // 10 or 1)) for _ in range(count)]
+
+def test_combined_matcher_matches_sequential_patterns():
+    """One alternation pass gives the same tier or channel as trying each pattern in turn"""
+    classifier = TierClassifier()
+    assert classifier._tier_matcher.combined is not None
+
+    for url in _urls(2000):
+        assert classifier.classify_url(url)[0] == _reference(classifier, url), url
+
+def test_cache_is_keyed_by_canonical_url():
+    """Case variants share one cache entry"""
+    classifier = TierClassifier(cache_size=4)
+    for url in ["https://www.soprasteria.be/", "HTTPS://WWW.SOPRASTERIA.BE/", "https://www.SopraSteria.be/"]:
+        assert classifier.classify_url(url)[0] == "tier_1"
+
+    info = classifier.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (2, 1, 4)
+
+def test_padded_urls_classify_as_before():
+    """Surrounding whitespace is not trimmed, so padded URLs get the sequential classification's label"""
+    classifier = TierClassifier()
+    for url in [" HTTPS://WWW.SOPRASTERIA.BE/ ", "https://www.soprasteria.be/about-us ", "\thttps://www.linkedin.com/x"]:
+        assert classifier.classify_url(url)[0] == _reference(classifier, url), repr(url)
+    assert classifier.classify_many([" https://www.soprasteria.be/"]) == [_reference(classifier, " https://www.soprasteria.be/")]
+
+def test_patterns_with_groups_fall_back_to_one_by_one():
+    """Config patterns with their own groups still classify in priority order"""
+    classifier = TierClassifier({'tier_patterns': {'tier_1': [r'^https?://(www\.)?soprasteria\.be/?$'],
+                                                   'tier_3': [r'^https?://(www\.)?soprasteria\.be/.+']}})
+    assert classifier._tier_matcher.combined is None
+    assert classifier.classify_many(["https://soprasteria.be", "https://www.soprasteria.be/x"]) == ["tier_1", "tier_3"]
+
+def test_classify_many_labels_a_column_in_input_order():
+    """A DataFrame column keeps its index and every label matches the sequential classification"""
+    column = pd.Series(_urls(20_000), index=range(5, 20_005))
+    labels = TierClassifier().classify_many(column)
+
+    assert labels.index.equals(column.index)
+    sample = column.sample(500, random_state=1)
+    assert (labels[sample.index] == [_reference(TierClassifier(), url) for url in sample]).all()
+
+@pytest.mark.benchmark
+def test_classify_many_labels_a_column_quickly():
+    """A DataFrame column is labelled at well over 100k URLs per second"""
+    column = pd.Series(_urls(200_000), index=range(5, 200_005))
+    classifier = TierClassifier()
+
+    started = time.perf_counter()
+    classifier.classify_many(column)
+    rate = len(column) / (time.perf_counter() - started)
+
+    print(f"\nclassify_many of {len(column)} URLs: {rate:,.0f} URLs/s")
+    assert rate > 100_000, f"{rate:,.0f} URLs/s"
@@ -12,24 +12,114 @@ This module provides URL classification functionality that:
 
 The classifier uses URL patterns, content indicators, and predefined rules
 to ensure appropriate evaluation criteria are applied to each digital touchpoint.
+
+The tier and channel patterns are compiled once into a single alternation per
+set, so a URL is matched in one regex pass with the first listed pattern still
+winning. Results are memoised in a bounded LRU cache keyed by canonical URL,
+and classify_many labels whole columns by classifying each distinct URL once.
 """
 
 import re
 import logging
-from typing import Tuple, Dict, Any, List, Optional
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Tuple, Dict, Any, List, Optional, Iterable
 
 logger = logging.getLogger(__name__)
 
+# Distinct URLs whose classification is memoised per classifier
+DEFAULT_CACHE_SIZE = 65536
+
+# Domains whose pages are classified into tiers rather than channels
+ONSITE_DOMAINS = ('soprasteria.com', 'soprasteria.be', 'soprasteria.nl')
+
+# A URL whose host is an onsite domain or one of its subdomains, i.e. the netloc
+# urlparse would return equals a domain or ends with "." + domain
+_ONSITE_URL = re.compile(
+    r'^(?:[a-z][a-z0-9+.\-]*:)?//(?:[^/?#]*\.)?(?:' + '|'.join(re.escape(d) for d in ONSITE_DOMAINS) + r')(?=[/?#]|$)',
+    re.IGNORECASE
+)
+
+# Characters urlparse ignores before matching the netloc: leading control characters
+# and spaces, and tabs and newlines anywhere
+_URL_PADDING = ''.join(chr(code) for code in range(33))
+_URL_UNSAFE = {ord('\t'): None, ord('\r'): None, ord('\n'): None}
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of a URL used as the classification cache key.
+    
+    Every pattern is matched case-insensitively and the domain check lowercases
+    the host, so case never changes the result. Whitespace is kept: the anchored
+    patterns do not match a padded URL, which falls back to the default tier or
+    channel as it always has.
+    
+    Args:
+        url: URL to canonicalise
+        
+    Returns:
+        The lowercased URL
+    """
+    return url.lower()
+
+class _PatternMatcher:
+    """Ordered labelled patterns compiled into one regex; the first pattern that matches wins."""
+    
+    def __init__(self, patterns: Dict[str, List[str]]):
+        """
+        Compile the patterns.
+        
+        Args:
+            patterns: Lists of regex patterns by label, in priority order
+        """
+        self.labels: List[str] = []
+        self.patterns = []
+        for label, label_patterns in patterns.items():
+            for pattern in label_patterns:
+                self.patterns.append(re.compile(pattern, re.IGNORECASE))
+                self.labels.append(label)
+        
+        # Alternatives are tried left to right, which keeps the original first-match order.
+        # Patterns with their own groups could clash with the group names, so they are
+        # matched one by one instead.
+        self.combined = None
+        if self.patterns and all(pattern.groups == 0 for pattern in self.patterns):
+            try:
+                self.combined = re.compile(
+                    '|'.join(f'(?P<p{i}>{pattern.pattern})' for i, pattern in enumerate(self.patterns)),
+                    re.IGNORECASE
+                )
+            except re.error as e:
+                logger.warning(f"Could not combine classification patterns, matching one by one: {str(e)}")
+    
+    def match(self, url: str) -> Optional[str]:
+        """
+        Return the label of the first pattern matching the start of the URL.
+        
+        Args:
+            url: URL to match
+            
+        Returns:
+            The label, or None if no pattern matches
+        """
+        if self.combined is not None:
+            match = self.combined.match(url)
+            return self.labels[int(match.lastgroup[1:])] if match else None
+        
+        for pattern, label in zip(self.patterns, self.labels):
+            if pattern.match(url):
+                return label
+        return None
+
 class TierClassifier:
     """Classifies URLs into appropriate tiers and channel types."""
     
-    def __init__(self, methodology_config: Dict[str, Any] = None):
+    def __init__(self, methodology_config: Dict[str, Any] = None, cache_size: int = DEFAULT_CACHE_SIZE):
         """
         Initialize with optional methodology configuration.
         
         Args:
             methodology_config: Dictionary containing classification rules
+            cache_size: Number of distinct URLs whose classification is memoised
         """
         self.config = methodology_config or {}
         
@@ -74,6 +164,12 @@ class TierClassifier:
         # Default fallback tiers
         self.default_tier = 'tier_2'
         self.default_channel = 'owned'
+        
+        # Compile every pattern once and memoise results per classifier
+        self._tier_matcher = _PatternMatcher(self.tier_patterns)
+        self._channel_matcher = _PatternMatcher(self.channel_patterns)
+        self._configs: Dict[Tuple[bool, str], Dict[str, Any]] = {}
+        self._classify_canonical = lru_cache(maxsize=cache_size)(self._classify_uncached)
     
     def classify_url(self, url: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -85,13 +181,61 @@ class TierClassifier:
         Returns:
             Tuple of (tier_name, tier_config)
         """
+        onsite, name = self._classify_canonical(canonical_url(url))
+        return name, self._config_for(onsite, name)
+    
+    def classify_many(self, urls: Iterable[str]) -> Any:
+        """
+        Classify a column of URLs, classifying each distinct URL once.
+        
+        Args:
+            urls: URLs to classify; a pandas Series keeps its index
+            
+        Returns:
+            Tier or channel names in input order, as a Series for Series input and a list otherwise.
+            Missing (non-string) values are labelled None.
+        """
+        if hasattr(urls, 'map') and hasattr(urls, 'index'):
+            labels = {url: self._label(url) for url in urls.unique()}
+            return urls.map(labels)
+        
+        urls = list(urls)
+        labels = {url: self._label(url) for url in dict.fromkeys(urls)}
+        return [labels[url] for url in urls]
+    
+    def cache_info(self):
+        """Hit and miss statistics of the classification cache."""
+        return self._classify_canonical.cache_info()
+    
+    def _label(self, url: Any) -> Optional[str]:
+        if not isinstance(url, str):
+            return None
+        return self._classify_canonical(canonical_url(url))[1]
+    
+    def _classify_uncached(self, url: str) -> Tuple[bool, str]:
+        """
+        Classify a canonical URL.
+        
+        Args:
+            url: Canonical URL
+            
+        Returns:
+            Tuple of (is_onsite, tier or channel name)
+        """
         logger.debug(f"Classifying URL: {url}")
         
         # Check if this is an onsite or offsite URL
         if self._is_onsite(url):
-            return self._classify_onsite(url)
-        else:
-            return self._classify_offsite(url)
+            return True, self._tier_matcher.match(url) or self.default_tier
+        return False, self._channel_matcher.match(url) or self.default_channel
+    
+    def _config_for(self, onsite: bool, name: str) -> Dict[str, Any]:
+        key = (onsite, name)
+        config = self._configs.get(key)
+        if config is None:
+            config = self._get_tier_config(name) if onsite else self._get_channel_config(name)
+            self._configs[key] = config
+        return config
     
     def _is_onsite(self, url: str) -> bool:
         """
@@ -103,20 +247,8 @@ class TierClassifier:
         Returns:
             True if onsite, False if offsite
         """
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        # Check if domain is a Sopra Steria domain
-        onsite_domains = [
-            'soprasteria.com',
-            'soprasteria.be',
-            'soprasteria.nl',
-            'www.soprasteria.com',
-            'www.soprasteria.be',
-            'www.soprasteria.nl'
-        ]
-        
-        return any(domain == d or domain.endswith('.' + d) for d in onsite_domains)
+        # Check if domain is a Sopra Steria domain or one of its subdomains
+        return _ONSITE_URL.match(url.lstrip(_URL_PADDING).translate(_URL_UNSAFE)) is not None
     
     def _classify_onsite(self, url: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -128,16 +260,8 @@ class TierClassifier:
         Returns:
             Tuple of (tier_name, tier_config)
         """
-        # Check each tier pattern
-        for tier_name, patterns in self.tier_patterns.items():
-            for pattern in patterns:
-                if re.match(pattern, url, re.IGNORECASE):
-                    logger.debug(f"URL {url} classified as {tier_name}")
-                    return tier_name, self._get_tier_config(tier_name)
-        
-        # If no match, use default tier
-        logger.debug(f"URL {url} defaulted to {self.default_tier}")
-        return self.default_tier, self._get_tier_config(self.default_tier)
+        tier_name = self._tier_matcher.match(url) or self.default_tier
+        return tier_name, self._get_tier_config(tier_name)
     
     def _classify_offsite(self, url: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -149,16 +273,8 @@ class TierClassifier:
         Returns:
             Tuple of (channel_name, channel_config)
         """
-        # Check each channel pattern
-        for channel_name, patterns in self.channel_patterns.items():
-            for pattern in patterns:
-                if re.match(pattern, url, re.IGNORECASE):
-                    logger.debug(f"URL {url} classified as {channel_name}")
-                    return channel_name, self._get_channel_config(channel_name)
-        
-        # If no match, use default channel
-        logger.debug(f"URL {url} defaulted to {self.default_channel}")
-        return self.default_channel, self._get_channel_config(self.default_channel)
+        channel_name = self._channel_matcher.match(url) or self.default_channel
+        return channel_name, self._get_channel_config(channel_name)
     
     def _get_tier_config(self, tier_name: str) -> Dict[str, Any]:
         """